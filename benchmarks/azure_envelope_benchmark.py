@@ -0,0 +1,110 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the envelopes per second built, and serialized, by the Azure
+trace and log exporters.
+
+Requires the opencensus-ext-azure package.
+
+Usage: python benchmarks/azure_envelope_benchmark.py
+"""
+
+import logging
+import timeit
+
+from opencensus.common import json_serializer
+from opencensus.ext.azure.common import Options
+from opencensus.ext.azure.log_exporter import AzureLogHandler
+from opencensus.ext.azure.trace_exporter import AzureExporter
+from opencensus.trace import span_context, span_data
+from opencensus.trace.span import SpanKind
+from opencensus.trace.status import Status
+
+INSTRUMENTATION_KEY = '12345678-1234-5678-abcd-12345678abcd'
+
+
+def make_exporter():
+    # Skip the constructor, which starts the export worker and statsbeat.
+    exporter = AzureExporter.__new__(AzureExporter)
+    exporter.options = Options(instrumentation_key=INSTRUMENTATION_KEY)
+    return exporter
+
+
+def make_handler():
+    handler = AzureLogHandler.__new__(AzureLogHandler)
+    logging.Handler.__init__(handler)
+    handler.options = Options(instrumentation_key=INSTRUMENTATION_KEY)
+    return handler
+
+
+def make_span_data(kind):
+    return span_data.SpanData(
+        name='GET /api',
+        context=span_context.SpanContext(
+            trace_id='6e0c63257de34c92bf9efcd03927272e'),
+        span_id='6e0c63257de34c92',
+        parent_span_id='6e0c63257de34c93',
+        attributes={
+            'component': 'HTTP',
+            'http.method': 'GET',
+            'http.url': 'https://example.com/api?a=b',
+            'http.route': '/api',
+            'http.status_code': 200,
+        },
+        start_time='2026-01-02T03:04:05.678901Z',
+        end_time='2026-01-02T03:04:05.778901Z',
+        stack_trace=None,
+        links=None,
+        status=Status(0),
+        annotations=None,
+        message_events=None,
+        same_process_as_parent_span=None,
+        child_span_count=None,
+        span_kind=kind,
+    )
+
+
+def make_record():
+    record = logging.LogRecord('benchmark', logging.WARNING, __file__, 1,
+                               'Message %s', ('value',), None)
+    record.custom_dimensions = {'key': 'value'}
+    return record
+
+
+def measure(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=5))
+
+
+def main(number=10000):
+    exporter = make_exporter()
+    handler = make_handler()
+    record = make_record()
+    paths = [
+        ('server span', lambda sd=make_span_data(SpanKind.SERVER):
+            next(exporter.span_data_to_envelope(sd))),
+        ('client span', lambda sd=make_span_data(SpanKind.CLIENT):
+            next(exporter.span_data_to_envelope(sd))),
+        ('log record', lambda: handler.log_record_to_envelope(record)),
+    ]
+    print('{:>12} {:>14} {:>14}'.format('path', 'built/s', 'serialized/s'))
+    for name, build in paths:
+        print('{:>12} {:>14.0f} {:>14.0f}'.format(
+            name,
+            measure(build, number),
+            measure(lambda: json_serializer.dumpb(build(), default=str),
+                    number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure storing a backlog of batches in the Azure local storage engines,
+and draining it.
+
+Requires the opencensus-ext-azure package.
+
+Usage: python benchmarks/azure_storage_benchmark.py
+"""
+
+import shutil
+import tempfile
+import time
+
+from opencensus.ext.azure.common.segmented_storage import (
+    SegmentedFileStorage,
+)
+from opencensus.ext.azure.common.storage import LocalFileStorage
+
+BACKLOG_SIZES = (100, 1000, 5000)
+BATCH = [{
+    'name': 'Microsoft.ApplicationInsights.Message',
+    'time': '2026-01-02T03:04:05.678901Z',
+    'iKey': '12345678-1234-5678-abcd-12345678abcd',
+    'tags': {'ai.operation.id': '6e0c63257de34c92bf9efcd03927272e'},
+    'data': {'baseType': 'MessageData',
+             'baseData': {'ver': 2, 'message': 'message', 'properties': {}}},
+}] * 10
+
+
+def drain(storage):
+    count = 0
+    for blob in storage.gets():
+        if blob.lease(10):
+            blob.get()
+            blob.delete()
+            count += 1
+    return count
+
+
+def measure(storage_class, size, **kwargs):
+    path = tempfile.mkdtemp()
+    try:
+        storage = storage_class(path, max_size=1 << 40, **kwargs)
+        start = time.time()
+        for _ in range(size):
+            storage.put(BATCH)
+        put_time = time.time() - start
+        start = time.time()
+        assert drain(storage) == size
+        drain_time = time.time() - start
+        storage.close()
+        return put_time, drain_time
+    finally:
+        shutil.rmtree(path)
+
+
+def main():
+    engines = [
+        ('file', LocalFileStorage, {}),
+        ('segmented', SegmentedFileStorage, {}),
+        ('no fsync', SegmentedFileStorage, {'fsync': False}),
+    ]
+    print('{:>10} {:>8} {:>12} {:>12}'.format(
+        'engine', 'batches', 'put/s', 'drained/s'))
+    for size in BACKLOG_SIZES:
+        for name, storage_class, kwargs in engines:
+            put_time, drain_time = measure(storage_class, size, **kwargs)
+            print('{:>10} {:>8} {:>12.0f} {:>12.0f}'.format(
+                name, size, size / put_time, size / drain_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure binary tag map serialization for tag maps of 1 to 64 tags.
+
+Usage: python benchmarks/binary_serializer_benchmark.py
+"""
+
+import timeit
+
+from opencensus.tags import tag_map as tag_map_module
+from opencensus.tags.propagation import binary_serializer
+
+TAG_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def make_tag_map(tag_count):
+    tag_map = tag_map_module.TagMap()
+    for ii in range(tag_count):
+        tag_map.insert('key{}'.format(ii), 'value{}'.format(ii))
+    return tag_map
+
+
+def decode_uncached(serializer, binary):
+    binary_serializer._decoded_tag_maps.clear()
+    return serializer.from_byte_array(binary)
+
+
+def main(number=2000):
+    serializer = binary_serializer.BinarySerializer()
+    print('{:>5} {:>12} {:>12} {:>12}'.format(
+        'tags', 'encode', 'decode', 'cached'))
+    for tag_count in TAG_COUNTS:
+        tag_map = make_tag_map(tag_count)
+        binary = serializer.to_byte_array(tag_map)
+        results = [
+            timeit.timeit(func, number=number) / number * 1e6
+            for func in (
+                lambda: serializer.to_byte_array(tag_map),
+                lambda: decode_uncached(serializer, binary),
+                lambda: serializer.from_byte_array(binary),
+            )
+        ]
+        print('{:>5} {:>10.2f}us {:>10.2f}us {:>10.2f}us'.format(
+            tag_count, *results))
+
+
+if __name__ == '__main__':
+    main()
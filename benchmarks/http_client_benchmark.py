@@ -0,0 +1,93 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure batches per second posted to a local stand-in collector, with a
+new connection per batch and with the pooled keep-alive client.
+
+Usage: python benchmarks/http_client_benchmark.py
+"""
+
+import json
+import threading
+import timeit
+
+import requests
+from six.moves import BaseHTTPServer, socketserver
+
+from opencensus.common.transports import http
+
+BATCH_SIZES = (1, 100, 1000)
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(202)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def make_batch(size):
+    return json.dumps([{
+        'traceId': '6e0c63257de34c92bf9efcd03927272e',
+        'id': '{:016x}'.format(ii),
+        'name': 'span{}'.format(ii),
+        'timestamp': 1502820146071158,
+        'duration': 10000000,
+        'tags': {'key': 'value'},
+    } for ii in range(size)])
+
+
+def measure(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main(number=200):
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:{}/api/v2/spans'.format(server.server_address[1])
+    headers = {'Content-Type': 'application/json'}
+    client = http.HttpClient()
+
+    try:
+        print('{:>10} {:>16} {:>16}'.format(
+            'spans', 'requests.post', 'HttpClient'))
+        for size in BATCH_SIZES:
+            data = make_batch(size)
+            results = [
+                measure(lambda: requests.post(url, data=data,
+                                              headers=headers), number),
+                measure(lambda: client.post(url, data=data,
+                                            headers=headers), number),
+            ]
+            print('{:>10} {:>14.0f}/s {:>14.0f}/s'.format(size, *results))
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
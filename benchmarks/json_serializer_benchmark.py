@@ -0,0 +1,78 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure serializing a batch of envelopes to JSON bytes with each
+installed serializer.
+
+Usage: python benchmarks/json_serializer_benchmark.py
+"""
+
+import timeit
+
+from opencensus.common import json_serializer
+
+BATCH_SIZES = (1, 100, 1000)
+
+
+def make_batch(size):
+    return [{
+        'name': 'Microsoft.ApplicationInsights.RemoteDependency',
+        'time': '2026-01-02T03:04:05.678901Z',
+        'iKey': '12345678-1234-5678-abcd-12345678abcd',
+        'tags': {
+            'ai.cloud.role': 'benchmark',
+            'ai.operation.id': '6e0c63257de34c92bf9efcd03927272e',
+            'ai.operation.parentId': '{:016x}'.format(ii),
+        },
+        'data': {
+            'baseType': 'RemoteDependencyData',
+            'baseData': {
+                'id': '{:016x}'.format(ii),
+                'name': 'GET /api/{}'.format(ii),
+                'duration': '0.00:00:00.010',
+                'resultCode': '200',
+                'success': True,
+                'properties': {'component': 'HTTP', 'http.method': 'GET'},
+            },
+        },
+    } for ii in range(size)]
+
+
+def get_serializers():
+    serializers = []
+    for serializer_class in json_serializer._SERIALIZERS:
+        try:
+            serializers.append(serializer_class())
+        except Exception:
+            pass
+    return serializers
+
+
+def measure(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=200):
+    print('{:>10} {:>10} {:>12}'.format('serializer', 'envelopes', 'time'))
+    for size in BATCH_SIZES:
+        batch = make_batch(size)
+        for serializer in get_serializers():
+            print('{:>10} {:>10} {:>10.1f}us'.format(
+                serializer.name, size,
+                measure(lambda: serializer.dumpb(batch, default=str),
+                        number)))
+
+
+if __name__ == '__main__':
+    main()
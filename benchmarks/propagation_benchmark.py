@@ -0,0 +1,89 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the composite propagator with trying the individual propagators
+one after another.
+
+Usage: python benchmarks/propagation_benchmark.py
+"""
+
+import timeit
+
+from opencensus.trace.propagation import (
+    b3_format,
+    composite_format,
+    google_cloud_format,
+    trace_context_http_header_format,
+)
+
+TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+SPAN_ID = '00f067aa0ba902b7'
+
+COMMON_HEADERS = {
+    'host': 'example.com',
+    'user-agent': 'benchmark',
+    'accept': '*/*',
+    'accept-encoding': 'gzip, deflate',
+    'connection': 'keep-alive',
+}
+
+HEADERS = {
+    'traceparent': dict(
+        COMMON_HEADERS,
+        traceparent='00-{}-{}-01'.format(TRACE_ID, SPAN_ID),
+        tracestate='congo=t61rcWkgMzE'),
+    'b3': dict(
+        COMMON_HEADERS,
+        **{'x-b3-traceid': TRACE_ID,
+           'x-b3-spanid': SPAN_ID,
+           'x-b3-sampled': '1'}),
+    'google cloud': dict(
+        COMMON_HEADERS,
+        **{'X-Cloud-Trace-Context': '{}/1;o=1'.format(TRACE_ID)}),
+}
+
+INDIVIDUAL_PROPAGATORS = (
+    trace_context_http_header_format.TraceContextPropagator(),
+    b3_format.B3FormatPropagator(),
+    google_cloud_format.GoogleCloudFormatPropagator(),
+)
+
+
+def from_headers_individually(headers):
+    for propagator in INDIVIDUAL_PROPAGATORS:
+        span_context = propagator.from_headers(headers)
+        if span_context.from_header:
+            return span_context
+    return span_context
+
+
+def main(number=20000):
+    cached = composite_format.CompositePropagator()
+    uncached = composite_format.CompositePropagator(cache_size=0)
+    print('{:<14} {:>12} {:>12} {:>12}'.format(
+        'format', 'individual', 'composite', 'cached'))
+    for name, headers in HEADERS.items():
+        results = [
+            timeit.timeit(lambda: from_(headers), number=number) /
+            number * 1e6
+            for from_ in (from_headers_individually,
+                          uncached.from_headers,
+                          cached.from_headers)
+        ]
+        print('{:<14} {:>10.2f}us {:>10.2f}us {:>10.2f}us'.format(
+            name, *results))
+
+
+if __name__ == '__main__':
+    main()
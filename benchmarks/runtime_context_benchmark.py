@@ -0,0 +1,59 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure getting and setting runtime context slots with the thread local
+and the contextvars backends.
+
+Usage: python benchmarks/runtime_context_benchmark.py
+"""
+
+import timeit
+
+from opencensus.common import runtime_context
+
+
+def get_backends():
+    backends = [('threading.local',
+                 runtime_context._ThreadLocalRuntimeContext())]
+    if runtime_context.contextvars is not None:
+        backends.append(('contextvars',
+                         runtime_context._AsyncRuntimeContext()))
+    return backends
+
+
+def measure(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def main(number=100000):
+    print('{:>16} {:>16} {:>10}'.format('backend', 'operation', 'time'))
+    for name, backend in get_backends():
+        value_slot = backend.register_slot('benchmark_value', None)
+        dict_slot = backend.register_slot('benchmark_dict', lambda: {})
+        current = backend.current
+        operations = (
+            ('getattr', lambda: backend.benchmark_value),
+            ('slot.get', value_slot.get),
+            ('current', lambda: current().benchmark_value),
+            ('slot.set', lambda: value_slot.set(None)),
+            ('update dict', lambda: dict_slot.get_mutable().update(k=1)),
+            ('snapshot', backend.snapshot),
+        )
+        for operation, func in operations:
+            print('{:>16} {:>16} {:>8.0f}ns'.format(
+                name, operation, measure(func, number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -18,17 +18,164 @@ try:
 except ImportError:
     contextvars = None
 
+import copy
 import threading
 
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: NO COVER
+    from collections import Mapping
+
 __all__ = ['RuntimeContext']
 
 
+class _Context(Mapping):
+    """The values of all the slots of a runtime context.
+
+    Every registered slot is an attribute of the context, preallocated with
+    its default value. A context is captured as a snapshot by reference and
+    shared from then on, a write to a shared context copies it first.
+    """
+
+    __slots__ = ('_shared', '_owned', '__dict__')
+
+    def __getitem__(self, name):
+        return self.__dict__[name]
+
+    def __iter__(self):
+        return iter(self.__dict__)
+
+    def __len__(self):
+        return len(self.__dict__)
+
+    def __repr__(self):
+        return repr(self.__dict__)
+
+
+_new_context_object = object.__new__
+
+
+def _copy_context(context, context_type, shared=False):
+    new_context = _new_context_object(context_type)
+    new_context._shared = shared
+    new_context._owned = ()
+    new_context.__dict__ = context.__dict__.copy()
+    return new_context
+
+
+def _disown(context, name):
+    context._owned = tuple(owned for owned in context._owned
+                           if owned != name)
+
+
+class _Slot(object):
+    def __init__(self, name, default, runtime_context):
+        self.name = name
+        self.default = default if callable(default) else (lambda: default)
+        self._bind(runtime_context)
+
+    def _bind(self, runtime_context):
+        self._runtime_context = runtime_context
+        self._set_value = runtime_context._set_value
+        # The context of the runtime context the slot is registered with.
+        self.current = runtime_context.current
+
+    def clear(self):
+        self.set(self.default())
+
+    def get(self):
+        context = self.current()
+        if self.name in context._owned:
+            # The value escapes, it mustn't be updated in place anymore.
+            _disown(context, self.name)
+        return context.__dict__[self.name]
+
+    def get_mutable(self):
+        """Get the value of the slot to update it in place.
+
+        The value is copied on the first update after the context was
+        shared or the value was read with :meth:`get`.
+        """
+        context = self._runtime_context._get_writable_context()
+        value = context.__dict__[self.name]
+        if self.name not in context._owned:
+            value = copy.copy(value)
+            context.__dict__[self.name] = value
+            context._owned += (self.name,)
+        return value
+
+    def set(self, value):
+        self._set_value(self.name, value)
+
+
 class _RuntimeContext(object):
+    @classmethod
+    def _get_context(cls):
+        """Get the current context, or None if there's none yet."""
+
+        raise NotImplementedError  # pragma: NO COVER
+
+    @classmethod
+    def _set_context(cls, context):
+        """Replace the current context."""
+
+        raise NotImplementedError  # pragma: NO COVER
+
+    @classmethod
+    def _new_context(cls, values=()):
+        """Create a context of the registered slots, the slots missing from
+        values are set to their default value."""
+
+        context = _new_context_object(cls._context_type)
+        context._shared = False
+        context._owned = ()
+        context.__dict__.update(
+            (name, slot.default()) for name, slot in cls._slots.items()
+            if name not in values)
+        context.__dict__.update(values)
+        return context
+
+    @classmethod
+    def _init_context(cls, context):
+        # Either there's no context yet, or slots were registered since it
+        # was created.
+        context = cls._new_context(context or ())
+        cls._set_context(context)
+        return context
+
+    @classmethod
+    def current(cls):
+        """Get the context of the current thread or task.
+
+        The slots are attributes of the returned context, it must only be
+        read, slots are set through the runtime context.
+        """
+
+        context = cls._get_context()
+        if type(context) is not cls._context_type:
+            context = cls._init_context(context)
+        return context
+
+    @classmethod
+    def _get_writable_context(cls):
+        context = cls.current()
+        if context._shared:
+            context = _copy_context(context, cls._context_type)
+            cls._set_context(context)
+        return context
+
+    @classmethod
+    def _set_value(cls, name, value):
+        context = cls._get_writable_context()
+        context.__dict__[name] = value
+        if name in context._owned:
+            _disown(context, name)
+
     @classmethod
     def clear(cls):
         """Clear all slots to their default value."""
 
-        raise NotImplementedError  # pragma: NO COVER
+        cls._set_context(cls._new_context())
 
     @classmethod
     def register_slot(cls, name, default=None):
@@ -43,21 +190,76 @@ class _RuntimeContext(object):
         :returns: The registered slot.
         """
 
-        raise NotImplementedError  # pragma: NO COVER
+        with cls._lock:
+            if name in cls._slots:
+                raise ValueError('slot {} already registered'.format(name))
+            if hasattr(_Context, name):
+                raise ValueError('slot name {} is reserved'.format(name))
+            slot = _Slot(name, default, cls)
+            cls._add_slot(slot)
+            return slot
+
+    @classmethod
+    def _add_slot(cls, slot):
+        cls._slots[slot.name] = slot
+        if not hasattr(cls, slot.name):
+            # Skip __getattr__ for registered slots.
+            setattr(cls, slot.name, property(lambda self: slot.get()))
+        # Contexts created before are upgraded on their next access.
+        cls._context_type = type(_Context)(
+            '_Context', (_Context,), {'__slots__': ()})
+
+    @classmethod
+    def adopt_slots(cls, runtime_context):
+        """Move the slots registered with another runtime context to this
+        one, to replace it after the slots were registered.
+
+        The slots keep working through both runtime contexts, the values of
+        the current context are copied.
+
+        :type runtime_context: :class:`_RuntimeContext`
+        :param runtime_context: The runtime context to replace.
+        """
+
+        values = dict(runtime_context.current())
+        with cls._lock:
+            for slot in list(runtime_context._slots.values()):
+                if slot.name not in cls._slots:
+                    slot._bind(cls)
+                    cls._add_slot(slot)
+        for name, value in values.items():
+            if name in cls._slots:
+                cls._set_value(name, value)
 
     def apply(self, snapshot):
-        """Set the current context from a given snapshot dictionary"""
+        """Set the current context from a given snapshot.
 
+        A snapshot taken by :meth:`snapshot` is applied by reference, for
+        a dictionary every slot is set in turn.
+        """
+
+        if isinstance(snapshot, _Context):
+            snapshot._shared = True
+            self._set_context(snapshot)
+            return
         for name in snapshot:
             setattr(self, name, snapshot[name])
 
-    def snapshot(self):
-        """Return a dictionary of current slots by reference."""
+    @classmethod
+    def snapshot(cls):
+        """Return a read-only mapping of the current slots by reference.
 
-        return dict((n, self._slots[n].get()) for n in self._slots.keys())
+        The snapshot is not copied, writes to the context after taking it
+        copy the context instead.
+        """
+
+        context = cls.current()
+        context._shared = True
+        return context
 
     def __repr__(self):
-        return ('{}({})'.format(type(self).__name__, self.snapshot()))
+        return ('{}({})'.format(type(self).__name__,
+                                self.current().__dict__))
 
     def __getattr__(self, name):
         if name not in self._slots:
@@ -79,12 +281,12 @@ class _RuntimeContext(object):
         caller_context = self.snapshot()
 
         def call_with_current_context(*args, **kwargs):
+            backup_context = self._get_context()
+            self._set_context(caller_context)
             try:
-                backup_context = self.snapshot()
-                self.apply(caller_context)
                 return func(*args, **kwargs)
             finally:
-                self.apply(backup_context)
+                self._set_context(backup_context)
 
         return call_with_current_context
 
@@ -92,86 +294,81 @@ class _RuntimeContext(object):
 class _ThreadLocalRuntimeContext(_RuntimeContext):
     _lock = threading.Lock()
     _slots = {}
+    _context_type = None
 
-    class Slot(object):
-        _thread_local = threading.local()
-
-        def __init__(self, name, default):
-            self.name = name
-            self.default = default if callable(default) else (lambda: default)
+    class _ThreadLocal(threading.local):
+        context = None
 
-        def clear(self):
-            setattr(self._thread_local, self.name, self.default())
+    _thread_local = _ThreadLocal()
 
-        def get(self):
-            try:
-                return getattr(self._thread_local, self.name)
-            except AttributeError:
-                value = self.default()
-                self.set(value)
-                return value
-
-        def set(self, value):
-            setattr(self._thread_local, self.name, value)
+    @classmethod
+    def _get_context(cls):
+        return cls._thread_local.context
 
     @classmethod
-    def clear(cls):
-        with cls._lock:
-            for name in cls._slots:
-                slot = cls._slots[name]
-                slot.clear()
+    def _set_context(cls, context):
+        cls._thread_local.context = context
 
     @classmethod
-    def register_slot(cls, name, default=None):
-        with cls._lock:
-            if name in cls._slots:
-                raise ValueError('slot {} already registered'.format(name))
-            slot = cls.Slot(name, default)
-            cls._slots[name] = slot
-            return slot
+    def current(cls):
+        context = cls._thread_local.context
+        if type(context) is not cls._context_type:
+            context = cls._init_context(context)
+        return context
 
 
 class _AsyncRuntimeContext(_RuntimeContext):
     _lock = threading.Lock()
     _slots = {}
+    _context_type = None
+    _contextvar = None
 
-    class Slot(object):
-        def __init__(self, name, default):
-            self.name = name
-            self.contextvar = contextvars.ContextVar(name)
-            self.default = default if callable(default) else (lambda: default)
+    @classmethod
+    def _get_context(cls):
+        return cls._contextvar.get(None)
 
-        def clear(self):
-            self.contextvar.set(self.default())
+    @classmethod
+    def _set_context(cls, context):
+        cls._contextvar.set(context)
 
-        def get(self):
-            try:
-                return self.contextvar.get()
-            except LookupError:
-                value = self.default()
-                self.set(value)
-                return value
+    @classmethod
+    def _init_context(cls, context):
+        context = cls._new_context(context or ())
+        # Tasks inherit the context of their parent, so the context is
+        # always shared.
+        context._shared = True
+        cls._contextvar.set(context)
+        return context
 
-        def set(self, value):
-            self.contextvar.set(value)
+    @classmethod
+    def current(cls):
+        context = cls._contextvar.get(None)
+        if type(context) is not cls._context_type:
+            context = cls._init_context(context)
+        return context
 
     @classmethod
-    def clear(cls):
-        with cls._lock:
-            for name in cls._slots:
-                slot = cls._slots[name]
-                slot.clear()
+    def _get_writable_context(cls):
+        context = _copy_context(cls.current(), cls._context_type, True)
+        cls._contextvar.set(context)
+        return context
 
     @classmethod
-    def register_slot(cls, name, default=None):
-        with cls._lock:
-            if name in cls._slots:
-                raise ValueError('slot {} already registered'.format(name))
-            slot = cls.Slot(name, default)
-            cls._slots[name] = slot
-            return slot
+    def _set_value(cls, name, value):
+        context = cls._contextvar.get(None)
+        if type(context) is not cls._context_type:
+            context = cls._init_context(context)
+        # Inlined _copy_context, setting a slot is the most frequent write.
+        new_context = _new_context_object(cls._context_type)
+        new_context._shared = True
+        new_context._owned = ()
+        new_context.__dict__ = values = context.__dict__.copy()
+        values[name] = value
+        cls._contextvar.set(new_context)
 
 
 RuntimeContext = _ThreadLocalRuntimeContext()
 if contextvars:
+    _AsyncRuntimeContext._contextvar = contextvars.ContextVar(
+        'opencensus_runtime_context')
     RuntimeContext = _AsyncRuntimeContext()
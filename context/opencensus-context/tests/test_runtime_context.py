@@ -14,6 +14,7 @@
 
 import unittest
 
+from opencensus.common import runtime_context
 from opencensus.common.runtime_context import RuntimeContext
 
 
@@ -70,3 +71,88 @@ class RuntimeContextTest(unittest.TestCase):
         thread.join()
 
         self.assertEqual(RuntimeContext.operation_id, 'foo')
+
+    def test_snapshot_copy_on_write(self):
+        RuntimeContext.register_slot('cow', 'default')
+        RuntimeContext.cow = 'foo'
+
+        snapshot = RuntimeContext.snapshot()
+        self.assertIs(RuntimeContext.snapshot(), snapshot)
+        self.assertEqual(snapshot['cow'], 'foo')
+
+        RuntimeContext.cow = 'bar'
+        self.assertEqual(RuntimeContext.cow, 'bar')
+        self.assertEqual(snapshot['cow'], 'foo')
+        self.assertIsNot(RuntimeContext.snapshot(), snapshot)
+
+        RuntimeContext.apply(snapshot)
+        self.assertIs(RuntimeContext.snapshot(), snapshot)
+        self.assertEqual(RuntimeContext.cow, 'foo')
+
+        RuntimeContext.apply({'cow': 'baz'})
+        self.assertEqual(RuntimeContext.cow, 'baz')
+        self.assertEqual(snapshot['cow'], 'foo')
+        self.assertIn('cow', repr(RuntimeContext))
+
+    def test_with_current_context_restores_context(self):
+        RuntimeContext.register_slot('restored')
+        RuntimeContext.restored = 'caller'
+        wrapped = RuntimeContext.with_current_context(
+            lambda: RuntimeContext.restored)
+
+        RuntimeContext.restored = 'other'
+        backup = RuntimeContext.snapshot()
+        self.assertEqual(wrapped(), 'caller')
+        self.assertIs(RuntimeContext.snapshot(), backup)
+        self.assertEqual(RuntimeContext.restored, 'other')
+
+    def test_register_reserved_name(self):
+        self.assertRaises(ValueError, lambda: RuntimeContext.register_slot(
+            'items'))
+
+    def test_current(self):
+        RuntimeContext.register_slot('preallocated', lambda: [])
+        context = RuntimeContext.current()
+        self.assertEqual(context.preallocated, [])
+        self.assertIs(RuntimeContext.current(), context)
+
+        RuntimeContext.register_slot('registered_later', 'default')
+        self.assertIs(RuntimeContext.current().preallocated,
+                      context.preallocated)
+        self.assertEqual(RuntimeContext.current().registered_later,
+                         'default')
+
+
+class RuntimeContextBackendTest(unittest.TestCase):
+    def _test_get_mutable(self, backend):
+        slot = backend.register_slot('mutable', lambda: {})
+        slot.get_mutable()['foo'] = 1
+        value = slot.get()
+        self.assertEqual(value, {'foo': 1})
+
+        # The value escaped, the update copies it.
+        slot.get_mutable()['foo'] = 2
+        self.assertEqual(value, {'foo': 1})
+        self.assertEqual(backend.mutable, {'foo': 2})
+
+        snapshot = backend.snapshot()
+        slot.get_mutable()['foo'] = 3
+        self.assertEqual(snapshot['mutable'], {'foo': 2})
+        self.assertEqual(backend.mutable, {'foo': 3})
+
+    def test_get_mutable_thread_local(self):
+        backend = runtime_context._ThreadLocalRuntimeContext()
+        self._test_get_mutable(backend)
+
+        # Unshared values are updated in place until they escape.
+        slot = backend._slots['mutable']
+        slot.get_mutable()['bar'] = 1
+        mutable = backend.current().mutable
+        slot.get_mutable()['baz'] = 1
+        self.assertIs(backend.current().mutable, mutable)
+        self.assertEqual(mutable, {'foo': 3, 'bar': 1, 'baz': 1})
+
+    @unittest.skipIf(runtime_context.contextvars is None,
+                     'contextvars not available')
+    def test_get_mutable_contextvars(self):
+        self._test_get_mutable(runtime_context._AsyncRuntimeContext())
@@ -117,13 +117,16 @@ class Options(BaseObject):
         process_options(self)
 
     _default = BaseObject(
+        compression=None,  # 'gzip' or 'deflate' to compress large requests
         connection_string=None,
         credential=None,  # Credential class used by AAD auth
         enable_local_storage=True,
         enable_standard_metrics=True,  # Used by metrics exporter, True to send standard metrics  # noqa: E501
         endpoint='https://dc.services.visualstudio.com/v2/track',
         export_interval=15.0,
+        export_policy=None,  # opencensus.common.transports.retry.ExportPolicy
         grace_period=5.0,
+        http_client=None,  # opencensus.common.transports.http.HttpClient
         instrumentation_key=None,
         logging_sampling_rate=1.0,  # Used by log exporter, controls sampling
         max_batch_size=100,
@@ -131,6 +134,9 @@ class Options(BaseObject):
         proxies=None,  # string maps url schemes to the url of the proxies
         queue_capacity=8192,
         storage_maintenance_period=60,
+        storage_drain_concurrency=0,  # blobs sent at once by a background drainer, 0 drains on the export thread  # noqa: E501
+        storage_drain_rate=0,  # bytes per second sent by the drainer, 0 for no limit  # noqa: E501
+        storage_engine='file',  # 'file' or 'segmented'
         storage_max_size=50*1024*1024,  # 50MiB
         storage_path=None,
         storage_retention_period=7*24*60*60,
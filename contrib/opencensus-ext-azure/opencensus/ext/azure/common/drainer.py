@@ -0,0 +1,193 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import logging
+import threading
+import time
+
+from opencensus.common.schedule import Scheduler, Task, register_at_fork
+from opencensus.ext.azure.common import transport
+
+logger = logging.getLogger(__name__)
+
+_DRAINER_THREAD_NAME = 'opencensus.ext.azure.BacklogDrainer'
+
+
+class BacklogDrainer(object):
+    """Sends the batches left in the local storage of an exporter, e.g.
+    after an ingestion outage, on threads of its own.
+
+    Up to ``concurrency`` blobs are sent at the same time, within a budget
+    of ``rate`` bytes per second. Draining pauses while the exporter sends
+    live telemetry or ingestion throttles the instrumentation key, and
+    resumes once a live export succeeds.
+
+    :type exporter: :class:`~opencensus.ext.azure.common.transport.TransportMixin`
+    :param exporter: The exporter whose local storage is drained.
+
+    :type concurrency: int
+    :param concurrency: The maximum number of blobs sent at the same time.
+
+    :type rate: float
+    :param rate: The maximum number of bytes sent per second, or 0 for no
+                 limit.
+    """  # noqa: E501
+
+    def __init__(self, exporter, concurrency=1, rate=0):
+        if concurrency < 1:
+            raise ValueError(
+                'concurrency must be at least 1, got {!r}'.format(
+                    concurrency))
+        if rate < 0:
+            raise ValueError(
+                'rate must not be negative, got {!r}'.format(rate))
+        self.exporter = exporter
+        self.concurrency = concurrency
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._live = 0
+        # Token bucket of the bytes that can be sent, allowing bursts of
+        # one second.
+        self._allowance = rate
+        self._refilled = time.time()
+        self._closed = False
+        self._scheduler = Scheduler(
+            max_workers=concurrency, name=_DRAINER_THREAD_NAME)
+        self._tasks = [
+            Task(self._run, scheduler=self._scheduler,
+                 name='AzureExporter BacklogDrainer')
+            for _ in range(concurrency)
+        ]
+        register_at_fork(self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._live = 0
+
+    def trigger(self, delay=0):
+        """Drain the local storage in ``delay`` seconds."""
+        for task in self._tasks:
+            task.trigger(delay)
+
+    @contextlib.contextmanager
+    def live(self):
+        """Pause draining while sending live telemetry."""
+        with self._lock:
+            self._live += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._live -= 1
+
+    def _reserve(self, size):
+        """Take ``size`` bytes from the budget, returns the seconds to wait
+        first if it's spent."""
+        # Called with the lock held.
+        if not self.rate:
+            return 0
+        now = time.time()
+        self._allowance = min(
+            self.rate, self._allowance + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._allowance <= 0:
+            return -self._allowance / self.rate or 1.0 / self.rate
+        self._allowance -= size
+        return 0
+
+    def _can_send(self, size=0):
+        """Returns True if ``size`` bytes can be sent now, otherwise the
+        drain is triggered again when they can, or by a live export."""
+        if self._closed:
+            return False
+        delay = transport._throttle_remaining(
+            self.exporter.options.instrumentation_key)
+        if not delay:
+            with self._lock:
+                if self._live:
+                    return False
+                delay = self._reserve(size)
+        if delay:
+            self.trigger(delay)
+            return False
+        return True
+
+    def _run(self):
+        exporter = self.exporter
+        for blob in exporter.storage.gets():
+            if not self._can_send():
+                return
+            if blob.lease(exporter._lease_period()) and \
+                    not self._drain(blob):
+                return
+
+    def _drain(self, blob):
+        """Send a leased blob, returns False to stop draining."""
+        exporter = self.exporter
+        start = offset = blob.offset
+        try:
+            for envelopes, end in blob.get_batches(
+                    exporter.options.max_batch_size):
+                if not self._can_send(end - offset):
+                    break
+                # Renew the lease for each batch, the blob is left to the
+                # reader that took it over if it expired meanwhile
+                if offset != start and \
+                        not blob.lease(exporter._lease_period()):
+                    return True
+                result = exporter._transmit(envelopes, backlog=True)
+                if result is transport.TransportStatusCode.RETRY:
+                    break
+                offset = end
+            else:
+                blob.delete()
+                return True
+        except Exception as ex:
+            # Keep the blob, it's read again once the lease expires
+            logger.warning('Error reading stored telemetry %s.', ex)
+            return True
+        # Release the blob, the next drain skips the envelopes sent
+        if offset != start:
+            blob.set_offset(offset)
+        blob.lease(0)
+        return False
+
+    def close(self, timeout=None):
+        """Stop draining, a batch being sent finishes.
+
+        :type timeout: float
+        :param timeout: The maximum time to wait for the batches being sent.
+        """
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        self._scheduler.shutdown(timeout)
+
+
+def create_drainer(exporter):
+    """Create the backlog drainer configured by the options of an exporter.
+
+    :rtype: :class:`BacklogDrainer`
+    :returns: The drainer, or None to drain the local storage on the export
+              thread when ``storage_drain_concurrency`` is 0.
+    """
+    options = exporter.options
+    if not exporter.storage or not options.storage_drain_concurrency:
+        return None
+    return BacklogDrainer(
+        exporter,
+        concurrency=options.storage_drain_concurrency,
+        rate=options.storage_drain_rate,
+    )
@@ -16,9 +16,13 @@ import atexit
 import threading
 import time
 
-from opencensus.common.schedule import Queue, QueueEvent
+from opencensus.common.schedule import (
+    Queue,
+    QueueEvent,
+    Task,
+    register_at_fork,
+)
 from opencensus.ext.azure.common import Options
-from opencensus.trace import execution_context
 
 
 class BaseExporter(object):
@@ -54,32 +58,81 @@ class BaseExporter(object):
         self._queue.puts(items, block=False)  # pragma: NO COVER
 
 
-class Worker(threading.Thread):
-    daemon = True
+class Worker(object):
+    """Exports the batches of a queue on the shared scheduler."""
 
     def __init__(self, src, dst):
         self.src = src
         self.dst = dst
+        self.name = "AzureExporter Worker"
         self._stopping = False
-        super(Worker, self).__init__(
-            name="AzureExporter Worker"
-        )
-
-    def run(self):  # pragma: NO COVER
-        # Indicate that this thread is an exporter thread.
-        # Used to suppress tracking of requests in this thread
-        execution_context.set_is_exporter(True)
+        self._stopped = False
+        self._task = None
+        self._lock = threading.Lock()
+        # Set when a flush or exit event is queued, to export the queue
+        # until it's empty.
+        self._flushing = False
+        # When the oldest item not exported yet was queued.
+        self._batch_start = None
+        register_at_fork(self._after_fork)
+
+    def _after_fork(self):
+        # The queue drops the items of the parent in the child.
+        self._lock = threading.Lock()
+        self._flushing = False
+        self._batch_start = None
+
+    def start(self):
+        self._task = Task(self._run, name=self.name, blocking=True)
+        self.src.on_put = self._on_put
+
+    def is_alive(self):
+        return self._task is not None and not self._stopped
+
+    def _on_put(self, item):
+        if isinstance(item, QueueEvent):
+            self._flushing = True
+        elif self._batch_start is None:
+            with self._lock:
+                if self._batch_start is None:
+                    self._batch_start = time.time()
+        self._schedule()
+
+    def _schedule(self):
+        """Trigger the task when the next batch is due."""
+        if self._flushing or self.src.qsize() >= self.dst.max_batch_size:
+            self._task.trigger()
+        elif self._batch_start is not None:
+            self._task.trigger(
+                self._batch_start + self.dst.export_interval - time.time())
+
+    def _is_due(self):
+        if self._flushing or self.src.qsize() >= self.dst.max_batch_size:
+            return True
+        with self._lock:
+            if self._batch_start is None or \
+                    time.time() < self._batch_start + self.dst.export_interval:
+                return False
+            self._batch_start = None
+            return True
+
+    def _run(self):
         src = self.src
         dst = self.dst
-        while True:
-            batch = src.gets(dst.max_batch_size, dst.export_interval)
-            if batch and isinstance(batch[-1], QueueEvent):
+        while self._is_due():
+            batch = src.gets(dst.max_batch_size, 0)
+            if not batch:
+                self._flushing = False
+                break
+            if isinstance(batch[-1], QueueEvent):
                 dst.emit(batch[:-1], event=batch[-1])
                 if batch[-1] is src.EXIT_EVENT:
-                    break
-                else:
-                    continue
+                    self._stopped = True
+                    self._task.cancel()
+                    return
+                continue
             dst.emit(batch)
+        self._schedule()
 
     def stop(self, timeout=None):  # pragma: NO COVER
         start_time = time.time()
@@ -14,10 +14,21 @@
 
 
 class BaseObject(dict):
+    """Dict with attribute access, falling back to the class defaults.
+
+    Instances hold their fields in the dict only, without an instance
+    ``__dict__``, and are serialized as plain dicts. The ``_required``
+    fields are copied from the defaults when missing, so that they are
+    always serialized.
+    """
+    __slots__ = ()
+    _required = ()
+
     def __init__(self, *args, **kwargs):
         super(BaseObject, self).__init__(*args, **kwargs)
-        for key in kwargs:
-            self[key] = kwargs[key]
+        for key in self._required:
+            if key not in self:
+                self[key] = self._default[key]
 
     def __repr__(self):
         tmp = {}
@@ -42,11 +53,10 @@ class BaseObject(dict):
                 name,
             ))
 
-    def __getitem__(self, key):
+    def __missing__(self, key):
+        # Only called for missing keys, present ones are looked up by dict.
         if self._default is self:
-            return super(BaseObject, self).__getitem__(key)
-        if key in self:
-            return super(BaseObject, self).__getitem__(key)
+            raise KeyError(key)
         return self._default[key]
 
 
@@ -54,18 +64,16 @@ BaseObject._default = BaseObject()
 
 
 class Data(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         baseData=None,
         baseType=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(Data, self).__init__(*args, **kwargs)
-        self.baseData = self.baseData
-        self.baseType = self.baseType
+    _required = ('baseData', 'baseType')
 
 
 class DataPoint(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         ns='',
         name='',
@@ -76,14 +84,11 @@ class DataPoint(BaseObject):
         max=None,
         stdDev=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(DataPoint, self).__init__(*args, **kwargs)
-        self.name = self.name
-        self.value = self.value
+    _required = ('name', 'value')
 
 
 class Envelope(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         ver=1,
         name='',
@@ -95,28 +100,22 @@ class Envelope(BaseObject):
         tags=None,
         data=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(Envelope, self).__init__(*args, **kwargs)
-        self.name = self.name
-        self.time = self.time
+    _required = ('name', 'time')
 
 
 class Event(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         ver=2,
         name='',
         properties=None,
         measurements=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(Event, self).__init__(*args, **kwargs)
-        self.ver = self.ver
-        self.name = self.name
+    _required = ('ver', 'name')
 
 
 class ExceptionData(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         ver=2,
         exceptions=[],
@@ -125,14 +124,11 @@ class ExceptionData(BaseObject):
         properties=None,
         measurements=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(ExceptionData, self).__init__(*args, **kwargs)
-        self.ver = self.ver
-        self.exceptions = self.exceptions
+    _required = ('ver', 'exceptions')
 
 
 class Message(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         ver=2,
         message='',
@@ -140,27 +136,21 @@ class Message(BaseObject):
         properties=None,
         measurements=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(Message, self).__init__(*args, **kwargs)
-        self.ver = self.ver
-        self.message = self.message
+    _required = ('ver', 'message')
 
 
 class MetricData(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         ver=2,
         metrics=[],
         properties=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(MetricData, self).__init__(*args, **kwargs)
-        self.ver = self.ver
-        self.metrics = self.metrics
+    _required = ('ver', 'metrics')
 
 
 class RemoteDependency(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         ver=2,
         name='',
@@ -174,16 +164,11 @@ class RemoteDependency(BaseObject):
         properties=None,
         measurements=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(RemoteDependency, self).__init__(*args, **kwargs)
-        self.ver = self.ver
-        self.name = self.name
-        self.resultCode = self.resultCode
-        self.duration = self.duration
+    _required = ('ver', 'name', 'resultCode', 'duration')
 
 
 class Request(BaseObject):
+    __slots__ = ()
     _default = BaseObject(
         ver=2,
         id='',
@@ -196,11 +181,4 @@ class Request(BaseObject):
         properties=None,
         measurements=None,
     )
-
-    def __init__(self, *args, **kwargs):
-        super(Request, self).__init__(*args, **kwargs)
-        self.ver = self.ver
-        self.id = self.id
-        self.duration = self.duration
-        self.responseCode = self.responseCode
-        self.success = self.success
+    _required = ('ver', 'id', 'duration', 'responseCode', 'success')
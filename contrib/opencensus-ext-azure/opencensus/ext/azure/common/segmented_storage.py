@@ -0,0 +1,798 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local storage appending batches of telemetry to a few large segment
+files, instead of writing a file per batch.
+
+Layout of the storage directory::
+
+    <path>/<writer>/LOCK        locked by the storage writing to <writer>
+    <path>/<writer>/<seq>.seg   segments, records appended one after another
+    <path>/<writer>/index       journal of the leases, progress and deletions
+
+A record is a header, with a checksum of the record, followed by the
+batch as JSON lines. Records are flushed to disk as they are appended, and
+segments are read through :mod:`mmap`. The leases, the offsets of the
+records sent in part and the deletions are appended to the index journal,
+which is compacted once most of its entries are stale. On opening a writer
+directory, torn records and index entries left by a crash are truncated.
+
+Each storage writes to its own writer directory, locked while the storage
+is open, so that processes sharing the storage path don't send the same
+records. Writer directories that are no longer locked, e.g. left with
+records by a process that exited, are adopted by the storages maintaining
+the same path. The child of a fork leaves the records of its parent to the
+parent, and writes to a new writer directory.
+"""
+
+import collections
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+import zlib
+
+from opencensus.common import json_serializer, schedule
+from opencensus.common.schedule import PeriodicTask
+
+try:
+    import fcntl
+except ImportError:  # pragma: NO COVER
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b'OCR1'
+# Magic, length of the batch, CRC32 of the record, creation time and lease
+# deadline.
+_RECORD_HEADER = struct.Struct('<4sIIdd')
+# Segment, offset of the record, operation and its value, the lease deadline
+# or progress offset, followed by the CRC32 of the entry.
+_INDEX_ENTRY = struct.Struct('<IQBd')
+_CRC = struct.Struct('<I')
+_INDEX_ENTRY_SIZE = _INDEX_ENTRY.size + _CRC.size
+
+_LEASE = 1
+_DELETE = 2
+_PROGRESS = 3
+
+_LOCK_FILE = 'LOCK'
+_INDEX_FILE = 'index'
+_SEGMENT_SUFFIX = '.seg'
+# The index is compacted when it has this many entries more than twice
+# the number of records.
+_INDEX_COMPACTION_SLACK = 1024
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _fsync_directory(path):
+    """Wait for the entries of a directory, e.g. a renamed file, to be
+    written to disk. Directories can't be opened on Windows, where renames
+    are written through."""
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _crc32(data, value=0):
+    return zlib.crc32(data, value) & 0xffffffff
+
+
+def _pack_record(batch, created, lease_deadline):
+    header = _RECORD_HEADER.pack(
+        _MAGIC, len(batch), 0, created, lease_deadline)
+    crc = _crc32(batch, _crc32(header))
+    return _RECORD_HEADER.pack(
+        _MAGIC, len(batch), crc, created, lease_deadline) + batch
+
+
+def _is_writer_name(name):
+    try:
+        return len(name) == 32 and int(name, 16) >= 0
+    except ValueError:
+        return False
+
+
+def _try_lock(file):
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: NO COVER
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except (IOError, OSError):
+        return False
+
+
+class SegmentRecord(object):
+    """A batch stored in a segment, used like a
+    :class:`~opencensus.ext.azure.common.storage.LocalFileBlob`.
+
+    Like renaming a blob file, leasing a record fails once it was leased
+    through another :class:`SegmentRecord`, so that concurrent readers
+    don't send the same batch.
+    """
+
+    def __init__(self, storage, key, lease_deadline=0):
+        self.storage = storage
+        self.key = key
+        self.lease_deadline = lease_deadline
+
+    @property
+    def offset(self):
+        """The number of bytes of the batch already sent."""
+        record = self.storage._records.get(self.key)
+        return record[3] if record is not None else 0
+
+    def get(self):
+        return self.storage._read(self.key)
+
+    def get_batches(self, max_batch_size):
+        """Read the items not sent yet, a batch at a time, like
+        :meth:`LocalFileBlob.get_batches`, raising if the record was
+        deleted or can't be decoded.
+        """
+        offset = self.offset
+        while True:
+            batch, offset = self.storage._read_batch(
+                self.key, offset, max_batch_size)
+            if not batch:
+                return
+            yield batch, offset
+
+    def set_offset(self, offset):
+        """Record that the items before the offset were sent."""
+        if self.storage._set_offset(self.key, offset):
+            return self
+        return None
+
+    def lease(self, period):
+        deadline = self.storage._lease(
+            self.key, period, self.lease_deadline)
+        if deadline is None:
+            return None
+        self.lease_deadline = deadline
+        return self
+
+    def delete(self):
+        self.storage._delete(self.key)
+
+
+class _Segment(object):
+    def __init__(self, writer, seq):
+        self.writer = writer
+        self.seq = seq
+        self.path = os.path.join(
+            writer.path, '{:08d}{}'.format(seq, _SEGMENT_SUFFIX))
+        self.size = 0
+        # Offsets of every record appended, and number of records not
+        # deleted yet.
+        self.offsets = []
+        self.live = 0
+        self._file = None
+        self._map = None
+
+    def _mapped(self, end):
+        if self._map is None or len(self._map) < end:
+            # Map the segment again once it grew past the mapping.
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is None:
+                self._file = open(self.path, 'rb')
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if end > len(self._map):
+            raise ValueError('Read past the end of {}'.format(self.path))
+        return self._map
+
+    def read(self, offset, length):
+        end = offset + length
+        return self._mapped(end)[offset:end]
+
+    def read_lines(self, offset, end, count):
+        """Read up to count lines between the offsets.
+
+        :rtype: tuple
+        :returns: The lines, and the offset following them.
+        """
+        mapped = self._mapped(end)
+        lines = []
+        while offset < end and len(lines) < count:
+            newline = mapped.find(b'\n', offset, end)
+            if newline < 0:
+                newline = end
+            lines.append(mapped[offset:newline])
+            offset = newline + 1
+        return lines, min(offset, end)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _Writer(object):
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.segments = collections.OrderedDict()
+        self.next_seq = 0
+        # The segment appended to, and its file.
+        self.active = None
+        self.active_file = None
+        self.index_file = None
+        self.index_entries = 0
+        self._lock_file = None
+
+    def lock(self):
+        lock_file = open(os.path.join(self.path, _LOCK_FILE), 'a+b')
+        if not _try_lock(lock_file):
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def open_index(self):
+        self.index_file = open(os.path.join(self.path, _INDEX_FILE), 'ab')
+
+    def seal(self):
+        """Stop appending to the active segment."""
+        if self.active_file is not None:
+            self.active_file.close()
+        self.active = None
+        self.active_file = None
+
+    def close(self):
+        """Close the files, which releases the lock."""
+        self.seal()
+        for segment in self.segments.values():
+            segment.close()
+        if self.index_file is not None:
+            self.index_file.close()
+            self.index_file = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def remove(self):
+        """Remove the directory of a writer without records."""
+        self.close()
+        for name in os.listdir(self.path):
+            os.remove(os.path.join(self.path, name))
+        os.rmdir(self.path)
+
+
+class SegmentedFileStorage(object):
+    """Local storage appending batches to segment files.
+
+    Has the interface of
+    :class:`~opencensus.ext.azure.common.storage.LocalFileStorage`, with
+    the batches returned by :meth:`put` and :meth:`gets` as
+    :class:`SegmentRecord`.
+
+    :type path: str
+    :param path: The storage directory.
+
+    :type max_size: int
+    :param max_size: The size in bytes from which batches are dropped.
+
+    :type maintenance_period: float
+    :param maintenance_period: The period in seconds of the maintenance
+                               routine, which adopts the writer directories
+                               of other processes and compacts the indexes.
+
+    :type retention_period: float
+    :param retention_period: The time in seconds after which stored batches
+                             are dropped.
+
+    :type write_timeout: float
+    :param write_timeout: The time in seconds after which empty writer
+                          directories of other processes are removed.
+
+    :type source: str
+    :param source: Used for naming the maintenance task.
+
+    :type segment_size: int
+    :param segment_size: The size in bytes from which batches are appended
+                         to a new segment. Segments are removed once all
+                         their records are deleted.
+
+    :type fsync: bool
+    :param fsync: Whether to wait for records to be written to disk before
+                  returning from :meth:`put`, and likewise for deletes,
+                  leases and progress. Otherwise records written before a
+                  system crash may be lost, and deleted ones sent again.
+    """
+
+    def __init__(
+            self,
+            path,
+            max_size=50*1024*1024,  # 50MiB
+            maintenance_period=60,  # 1 minute
+            retention_period=7*24*60*60,  # 7 days
+            write_timeout=60,  # 1 minute
+            source=None,
+            segment_size=4*1024*1024,  # 4MiB
+            fsync=True,
+    ):
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+        self.maintenance_period = maintenance_period
+        self.retention_period = retention_period
+        self.write_timeout = write_timeout
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._reset()
+        # Run maintenance routine once upon instantiating
+        self._maintenance_routine()
+        self._maintenance_task = PeriodicTask(
+            interval=self.maintenance_period,
+            function=self._maintenance_routine,
+            name='{} Storage Worker'.format(source)
+        )
+        self._maintenance_task.start()
+        schedule.register_at_fork(self._after_fork)
+
+    def _reset(self):
+        # Writer directories locked by the storage, by name.
+        self._writers = {}
+        # The writer directory appended to, created on first put.
+        self._writer = None
+        # Maps the (writer, segment, offset) of the records not deleted to
+        # their [batch length, creation time, lease deadline, offset of the
+        # items not sent yet in the batch].
+        self._records = collections.OrderedDict()
+        self._size = 0
+        # Size of the segments of the writer directories of other
+        # processes, updated by the maintenance routine.
+        self._foreign_size = 0
+
+    def _after_fork(self):
+        """Leave the records of the parent process to the parent."""
+        self._lock = threading.Lock()
+        for writer in self._writers.values():
+            # Closing the inherited files doesn't release the locks of the
+            # parent.
+            try:
+                writer.close()
+            except Exception:
+                pass  # keep silent
+        self._reset()
+
+    def close(self):
+        self._maintenance_task.cancel()
+        self._maintenance_task.join()
+        with self._lock:
+            for writer in self._writers.values():
+                try:
+                    if writer.segments:
+                        writer.close()
+                    else:
+                        writer.remove()
+                except Exception:
+                    pass  # keep silent
+            self._reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def _maintenance_routine(self):
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+        except Exception:
+            # Race case will throw OSError which we can ignore
+            pass
+        try:
+            with self._lock:
+                self._adopt_writers()
+                for writer in list(self._writers.values()):
+                    self._compact_index(writer)
+            for record in self.gets():
+                pass
+        except Exception:
+            pass  # keep silent
+
+    def _adopt_writers(self):
+        foreign_size = 0
+        for name in sorted(os.listdir(self.path)):
+            path = os.path.join(self.path, name)
+            if name in self._writers or not _is_writer_name(name) or \
+                    not os.path.isdir(path):
+                continue
+            writer = _Writer(path)
+            try:
+                locked = writer.lock()
+            except Exception:
+                continue  # keep silent
+            if not locked:
+                for segment_name in os.listdir(path):
+                    if segment_name.endswith(_SEGMENT_SUFFIX):
+                        try:
+                            foreign_size += os.path.getsize(
+                                os.path.join(path, segment_name))
+                        except OSError:
+                            pass
+                continue
+            try:
+                found = self._load_writer(writer)
+            except Exception:
+                logger.exception('Failed to load storage %s.', path)
+                writer.close()
+                continue
+            if writer.segments:
+                self._writers[name] = writer
+                logger.info('Adopted storage %s.', path)
+            elif found or \
+                    os.path.getmtime(path) < time.time() - self.write_timeout:
+                writer.remove()
+            else:
+                # Possibly created but not locked yet by another storage.
+                writer.close()
+        self._foreign_size = foreign_size
+
+    def _load_writer(self, writer):
+        seqs = sorted(
+            int(name[:-len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(writer.path)
+            if name.endswith(_SEGMENT_SUFFIX) and
+            name[:-len(_SEGMENT_SUFFIX)].isdigit()
+        )
+        records = collections.OrderedDict()
+        for seq in seqs:
+            segment = _Segment(writer, seq)
+            writer.segments[seq] = segment
+            writer.next_seq = seq + 1
+            for offset, length, created, lease_deadline in \
+                    self._load_segment(segment):
+                segment.offsets.append(offset)
+                segment.live += 1
+                records[(writer.name, seq, offset)] = [
+                    length, created, lease_deadline, 0]
+        self._load_index(writer, records)
+        writer.open_index()
+        # Only account for the writer once it's fully loaded.
+        for segment in list(writer.segments.values()):
+            if segment.live:
+                self._size += segment.size
+            else:
+                segment.close()
+                os.remove(segment.path)
+                del writer.segments[segment.seq]
+        self._records.update(records)
+        return len(seqs)
+
+    def _load_segment(self, segment):
+        size = os.path.getsize(segment.path)
+        records = []
+        offset = 0
+        while offset + _RECORD_HEADER.size <= size:
+            header = segment.read(offset, _RECORD_HEADER.size)
+            magic, length, crc, created, lease_deadline = \
+                _RECORD_HEADER.unpack(header)
+            start = offset + _RECORD_HEADER.size
+            if magic != _MAGIC or start + length > size:
+                break
+            header = _RECORD_HEADER.pack(
+                magic, length, 0, created, lease_deadline)
+            if _crc32(segment.read(start, length), _crc32(header)) != crc:
+                break
+            records.append((offset, length, created, lease_deadline))
+            offset = start + length
+        if offset < size:
+            logger.warning(
+                'Dropping %s bytes of torn or corrupted telemetry in %s.',
+                size - offset, segment.path)
+            segment.close()
+            with open(segment.path, 'r+b') as file:
+                file.truncate(offset)
+        segment.size = offset
+        return records
+
+    def _load_index(self, writer, records):
+        path = os.path.join(writer.path, _INDEX_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as file:
+            data = file.read()
+        offset = 0
+        while offset + _INDEX_ENTRY_SIZE <= len(data):
+            entry = data[offset:offset + _INDEX_ENTRY.size]
+            crc, = _CRC.unpack_from(data, offset + _INDEX_ENTRY.size)
+            if _crc32(entry) != crc:
+                break
+            offset += _INDEX_ENTRY_SIZE
+            writer.index_entries += 1
+            seq, record_offset, op, value = _INDEX_ENTRY.unpack(entry)
+            key = (writer.name, seq, record_offset)
+            record = records.get(key)
+            if record is None:
+                continue
+            if op == _DELETE:
+                del records[key]
+                writer.segments[seq].live -= 1
+            elif op == _LEASE:
+                record[2] = value
+            elif op == _PROGRESS:
+                record[3] = int(value)
+        if offset < len(data):
+            logger.warning('Dropping torn storage index entries in %s.', path)
+            with open(path, 'r+b') as file:
+                file.truncate(offset)
+
+    def _compact_index(self, writer):
+        """Rewrite the index of a writer without the stale entries."""
+        live = sum(segment.live for segment in writer.segments.values())
+        if writer.index_entries <= 2 * live + _INDEX_COMPACTION_SLACK:
+            return
+        entries = []
+        for segment in writer.segments.values():
+            for offset in segment.offsets:
+                record = self._records.get((writer.name, segment.seq, offset))
+                if record is None:
+                    entries.append(_INDEX_ENTRY.pack(
+                        segment.seq, offset, _DELETE, 0.0))
+                    continue
+                if record[2]:
+                    entries.append(_INDEX_ENTRY.pack(
+                        segment.seq, offset, _LEASE, record[2]))
+                if record[3]:
+                    entries.append(_INDEX_ENTRY.pack(
+                        segment.seq, offset, _PROGRESS, record[3]))
+        path = os.path.join(writer.path, _INDEX_FILE)
+        with open(path + '.tmp', 'wb') as file:
+            for entry in entries:
+                file.write(entry + _CRC.pack(_crc32(entry)))
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        writer.index_file.close()
+        _replace(path + '.tmp', path)
+        if self.fsync:
+            _fsync_directory(writer.path)
+        writer.open_index()
+        writer.index_entries = len(entries)
+
+    def _append_index(self, key, op, value=0.0):
+        writer = self._writers[key[0]]
+        entry = _INDEX_ENTRY.pack(key[1], key[2], op, value)
+        writer.index_file.write(entry + _CRC.pack(_crc32(entry)))
+        writer.index_file.flush()
+        if self.fsync:
+            os.fsync(writer.index_file.fileno())
+        writer.index_entries += 1
+
+    def _get_writer(self):
+        while self._writer is None:
+            writer = _Writer(os.path.join(self.path, uuid.uuid4().hex))
+            os.makedirs(writer.path)
+            if not writer.lock():
+                # Raced by another storage checking whether the new
+                # directory was left by a process that exited.
+                writer.close()
+                continue
+            writer.open_index()
+            self._writers[writer.name] = writer
+            self._writer = writer
+        return self._writer
+
+    def _get_active_segment(self, writer, length):
+        segment = writer.active
+        if segment is None or (
+                segment.size and
+                segment.size + length > self.segment_size):
+            self._seal(writer)
+            segment = _Segment(writer, writer.next_seq)
+            writer.next_seq += 1
+            writer.active_file = open(segment.path, 'ab')
+            writer.segments[segment.seq] = segment
+            writer.active = segment
+        return segment
+
+    def _seal(self, writer):
+        segment = writer.active
+        writer.seal()
+        if segment is not None and not segment.live:
+            self._remove_segment(segment)
+
+    def _remove_segment(self, segment):
+        writer = segment.writer
+        segment.close()
+        try:
+            os.remove(segment.path)
+        except Exception:
+            pass  # keep silent
+        del writer.segments[segment.seq]
+        self._size -= segment.size
+        if not writer.segments and writer.name in self._writers and \
+                writer is not self._writer:
+            # All the records adopted from another process were sent.
+            del self._writers[writer.name]
+            try:
+                writer.remove()
+            except Exception:
+                pass  # keep silent
+
+    def gets(self):
+        now = time.time()
+        retention_deadline = now - self.retention_period
+        with self._lock:
+            keys = list(self._records)
+        for key in keys:
+            record = self._records.get(key)
+            if record is None:
+                continue  # deleted meanwhile
+            if record[1] < retention_deadline:
+                self._delete(key)
+                logger.warning(
+                    'File write exceeded retention.' +
+                    'Dropping telemetry')
+            elif record[2] <= now:
+                yield SegmentRecord(self, key, record[2])
+
+    def get(self):
+        cursor = self.gets()
+        try:
+            return next(cursor)
+        except StopIteration:
+            pass
+        return None
+
+    def put(self, data, lease_period=0):
+        if not self._check_storage_size():
+            return None
+        try:
+            batch = b''.join(
+                json_serializer.dumpb(item) + b'\n' for item in data)
+            created = time.time()
+            lease_deadline = created + lease_period if lease_period else 0.0
+            record = _pack_record(batch, created, lease_deadline)
+        except Exception:
+            return None  # keep silent
+        with self._lock:
+            try:
+                writer = self._get_writer()
+                segment = self._get_active_segment(writer, len(record))
+            except Exception:
+                return None  # keep silent
+            offset = segment.size
+            try:
+                writer.active_file.write(record)
+                writer.active_file.flush()
+                if self.fsync:
+                    os.fsync(writer.active_file.fileno())
+            except Exception:
+                # Don't append after a partially written record, it is
+                # truncated when the segment is loaded again.
+                self._seal(writer)
+                return None
+            segment.size += len(record)
+            segment.offsets.append(offset)
+            segment.live += 1
+            self._size += len(record)
+            key = (writer.name, segment.seq, offset)
+            self._records[key] = [len(batch), created, lease_deadline, 0]
+        return SegmentRecord(self, key, lease_deadline)
+
+    def _read(self, key):
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                return None
+            writer = self._writers[key[0]]
+            try:
+                batch = writer.segments[key[1]].read(
+                    key[2] + _RECORD_HEADER.size + record[3],
+                    record[0] - record[3])
+            except Exception:
+                return None  # keep silent
+        try:
+            return tuple(
+                json_serializer.loads(line)
+                for line in batch.split(b'\n') if line
+            )
+        except Exception:
+            pass  # keep silent
+
+    def _read_batch(self, key, offset, max_batch_size):
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                raise IOError('Record {} was deleted'.format(key))
+            start = key[2] + _RECORD_HEADER.size
+            segment = self._writers[key[0]].segments[key[1]]
+            lines, end = segment.read_lines(
+                start + offset, start + record[0], max_batch_size)
+        batch = tuple(json_serializer.loads(line) for line in lines if line)
+        return batch, end - start
+
+    def _set_offset(self, key, offset):
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                return False
+            record[3] = offset
+            try:
+                self._append_index(key, _PROGRESS, offset)
+            except Exception:
+                pass  # the progress holds in this process
+            return True
+
+    def _lease(self, key, period, expected):
+        """Lease a record, unless its lease changed since ``expected``.
+
+        :rtype: float
+        :returns: The new lease deadline, or None.
+        """
+        with self._lock:
+            record = self._records.get(key)
+            if record is None or record[2] != expected:
+                return None
+            record[2] = time.time() + period
+            try:
+                self._append_index(key, _LEASE, record[2])
+            except Exception:
+                pass  # the lease holds in this process
+            return record[2]
+
+    def _delete(self, key):
+        with self._lock:
+            if self._records.pop(key, None) is None:
+                return
+            writer = self._writers[key[0]]
+            segment = writer.segments[key[1]]
+            segment.live -= 1
+            try:
+                self._append_index(key, _DELETE)
+            except Exception:
+                pass  # keep silent, the batch may be sent again
+            if not segment.live:
+                if segment is writer.active:
+                    self._seal(writer)
+                else:
+                    self._remove_segment(segment)
+
+    def _check_storage_size(self):
+        size = self._size + self._foreign_size
+        if size >= self.max_size:
+            logger.warning(
+                "Persistent storage max capacity has been "
+                "reached. Currently at %sKB. Telemetry will be "
+                "lost. Please consider increasing the value of "
+                "'storage_max_size' in exporter config.",
+                format(size/1024)
+            )
+            return False
+        return True
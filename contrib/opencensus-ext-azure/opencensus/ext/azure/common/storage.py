@@ -1,13 +1,21 @@
 import datetime
-import json
 import logging
 import os
 import random
+import threading
 
+from opencensus.common import json_serializer
 from opencensus.common.schedule import PeriodicTask
+from opencensus.ext.azure.common.segmented_storage import (
+    SegmentedFileStorage,
+)
 
 logger = logging.getLogger(__name__)
 
+# Local storage engines, the values of the storage_engine option.
+FILE = 'file'
+SEGMENTED = 'segmented'
+
 
 def _fmt(timestamp):
     return timestamp.strftime('%Y-%m-%dT%H%M%S.%f')
@@ -21,36 +29,114 @@ def _seconds(seconds):
     return datetime.timedelta(seconds=seconds)
 
 
+def _getsize(path):
+    try:
+        return os.path.getsize(path)
+    except Exception:
+        return 0
+
+
 class LocalFileBlob(object):
-    def __init__(self, fullpath):
+    def __init__(self, fullpath, storage=None):
         self.fullpath = fullpath
+        # The LocalFileStorage accounting for the size of the blob
+        self.storage = storage
 
     def delete(self):
+        size = _getsize(self.fullpath)
         try:
             os.remove(self.fullpath)
         except Exception:
-            pass  # keep silent
+            return  # keep silent
+        if self.storage is not None:
+            self.storage._update_size(-size)
+
+    @property
+    def offset(self):
+        """The number of bytes of the blob already sent.
+
+        Kept in the name of the blob, as ``<name>+<offset>.blob``.
+        """
+        name = os.path.basename(self.fullpath).split('@')[0]
+        if '+' not in name:
+            return 0
+        try:
+            return int(name[name.rindex('+') + 1: -len('.blob')])
+        except ValueError:
+            return 0
 
     def get(self):
         try:
-            with open(self.fullpath, 'r') as file:
+            with open(self.fullpath, 'rb') as file:
+                file.seek(self.offset)
                 return tuple(
-                    json.loads(line.strip())
-                    for line in file.readlines()
+                    json_serializer.loads(line.strip())
+                    for line in file
                 )
         except Exception:
             pass  # keep silent
 
+    def _read_batch(self, offset, max_batch_size):
+        batch = []
+        with open(self.fullpath, 'rb') as file:
+            file.seek(offset)
+            while len(batch) < max_batch_size:
+                line = file.readline()
+                if not line:
+                    break
+                offset += len(line)
+                batch.append(json_serializer.loads(line.strip()))
+        return tuple(batch), offset
+
+    def get_batches(self, max_batch_size):
+        """Read the items not sent yet, a batch at a time.
+
+        Only a batch is held in memory, the file is read again from the
+        end of the previous batch for the next one.
+
+        :type max_batch_size: int
+        :param max_batch_size: The maximum number of items in a batch.
+
+        :rtype: iterator
+        :returns: Tuples of the items of a batch, and the offset following
+                  the batch to pass to :meth:`set_offset` once sent. The
+                  iterator ends once the end of the blob is read.
+
+        :raises: An exception if the blob can't be read, e.g. when it was
+                 renamed by another reader after the lease expired, or
+                 can't be decoded.
+        """
+        offset = self.offset
+        while True:
+            batch, offset = self._read_batch(offset, max_batch_size)
+            if not batch:
+                return
+            yield batch, offset
+
+    def set_offset(self, offset):
+        """Record that the items before the offset were sent, they are
+        skipped when the blob is read again."""
+        dirname, name = os.path.split(self.fullpath)
+        name, sep, lease = name.partition('@')
+        name = name[: -len('.blob')]
+        if '+' in name:
+            name = name[: name.rindex('+')]
+        fullpath = os.path.join(
+            dirname, '{}+{}.blob{}{}'.format(name, offset, sep, lease))
+        try:
+            os.rename(self.fullpath, fullpath)
+        except Exception:
+            return None
+        self.fullpath = fullpath
+        return self
+
     def put(self, data, lease_period=0):
         try:
             fullpath = self.fullpath + '.tmp'
-            with open(fullpath, 'w') as file:
+            with open(fullpath, 'wb') as file:
                 for item in data:
-                    file.write(json.dumps(item))
-                    # The official Python doc: Do not use os.linesep as a line
-                    # terminator when writing files opened in text mode (the
-                    # default); use a single '\n' instead, on all platforms.
-                    file.write('\n')
+                    json_serializer.dump(item, file)
+                    file.write(b'\n')
             if lease_period:
                 timestamp = _now() + _seconds(lease_period)
                 self.fullpath += '@{}.lock'.format(_fmt(timestamp))
@@ -88,6 +174,11 @@ class LocalFileStorage(object):
         self.maintenance_period = maintenance_period
         self.retention_period = retention_period
         self.write_timeout = write_timeout
+        # Running total of the bytes stored, updated as blobs are added and
+        # removed, and reconciled with the files on disk by the maintenance
+        # routine, e.g. for blobs removed by other processes
+        self._size = 0
+        self._size_lock = threading.Lock()
         # Run maintenance routine once upon instantiating
         self._maintenance_routine()
         self._maintenance_task = PeriodicTask(
@@ -95,7 +186,6 @@ class LocalFileStorage(object):
             function=self._maintenance_routine,
             name='{} Storage Worker'.format(source)
         )
-        self._maintenance_task.daemon = True
         self._maintenance_task.start()
 
     def close(self):
@@ -120,6 +210,7 @@ class LocalFileStorage(object):
                 pass
         except Exception:
             pass  # keep silent
+        self._reconcile_size()
 
     def gets(self):
         now = _now()
@@ -132,8 +223,10 @@ class LocalFileStorage(object):
                 continue  # skip if not a file
             if path.endswith('.tmp'):
                 if name < timeout_deadline:
+                    size = _getsize(path)
                     try:
                         os.remove(path)
+                        self._update_size(-size)
                         logger.warning(
                             'File write exceeded timeout. Dropping telemetry')
                     except Exception:
@@ -149,15 +242,17 @@ class LocalFileStorage(object):
                 path = new_path
             if path.endswith('.blob'):
                 if name < retention_deadline:
+                    size = _getsize(path)
                     try:
                         os.remove(path)
+                        self._update_size(-size)
                         logger.warning(
                             'File write exceeded retention.' +
                             'Dropping telemetry')
                     except Exception:
                         pass  # keep silent
                 else:
-                    yield LocalFileBlob(path)
+                    yield LocalFileBlob(path, self)
 
     def get(self):
         cursor = self.gets()
@@ -176,10 +271,23 @@ class LocalFileStorage(object):
                 _fmt(_now()),
                 '{:08x}'.format(random.getrandbits(32)),  # thread-safe random
             ),
-        ))
-        return blob.put(data, lease_period=lease_period)
+        ), self)
+        blob = blob.put(data, lease_period=lease_period)
+        if blob is not None:
+            try:
+                self._update_size(os.path.getsize(blob.fullpath))
+            except OSError:
+                logger.error(
+                    "Path %s does not exist or is inaccessible.",
+                    blob.fullpath,
+                )
+        return blob
 
-    def _check_storage_size(self):
+    def _update_size(self, delta):
+        with self._size_lock:
+            self._size = max(self._size + delta, 0)
+
+    def _get_storage_size(self):
         size = 0
         for dirpath, dirnames, filenames in os.walk(self.path):
             for f in filenames:
@@ -192,14 +300,56 @@ class LocalFileStorage(object):
                         logger.error(
                             "Path %s does not exist or is inaccessible.", fp
                         )
-                        continue
-                    if size >= self.max_size:
-                        logger.warning(
-                            "Persistent storage max capacity has been "
-                            "reached. Currently at %sKB. Telemetry will be "
-                            "lost. Please consider increasing the value of "
-                            "'storage_max_size' in exporter config.",
-                            format(size/1024)
-                        )
-                        return False
+        return size
+
+    def _reconcile_size(self):
+        # Walks the whole directory, only run by the maintenance routine so
+        # that put doesn't depend on the number of blobs stored.
+        size = self._get_storage_size()
+        with self._size_lock:
+            self._size = size
+
+    def _check_storage_size(self):
+        size = self._size
+        if size >= self.max_size:
+            logger.warning(
+                "Persistent storage max capacity has been "
+                "reached. Currently at %sKB. Telemetry will be "
+                "lost. Please consider increasing the value of "
+                "'storage_max_size' in exporter config.",
+                format(size/1024)
+            )
+            return False
         return True
+
+
+def create_storage(options, source=None):
+    """Create the local storage of an exporter.
+
+    :type options: :class:`~opencensus.ext.azure.common.Options`
+    :param options: The options of the exporter, the ``storage_engine``
+                    option selects :data:`FILE` for a
+                    :class:`LocalFileStorage`, writing a file per batch, or
+                    :data:`SEGMENTED` for a :class:`SegmentedFileStorage`,
+                    appending batches to a few large files.
+
+    :type source: str
+    :param source: Used for naming the maintenance task of the storage.
+
+    :rtype: :class:`LocalFileStorage` or :class:`SegmentedFileStorage`
+    :returns: The storage.
+    """
+    if options.storage_engine == FILE:
+        storage_class = LocalFileStorage
+    elif options.storage_engine == SEGMENTED:
+        storage_class = SegmentedFileStorage
+    else:
+        raise ValueError(
+            'Unknown storage engine {}'.format(options.storage_engine))
+    return storage_class(
+        path=options.storage_path,
+        max_size=options.storage_max_size,
+        maintenance_period=options.storage_maintenance_period,
+        retention_period=options.storage_retention_period,
+        source=source,
+    )
@@ -21,6 +21,7 @@ import requests
 from azure.core.exceptions import ClientAuthenticationError
 from azure.identity._exceptions import CredentialUnavailableError
 
+from opencensus.common.transports import http, retry
 from opencensus.ext.azure.statsbeat import state
 
 try:
@@ -36,6 +37,10 @@ _MAX_CONSECUTIVE_REDIRECTS = 10
 _MONITOR_OAUTH_SCOPE = "https://monitor.azure.com//.default"
 _requests_lock = threading.Lock()
 _requests_map = {}
+# Until when ingestion throttled each instrumentation key, shared by the
+# exporters of the process.
+_throttle_lock = threading.Lock()
+_throttled_until = {}
 _REACHED_INGESTION_STATUS_CODES = (200, 206, 402, 408, 429, 439, 500)
 REDIRECT_STATUS_CODES = (307, 308)
 RETRYABLE_STATUS_CODES = (
@@ -62,6 +67,9 @@ class TransportStatusCode:
 
 
 class TransportMixin(object):
+    # Sends the local storage on its own threads when set, see
+    # :class:`opencensus.ext.azure.common.drainer.BacklogDrainer`
+    _drainer = None
 
     # check to see whether its the case of stats collection
     def _check_stats_collection(self):
@@ -74,29 +82,114 @@ class TransportMixin(object):
     def _is_stats_exporter(self):
         return hasattr(self, '_is_stats') and self._is_stats
 
-    def _transmit_from_storage(self):
+    def _get_http_client(self):
+        http_client = self.options.http_client
+        if http_client is None:
+            http_client = http.get_client()
+        return http_client
+
+    def _transmit_from_storage(self, wait=False):
+        """Send the batches of the local storage, on the threads of the
+        backlog drainer if there's one.
+
+        :type wait: bool
+        :param wait: Send them on this thread, e.g. before exit once the
+                     drainer is closed.
+        """
         if self.storage:
+            if self._drainer is not None and not wait:
+                self._drainer.trigger()
+                return
             for blob in self.storage.gets():
-                # give a few more seconds for blob lease operation
-                # to reduce the chance of race (for perf consideration)
-                if blob.lease(self.options.timeout + 5):
-                    envelopes = blob.get()
-                    result = self._transmit(envelopes)
-                    if result is TransportStatusCode.RETRY:
-                        blob.lease(result)
-                    else:
-                        blob.delete()
-
-    def _transmit(self, envelopes):
+                if blob.lease(self._lease_period()):
+                    self._transmit_blob(blob)
+
+    def _lease_period(self):
+        """The time to lease a blob for, to send a batch."""
+        period = self.options.timeout
+        policy = self.options.export_policy
+        if policy is not None:
+            # Cover the retries and backoff of the policy
+            period = policy.get_max_duration(period)
+        # give a few more seconds for blob lease operation
+        # to reduce the chance of race (for perf consideration)
+        return period + 5
+
+    def _transmit_blob(self, blob):
+        """Send a leased blob max_batch_size envelopes at a time.
+
+        The lease is renewed before each batch, and the blob is left to the
+        reader that took it over if it expired meanwhile. On failure, the
+        envelopes sent are skipped on next retry.
+        """
+        offset = None
+        try:
+            for envelopes, end in blob.get_batches(
+                    self.options.max_batch_size):
+                if offset is not None and \
+                        not blob.lease(self._lease_period()):
+                    return
+                result = self._transmit(envelopes)
+                if result is TransportStatusCode.RETRY:
+                    if offset is not None:
+                        blob.set_offset(offset)
+                    blob.lease(result)
+                    return
+                offset = end
+        except Exception as ex:
+            # Keep the blob, it's read again once the lease expires
+            if not self._is_stats_exporter():
+                logger.warning('Error reading stored telemetry %s.', ex)
+            return
+        blob.delete()
+
+    def _transmit(self, envelopes, backlog=False):
         """
         Transmit the data envelopes to the ingestion service.
         Return a negative value for partial success or non-retryable failure.
         Return 0 if all envelopes have been successfully ingested.
         Return the next retry time in seconds for retryable failure.
         This function should never throw exception.
+
+        With the `export_policy` option, retryable failures are retried in
+        process before falling back to local storage, and envelopes go
+        straight to local storage while the circuit is open.
+
+        Live envelopes pause the backlog drainer, which sends the envelopes
+        of the local storage with ``backlog`` set.
         """
+        drainer = self._drainer
+        if drainer is None or backlog:
+            return self._transmit_with_policy(envelopes)
+        with drainer.live():
+            result = self._transmit_with_policy(envelopes)
+        if result is TransportStatusCode.SUCCESS:
+            # Ingestion accepts data, resume draining the backlog
+            drainer.trigger()
+        return result
+
+    def _transmit_with_policy(self, envelopes):
+        policy = self.options.export_policy
+        if policy is None or not envelopes:
+            return self._transmit_once(envelopes)
+        try:
+            return policy.call(self._transmit_with_retry, envelopes)
+        except retry.RetryableError:
+            return TransportStatusCode.RETRY
+
+    def _transmit_with_retry(self, envelopes):
+        result = self._transmit_once(envelopes)
+        if result is TransportStatusCode.RETRY:
+            raise retry.RetryableError('Transient ingestion failure.')
+        return result
+
+    def _transmit_once(self, envelopes):
         if not envelopes:
             return 0
+        if not self._is_stats_exporter() and \
+                _throttle_remaining(self.options.instrumentation_key):
+            # Don't add to the load while ingestion throttles the resource
+            return TransportStatusCode.RETRY
         status = None
         exception = None
         try:
@@ -113,9 +206,10 @@ class TransportMixin(object):
             proxies = json.loads(self.options.proxies)
             allow_redirects = len(proxies) != 0
 
-            response = requests.post(
+            response = self._get_http_client().post(
                 url=endpoint,
-                data=json.dumps(envelopes, default=str),
+                data=http.iter_json(envelopes, default=str),
+                compression=self.options.compression,
                 headers=headers,
                 timeout=self.options.timeout,
                 proxies=proxies,
@@ -247,7 +341,7 @@ class TransportMixin(object):
                             # Change the host to the new redirected host
                             self.options.endpoint = "{}://{}".format(url.scheme, url.netloc)  # noqa: E501
                             # Attempt to export again
-                            return self._transmit(envelopes)
+                            return self._transmit_once(envelopes)
                 if not self._is_stats_exporter():
                     logger.error(
                         "Error parsing redirect information."
@@ -263,6 +357,7 @@ class TransportMixin(object):
                 _update_requests_map('exception', value="Circular Redirect")
             return TransportStatusCode.DROP
         elif _status_code_is_throttle(status_code):  # Throttle
+            self._throttle(response)
             if self._check_stats_collection():
                 # 402: Monthly Quota Exceeded (new SDK)
                 # 439: Monthly Quota Exceeded (old SDK) <- Currently OC SDK
@@ -275,6 +370,8 @@ class TransportMixin(object):
                     )
             return TransportStatusCode.DROP
         elif _status_code_is_retryable(status_code):  # Retry
+            if status_code == 429:
+                self._throttle(response)
             if not self._is_stats_exporter():
                 if status_code == 401:  # Authentication error
                     logger.warning(
@@ -315,6 +412,42 @@ class TransportMixin(object):
                 )
             return TransportStatusCode.DROP
 
+    def _throttle(self, response):
+        """Pause the exports of every exporter of the process sending to
+        the same instrumentation key, for the time the ``Retry-After``
+        header asks or ``minimum_retry_interval``."""
+        if self._is_stats_exporter():
+            return
+        delay = None
+        if response.headers:
+            delay = retry.parse_retry_after(
+                response.headers.get('Retry-After'))
+        if delay is None:
+            delay = self.options.minimum_retry_interval
+        _throttle(self.options.instrumentation_key, delay)
+
+
+def _throttle(instrumentation_key, delay):
+    deadline = time.time() + delay
+    with _throttle_lock:
+        if deadline > _throttled_until.get(instrumentation_key, 0):
+            _throttled_until[instrumentation_key] = deadline
+
+
+def _throttle_remaining(instrumentation_key):
+    """Returns the seconds left before ingestion accepts data for the
+    instrumentation key again, or 0."""
+    deadline = _throttled_until.get(instrumentation_key)
+    if deadline is None:
+        return 0
+    remaining = deadline - time.time()
+    if remaining > 0:
+        return remaining
+    with _throttle_lock:
+        if _throttled_until.get(instrumentation_key) == deadline:
+            del _throttled_until[instrumentation_key]
+    return 0
+
 
 def _status_code_is_redirect(status_code):
     return status_code in REDIRECT_STATUS_CODES
@@ -18,8 +18,15 @@ import threading
 import time
 import traceback
 
-from opencensus.common.schedule import Queue, QueueEvent, QueueExitEvent
+from opencensus.common.schedule import (
+    Queue,
+    QueueEvent,
+    QueueExitEvent,
+    Task,
+    register_at_fork,
+)
 from opencensus.ext.azure.common import Options, utils
+from opencensus.ext.azure.common.drainer import create_drainer
 from opencensus.ext.azure.common.processor import ProcessorMixin
 from opencensus.ext.azure.common.protocol import (
     Data,
@@ -28,13 +35,12 @@ from opencensus.ext.azure.common.protocol import (
     ExceptionData,
     Message,
 )
-from opencensus.ext.azure.common.storage import LocalFileStorage
+from opencensus.ext.azure.common.storage import create_storage
 from opencensus.ext.azure.common.transport import (
     TransportMixin,
     TransportStatusCode,
 )
 from opencensus.ext.azure.statsbeat import statsbeat
-from opencensus.trace import execution_context
 
 logger = logging.getLogger(__name__)
 
@@ -53,13 +59,11 @@ class BaseLogHandler(logging.Handler):
         self.max_batch_size = self.options.max_batch_size
         self.storage = None
         if self.options.enable_local_storage:
-            self.storage = LocalFileStorage(
-                path=self.options.storage_path,
-                max_size=self.options.storage_max_size,
-                maintenance_period=self.options.storage_maintenance_period,
-                retention_period=self.options.storage_retention_period,
+            self.storage = create_storage(
+                self.options,
                 source=self.__class__.__name__,
             )
+            self._drainer = create_drainer(self)
         self._telemetry_processors = []
         self.addFilter(SamplingFilter(self.options.logging_sampling_rate))
         self._queue = Queue(capacity=self.options.queue_capacity)
@@ -87,7 +91,7 @@ class BaseLogHandler(logging.Handler):
                     if event:
                         if isinstance(event, QueueExitEvent):
                             # send files before exit
-                            self._transmit_from_storage()
+                            self._transmit_from_storage(wait=True)
         finally:
             if event:
                 event.set()
@@ -96,6 +100,8 @@ class BaseLogHandler(logging.Handler):
     def close(self, timeout=None):
         if not timeout and hasattr(self, "options"):
             timeout = self.options.grace_period
+        if getattr(self, "_drainer", None):
+            self._drainer.close(timeout)
         if hasattr(self, "storage") and self.storage:
             self.storage.close()
         if hasattr(self, "_worker") and self._worker:
@@ -130,37 +136,87 @@ class BaseLogHandler(logging.Handler):
         self._queue.flush(timeout=timeout)
 
 
-class Worker(threading.Thread):
-    daemon = True
+class Worker(object):
+    """Exports the batches of a queue on the shared scheduler."""
 
     def __init__(self, src, dst):
         self._src = src
         self._dst = dst
+        self.name = '{} Worker'.format(type(dst).__name__)
         self._stopping = False
-        super(Worker, self).__init__(
-            name='{} Worker'.format(type(dst).__name__)
-        )
-
-    def run(self):
-        # Indicate that this thread is an exporter thread.
-        # Used to suppress tracking of requests in this thread
-        execution_context.set_is_exporter(True)
+        self._stopped = False
+        self._task = None
+        self._lock = threading.Lock()
+        # Set when a flush or exit event is queued, to export the queue
+        # until it's empty.
+        self._flushing = False
+        # When the oldest item not exported yet was queued.
+        self._batch_start = None
+        register_at_fork(self._after_fork)
+
+    def _after_fork(self):
+        # The queue drops the items of the parent in the child.
+        self._lock = threading.Lock()
+        self._flushing = False
+        self._batch_start = None
+
+    def start(self):
+        self._task = Task(self._run, name=self.name, blocking=True)
+        self._src.on_put = self._on_put
+
+    def is_alive(self):
+        return self._task is not None and not self._stopped
+
+    def _on_put(self, item):
+        if isinstance(item, QueueEvent):
+            self._flushing = True
+        elif self._batch_start is None:
+            with self._lock:
+                if self._batch_start is None:
+                    self._batch_start = time.time()
+        self._schedule()
+
+    def _schedule(self):
+        """Trigger the task when the next batch is due."""
+        if self._flushing or self._src.qsize() >= self._dst.max_batch_size:
+            self._task.trigger()
+        elif self._batch_start is not None:
+            self._task.trigger(
+                self._batch_start + self._dst.export_interval - time.time())
+
+    def _is_due(self):
+        if self._flushing or self._src.qsize() >= self._dst.max_batch_size:
+            return True
+        with self._lock:
+            if self._batch_start is None or time.time() < \
+                    self._batch_start + self._dst.export_interval:
+                return False
+            self._batch_start = None
+            return True
+
+    def _run(self):
         src = self._src
         dst = self._dst
-        while True:
-            batch = src.gets(dst.max_batch_size, dst.export_interval)
-            if batch and isinstance(batch[-1], QueueEvent):
+        while self._is_due():
+            batch = src.gets(dst.max_batch_size, 0)
+            if not batch:
+                self._flushing = False
+                break
+            if isinstance(batch[-1], QueueEvent):
                 try:
                     dst._export(batch[:-1], event=batch[-1])
                 except Exception:
                     logger.exception('Unhandled exception from exporter.')
                 if batch[-1] is src.EXIT_EVENT:
-                    break
+                    self._stopped = True
+                    self._task.cancel()
+                    return
                 continue  # pragma: NO COVER
             try:
                 dst._export(batch)
             except Exception:
                 logger.exception('Unhandled exception from exporter.')
+        self._schedule()
 
     def stop(self, timeout=None):  # pragma: NO COVER
         start_time = time.time()
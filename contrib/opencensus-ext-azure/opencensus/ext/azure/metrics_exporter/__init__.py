@@ -16,6 +16,7 @@ import atexit
 
 from opencensus.common import utils as common_utils
 from opencensus.ext.azure.common import Options, utils
+from opencensus.ext.azure.common.drainer import create_drainer
 from opencensus.ext.azure.common.processor import ProcessorMixin
 from opencensus.ext.azure.common.protocol import (
     Data,
@@ -23,7 +24,7 @@ from opencensus.ext.azure.common.protocol import (
     Envelope,
     MetricData,
 )
-from opencensus.ext.azure.common.storage import LocalFileStorage
+from opencensus.ext.azure.common.storage import create_storage
 from opencensus.ext.azure.common.transport import (
     TransportMixin,
     TransportStatusCode,
@@ -53,13 +54,11 @@ class MetricsExporter(TransportMixin, ProcessorMixin):
         self._telemetry_processors = []
         self.storage = None
         if self.options.enable_local_storage:
-            self.storage = LocalFileStorage(
-                path=self.options.storage_path,
-                max_size=self.options.storage_max_size,
-                maintenance_period=self.options.storage_maintenance_period,
-                retention_period=self.options.storage_retention_period,
+            self.storage = create_storage(
+                self.options,
                 source=self.__class__.__name__,
             )
+            self._drainer = create_drainer(self)
         self._atexit_handler = atexit.register(self.shutdown)
         self.exporter_thread = None
         # For redirects
@@ -168,6 +167,8 @@ class MetricsExporter(TransportMixin, ProcessorMixin):
                 self.exporter_thread.close()
             else:
                 self.exporter_thread.cancel()
+        if self._drainer:
+            self._drainer.close(self.options.grace_period)
         # Shutsdown storage worker
         if self.storage:
             self.storage.close()
@@ -18,6 +18,7 @@ import logging
 
 from opencensus.common.schedule import QueueExitEvent
 from opencensus.ext.azure.common import Options, utils
+from opencensus.ext.azure.common.drainer import create_drainer
 from opencensus.ext.azure.common.exporter import BaseExporter
 from opencensus.ext.azure.common.processor import ProcessorMixin
 from opencensus.ext.azure.common.protocol import (
@@ -27,7 +28,7 @@ from opencensus.ext.azure.common.protocol import (
     RemoteDependency,
     Request,
 )
-from opencensus.ext.azure.common.storage import LocalFileStorage
+from opencensus.ext.azure.common.storage import create_storage
 from opencensus.ext.azure.common.transport import (
     TransportMixin,
     TransportStatusCode,
@@ -67,13 +68,11 @@ class AzureExporter(BaseExporter, TransportMixin, ProcessorMixin):
         utils.validate_instrumentation_key(self.options.instrumentation_key)
         self.storage = None
         if self.options.enable_local_storage:
-            self.storage = LocalFileStorage(
-                path=self.options.storage_path,
-                max_size=self.options.storage_max_size,
-                maintenance_period=self.options.storage_maintenance_period,
-                retention_period=self.options.storage_retention_period,
+            self.storage = create_storage(
+                self.options,
                 source=self.__class__.__name__,
             )
+            self._drainer = create_drainer(self)
         self._telemetry_processors = []
         atexit.register(self._stop, self.options.grace_period)
         # start statsbeat on exporter instantiation
@@ -221,7 +220,8 @@ class AzureExporter(BaseExporter, TransportMixin, ProcessorMixin):
                     )
             if event:
                 if self.storage and isinstance(event, QueueExitEvent):
-                    self._transmit_from_storage()  # send files before exit
+                    # send files before exit
+                    self._transmit_from_storage(wait=True)
                 event.set()
                 return
             if self.storage and len(batch) < self.options.max_batch_size:
@@ -230,6 +230,8 @@ class AzureExporter(BaseExporter, TransportMixin, ProcessorMixin):
             logger.exception('Exception occurred while exporting the data.')
 
     def _stop(self, timeout=None):
+        if self._drainer:
+            self._drainer.close(timeout)
         if self.storage:
             self.storage.close()
         if self._worker:
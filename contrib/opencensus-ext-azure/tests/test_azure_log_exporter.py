@@ -19,6 +19,7 @@ import unittest
 
 import mock
 
+from opencensus.common.schedule import Queue, QueueEvent, QueueExitEvent
 from opencensus.ext.azure import log_exporter
 from opencensus.ext.azure.common.transport import TransportStatusCode
 
@@ -89,6 +90,89 @@ class TestBaseLogHandler(unittest.TestCase):
         handler.close()
 
 
+class TestWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.src = Queue(capacity=10)
+        self.dst = mock.Mock(max_batch_size=2, export_interval=60)
+        self.worker = log_exporter.Worker(self.src, self.dst)
+        self.worker._task = mock.Mock()
+        self.src.on_put = self.worker._on_put
+
+    def test_full_batches(self):
+        self.src.puts((1, 2, 3))
+        self.worker._task.trigger.assert_called_with()
+
+        self.worker._run()
+
+        self.dst._export.assert_called_once_with((1, 2))
+        self.assertEqual(self.src.qsize(), 1)
+        # The last item is exported once it waited export_interval.
+        [delay], _ = self.worker._task.trigger.call_args
+        self.assertGreater(delay, 59)
+
+    def test_export_interval(self):
+        with mock.patch('time.time', return_value=100.0):
+            self.src.put(1)
+        self.worker._task.trigger.assert_called_with(mock.ANY)
+
+        with mock.patch('time.time', return_value=159.0):
+            self.worker._run()
+        self.dst._export.assert_not_called()
+
+        with mock.patch('time.time', return_value=160.0):
+            self.worker._run()
+        self.dst._export.assert_called_once_with((1,))
+        self.assertIsNone(self.worker._batch_start)
+
+    def test_flush(self):
+        event = QueueEvent('SYNC')
+        self.src.puts((1, event, 2))
+        self.assertTrue(self.worker._flushing)
+
+        self.worker._run()
+
+        self.assertEqual(self.dst._export.call_args_list, [
+            mock.call((1,), event=event),
+            mock.call((2,)),
+        ])
+        self.assertFalse(self.worker._flushing)
+
+    def test_exit(self):
+        self.assertTrue(self.worker.is_alive())
+        self.src.puts((1, self.src.EXIT_EVENT))
+
+        self.worker._run()
+
+        self.dst._export.assert_called_once_with(
+            (1,), event=self.src.EXIT_EVENT)
+        self.assertFalse(self.worker.is_alive())
+        self.worker._task.cancel.assert_called_once_with()
+
+    def test_after_fork(self):
+        self.src.puts((1, QueueEvent('SYNC')))
+        self.worker._lock.acquire()
+
+        self.src._after_fork()
+        self.worker._after_fork()
+
+        self.assertTrue(self.src.is_empty())
+        self.assertFalse(self.worker._flushing)
+        self.assertIsNone(self.worker._batch_start)
+        self.worker._run()
+        self.dst._export.assert_not_called()
+
+    @mock.patch('opencensus.ext.azure.log_exporter.logger')
+    def test_export_error(self, mock_logger):
+        self.dst._export.side_effect = Exception
+        self.src.puts((1, 2))
+
+        self.worker._run()
+
+        mock_logger.exception.assert_called()
+        self.assertTrue(self.src.is_empty())
+
+
 class TestAzureLogHandler(unittest.TestCase):
 
     def setUp(self):
@@ -137,7 +221,26 @@ class TestAzureLogHandler(unittest.TestCase):
             500
         )
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
+    def test_close_drain_storage(self, requests_mock):
+        handler = log_exporter.AzureLogHandler(
+            instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
+            storage_path=os.path.join(TEST_FOLDER, self.id()),
+            storage_drain_concurrency=2,
+        )
+        handler.storage.put(['bar'])
+        handler._drainer.close()
+        record = logging.LogRecord(
+            'test', logging.INFO, __file__, 1, 'message', None, None)
+        event = QueueExitEvent('EXIT')
+        handler._export([record], event=event)
+        # Sent on the export thread before exit, the drainer is closed
+        self.assertEqual(len(requests_mock.call_args_list), 2)
+        self.assertEqual(len(os.listdir(handler.storage.path)), 0)
+        self.assertTrue(event.wait(0))
+        handler.close()
+
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_exception(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureLogHandler(
@@ -151,10 +254,10 @@ class TestAzureLogHandler(unittest.TestCase):
             logger.exception('Captured an exception.')
         handler.close()
         self.assertEqual(len(requests_mock.call_args_list), 1)
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('ZeroDivisionError' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_exception_with_custom_properties(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureLogHandler(
@@ -175,12 +278,12 @@ class TestAzureLogHandler(unittest.TestCase):
             logger.exception('Captured an exception.', extra=properties)
         handler.close()
         self.assertEqual(len(requests_mock.call_args_list), 1)
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('ZeroDivisionError' in post_body)
         self.assertTrue('key_1' in post_body)
         self.assertTrue('key_2' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_export_empty(self, request_mock):
         handler = log_exporter.AzureLogHandler(
             instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
@@ -236,7 +339,7 @@ class TestAzureLogHandler(unittest.TestCase):
             '12345678-1234-5678-abcd-12345678abcd')
         handler.close()
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_log_record_with_custom_properties(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureLogHandler(
@@ -252,12 +355,12 @@ class TestAzureLogHandler(unittest.TestCase):
                 }
             })
         handler.close()
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('action' in post_body)
         self.assertTrue('key_1' in post_body)
         self.assertTrue('key_2' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_log_with_invalid_custom_properties(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureLogHandler(
@@ -274,7 +377,7 @@ class TestAzureLogHandler(unittest.TestCase):
         })
 
         handler.close()
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('action_1_' in post_body)
         self.assertTrue('action_2_arg' in post_body)
         self.assertTrue('action_3_arg' in post_body)
@@ -282,7 +385,7 @@ class TestAzureLogHandler(unittest.TestCase):
         self.assertFalse('not_a_dict' in post_body)
         self.assertFalse('key_1' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_log_record_sampled(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureLogHandler(
@@ -295,13 +398,13 @@ class TestAzureLogHandler(unittest.TestCase):
         logger.warning('Hello_World3')
         logger.warning('Hello_World4')
         handler.close()
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('Hello_World' in post_body)
         self.assertTrue('Hello_World2' in post_body)
         self.assertTrue('Hello_World3' in post_body)
         self.assertTrue('Hello_World4' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_log_record_not_sampled(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureLogHandler(
@@ -363,7 +466,7 @@ class TestAzureEventHandler(unittest.TestCase):
             500
         )
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_exception(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureEventHandler(
@@ -377,10 +480,10 @@ class TestAzureEventHandler(unittest.TestCase):
             logger.exception('Captured an exception.')
         handler.close()
         self.assertEqual(len(requests_mock.call_args_list), 1)
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('ZeroDivisionError' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_exception_with_custom_properties(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureEventHandler(
@@ -406,14 +509,14 @@ class TestAzureEventHandler(unittest.TestCase):
             logger.exception('Captured an exception.', extra=properties)
         handler.close()
         self.assertEqual(len(requests_mock.call_args_list), 1)
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('ZeroDivisionError' in post_body)
         self.assertTrue('key_1' in post_body)
         self.assertTrue('key_2' in post_body)
         self.assertTrue('measure_1' in post_body)
         self.assertTrue('measure_2' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_export_empty(self, request_mock):
         handler = log_exporter.AzureEventHandler(
             instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
@@ -469,7 +572,7 @@ class TestAzureEventHandler(unittest.TestCase):
             '12345678-1234-5678-abcd-12345678abcd')
         handler.close()
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_log_record_with_custom_properties(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureEventHandler(
@@ -490,14 +593,14 @@ class TestAzureEventHandler(unittest.TestCase):
                 }
             })
         handler.close()
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('action' in post_body)
         self.assertTrue('key_1' in post_body)
         self.assertTrue('key_2' in post_body)
         self.assertTrue('measure_1' in post_body)
         self.assertTrue('measure_2' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_log_with_invalid_custom_properties(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureEventHandler(
@@ -515,7 +618,7 @@ class TestAzureEventHandler(unittest.TestCase):
         })
 
         handler.close()
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('action_1_' in post_body)
         self.assertTrue('action_2_arg' in post_body)
         self.assertTrue('action_3_arg' in post_body)
@@ -524,7 +627,7 @@ class TestAzureEventHandler(unittest.TestCase):
         self.assertFalse('also_not' in post_body)
         self.assertFalse('key_1' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_log_record_sampled(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureEventHandler(
@@ -537,13 +640,13 @@ class TestAzureEventHandler(unittest.TestCase):
         logger.warning('Hello_World3')
         logger.warning('Hello_World4')
         handler.close()
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('Hello_World' in post_body)
         self.assertTrue('Hello_World2' in post_body)
         self.assertTrue('Hello_World3' in post_body)
         self.assertTrue('Hello_World4' in post_body)
 
-    @mock.patch('requests.post', return_value=MockResponse(200, ''))
+    @mock.patch('requests.Session.post', return_value=MockResponse(200, ''))
     def test_log_record_not_sampled(self, requests_mock):
         logger = logging.getLogger(self.id())
         handler = log_exporter.AzureEventHandler(
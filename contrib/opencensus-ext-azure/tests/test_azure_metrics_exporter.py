@@ -152,7 +152,7 @@ class TestAzureMetricsExporter(unittest.TestCase):
                 max_batch_size=-1
             ))
 
-    @mock.patch('requests.post', return_value=mock.Mock())
+    @mock.patch('requests.Session.post', return_value=mock.Mock())
     def test_export_metrics(self, requests_mock):
         metric = create_metric()
         exporter = MetricsExporter(
@@ -164,7 +164,7 @@ class TestAzureMetricsExporter(unittest.TestCase):
         exporter.export_metrics([metric])
 
         self.assertEqual(len(requests_mock.call_args_list), 1)
-        post_body = requests_mock.call_args_list[0][1]['data']
+        post_body = requests_mock.call_args_list[0][1]['data'].decode()
         self.assertTrue('metrics' in post_body)
         self.assertTrue('properties' in post_body)
 
@@ -176,7 +176,7 @@ class TestAzureMetricsExporter(unittest.TestCase):
 
         self.assertIsNone(exporter.export_metrics([metric]))
 
-    @mock.patch('requests.post', return_value=mock.Mock())
+    @mock.patch('requests.Session.post', return_value=mock.Mock())
     def test_export_metrics_empty(self, requests_mock):
         exporter = MetricsExporter(
             instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
@@ -19,7 +19,9 @@ import unittest
 
 import mock
 
+from opencensus.common.schedule import Queue
 from opencensus.ext.azure import trace_exporter
+from opencensus.ext.azure.common.exporter import Worker
 from opencensus.ext.azure.common.transport import TransportStatusCode
 from opencensus.trace.link import Link
 
@@ -40,6 +42,29 @@ def throw(exc_type, *args, **kwargs):
     return func
 
 
+class TestWorker(unittest.TestCase):
+
+    def test_run(self):
+        src = Queue(capacity=10)
+        dst = mock.Mock(max_batch_size=2, export_interval=60)
+        worker = Worker(src, dst)
+        with mock.patch(
+                'opencensus.ext.azure.common.exporter.Task') as mock_task:
+            worker.start()
+        self.assertEqual(src.on_put, worker._on_put)
+        self.assertEqual(mock_task.call_args[1],
+                         {'name': worker.name, 'blocking': True})
+
+        src.puts((1, 2, 3, src.EXIT_EVENT))
+        worker._run()
+
+        self.assertEqual(dst.emit.call_args_list, [
+            mock.call((1, 2)),
+            mock.call((3,), event=src.EXIT_EVENT),
+        ])
+        self.assertFalse(worker.is_alive())
+
+
 class TestAzureExporter(unittest.TestCase):
 
     def setUp(self):
@@ -80,7 +105,7 @@ class TestAzureExporter(unittest.TestCase):
             500
         )
 
-    @mock.patch('requests.post', return_value=mock.Mock())
+    @mock.patch('requests.Session.post', return_value=mock.Mock())
     def test_emit_empty(self, request_mock):
         exporter = trace_exporter.AzureExporter(
             instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
@@ -131,6 +156,39 @@ class TestAzureExporter(unittest.TestCase):
             self.assertEqual(len(os.listdir(exporter.storage.path)), 0)
         exporter._stop()
 
+    @mock.patch('requests.Session.post')
+    def test_emit_drain_storage(self, post_mock):
+        post_mock.return_value = mock.Mock(status_code=200, text='')
+        exporter = trace_exporter.AzureExporter(
+            instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
+            storage_path=os.path.join(TEST_FOLDER, self.id()),
+            storage_drain_concurrency=2,
+        )
+        exporter.storage.put(['bar'])
+        with mock.patch.object(exporter._drainer, 'trigger') as trigger:
+            exporter.emit([])
+            trigger.assert_called_once_with()
+        # Drained by the drainer, not on the export thread
+        self.assertEqual(len(os.listdir(exporter.storage.path)), 1)
+        with mock.patch.object(exporter._drainer, 'close') as close:
+            exporter._stop()
+            close.assert_called_once_with(None)
+        exporter._drainer.close()
+
+    @mock.patch('requests.Session.post')
+    def test_stop_drain_storage(self, post_mock):
+        post_mock.return_value = mock.Mock(status_code=200, text='')
+        exporter = trace_exporter.AzureExporter(
+            instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
+            storage_path=os.path.join(TEST_FOLDER, self.id()),
+            storage_drain_concurrency=2,
+        )
+        exporter.storage.put(['bar'])
+        exporter._stop()
+        # Sent on the export thread before exit, the drainer is closed
+        post_mock.assert_called_once()
+        self.assertEqual(len(os.listdir(exporter.storage.path)), 0)
+
     def test_span_data_to_envelope(self):
         from opencensus.trace.span import SpanKind
         from opencensus.trace.span_context import SpanContext
@@ -0,0 +1,251 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import time
+import unittest
+
+import mock
+
+from opencensus.common.transports import retry
+from opencensus.ext.azure.common import Options, transport
+from opencensus.ext.azure.common.drainer import (
+    BacklogDrainer,
+    create_drainer,
+)
+from opencensus.ext.azure.common.segmented_storage import (
+    SegmentedFileStorage,
+)
+from opencensus.ext.azure.common.storage import (
+    LocalFileStorage,
+    _now,
+    _seconds,
+)
+from opencensus.ext.azure.common.transport import (
+    TransportMixin,
+    TransportStatusCode,
+)
+
+TEST_FOLDER = os.path.abspath('.test.drainer')
+
+
+def setUpModule():
+    os.makedirs(TEST_FOLDER)
+
+
+def tearDownModule():
+    shutil.rmtree(TEST_FOLDER)
+
+
+class TestBacklogDrainer(unittest.TestCase):
+    def setUp(self):
+        transport._throttled_until.clear()
+        self.addCleanup(transport._throttled_until.clear)
+        self.exporter = TransportMixin()
+        self.exporter.options = Options(
+            instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
+            max_batch_size=2,
+        )
+        self.exporter.storage = LocalFileStorage(
+            os.path.join(TEST_FOLDER, self.id()))
+        self.addCleanup(self.exporter.storage.close)
+        self.sent = []
+        patch = mock.patch.object(
+            self.exporter, '_transmit_once', side_effect=self._transmit_once)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.results = []
+
+    def _transmit_once(self, envelopes):
+        self.sent.append(list(envelopes))
+        if self.results:
+            return self.results.pop(0)
+        return TransportStatusCode.SUCCESS
+
+    def _drainer(self, **kwargs):
+        drainer = BacklogDrainer(self.exporter, **kwargs)
+        self.addCleanup(drainer.close)
+        return drainer
+
+    def test_drain(self):
+        self.exporter.storage.put([1, 2, 3])
+        self.exporter.storage.put([4])
+        self._drainer()._run()
+        self.assertEqual(sorted(self.sent), [[1, 2], [3], [4]])
+        self.assertIsNone(self.exporter.storage.get())
+
+    def test_drain_concurrently(self):
+        stor = self.exporter.storage = SegmentedFileStorage(
+            os.path.join(TEST_FOLDER, self.id() + '.segmented'))
+        self.addCleanup(stor.close)
+        for value in range(20):
+            stor.put([value])
+        drainer = self._drainer(concurrency=4)
+        drainer.trigger()
+        deadline = time.time() + 5
+        while stor.get() is not None and time.time() < deadline:
+            time.sleep(0.01)
+        drainer.close()
+        # Every batch is sent once
+        self.assertEqual(sorted(self.sent), [[value] for value in range(20)])
+
+    def test_retry(self):
+        self.exporter.storage.put([1, 2, 3, 4, 5])
+        self.results = [TransportStatusCode.SUCCESS, TransportStatusCode.RETRY]
+        drainer = self._drainer()
+        drainer._run()
+        self.assertEqual(self.sent, [[1, 2], [3, 4]])
+        # The blob is released, without the envelopes sent
+        self.assertEqual(self.exporter.storage.get().get(), (3, 4, 5))
+        drainer._run()
+        self.assertEqual(self.sent[2:], [[3, 4], [5]])
+        self.assertIsNone(self.exporter.storage.get())
+
+    def test_lease_renewed(self):
+        self.exporter.options.timeout = 5
+        self.exporter.storage.put([1, 2, 3, 4, 5])
+        now = [_now()]
+
+        def transmit_once(envelopes):
+            # Each request outlasts half the lease, a sibling task can't
+            # take the blob over
+            now[0] += _seconds(6)
+            self.assertIsNone(self.exporter.storage.get())
+            return self._transmit_once(envelopes)
+
+        with mock.patch('opencensus.ext.azure.common.storage._now',
+                        side_effect=lambda: now[0]):
+            with mock.patch.object(self.exporter, '_transmit_once',
+                                   side_effect=transmit_once):
+                self._drainer(concurrency=2)._run()
+        self.assertEqual(self.sent, [[1, 2], [3, 4], [5]])
+        self.assertIsNone(self.exporter.storage.get())
+
+    def test_lease_lost(self):
+        self.exporter.storage.put([1, 2, 3, 4, 5])
+        self.exporter.storage.put([6])
+        now = [_now()]
+        other = []
+
+        def transmit_once(envelopes):
+            if not other:
+                # The lease expires and a sibling task takes the blob over
+                now[0] += _seconds(60)
+                other.append(self.exporter.storage.get().lease(10))
+            return self._transmit_once(envelopes)
+
+        with mock.patch('opencensus.ext.azure.common.storage._now',
+                        side_effect=lambda: now[0]):
+            with mock.patch.object(self.exporter, '_transmit_once',
+                                   side_effect=transmit_once):
+                self._drainer()._run()
+            self.assertEqual(self.sent, [[1, 2], [6]])
+            self.assertEqual(other[0].get(), (1, 2, 3, 4, 5))
+
+    def test_lease_period(self):
+        self.exporter.options.timeout = 10
+        self.assertEqual(self.exporter._lease_period(), 15)
+        self.exporter.options.export_policy = retry.ExportPolicy(
+            max_retries=2, max_backoff=20)
+        self.assertEqual(self.exporter._lease_period(), 3 * 10 + 2 * 20 + 5)
+
+    def test_read_error(self):
+        blob = self.exporter.storage.put([1, 2, 3])
+        self.exporter.storage.put([4])
+        with open(blob.fullpath, 'ab') as file:
+            file.write(b'{\n')
+        self._drainer()._run()
+        # The batch with the corrupted line isn't sent
+        self.assertEqual(sorted(self.sent), [[1, 2], [4]])
+        # Kept, the blob is read again once the lease expires
+        self.assertEqual(len(os.listdir(self.exporter.storage.path)), 1)
+
+    def test_yield_to_live(self):
+        self.exporter.storage.put([1])
+        drainer = self.exporter._drainer = self._drainer()
+        with mock.patch.object(drainer, 'trigger') as trigger:
+            with drainer.live():
+                drainer._run()
+            self.assertEqual(self.sent, [])
+            trigger.assert_not_called()
+            self.results = [TransportStatusCode.RETRY]
+            self.exporter._transmit(['live'])
+            trigger.assert_not_called()
+            self.exporter._transmit(['live'])
+            trigger.assert_called_once_with()
+            self.exporter._transmit_from_storage()
+            self.assertEqual(trigger.call_count, 2)
+        self.assertEqual(self.sent, [['live'], ['live']])
+        self.assertEqual(self.exporter.storage.get().get(), (1,))
+
+    def test_throttled(self):
+        self.exporter.storage.put([1])
+        transport._throttle(self.exporter.options.instrumentation_key, 30)
+        drainer = self._drainer()
+        with mock.patch.object(drainer, 'trigger') as trigger:
+            drainer._run()
+        self.assertEqual(self.sent, [])
+        self.assertAlmostEqual(trigger.call_args[0][0], 30, delta=1)
+
+    def test_rate(self):
+        for _ in range(3):
+            self.exporter.storage.put(['x' * 100, 'y' * 100])
+        drainer = self._drainer(rate=300)
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            drainer._refilled = now
+            with mock.patch.object(drainer, 'trigger') as trigger:
+                drainer._run()
+            # The budget of a second is spent by the first two blobs
+            self.assertEqual(len(self.sent), 2)
+            self.assertAlmostEqual(
+                trigger.call_args[0][0], (2 * 206 - 300) / 300.0, delta=0.01)
+        with mock.patch('time.time', return_value=now + 1):
+            drainer._run()
+        self.assertEqual(len(self.sent), 3)
+        self.assertIsNone(self.exporter.storage.get())
+
+    def test_close(self):
+        self.exporter.storage.put([1])
+        drainer = self._drainer()
+        drainer.close()
+        drainer.trigger()
+        drainer._run()
+        self.assertEqual(self.sent, [])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            BacklogDrainer(self.exporter, concurrency=0)
+        with self.assertRaises(ValueError):
+            BacklogDrainer(self.exporter, rate=-1)
+
+    def test_create_drainer(self):
+        self.assertIsNone(create_drainer(self.exporter))
+        self.exporter.options.storage_drain_concurrency = 2
+        self.exporter.options.storage_drain_rate = 1024
+        drainer = create_drainer(self.exporter)
+        self.addCleanup(drainer.close)
+        self.assertEqual(drainer.concurrency, 2)
+        self.assertEqual(drainer.rate, 1024)
+        self.exporter.storage = None
+        self.assertIsNone(create_drainer(self.exporter))
+
+    def test_after_fork(self):
+        drainer = self._drainer()
+        lock = drainer._lock
+        drainer._live = 1
+        drainer._after_fork()
+        self.assertEqual(drainer._live, 0)
+        self.assertIsNot(drainer._lock, lock)
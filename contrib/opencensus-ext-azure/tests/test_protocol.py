@@ -58,3 +58,21 @@ class TestProtocol(unittest.TestCase):
     def test_request(self):
         data = protocol.Request()
         self.assertEqual(data.ver, 2)
+
+    def test_required_fields(self):
+        data = protocol.RemoteDependency(name='GET /', success=False)
+        self.assertEqual(data, {
+            'name': 'GET /',
+            'success': False,
+            'ver': 2,
+            'resultCode': '',
+            'duration': '',
+        })
+        self.assertIsNone(data.target)
+        self.assertNotIn('target', data)
+
+    def test_slots(self):
+        data = protocol.Envelope(iKey='key')
+        self.assertFalse(hasattr(data, '__dict__'))
+        data.name = 'name'
+        self.assertEqual(data, {'iKey': 'key', 'name': 'name', 'time': ''})
@@ -0,0 +1,324 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import time
+import unittest
+
+import mock
+
+from opencensus.ext.azure.common import Options, segmented_storage
+from opencensus.ext.azure.common.segmented_storage import (
+    SegmentedFileStorage,
+)
+from opencensus.ext.azure.common.storage import (
+    LocalFileStorage,
+    create_storage,
+)
+
+TEST_FOLDER = os.path.abspath('.test.segmented_storage')
+
+
+def setUpModule():
+    os.makedirs(TEST_FOLDER)
+
+
+def tearDownModule():
+    shutil.rmtree(TEST_FOLDER)
+
+
+def _writer_paths(path):
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))]
+
+
+def _segment_paths(path):
+    return [
+        os.path.join(writer_path, name)
+        for writer_path in _writer_paths(path)
+        for name in sorted(os.listdir(writer_path))
+        if name.endswith('.seg')
+    ]
+
+
+class TestSegmentedFileStorage(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(TEST_FOLDER, self.id())
+
+    def test_put_get(self):
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertIsNone(stor.get())
+            stor.put(({'a': 1}, 2))
+            stor.put((3,))
+            self.assertEqual([record.get() for record in stor.gets()],
+                             [({'a': 1}, 2), (3,)])
+            self.assertEqual(len(_writer_paths(self.path)), 1)
+            self.assertEqual(len(_segment_paths(self.path)), 1)
+
+    def test_put_with_lease(self):
+        with SegmentedFileStorage(self.path) as stor:
+            record = stor.put((1, 2, 3), lease_period=10)
+            self.assertIsNone(stor.get())
+            with mock.patch('time.time', return_value=time.time() + 20):
+                self.assertEqual(stor.get().get(), (1, 2, 3))
+            self.assertEqual(record.get(), (1, 2, 3))
+
+    def test_lease(self):
+        with SegmentedFileStorage(self.path) as stor:
+            stor.put((1, 2, 3))
+            record = stor.get()
+            self.assertIs(record.lease(10), record)
+            self.assertIsNone(stor.get())
+            record.delete()
+            self.assertIsNone(record.lease(10))
+            self.assertIsNone(record.get())
+
+    def test_lease_conflict(self):
+        with SegmentedFileStorage(self.path) as stor:
+            stor.put((1, 2, 3))
+            record, other = stor.get(), stor.get()
+            self.assertIs(record.lease(10), record)
+            # Like the rename of a blob file, only the first lease wins
+            self.assertIsNone(other.lease(10))
+            self.assertIs(record.lease(0), record)
+            self.assertIs(stor.get().lease(10).key, record.key)
+            self.assertIsNone(record.lease(10))
+
+    def test_delete(self):
+        with SegmentedFileStorage(self.path, segment_size=1) as stor:
+            for value in range(3):
+                stor.put((value,))
+            self.assertEqual(len(_segment_paths(self.path)), 3)
+            size = stor._size
+            for record in stor.gets():
+                record.delete()
+                record.delete()
+            self.assertIsNone(stor.get())
+            self.assertEqual(_segment_paths(self.path), [])
+            self.assertEqual(stor._size, 0)
+            stor.put((3,))
+            self.assertEqual(stor._size, size // 3)
+
+    def test_reopen(self):
+        with SegmentedFileStorage(self.path, segment_size=1) as stor:
+            for value in range(4):
+                stor.put((value,))
+            records = list(stor.gets())
+            records[0].delete()
+            records[1].lease(10)
+            size = stor._size
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertEqual([record.get() for record in stor.gets()],
+                             [(2,), (3,)])
+            self.assertEqual(stor._size, size)
+            self.assertEqual(len(_segment_paths(self.path)), 3)
+
+    def test_get_batches(self):
+        with SegmentedFileStorage(self.path) as stor:
+            stor.put((1, 2, 3, 4, 5))
+            record = stor.get()
+            batches = list(record.get_batches(2))
+            self.assertEqual([batch for batch, _ in batches],
+                             [(1, 2), (3, 4), (5,)])
+            self.assertIs(record.set_offset(batches[1][1]), record)
+            self.assertEqual(record.get(), (5,))
+            self.assertEqual(list(record.get_batches(2)), [batches[2]])
+        with SegmentedFileStorage(self.path) as stor:
+            record = stor.get()
+            self.assertEqual(record.offset, batches[1][1])
+            self.assertEqual(record.get(), (5,))
+            record.delete()
+            self.assertIsNone(record.set_offset(0))
+            self.assertEqual(record.offset, 0)
+            with self.assertRaises(IOError):
+                list(record.get_batches(2))
+
+    def test_torn_record(self):
+        with SegmentedFileStorage(self.path) as stor:
+            stor.put((1,))
+            stor.put((2,))
+        segment_path, = _segment_paths(self.path)
+        size = os.path.getsize(segment_path)
+        with open(segment_path, 'r+b') as file:
+            file.truncate(size - 1)
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertEqual([record.get() for record in stor.gets()], [(1,)])
+            self.assertEqual(os.path.getsize(segment_path), size // 2)
+            stor.put((3,))
+            self.assertEqual([record.get() for record in stor.gets()],
+                             [(1,), (3,)])
+
+    def test_corrupted_record(self):
+        with SegmentedFileStorage(self.path) as stor:
+            stor.put((1,))
+            stor.put((2,))
+        segment_path, = _segment_paths(self.path)
+        with open(segment_path, 'r+b') as file:
+            file.seek(-3, os.SEEK_END)
+            file.write(b'9')
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertEqual([record.get() for record in stor.gets()], [(1,)])
+
+    def test_torn_index(self):
+        with SegmentedFileStorage(self.path) as stor:
+            stor.put((1,))
+            stor.put((2,))
+            stor.get().delete()
+        index_path = os.path.join(_writer_paths(self.path)[0], 'index')
+        with open(index_path, 'ab') as file:
+            file.write(b'\0' * 10)
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertEqual([record.get() for record in stor.gets()], [(2,)])
+        self.assertEqual(os.path.getsize(index_path),
+                         segmented_storage._INDEX_ENTRY_SIZE)
+
+    def test_compact_index(self):
+        with SegmentedFileStorage(self.path) as stor:
+            for value in range(4):
+                stor.put((value,))
+            for record in stor.gets():
+                record.lease(10)
+                record.lease(20)
+                record.set_offset(2)
+            self.assertIsNone(stor.get())
+            stor._delete(next(iter(stor._records)))
+            with mock.patch.object(segmented_storage,
+                                   '_INDEX_COMPACTION_SLACK', 0):
+                stor._maintenance_routine()
+            writer, = stor._writers.values()
+            self.assertEqual(writer.index_entries, 7)
+            stor.put((4,))
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertEqual([record.get() for record in stor.gets()], [(4,)])
+            with mock.patch('time.time', return_value=time.time() + 30):
+                self.assertEqual([record.offset for record in stor.gets()],
+                                 [2, 2, 2, 0])
+
+    def test_fsync_index(self):
+        with SegmentedFileStorage(self.path) as stor:
+            record = stor.put((1,))
+            writer, = stor._writers.values()
+            with mock.patch('os.fsync') as mock_fsync:
+                record.lease(10)
+                record.delete()
+            self.assertEqual(mock_fsync.call_args_list,
+                             [mock.call(writer.index_file.fileno())] * 2)
+            with mock.patch('os.fsync') as mock_fsync, \
+                    mock.patch.object(segmented_storage,
+                                      '_INDEX_COMPACTION_SLACK', -1):
+                stor._compact_index(writer)
+            # The new index and its directory entry.
+            self.assertEqual(mock_fsync.call_count, 2)
+
+    def test_no_fsync(self):
+        with SegmentedFileStorage(self.path, fsync=False) as stor:
+            with mock.patch('os.fsync') as mock_fsync:
+                stor.put((1,)).delete()
+                writer, = stor._writers.values()
+                with mock.patch.object(segmented_storage,
+                                       '_INDEX_COMPACTION_SLACK', -1):
+                    stor._compact_index(writer)
+            self.assertFalse(mock_fsync.called)
+
+    def test_retention(self):
+        with SegmentedFileStorage(self.path, retention_period=10) as stor:
+            with mock.patch('time.time', return_value=time.time() - 20):
+                stor.put((1,))
+            stor.put((2,))
+            self.assertEqual([record.get() for record in stor.gets()], [(2,)])
+            self.assertEqual(len(stor._records), 1)
+
+    def test_max_size(self):
+        with SegmentedFileStorage(self.path, max_size=10) as stor:
+            self.assertIsNotNone(stor.put((1,)))
+            self.assertIsNone(stor.put((2,)))
+            self.assertFalse(stor._check_storage_size())
+            stor.get().delete()
+            self.assertTrue(stor._check_storage_size())
+
+    def test_put_error(self):
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertIsNone(stor.put((object(),)))
+            stor.put((1,))
+            writer, = stor._writers.values()
+            with mock.patch('os.fsync', side_effect=OSError):
+                self.assertIsNone(stor.put((2,)))
+            self.assertIsNone(writer.active)
+            stor.put((3,))
+            self.assertEqual(len(_segment_paths(self.path)), 2)
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertEqual([record.get() for record in stor.gets()],
+                             [(1,), (2,), (3,)])
+
+    def test_shared_path(self):
+        with SegmentedFileStorage(self.path) as stor:
+            stor.put((1,))
+            with SegmentedFileStorage(self.path) as other:
+                # Records of a storage still open aren't adopted.
+                self.assertIsNone(other.get())
+                self.assertEqual(other._foreign_size, stor._size)
+                other.put((2,))
+            self.assertEqual(len(_writer_paths(self.path)), 2)
+            stor._maintenance_routine()
+            self.assertEqual([record.get() for record in stor.gets()],
+                             [(1,), (2,)])
+            for record in stor.gets():
+                record.delete()
+            # The adopted writer directory is removed once drained.
+            self.assertEqual(len(_writer_paths(self.path)), 1)
+        with SegmentedFileStorage(self.path) as stor:
+            self.assertIsNone(stor.get())
+            stor._maintenance_routine()
+        self.assertEqual(_writer_paths(self.path), [])
+
+    def test_ignores_other_directories(self):
+        os.makedirs(os.path.join(self.path, 'other'))
+        with SegmentedFileStorage(self.path, write_timeout=0) as stor:
+            stor._maintenance_routine()
+            self.assertIsNone(stor.get())
+        self.assertEqual(os.listdir(self.path), ['other'])
+
+    def test_after_fork(self):
+        with SegmentedFileStorage(self.path) as stor:
+            stor.put((1,))
+            parent_writer, = stor._writers.values()
+            lock_file = open(os.path.join(parent_writer.path, 'LOCK'), 'a+b')
+            self.addCleanup(lock_file.close)
+
+            stor._after_fork()
+
+            self.assertIsNone(stor.get())
+            self.assertEqual(stor._size, 0)
+            stor.put((2,))
+            self.assertEqual([record.get() for record in stor.gets()], [(2,)])
+            self.assertEqual(len(_writer_paths(self.path)), 2)
+
+
+class TestCreateStorage(unittest.TestCase):
+    def test_create_storage(self):
+        options = Options(
+            instrumentation_key='12345678-1234-5678-abcd-12345678abcd',
+            storage_path=os.path.join(TEST_FOLDER, 'create'),
+        )
+        with create_storage(options) as stor:
+            self.assertIsInstance(stor, LocalFileStorage)
+        options.storage_engine = 'segmented'
+        with create_storage(options, 'source') as stor:
+            self.assertIsInstance(stor, SegmentedFileStorage)
+            self.assertEqual(stor.max_size, options.storage_max_size)
+            self.assertEqual(stor.retention_period,
+                             options.storage_retention_period)
+        options.storage_engine = 'sqlite'
+        with self.assertRaises(ValueError):
+            create_storage(options)
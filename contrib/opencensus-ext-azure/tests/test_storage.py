@@ -74,6 +74,46 @@ class TestLocalFileBlob(unittest.TestCase):
         blob.delete()
         self.assertEqual(blob.lease(0.01), None)
 
+    def test_get_batches(self):
+        blob = LocalFileBlob(os.path.join(TEST_FOLDER, 'batches.blob'))
+        blob.put((1, 2, 3, 4, 5))
+        batches = list(blob.get_batches(2))
+        self.assertEqual([batch for batch, _ in batches],
+                         [(1, 2), (3, 4), (5,)])
+        self.assertEqual(batches[-1][1], os.path.getsize(blob.fullpath))
+        with mock.patch('os.rename', side_effect=throw(Exception)):
+            self.assertIsNone(blob.set_offset(batches[0][1]))
+        self.assertEqual(blob.offset, 0)
+        blob.delete()
+        with self.assertRaises(IOError):
+            list(blob.get_batches(2))
+
+    def test_get_batches_decode_error(self):
+        blob = LocalFileBlob(os.path.join(TEST_FOLDER, 'corrupt.blob'))
+        blob.put((1, 2, 3))
+        with open(blob.fullpath, 'ab') as file:
+            file.write(b'{\n')
+        batches = blob.get_batches(3)
+        self.assertEqual(next(batches)[0], (1, 2, 3))
+        with self.assertRaises(ValueError):
+            next(batches)
+        blob.delete()
+
+    def test_set_offset(self):
+        blob = LocalFileBlob(os.path.join(TEST_FOLDER, 'offset.blob'))
+        blob.put((1, 2, 3, 4, 5), lease_period=10)
+        (_, offset), (_, end) = list(blob.get_batches(2))[:2]
+        self.assertIs(blob.set_offset(offset), blob)
+        self.assertEqual(blob.offset, offset)
+        self.assertTrue(blob.fullpath.endswith('.lock'))
+        self.assertEqual(blob.get(), (3, 4, 5))
+        blob.set_offset(end)
+        self.assertEqual(blob.offset, end)
+        self.assertEqual(list(blob.get_batches(2)), [((5,), end + 2)])
+        blob.lease(10)
+        self.assertEqual(blob.offset, end)
+        blob.delete()
+
 
 class TestLocalFileStorage(unittest.TestCase):
     def test_get_nothing(self):
@@ -144,7 +184,7 @@ class TestLocalFileStorage(unittest.TestCase):
 
     def test_check_storage_size_error(self):
         input = (1, 2, 3)
-        with LocalFileStorage(os.path.join(TEST_FOLDER, 'asd5'), 1) as stor:
+        with LocalFileStorage(os.path.join(TEST_FOLDER, 'asd6'), 1) as stor:
             with mock.patch('os.path.getsize', side_effect=throw(OSError)):
                 stor.put(input)
                 with mock.patch('os.path.islink') as os_mock:
@@ -185,3 +225,39 @@ class TestLocalFileStorage(unittest.TestCase):
                 stor._maintenance_routine()
                 stor._maintenance_routine()
                 self.assertEqual(isdir.call_count, 2)
+
+    def test_size_accounting(self):
+        input = (1, 2, 3)
+        with LocalFileStorage(os.path.join(TEST_FOLDER, 'qux')) as stor:
+            self.assertEqual(stor._size, 0)
+            blob = stor.put(input)
+            size = os.path.getsize(blob.fullpath)
+            self.assertEqual(stor._size, size)
+            with mock.patch('os.walk') as walk:
+                stor.put(input)
+                self.assertEqual(stor._size, size * 2)
+                walk.assert_not_called()
+            stor.get().delete()
+            self.assertEqual(stor._size, size)
+            stor.get().delete()
+            self.assertEqual(stor._size, 0)
+
+    def test_size_accounting_expiry(self):
+        with LocalFileStorage(os.path.join(TEST_FOLDER, 'quux')) as stor:
+            with mock.patch('opencensus.ext.azure.common.storage._now') as m:
+                m.return_value = _now() - _seconds(30 * 24 * 60 * 60)
+                stor.put((1, 2, 3))
+            self.assertGreater(stor._size, 0)
+            self.assertIsNone(stor.get())
+            self.assertEqual(stor._size, 0)
+
+    def test_size_reconciled(self):
+        with LocalFileStorage(os.path.join(TEST_FOLDER, 'corge'), 1) as stor:
+            stor.put((1, 2, 3))
+            self.assertFalse(stor._check_storage_size())
+            # Blob removed behind the storage, e.g. by another process
+            os.remove(stor.get().fullpath)
+            self.assertFalse(stor._check_storage_size())
+            stor._maintenance_routine()
+            self.assertEqual(stor._size, 0)
+            self.assertTrue(stor._check_storage_size())
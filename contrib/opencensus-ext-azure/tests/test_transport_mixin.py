@@ -15,15 +15,23 @@
 import json
 import os
 import shutil
+import time
 import unittest
+import zlib
 
 import mock
 import requests
 from azure.core.exceptions import ClientAuthenticationError
 from azure.identity._exceptions import CredentialUnavailableError
 
+from opencensus.common import json_serializer
+from opencensus.common.transports import retry
 from opencensus.ext.azure.common import Options
-from opencensus.ext.azure.common.storage import LocalFileStorage
+from opencensus.ext.azure.common.storage import (
+    LocalFileStorage,
+    _now,
+    _seconds,
+)
 from opencensus.ext.azure.common.transport import (
     _MAX_CONSECUTIVE_REDIRECTS,
     _MONITOR_OAUTH_SCOPE,
@@ -31,6 +39,7 @@ from opencensus.ext.azure.common.transport import (
     TransportMixin,
     TransportStatusCode,
     _requests_map,
+    _throttled_until,
 )
 from opencensus.ext.azure.statsbeat import state
 
@@ -63,6 +72,8 @@ class TestTransportMixin(unittest.TestCase):
     def setUp(self):
         # pylint: disable=protected-access
         _requests_map.clear()
+        _throttled_until.clear()
+        self.addCleanup(_throttled_until.clear)
         state._STATSBEAT_STATE = {
             "INITIAL_FAILURE_COUNT": 0,
             "INITIAL_SUCCESS": False,
@@ -96,7 +107,7 @@ class TestTransportMixin(unittest.TestCase):
         mixin = TransportMixin()
         mixin.options = Options()
         mixin._is_stats = True
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             for code in _REACHED_INGESTION_STATUS_CODES:
                 post.return_value = MockResponse(code, 'unknown')
                 mixin._transmit([1])
@@ -114,7 +125,7 @@ class TestTransportMixin(unittest.TestCase):
                 os.environ, {
                     "APPLICATIONINSIGHTS_STATSBEAT_DISABLED_ALL": "",
                 }):
-            with mock.patch('requests.post', throw(Exception)):
+            with mock.patch('requests.Session.post', throw(Exception)):
                 result = mixin._transmit([1, 2, 3])
                 self.assertEqual(state._STATSBEAT_STATE["INITIAL_FAILURE_COUNT"], 1)  # noqa: E501
                 self.assertEqual(result, TransportStatusCode.DROP)
@@ -130,7 +141,7 @@ class TestTransportMixin(unittest.TestCase):
                 os.environ, {
                     "APPLICATIONINSIGHTS_STATSBEAT_DISABLED_ALL": "",
                 }):
-            with mock.patch('requests.post', throw(Exception)):
+            with mock.patch('requests.Session.post', throw(Exception)):
                 result = mixin._transmit([1, 2, 3])
                 self.assertEqual(state._STATSBEAT_STATE["INITIAL_FAILURE_COUNT"], 3)  # noqa: E501
                 self.assertEqual(result, TransportStatusCode.STATSBEAT_SHUTDOWN)  # noqa: E501
@@ -146,12 +157,12 @@ class TestTransportMixin(unittest.TestCase):
                 os.environ, {
                     "APPLICATIONINSIGHTS_STATSBEAT_DISABLED_ALL": "",
                 }):
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(403, 'unknown')
                 mixin._transmit([1, 2, 3])
                 self.assertEqual(state._STATSBEAT_STATE["INITIAL_FAILURE_COUNT"], 1)  # noqa: E501
                 self.assertFalse(state._STATSBEAT_STATE["INITIAL_SUCCESS"])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(200, 'unknown')
                 mixin._transmit([1, 2, 3])
                 self.assertEqual(state._STATSBEAT_STATE["INITIAL_FAILURE_COUNT"], 1)  # noqa: E501
@@ -168,7 +179,7 @@ class TestTransportMixin(unittest.TestCase):
                 os.environ, {
                     "APPLICATIONINSIGHTS_STATSBEAT_DISABLED_ALL": "",
                 }):
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(403, 'unknown')
                 result = mixin._transmit([1, 2, 3])
                 self.assertEqual(state._STATSBEAT_STATE["INITIAL_FAILURE_COUNT"], 3)  # noqa: E501
@@ -179,7 +190,7 @@ class TestTransportMixin(unittest.TestCase):
         mixin = TransportMixin()
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = None
                 mixin._transmit_from_storage()
 
@@ -189,7 +200,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post', throw(requests.Timeout)):
+            with mock.patch('requests.Session.post', throw(requests.Timeout)):
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
             self.assertEqual(len(os.listdir(mixin.storage.path)), 1)
@@ -197,7 +208,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_timeout(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post', throw(requests.Timeout)):
+        with mock.patch('requests.Session.post', throw(requests.Timeout)):
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
             self.assertIsNotNone(_requests_map['duration'])
@@ -211,7 +222,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post', throw(requests.RequestException)):
+            with mock.patch('requests.Session.post', throw(requests.RequestException)):  # noqa: E501
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
             self.assertEqual(len(os.listdir(mixin.storage.path)), 1)
@@ -219,7 +230,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_req_exception(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post', throw(requests.RequestException)):
+        with mock.patch('requests.Session.post', throw(requests.RequestException)):  # noqa: E501
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
             self.assertIsNotNone(_requests_map['duration'])
@@ -233,7 +244,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post', throw(CredentialUnavailableError)):  # noqa: E501
+            with mock.patch('requests.Session.post', throw(CredentialUnavailableError)):  # noqa: E501
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
             self.assertEqual(len(os.listdir(mixin.storage.path)), 0)
@@ -241,7 +252,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_cred_exception(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post', throw(CredentialUnavailableError)):
+        with mock.patch('requests.Session.post', throw(CredentialUnavailableError)):  # noqa: E501
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
             self.assertIsNotNone(_requests_map['duration'])
@@ -255,7 +266,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post', throw(ClientAuthenticationError)):
+            with mock.patch('requests.Session.post', throw(ClientAuthenticationError)):  # noqa: E501
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
             self.assertEqual(len(os.listdir(mixin.storage.path)), 1)
@@ -263,7 +274,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_client_exception(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post', throw(ClientAuthenticationError)):
+        with mock.patch('requests.Session.post', throw(ClientAuthenticationError)):  # noqa: E501
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
             self.assertIsNotNone(_requests_map['duration'])
@@ -277,7 +288,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post', throw(Exception)):
+            with mock.patch('requests.Session.post', throw(Exception)):
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
             self.assertEqual(len(os.listdir(mixin.storage.path)), 0)
@@ -285,7 +296,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_exception(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post', throw(Exception)):
+        with mock.patch('requests.Session.post', throw(Exception)):
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
             self.assertIsNotNone(_requests_map['duration'])
@@ -293,7 +304,7 @@ class TestTransportMixin(unittest.TestCase):
             self.assertEqual(_requests_map['count'], 1)
             self.assertEqual(result, TransportStatusCode.DROP)
 
-    @mock.patch('requests.post', return_value=mock.Mock())
+    @mock.patch('requests.Session.post', return_value=mock.Mock())
     def test_transmission_lease_failure(self, requests_mock):
         requests_mock.return_value = MockResponse(200, 'unknown')
         mixin = TransportMixin()
@@ -314,7 +325,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(200, None)
                 del post.return_value.text
                 mixin._transmit_from_storage()
@@ -328,7 +339,7 @@ class TestTransportMixin(unittest.TestCase):
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(200, 'unknown')
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
@@ -337,7 +348,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_200(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(200, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -356,7 +367,7 @@ class TestTransportMixin(unittest.TestCase):
         token_mock = mock.Mock()
         token_mock.token = "test_token"
         credential.get_token.return_value = token_mock
-        data = '[1, 2, 3]'
+        data = json_serializer.dumpb([1, 2, 3])
         headers = {
             'Accept': 'application/json',
             'Content-Type': 'application/json; charset=utf-8',
@@ -365,7 +376,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(200, 'unknown')
                 mixin._transmit_from_storage()
                 post.assert_called_with(
@@ -387,7 +398,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(206, 'unknown')
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
@@ -396,7 +407,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_206_invalid_data(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(206, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -410,7 +421,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3, 4, 5])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(206, json.dumps({
                     'itemsReceived': 5,
                     'itemsAccepted': 3,
@@ -431,12 +442,106 @@ class TestTransportMixin(unittest.TestCase):
             self.assertEqual(len(os.listdir(mixin.storage.path)), 1)
             self.assertEqual(mixin.storage.get().get(), (3,))
 
+    def test_transmission_from_storage_batches(self):
+        mixin = TransportMixin()
+        mixin.options = Options(max_batch_size=2)
+        with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
+            mixin.storage = stor
+            mixin.storage.put([1, 2, 3, 4, 5])
+            with mock.patch('requests.Session.post') as post:
+                post.side_effect = [
+                    MockResponse(200, 'unknown'),
+                    MockResponse(503, 'unknown'),
+                ]
+                mixin._transmit_from_storage()
+            self.assertEqual(
+                [json.loads(call[1]['data'].decode())
+                 for call in post.call_args_list],
+                [[1, 2], [3, 4]],
+            )
+            # Only the envelopes not sent are sent again
+            with mock.patch('opencensus.ext.azure.common.storage._now',
+                            return_value=_now() + _seconds(100)):
+                with mock.patch('requests.Session.post') as post:
+                    post.return_value = MockResponse(200, 'unknown')
+                    mixin._transmit_from_storage()
+            self.assertEqual(
+                [json.loads(call[1]['data'].decode())
+                 for call in post.call_args_list],
+                [[3, 4], [5]],
+            )
+            self.assertEqual(len(os.listdir(mixin.storage.path)), 0)
+
+    def test_transmission_from_storage_renews_lease(self):
+        mixin = TransportMixin()
+        mixin.options = Options(max_batch_size=2, timeout=5)
+        now = [_now()]
+        with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
+            mixin.storage = stor
+            stor.put([1, 2, 3, 4, 5])
+
+            def transmit(envelopes):
+                # Each request outlasts half the lease
+                now[0] += _seconds(6)
+                self.assertIsNone(stor.get())
+                return TransportStatusCode.SUCCESS
+
+            with mock.patch('opencensus.ext.azure.common.storage._now',
+                            side_effect=lambda: now[0]):
+                with mock.patch.object(mixin, '_transmit',
+                                       side_effect=transmit) as m:
+                    mixin._transmit_from_storage()
+            self.assertEqual(m.call_count, 3)
+            self.assertEqual(os.listdir(stor.path), [])
+
+    def test_transmission_from_storage_lease_lost(self):
+        mixin = TransportMixin()
+        mixin.options = Options(max_batch_size=2, timeout=5)
+        now = [_now()]
+        with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
+            mixin.storage = stor
+            stor.put([1, 2, 3, 4, 5])
+            other = []
+
+            def transmit(envelopes):
+                # The lease expires and another reader takes the blob
+                now[0] += _seconds(20)
+                other.append(stor.get().lease(10))
+                return TransportStatusCode.SUCCESS
+
+            with mock.patch('opencensus.ext.azure.common.storage._now',
+                            side_effect=lambda: now[0]):
+                with mock.patch.object(mixin, '_transmit',
+                                       side_effect=transmit) as m:
+                    mixin._transmit_from_storage()
+                m.assert_called_once_with((1, 2))
+                # The blob is left to the other reader
+                self.assertEqual(other[0].get(), (1, 2, 3, 4, 5))
+                self.assertEqual(os.listdir(stor.path),
+                                 [os.path.basename(other[0].fullpath)])
+
+    def test_transmission_from_storage_read_error(self):
+        mixin = TransportMixin()
+        mixin.options = Options(max_batch_size=2)
+        with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
+            mixin.storage = stor
+            blob = stor.put([1, 2, 3])
+            with open(blob.fullpath, 'ab') as file:
+                file.write(b'{\n')
+            with mock.patch.object(mixin, '_transmit') as m:
+                m.return_value = TransportStatusCode.SUCCESS
+                mixin._transmit_from_storage()
+            self.assertEqual(m.call_count, 1)
+            # Not deleted, the blob is read again once the lease expires
+            self.assertEqual(len(os.listdir(stor.path)), 1)
+            self.assertIsNone(stor.get())
+
     def test_statsbeat_206_partial_retry(self):
         mixin = TransportMixin()
         mixin.options = Options()
         storage_mock = mock.Mock()
         mixin.storage = storage_mock
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(206, json.dumps({
                     'itemsReceived': 5,
                     'itemsAccepted': 3,
@@ -468,7 +573,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(206, json.dumps({
                     'itemsReceived': 3,
                     'itemsAccepted': 2,
@@ -488,7 +593,7 @@ class TestTransportMixin(unittest.TestCase):
         mixin.options = Options()
         storage_mock = mock.Mock()
         mixin.storage = storage_mock
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(206, json.dumps({
                     'itemsReceived': 3,
                     'itemsAccepted': 2,
@@ -513,7 +618,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3, 4, 5])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(206, json.dumps({
                     'itemsReceived': 5,
                     'itemsAccepted': 3,
@@ -533,7 +638,7 @@ class TestTransportMixin(unittest.TestCase):
         mixin.options = Options()
         storage_mock = mock.Mock()
         mixin.storage = storage_mock
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(206, json.dumps({
                     'itemsReceived': 5,
                     'itemsAccepted': 3,
@@ -558,7 +663,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(429, 'unknown')
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
@@ -567,7 +672,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_429(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(429, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -582,7 +687,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(500, 'unknown')
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
@@ -591,7 +696,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_500(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(500, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -606,7 +711,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(502, 'unknown')
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
@@ -615,7 +720,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_502(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(502, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -630,7 +735,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(503, 'unknown')
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
@@ -639,7 +744,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_503(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(503, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -654,7 +759,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(504, 'unknown')
                 mixin._transmit_from_storage()
             self.assertIsNone(mixin.storage.get())
@@ -663,7 +768,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_504(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(504, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -678,7 +783,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(401, '{}')
                 mixin._transmit_from_storage()
             self.assertEqual(len(os.listdir(mixin.storage.path)), 1)
@@ -686,7 +791,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_401(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(401, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -701,7 +806,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(403, '{}')
                 mixin._transmit_from_storage()
             self.assertEqual(len(os.listdir(mixin.storage.path)), 1)
@@ -709,7 +814,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_403(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(403, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -726,7 +831,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(307, '{}', {"location": "https://example.com"})  # noqa: E501
                 mixin._transmit_from_storage()
             self.assertEqual(post.call_count, _MAX_CONSECUTIVE_REDIRECTS)
@@ -738,7 +843,7 @@ class TestTransportMixin(unittest.TestCase):
         mixin.options = Options()
         mixin._consecutive_redirects = 0
         mixin.options.endpoint = "https://example.com"
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(307, '{}', {"location": "https://example.com"})  # noqa: E501
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(result, TransportStatusCode.DROP)
@@ -750,7 +855,7 @@ class TestTransportMixin(unittest.TestCase):
         mixin.options = Options()
         mixin._consecutive_redirects = 0
         mixin.options.endpoint = "test.endpoint"
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(307, '{}', {"location": "https://example.com"})  # noqa: E501
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -765,7 +870,7 @@ class TestTransportMixin(unittest.TestCase):
         with LocalFileStorage(os.path.join(TEST_FOLDER, self.id())) as stor:
             mixin.storage = stor
             mixin.storage.put([1, 2, 3])
-            with mock.patch('requests.post') as post:
+            with mock.patch('requests.Session.post') as post:
                 post.return_value = MockResponse(439, '{}')
                 mixin._transmit_from_storage()
             self.assertEqual(len(os.listdir(mixin.storage.path)), 0)
@@ -773,7 +878,7 @@ class TestTransportMixin(unittest.TestCase):
     def test_statsbeat_439(self):
         mixin = TransportMixin()
         mixin.options = Options()
-        with mock.patch('requests.post') as post:
+        with mock.patch('requests.Session.post') as post:
             post.return_value = MockResponse(439, 'unknown')
             result = mixin._transmit([1, 2, 3])
             self.assertEqual(len(_requests_map), 3)
@@ -781,3 +886,84 @@ class TestTransportMixin(unittest.TestCase):
             self.assertEqual(_requests_map['throttle'][439], 1)
             self.assertEqual(_requests_map['count'], 1)
             self.assertEqual(result, TransportStatusCode.DROP)
+
+    def test_throttle_shared(self):
+        mixin = TransportMixin()
+        mixin.options = Options(instrumentation_key='a')
+        other = TransportMixin()
+        other.options = Options(instrumentation_key='a')
+        with mock.patch('requests.Session.post') as post:
+            post.return_value = MockResponse(
+                429, 'unknown', {'Retry-After': '30'})
+            self.assertEqual(mixin._transmit([1]), TransportStatusCode.RETRY)
+            post.return_value = MockResponse(200, 'unknown')
+            self.assertEqual(other._transmit([1]), TransportStatusCode.RETRY)
+            self.assertEqual(post.call_count, 1)
+            # Other instrumentation keys are not throttled
+            other.options.instrumentation_key = 'b'
+            self.assertEqual(other._transmit([1]), TransportStatusCode.SUCCESS)
+            with mock.patch('time.time', return_value=time.time() + 31):
+                self.assertEqual(mixin._transmit([1]),
+                                 TransportStatusCode.SUCCESS)
+            self.assertEqual(_throttled_until, {})
+
+    def test_throttle_quota(self):
+        mixin = TransportMixin()
+        mixin.options = Options(minimum_retry_interval=100)
+        with mock.patch('requests.Session.post') as post:
+            post.return_value = MockResponse(439, 'unknown')
+            self.assertEqual(mixin._transmit([1]), TransportStatusCode.DROP)
+            self.assertAlmostEqual(
+                _throttled_until[None], time.time() + 100, delta=1)
+            self.assertEqual(mixin._transmit([1]), TransportStatusCode.RETRY)
+            self.assertEqual(post.call_count, 1)
+        mixin._is_stats = True
+        with mock.patch('requests.Session.post') as post:
+            post.return_value = MockResponse(200, 'unknown')
+            self.assertEqual(mixin._transmit([1]), TransportStatusCode.SUCCESS)
+
+    def test_transmission_export_policy_retry(self):
+        mixin = TransportMixin()
+        sleep = mock.Mock()
+        mixin.options = Options(
+            export_policy=retry.ExportPolicy(max_retries=2, sleep=sleep))
+        with mock.patch('requests.Session.post') as post:
+            post.side_effect = [
+                MockResponse(503, 'unknown'),
+                MockResponse(200, 'unknown'),
+            ]
+            result = mixin._transmit([1, 2, 3])
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(result, TransportStatusCode.SUCCESS)
+
+        with mock.patch('requests.Session.post') as post:
+            post.return_value = MockResponse(503, 'unknown')
+            result = mixin._transmit([1, 2, 3])
+        self.assertEqual(post.call_count, 3)
+        self.assertEqual(result, TransportStatusCode.RETRY)
+
+    def test_transmission_export_policy_circuit_open(self):
+        mixin = TransportMixin()
+        breaker = retry.CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        mixin.options = Options(
+            export_policy=retry.ExportPolicy(circuit_breaker=breaker))
+        with mock.patch('requests.Session.post') as post:
+            result = mixin._transmit([1, 2, 3])
+        post.assert_not_called()
+        self.assertEqual(result, TransportStatusCode.RETRY)
+
+    def test_transmission_compression(self):
+        mixin = TransportMixin()
+        mixin.options = Options(compression='gzip')
+        envelopes = [{'name': 'envelope{}'.format(ii)} for ii in range(100)]
+        with mock.patch('requests.Session.post') as post:
+            post.return_value = MockResponse(200, 'unknown')
+            result = mixin._transmit(envelopes)
+        kwargs = post.call_args[1]
+        self.assertEqual(kwargs['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            json.loads(zlib.decompress(kwargs['data'], 16 + zlib.MAX_WBITS)),
+            envelopes)
+        self.assertEqual(result, TransportStatusCode.SUCCESS)
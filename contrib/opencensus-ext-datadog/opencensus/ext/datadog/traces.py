@@ -12,15 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import codecs
-from collections import defaultdict
 from datetime import datetime
 
 import bitarray
+import six
 
 from opencensus.common.transports import sync
-from opencensus.common.utils import ISO_DATETIME_REGEX
+from opencensus.common.utils import (
+    ISO_DATETIME_REGEX,
+    check_str_length,
+    get_truncatable_str,
+)
 from opencensus.ext.datadog.transport import DDTransport
-from opencensus.trace import base_exporter, span_data
+from opencensus.trace import base_exporter
+from opencensus.trace.span_batch import SpanBatch
 
 
 class Options(object):
@@ -42,10 +47,28 @@ class Options(object):
     :type global_tags: dict
     :param global_tags: global_tags is a set of tags that will be
     applied to all exported spans.
+
+    :type export_policy:
+        :class:`~opencensus.common.transports.retry.ExportPolicy`
+    :param export_policy: (Optional) Policy retrying failed requests to the
+    Datadog Trace Agent. By default failed requests aren't retried.
+
+    :type http_client: :class:`~opencensus.common.transports.http.HttpClient`
+    :param http_client: (Optional) Client sending the requests to the
+    Datadog Trace Agent, defaults to the client shared by the exporters.
+
+    :type compression: str
+    :param compression: compression compresses requests reaching the
+    compression threshold of the client with 'gzip' or 'deflate'. Requests
+    aren't compressed by default.
     """
     def __init__(self, service='', trace_addr='localhost:8126',
-                 global_tags={}):
+                 global_tags={}, export_policy=None, http_client=None,
+                 compression=None):
         self._service = service
+        self._compression = compression
+        self._export_policy = export_policy
+        self._http_client = http_client
         self._trace_addr = trace_addr
         for k, v in global_tags.items():
             if not isinstance(k, str) or not isinstance(v, str):
@@ -71,6 +94,24 @@ class Options(object):
         """
         return self._global_tags
 
+    @property
+    def export_policy(self):
+        """ Specifies the policy retrying failed requests.
+        """
+        return self._export_policy
+
+    @property
+    def http_client(self):
+        """ Specifies the client sending the requests.
+        """
+        return self._http_client
+
+    @property
+    def compression(self):
+        """ Specifies the compression of the requests.
+        """
+        return self._compression
+
 
 class DatadogTraceExporter(base_exporter.Exporter):
     """ A exporter that send traces and trace spans to Datadog.
@@ -87,7 +128,11 @@ class DatadogTraceExporter(base_exporter.Exporter):
     def __init__(self, options, transport=sync.SyncTransport):
         self._options = options
         self._transport = transport(self)
-        self._dd_transport = DDTransport(options.trace_addr)
+        self._dd_transport = DDTransport(
+            options.trace_addr,
+            export_policy=options.export_policy,
+            http_client=options.http_client,
+            compression=options.compression)
 
     @property
     def transport(self):
@@ -115,24 +160,105 @@ class DatadogTraceExporter(base_exporter.Exporter):
     def emit(self, span_datas):
         """
         :type span_datas: list of :class:
-            `~opencensus.trace.span_data.SpanData`
+            `~opencensus.trace.span_data.SpanData` or :class:
+            `~opencensus.trace.span_batch.SpanBatch`
         :param list of opencensus.trace.span_data.SpanData span_datas:
             SpanData tuples to emit
         """
-        # Map each span data to it's corresponding trace id
-        trace_span_map = defaultdict(list)
-        for sd in span_datas:
-            trace_span_map[sd.context.trace_id] += [sd]
-
-        dd_spans = []
-        # Write spans to Datadog
-        for _, sds in trace_span_map.items():
-            # convert to the legacy trace json for easier refactoring
-            trace = span_data.format_legacy_trace_json(sds)
-            dd_spans.append(self.translate_to_datadog(trace))
+        export_policy = self.options.export_policy
+        if export_policy is not None and export_policy.circuit_open:
+            return
+
+        batch = SpanBatch.from_span_datas(span_datas)
+        batch_meta = batch.convert_attributes(_attribute_to_meta)
+
+        # Write spans to Datadog, grouped by trace id
+        dd_spans = [
+            self.translate_batch_to_datadog(batch, indexes, batch_meta)
+            for indexes in batch.group_by_trace().values()
+        ]
 
         self._dd_transport.send_traces(dd_spans)
 
+    def translate_batch_to_datadog(self, batch, indexes, batch_meta=None):
+        """Translate the spans of a trace to Datadog format.
+
+        :type batch: :class:`~opencensus.trace.span_batch.SpanBatch`
+        :param batch: The batch of spans.
+
+        :type indexes: list of int
+        :param indexes: The indexes of the spans of a trace in the batch.
+
+        :type batch_meta: list
+        :param batch_meta: (Optional) The attributes of the spans of the
+                           batch converted to meta, to convert them once
+                           for all the traces of the batch.
+
+        :rtype: list
+        :returns: Spans in Datadog Trace format.
+        """
+        trace_id = convert_id(batch.trace_ids[indexes[0]][8:])
+        start_timestamps_mus = batch.start_microseconds
+        end_timestamps_mus = batch.end_microseconds
+        if batch_meta is None:
+            batch_meta = batch.convert_attributes(_attribute_to_meta)
+
+        dd_trace = []
+        for ii in indexes:
+            # Set meta at the end.
+            meta = self.options.global_tags.copy()
+
+            start_mus = int(round(start_timestamps_mus[ii]))
+            end_mus = int(round(end_timestamps_mus[ii]))
+            dd_span = {
+                'span_id': convert_id(batch.span_ids[ii]),
+                'trace_id': trace_id,
+                'name': "opencensus",
+                'service': self.options.service,
+                'resource': get_truncatable_str(batch.names[ii])['value'],
+                # The start time of the request in nanoseconds from the
+                # unix epoch.
+                'start': start_mus * 1000,
+                # The duration of the request in nanoseconds.
+                'duration': (end_mus - start_mus) * 1000,
+            }
+
+            if batch.parent_span_ids[ii] is not None:
+                dd_span['parent_id'] = convert_id(batch.parent_span_ids[ii])
+
+            status = batch.statuses[ii]
+            status_code = status.canonical_code if status is not None else 0
+            status_message = status.description if status is not None \
+                else None
+            code = STATUS_CODES.get(status_code)
+            if code is None:
+                code = {}
+                code["message"] = "ERR_CODE_" + str(status_code)
+                code["status"] = 500
+
+            # opencensus.trace.span.SpanKind
+            dd_span['type'] = to_dd_type(batch.span_kinds[ii])
+            dd_span["error"] = 0
+            if 4 <= code.get("status") // 100 <= 5:
+                dd_span["error"] = 1
+                meta["error.type"] = code.get("message")
+
+                if status_message is not None:
+                    meta["error.msg"] = status_message
+
+            meta["opencensus.status_code"] = str(code.get("status"))
+            meta["opencensus.status"] = code.get("message")
+
+            if status_message is not None:
+                meta["opencensus.status_description"] = status_message
+
+            meta.update(batch_meta[ii])
+
+            dd_span["meta"] = meta
+            dd_trace.append(dd_span)
+
+        return dd_trace
+
     def translate_to_datadog(self, trace):
         """Translate the spans json to Datadog format.
 
@@ -228,6 +354,19 @@ def atts_to_metadata(atts, meta={}):
     return meta
 
 
+def _attribute_to_meta(key, value):
+    """Convert an attribute to a Datadog meta ``(key, value)`` tuple."""
+    if isinstance(value, six.string_types):
+        value = get_truncatable_str(value)['value']
+    elif isinstance(value, (bool, int, float)):
+        value = str(value)
+    else:
+        return None
+    if value == "":
+        return None
+    return check_str_length(key)[0], value
+
+
 def value_from_atts_elem(elem):
     """ value_from_atts_elem takes an attribute element and retuns a string value
 
@@ -1,7 +1,12 @@
+import logging
 import platform
 
 import requests
 
+from opencensus.common.transports import http, retry
+
+logger = logging.getLogger(__name__)
+
 
 class DDTransport(object):
     """ DDTransport contains all the logic for sending Traces to Datadog
@@ -9,9 +14,28 @@ class DDTransport(object):
     :type trace_addr: str
     :param trace_addr: trace_addr specifies the host[:port] address of the
     Datadog Trace Agent.
+
+    :type export_policy:
+        :class:`~opencensus.common.transports.retry.ExportPolicy`
+    :param export_policy: (Optional) Policy retrying failed requests and
+    dropping traces while the agent is unavailable.
+
+    :type http_client: :class:`~opencensus.common.transports.http.HttpClient`
+    :param http_client: (Optional) Client sending the requests, defaults to
+    the client shared by the exporters.
+
+    :type compression: str
+    :param compression: (Optional) Compress requests reaching the
+    compression threshold of the client with 'gzip' or 'deflate'.
     """
-    def __init__(self, trace_addr):
+    def __init__(self, trace_addr, export_policy=None, http_client=None,
+                 compression=None):
         self._trace_addr = trace_addr
+        self._compression = compression
+        self._export_policy = export_policy
+        if http_client is None:
+            http_client = http.get_client()
+        self._http_client = http_client
 
         self._headers = {
             "Datadog-Meta-Lang": "python",
@@ -40,7 +64,32 @@ class DDTransport(object):
         :type trace: dic
         :param trace: Trace dictionary
         """
+        if self._export_policy is None:
+            self._post(trace)
+            return
+
+        try:
+            self._export_policy.call(self._post_with_retry, trace)
+        except retry.CircuitOpenError:
+            logger.debug('Datadog agent unavailable, dropping traces.')
+        except retry.RetryableError as e:
+            logger.warning('Failed to send traces to Datadog: %s', e)
+
+    def _post(self, trace):
+        return self._http_client.post(
+            "http://" + self.trace_addr + "/v0.4/traces",
+            data=http.iter_json(trace),
+            headers=self.headers,
+            compression=self._compression)
 
-        requests.post("http://" + self.trace_addr + "/v0.4/traces",
-                      json=trace,
-                      headers=self.headers)
+    def _post_with_retry(self, trace):
+        try:
+            result = self._post(trace)
+        except requests.RequestException as e:
+            raise retry.RetryableError(e)
+        if retry.is_retryable_status(result.status_code):
+            raise retry.RetryableError(
+                'Datadog agent responded {}'.format(result.status_code),
+                retry_after=retry.parse_retry_after(
+                    result.headers.get('Retry-After')))
+        return result
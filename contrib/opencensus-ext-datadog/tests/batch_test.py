@@ -0,0 +1,117 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+from opencensus.ext.datadog.traces import DatadogTraceExporter, Options
+from opencensus.trace import span_context
+from opencensus.trace import span_data as span_data_module
+from opencensus.trace import status as status_module
+from opencensus.trace.span_batch import SpanBatch
+
+TRACE_IDS = (
+    '6e0c63257de34c92bf9efcd03927272e',
+    'd17b83f89a2cbb08c2fa4469a3e1b9b4',
+)
+
+
+class MockTransport(object):
+    def __init__(self, exporter=None):
+        pass
+
+
+def _span_datas():
+    statuses = (
+        status_module.Status(0),
+        status_module.Status(0, 'OK'),
+        status_module.Status(5, 'missing'),
+        status_module.Status(23),
+    )
+    span_datas = []
+    for ii in range(8):
+        trace_id = TRACE_IDS[ii % 2]
+        span_datas.append(span_data_module.SpanData(
+            name='span{}'.format(ii),
+            context=span_context.SpanContext(trace_id=trace_id),
+            span_id='{:016x}'.format(ii + 1),
+            parent_span_id='{:016x}'.format(ii - 1) if ii > 1 else None,
+            attributes={
+                'http.host': 'host',
+                'component': 'test{}'.format(ii % 3),
+                'count': ii,
+                'flag': ii % 2 == 0,
+                'empty': '',
+            },
+            start_time='2019-09-19T14:05:1{}.000000Z'.format(ii),
+            end_time='2019-09-19T14:05:1{}.500000Z'.format(ii),
+            child_span_count=0,
+            stack_trace=None,
+            annotations=None,
+            message_events=None,
+            links=None,
+            status=statuses[ii % len(statuses)],
+            same_process_as_parent_span=None,
+            span_kind=ii % 3,
+        ))
+    return span_datas
+
+
+class TestTranslateBatch(unittest.TestCase):
+    def setUp(self):
+        self.exporter = DatadogTraceExporter(
+            options=Options(service='dd-unit-test',
+                            global_tags={'env': 'test'}),
+            transport=MockTransport)
+        self.exporter._dd_transport = mock.Mock()
+
+    def test_matches_legacy_translation(self):
+        span_datas = _span_datas()
+        batch = SpanBatch.from_span_datas(span_datas)
+        for trace_id, indexes in batch.group_by_trace().items():
+            trace = span_data_module.format_legacy_trace_json(
+                [sd for sd in span_datas if sd.context.trace_id == trace_id])
+            self.assertEqual(
+                self.exporter.translate_batch_to_datadog(batch, indexes),
+                self.exporter.translate_to_datadog(trace))
+
+    def test_emit_matches_legacy_translation(self):
+        span_datas = _span_datas()
+        self.exporter.emit(span_datas)
+        dd_spans, = self.exporter._dd_transport.send_traces.call_args[0]
+        self.assertEqual(dd_spans, [
+            self.exporter.translate_to_datadog(
+                span_data_module.format_legacy_trace_json(
+                    [sd for sd in span_datas
+                     if sd.context.trace_id == trace_id]))
+            for trace_id in TRACE_IDS
+        ])
+
+    def test_emit_converts_attributes_once(self):
+        with mock.patch.object(
+                SpanBatch, 'convert_attributes', autospec=True,
+                side_effect=SpanBatch.convert_attributes) as convert:
+            self.exporter.emit(_span_datas())
+        convert.assert_called_once()
+        self.assertEqual(
+            len(self.exporter._dd_transport.send_traces.call_args[0][0]),
+            len(TRACE_IDS))
+
+    def test_float_attributes(self):
+        # The legacy translation failed on double values
+        span_data = _span_datas()[0]._replace(attributes={'ratio': 0.5})
+        dd_span, = self.exporter.translate_batch_to_datadog(
+            SpanBatch.from_span_datas([span_data]), [0])
+        self.assertEqual(dd_span['meta']['ratio'], '0.5')
@@ -2,17 +2,16 @@ import logging
 
 import gevent.monkey
 
+from opencensus.ext.gevent import runtime_context
+
 
 def patch_opencensus(event):
     # Switch from the default runtime context using ContextVar to one
-    # using thread locals. Needed until gevent supports ContextVar.
+    # stored on greenlets, which also passes the context on to spawned
+    # greenlets. Needed until gevent supports ContextVar.
     # See https://github.com/gevent/gevent/issues/1407
-    import opencensus.common.runtime_context as runtime_context
-
     if not gevent.monkey.is_module_patched("contextvars"):
-        runtime_context.RuntimeContext = (
-            runtime_context._ThreadLocalRuntimeContext()
-        )
+        runtime_context.install()
 
         logging.warning("OpenCensus patched for gevent compatibility")
     else:
@@ -0,0 +1,79 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import gevent
+from greenlet import getcurrent
+
+from opencensus.common import runtime_context
+
+# Name of the greenlet attribute holding the runtime context.
+_CONTEXT_ATTR = '_opencensus_context'
+
+
+class GreenletRuntimeContext(runtime_context._RuntimeContext):
+    """Runtime context stored on the current greenlet.
+
+    Greenlets started by gevent begin with a snapshot of the context of the
+    greenlet starting them, shared until either of them sets a slot.
+    """
+
+    _lock = threading.Lock()
+    _slots = {}
+    _context_type = None
+
+    @classmethod
+    def _get_context(cls):
+        return getattr(getcurrent(), _CONTEXT_ATTR, None)
+
+    @classmethod
+    def _set_context(cls, context):
+        setattr(getcurrent(), _CONTEXT_ATTR, context)
+
+    @classmethod
+    def current(cls):
+        context = getattr(getcurrent(), _CONTEXT_ATTR, None)
+        if type(context) is not cls._context_type:
+            context = cls._init_context(context)
+        return context
+
+    @classmethod
+    def inherit_context(cls, greenlet):
+        """Give a greenlet a snapshot of the current context, used as
+        gevent spawn callback."""
+        setattr(greenlet, _CONTEXT_ATTR, cls.snapshot())
+
+
+def install():
+    """Replace the default runtime context with the greenlet runtime
+    context.
+
+    Slots registered before are moved to the greenlet runtime context, but
+    modules importing ``RuntimeContext`` later get the new one, so this
+    should run before OpenCensus is used, e.g. when gevent patches the
+    standard library.
+
+    :rtype: :class:`GreenletRuntimeContext`
+    :returns: The installed runtime context.
+    """
+    previous = runtime_context.RuntimeContext
+    if isinstance(previous, GreenletRuntimeContext):
+        return previous
+
+    context = GreenletRuntimeContext()
+    context.adopt_slots(previous)
+    runtime_context.RuntimeContext = context
+    gevent.Greenlet.add_spawn_callback(context.inherit_context)
+    return context
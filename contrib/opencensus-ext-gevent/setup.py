@@ -42,7 +42,7 @@ setup(
     long_description=open('README.rst').read(),
     install_requires=[
         'opencensus >= 0.9.dev0, < 1.0.0',
-        'gevent >= 1.3'
+        'gevent >= 1.4'
     ],
     extras_require={},
     license='Apache-2.0',
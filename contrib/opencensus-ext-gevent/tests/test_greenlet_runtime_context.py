@@ -0,0 +1,131 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import gevent
+import gevent.pool
+import mock
+
+from opencensus.common import runtime_context as common_runtime_context
+from opencensus.ext.gevent import geventcompatibility, runtime_context
+
+
+class _TestRuntimeContext(runtime_context.GreenletRuntimeContext):
+    _lock = threading.Lock()
+    _slots = {}
+    _context_type = None
+
+
+class TestGreenletRuntimeContext(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.context = _TestRuntimeContext()
+        cls.slot = cls.context.register_slot('span', None)
+
+    def setUp(self):
+        gevent.Greenlet.add_spawn_callback(self.context.inherit_context)
+        self.context.clear()
+
+    def tearDown(self):
+        gevent.Greenlet.remove_spawn_callback(self.context.inherit_context)
+
+    def test_greenlet_local(self):
+        def work(name):
+            self.context.span = name
+            gevent.sleep(0)
+            return self.context.span
+
+        greenlets = [gevent.spawn(work, name) for name in ('a', 'b')]
+        gevent.joinall(greenlets, timeout=5)
+
+        self.assertEqual([g.value for g in greenlets], ['a', 'b'])
+        self.assertIsNone(self.context.span)
+
+    def test_spawn_inherits_context(self):
+        self.context.span = 'parent'
+        pool = gevent.pool.Pool(2)
+        greenlet = pool.spawn(lambda: self.context.span)
+        # The context is captured when the greenlet is spawned.
+        self.context.span = 'other'
+        pool.join(timeout=5)
+
+        self.assertEqual(greenlet.value, 'parent')
+        self.assertEqual(self.context.span, 'other')
+
+    def test_spawned_greenlet_copies_on_write(self):
+        self.context.span = 'parent'
+        snapshot = self.context.snapshot()
+
+        def work():
+            self.assertIs(self.context.snapshot(), snapshot)
+            self.context.span = 'child'
+
+        gevent.spawn(work).join(timeout=5)
+
+        self.assertEqual(self.context.span, 'parent')
+
+
+class _PreviousRuntimeContext(
+        common_runtime_context._ThreadLocalRuntimeContext):
+    _lock = threading.Lock()
+    _slots = {}
+    _context_type = None
+    _thread_local = common_runtime_context._ThreadLocalRuntimeContext \
+        ._ThreadLocal()
+
+
+class TestInstall(unittest.TestCase):
+
+    def test_install(self):
+        # A fresh backend, the slot isn't registered with the process-wide
+        # one.
+        previous = _PreviousRuntimeContext()
+        with mock.patch.object(common_runtime_context, 'RuntimeContext',
+                               previous), \
+                mock.patch.object(runtime_context, 'GreenletRuntimeContext',
+                                  _TestRuntimeContext):
+            slot = previous.register_slot('adopted', None)
+            slot.set('value')
+
+            context = runtime_context.install()
+            self.addCleanup(gevent.Greenlet.remove_spawn_callback,
+                            context.inherit_context)
+
+            self.assertIs(common_runtime_context.RuntimeContext, context)
+            self.assertIs(runtime_context.install(), context)
+
+        self.assertIsInstance(context, _TestRuntimeContext)
+        self.assertEqual(context.adopted, 'value')
+        # The greenlet gets its own copy of the context.
+        gevent.spawn(slot.set, 'greenlet').join(timeout=5)
+        self.assertEqual(slot.get(), 'value')
+
+
+class TestPatchOpencensus(unittest.TestCase):
+
+    @mock.patch('gevent.monkey.is_module_patched', return_value=False)
+    @mock.patch.object(runtime_context, 'install')
+    def test_patch(self, mock_install, mock_is_module_patched):
+        geventcompatibility.patch_opencensus(mock.Mock())
+        mock_is_module_patched.assert_called_once_with('contextvars')
+        mock_install.assert_called_once_with()
+
+    @mock.patch('gevent.monkey.is_module_patched', return_value=True)
+    @mock.patch.object(runtime_context, 'install')
+    def test_contextvars_patched(self, mock_install, mock_is_module_patched):
+        geventcompatibility.patch_opencensus(mock.Mock())
+        mock_install.assert_not_called()
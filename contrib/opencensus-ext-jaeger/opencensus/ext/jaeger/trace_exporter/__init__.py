@@ -25,6 +25,7 @@ from opencensus.common.utils import timestamp_to_microseconds
 from opencensus.ext.jaeger.trace_exporter.gen.jaeger import agent, jaeger
 from opencensus.trace import base_exporter
 from opencensus.trace import link as link_module
+from opencensus.trace.span_batch import SpanBatch
 
 DEFAULT_HOST_NAME = 'localhost'
 DEFAULT_AGENT_PORT = 6831
@@ -160,26 +161,32 @@ class JaegerExporter(base_exporter.Exporter):
         """Translate the spans to Jaeger format.
 
         :type span_datas: list of :class:
-            `~opencensus.trace.span_data.SpanData`
+            `~opencensus.trace.span_data.SpanData` or :class:
+            `~opencensus.trace.span_batch.SpanBatch`
         :param span_datas:
             SpanData tuples to emit
         """
 
-        top_span = span_datas[0]
+        batch = SpanBatch.from_span_datas(span_datas)
+
+        top_context = batch.contexts[0]
+        trace_id = top_context.trace_id if top_context is not None else None
+        trace_id_high = _convert_hex_str_to_int(trace_id[0:16])
+        trace_id_low = _convert_hex_str_to_int(trace_id[16:32])
 
-        trace_id = top_span.context.trace_id if top_span.context is not None \
-            else None
+        start_timestamps_ms = batch.start_microseconds
+        end_timestamps_ms = batch.end_microseconds
+        batch_tags = batch.convert_attributes(_convert_attribute_to_tag)
 
         jaeger_spans = []
 
-        for span in span_datas:
-            start_timestamp_ms = timestamp_to_microseconds(span.start_time)
-            end_timestamp_ms = timestamp_to_microseconds(span.end_time)
-            duration_ms = end_timestamp_ms - start_timestamp_ms
+        for ii in range(len(batch)):
+            start_timestamp_ms = start_timestamps_ms[ii]
+            duration_ms = end_timestamps_ms[ii] - start_timestamp_ms
 
-            tags = _extract_tags(span.attributes)
+            tags = batch_tags[ii]
 
-            status = span.status
+            status = batch.statuses[ii]
             if status is not None:
                 tags.append(jaeger.Tag(
                     key='status.code',
@@ -191,22 +198,22 @@ class JaegerExporter(base_exporter.Exporter):
                     vType=jaeger.TagType.STRING,
                     vStr=status.description))
 
-            refs = _extract_refs_from_span(span)
-            logs = _extract_logs_from_span(span)
+            refs = _extract_refs(batch.links[ii])
+            logs = _extract_logs(batch.annotations[ii])
 
-            context = span.context
+            context = batch.contexts[ii]
             flags = None
             if context is not None:
                 flags = int(context.trace_options.trace_options_byte)
 
-            span_id = span.span_id
-            parent_span_id = span.parent_span_id
+            span_id = batch.span_ids[ii]
+            parent_span_id = batch.parent_span_ids[ii]
 
             jaeger_span = jaeger.Span(
-                traceIdHigh=_convert_hex_str_to_int(trace_id[0:16]),
-                traceIdLow=_convert_hex_str_to_int(trace_id[16:32]),
+                traceIdHigh=trace_id_high,
+                traceIdLow=trace_id_low,
                 spanId=_convert_hex_str_to_int(span_id),
-                operationName=span.name,
+                operationName=batch.names[ii],
                 startTime=int(round(start_timestamp_ms)),
                 duration=int(round(duration_ms)),
                 tags=tags,
@@ -220,12 +227,12 @@ class JaegerExporter(base_exporter.Exporter):
         return jaeger_spans
 
 
-def _extract_refs_from_span(span):
-    if span.links is None:
+def _extract_refs(links):
+    if links is None:
         return None
 
     refs = []
-    for link in span.links:
+    for link in links:
         trace_id = link.trace_id
         refs.append(jaeger.SpanRef(
             refType=_convert_reftype_to_jaeger_reftype(link.type),
@@ -258,13 +265,13 @@ def _convert_hex_str_to_int(val):
     return hex_num
 
 
-def _extract_logs_from_span(span):
-    if span.annotations is None:
+def _extract_logs(annotations):
+    if annotations is None:
         return None
 
     logs = []
 
-    for annotation in span.annotations:
+    for annotation in annotations:
         fields = []
         if annotation.attributes is not None:
             fields = _extract_tags(annotation.attributes.attributes)
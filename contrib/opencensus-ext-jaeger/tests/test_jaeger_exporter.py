@@ -26,6 +26,7 @@ from opencensus.trace import (
     status,
     time_event,
 )
+from opencensus.trace.span_batch import SpanBatch
 
 
 class TestJaegerExporter(unittest.TestCase):
@@ -449,6 +450,12 @@ class TestJaegerExporter(unittest.TestCase):
 
         self.assertEqual(spans_json[2], expected_spans_json[2])
 
+        # Translating a columnar span batch gives the same spans.
+        self.assertEqual(
+            exporter.translate_to_jaeger(SpanBatch.from_span_datas(
+                span_datas)),
+            spans)
+
     def test_convert_hex_str_to_int(self):
         invalid_id = '990c63257de34c92'
         trace_exporter._convert_hex_str_to_int(invalid_id)
@@ -17,7 +17,7 @@ from threading import Lock
 
 import grpc
 
-from opencensus.common.transports import sync
+from opencensus.common.transports import retry, sync
 from opencensus.ext.ocagent import utils as ocagent_utils
 from opencensus.ext.ocagent.trace_exporter import utils
 from opencensus.proto.agent.trace.v1 import (
@@ -25,6 +25,7 @@ from opencensus.proto.agent.trace.v1 import (
     trace_service_pb2_grpc,
 )
 from opencensus.trace import base_exporter
+from opencensus.trace.span_batch import SpanBatch
 
 # Default agent endpoint
 DEFAULT_ENDPOINT = 'localhost:55678'
@@ -32,6 +33,14 @@ DEFAULT_ENDPOINT = 'localhost:55678'
 # OCAgent exporter version
 EXPORTER_VERSION = '0.0.1'
 
+# gRPC status codes of transient failures, worth retrying.
+RETRYABLE_STATUS_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.ABORTED,
+)
+
 
 class TraceExporter(base_exporter.Exporter):
     """Export the spans by sending them to opencensus agent.
@@ -54,6 +63,12 @@ class TraceExporter(base_exporter.Exporter):
                       and implement :meth:`.Transport.export`. Defaults to
                       :class:`.SyncTransport`. The other option is
                       :class:`.AsyncTransport`.
+
+    :type export_policy:
+        :class:`~opencensus.common.transports.retry.ExportPolicy`
+    :param export_policy: (Optional) Policy retrying failed exports and
+                          dropping spans while the agent is unavailable.
+                          By default failed exports aren't retried.
     """
 
     def __init__(
@@ -62,8 +77,10 @@ class TraceExporter(base_exporter.Exporter):
             host_name=None,
             endpoint=None,
             client=None,
-            transport=sync.SyncTransport):
+            transport=sync.SyncTransport,
+            export_policy=None):
         self.transport = transport(self)
+        self.export_policy = export_policy
         self.endpoint = DEFAULT_ENDPOINT if endpoint is None else endpoint
 
         if client is None:
@@ -84,22 +101,41 @@ class TraceExporter(base_exporter.Exporter):
             SpanData tuples to emit
         """
 
-        try:
+        if self.export_policy is None:
+            try:
+                self._export(span_datas)
+            except grpc.RpcError:
+                pass
+            return
 
-            # TODO: keep the stream alive.
-            # The stream is terminated after iteration completes.
-            # To keep it alive, we can enqueue proto spans here
-            # and asyncronously read them and send to the agent.
-            responses = self.client.Export(
-                self.generate_span_requests(span_datas))
+        if self.export_policy.circuit_open:
+            return
+        try:
+            self.export_policy.call(self._export_with_retry, span_datas)
+        except (retry.RetryableError, grpc.RpcError):
+            pass
 
-            # read response
-            for _ in responses:
-                pass
+    def _export(self, span_datas):
+        # TODO: keep the stream alive.
+        # The stream is terminated after iteration completes.
+        # To keep it alive, we can enqueue proto spans here
+        # and asyncronously read them and send to the agent.
+        responses = self.client.Export(
+            self.generate_span_requests(span_datas))
 
-        except grpc.RpcError:
+        # read response
+        for _ in responses:
             pass
 
+    def _export_with_retry(self, span_datas):
+        try:
+            self._export(span_datas)
+        except grpc.RpcError as e:
+            code = getattr(e, 'code', None)
+            if code is not None and code() in RETRYABLE_STATUS_CODES:
+                raise retry.RetryableError(e)
+            raise
+
     def export(self, span_datas):
         """Export the trace.
         Send trace to transport, and transport will call exporter.emit()
@@ -117,7 +153,8 @@ class TraceExporter(base_exporter.Exporter):
         """Span request generator.
 
         :type span_datas: list of
-                         :class:`~opencensus.trace.span_data.SpanData`
+                         :class:`~opencensus.trace.span_data.SpanData` or
+                         :class:`~opencensus.trace.span_batch.SpanBatch`
         :param span_datas: SpanData tuples to convert to protobuf spans
                            and send to opensensusd agent
 
@@ -126,10 +163,8 @@ class TraceExporter(base_exporter.Exporter):
         :returns: List of span export requests.
         """
 
-        pb_spans = [
-            utils.translate_to_trace_proto(span_data)
-            for span_data in span_datas
-        ]
+        pb_spans = utils.translate_batch_to_trace_protos(
+            SpanBatch.from_span_datas(span_datas))
 
         # TODO: send node once per channel
         yield trace_service_pb2.ExportTraceServiceRequest(
@@ -14,6 +14,7 @@
 
 """Translates opencensus span data to trace proto"""
 
+from google.protobuf.timestamp_pb2 import Timestamp
 from google.protobuf.wrappers_pb2 import BoolValue, UInt32Value
 
 from opencensus.ext.ocagent import utils as ocagent_utils
@@ -64,23 +65,117 @@ def translate_to_trace_proto(span_data):
                 attribute_key,
                 attribute_value)
 
+    _add_proto_span_events(
+        pb_span,
+        span_data.annotations,
+        span_data.message_events,
+        span_data.links,
+        span_data.context.tracestate)
+
+    return pb_span
+
+
+def translate_batch_to_trace_protos(batch):
+    """Translates a batch of opencensus spans to ocagent proto spans.
+
+    Distinct trace ids and attributes are converted once per batch.
+
+    :type batch: :class:`~opencensus.trace.span_batch.SpanBatch`
+    :param batch: The spans to convert to protobuf spans
+
+    :rtype: list of :class:`~opencensus.proto.trace.Span`
+    :returns: Protobuf format spans.
+    """
+    trace_ids = {}
+    start_timestamps = batch.start_microseconds
+    end_timestamps = batch.end_microseconds
+    batch_attributes = batch.convert_attributes(_to_proto_attribute_value)
+
+    pb_spans = []
+    for ii in range(len(batch)):
+        trace_id = batch.trace_ids[ii]
+        pb_trace_id = trace_ids.get(trace_id)
+        if pb_trace_id is None:
+            pb_trace_id = trace_ids[trace_id] = hex_str_to_bytes_str(trace_id)
+
+        parent_span_id = batch.parent_span_ids[ii]
+        status = batch.statuses[ii]
+        same_process_as_parent_span = batch.same_process_as_parent_spans[ii]
+        child_span_count = batch.child_span_counts[ii]
+
+        pb_span = trace_pb2.Span(
+            name=trace_pb2.TruncatableString(value=batch.names[ii]),
+            kind=batch.span_kinds[ii],
+            trace_id=pb_trace_id,
+            span_id=hex_str_to_bytes_str(batch.span_ids[ii]),
+            parent_span_id=hex_str_to_bytes_str(parent_span_id)
+            if parent_span_id is not None else None,
+            start_time=_proto_ts_from_microseconds(start_timestamps[ii]),
+            end_time=_proto_ts_from_microseconds(end_timestamps[ii]),
+            status=trace_pb2.Status(
+                code=status.canonical_code,
+                message=status.description,
+            )
+            if status is not None else None,
+            same_process_as_parent_span=BoolValue(
+                value=same_process_as_parent_span)
+            if same_process_as_parent_span is not None
+            else None,
+            child_span_count=UInt32Value(value=child_span_count)
+            if child_span_count is not None else None)
+
+        attribute_map = pb_span.attributes.attribute_map
+        for attribute_key, pb_value in batch_attributes[ii]:
+            attribute_map[attribute_key].CopyFrom(pb_value)
+
+        _add_proto_span_events(
+            pb_span,
+            batch.annotations[ii],
+            batch.message_events[ii],
+            batch.links[ii],
+            batch.contexts[ii].tracestate)
+
+        pb_spans.append(pb_span)
+
+    return pb_spans
+
+
+def _proto_ts_from_microseconds(timestamp_mus):
+    ts = Timestamp()
+    if timestamp_mus is not None:
+        ts.FromMicroseconds(int(timestamp_mus))
+    return ts
+
+
+def _to_proto_attribute_value(attribute_key, attribute_value):
+    pb_attributes = trace_pb2.Span.Attributes()
+    add_proto_attribute_value(pb_attributes, attribute_key, attribute_value)
+    return attribute_key, pb_attributes.attribute_map[attribute_key]
+
+
+def _add_proto_span_events(
+        pb_span,
+        annotations,
+        message_events,
+        links,
+        tracestate):
     # annotations
-    if span_data.annotations is not None:
-        for annotation in span_data.annotations:
+    if annotations is not None:
+        for annotation in annotations:
             pb_event = pb_span.time_events.time_event.add()
             pb_event.time.FromJsonString(annotation.timestamp)
             set_proto_annotation(pb_event.annotation, annotation)
 
     # message events
-    if span_data.message_events is not None:
-        for message_event in span_data.message_events:
+    if message_events is not None:
+        for message_event in message_events:
             pb_event = pb_span.time_events.time_event.add()
             pb_event.time.FromJsonString(message_event.timestamp)
             set_proto_message_event(pb_event.message_event, message_event)
 
     # links
-    if span_data.links is not None:
-        for link in span_data.links:
+    if links is not None:
+        for link in links:
             pb_link = pb_span.links.link.add(
                 trace_id=hex_str_to_bytes_str(link.trace_id),
                 span_id=hex_str_to_bytes_str(link.span_id),
@@ -96,12 +191,10 @@ def translate_to_trace_proto(span_data):
                         attribute_value)
 
     # tracestate
-    if span_data.context.tracestate is not None:
-        for (key, value) in span_data.context.tracestate.items():
+    if tracestate is not None:
+        for (key, value) in tracestate.items():
             pb_span.tracestate.entries.add(key=key, value=value)
 
-    return pb_span
-
 
 def set_proto_message_event(
         pb_message_event,
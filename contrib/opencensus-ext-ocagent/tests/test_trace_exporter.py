@@ -20,6 +20,7 @@ import unittest
 import grpc
 import mock
 
+from opencensus.common.transports import retry
 from opencensus.common.version import __version__
 from opencensus.ext.ocagent.trace_exporter import TraceExporter
 from opencensus.proto.trace.v1 import trace_config_pb2
@@ -120,6 +121,26 @@ class TestTraceExporter(unittest.TestCase):
 
         self.assertTrue(client.Export.called)
 
+    def test_emit_retried(self):
+        unavailable = grpc.RpcError()
+        unavailable.code = lambda: grpc.StatusCode.UNAVAILABLE
+        invalid = grpc.RpcError()
+        invalid.code = lambda: grpc.StatusCode.INVALID_ARGUMENT
+        client = mock.Mock()
+        client.Export.side_effect = [unavailable, invalid]
+        sleep = mock.Mock()
+        exporter = TraceExporter(
+            service_name=SERVICE_NAME,
+            client=client,
+            transport=MockTransport,
+            export_policy=retry.ExportPolicy(sleep=sleep))
+
+        # does not throw
+        exporter.emit({})
+
+        self.assertEqual(client.Export.call_count, 2)
+        self.assertEqual(sleep.call_count, 1)
+
     def export_iterate(self, *args, **kwargs):
         self.export_requests = list(args[0])
         return iter(self.export_requests)
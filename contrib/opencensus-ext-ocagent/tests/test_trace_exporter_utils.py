@@ -26,6 +26,7 @@ from opencensus.trace import span_data as span_data_module
 from opencensus.trace import status as status_module
 from opencensus.trace import time_event as time_event_module
 from opencensus.trace import tracestate as tracestate_module
+from opencensus.trace.span_batch import SpanBatch
 
 
 class TestTraceExporterUtils(unittest.TestCase):
@@ -469,6 +470,39 @@ class TestTraceExporterUtils(unittest.TestCase):
         self.assertEqual(pb_span.tracestate.entries[2].key, "k3")
         self.assertEqual(pb_span.tracestate.entries[2].value, "v3")
 
+    def test_translate_batch(self):
+        tracestate = tracestate_module.Tracestate()
+        tracestate.append("k1", "v1")
+
+        span_datas = [
+            span_data_module.SpanData(
+                context=span_context_module.SpanContext(
+                    trace_id='6e0c63257de34c92bf9efcd03927272e',
+                    tracestate=tracestate),
+                span_id='6e0c63257de34c9' + str(ii),
+                start_time='2017-08-15T18:02:26.071158Z',
+                end_time=None if ii == 2 else '2017-08-15T18:02:36.071158Z',
+                span_kind=span_module.SpanKind.CLIENT,
+                same_process_as_parent_span=True,
+                name='span' + str(ii),
+                parent_span_id='6e0c63257de34c90' if ii else None,
+                attributes={'key': 'value', 'index': ii},
+                child_span_count=ii,
+                stack_trace=None,
+                annotations=None,
+                message_events=None,
+                links=None,
+                status=status_module.Status(ii, 'message'))
+            for ii in range(3)
+        ]
+
+        pb_spans = utils.translate_batch_to_trace_protos(
+            SpanBatch.from_span_datas(span_datas))
+
+        self.assertEqual(
+            pb_spans,
+            [utils.translate_to_trace_proto(sd) for sd in span_datas])
+
     def test_add_attribute_value(self):
         pb_span = trace_pb2.Span()
 
@@ -25,7 +25,12 @@ from opencensus.common.monitored_resource import (
 )
 from opencensus.common.transports.async_ import AsyncTransport
 from opencensus.common.version import __version__
-from opencensus.trace import attributes_helper, base_exporter, span_data
+from opencensus.trace import (
+    attributes_helper,
+    base_exporter,
+    span_data,
+    stack_trace,
+)
 from opencensus.trace.attributes import Attributes
 
 # Agent
@@ -188,6 +193,8 @@ class StackdriverExporter(base_exporter.Exporter):
         self.client = client
         self.project_id = client.project
         self.transport = transport(self)
+        # Stack traces are only sent by hash id once they were sent recently
+        self.stack_trace_window = stack_trace.StackTraceWindow()
 
     def emit(self, span_datas):
         """
@@ -208,7 +215,8 @@ class StackdriverExporter(base_exporter.Exporter):
         for _, sds in trace_span_map.items():
             # convert to the legacy trace json for easier refactoring
             # TODO: refactor this to use the span data directly
-            trace = span_data.format_legacy_trace_json(sds)
+            trace = span_data.format_legacy_trace_json(
+                sds, self.stack_trace_window)
             stackdriver_spans.extend(self.translate_to_stackdriver(trace))
 
         self.client.batch_write_spans(project, {'spans': stackdriver_spans})
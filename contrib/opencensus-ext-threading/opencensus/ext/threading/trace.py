@@ -17,8 +17,11 @@ import threading
 from concurrent import futures
 from multiprocessing import pool
 
+from opencensus.common.runtime_context import RuntimeContext
 from opencensus.trace import execution_context, tracer
 from opencensus.trace.propagation import binary_format
+from opencensus.trace.span_context import SpanContext
+from opencensus.trace.trace_options import TraceOptions
 
 log = logging.getLogger(__name__)
 
@@ -90,12 +93,20 @@ def wrap_apply_async(apply_async_func):
     def call(self, func, args=(), kwds={}, **kwargs):
         wrapped_func = wrap_task_func(func)
         _tracer = execution_context.get_opencensus_tracer()
-        propagator = binary_format.BinaryFormatPropagator()
 
         wrapped_kwargs = {}
-        wrapped_kwargs["span_context_binary"] = propagator.to_header(
-            _tracer.span_context
-        )
+        if isinstance(self, pool.ThreadPool):
+            # Thread pools share the memory of the caller, pass the context
+            # by reference rather than serializing it.
+            wrapped_func = RuntimeContext.with_current_context(wrapped_func)
+            wrapped_kwargs["span_context_fields"] = _get_span_context_fields(
+                _tracer.span_context
+            )
+        else:
+            propagator = binary_format.BinaryFormatPropagator()
+            wrapped_kwargs["span_context_binary"] = propagator.to_header(
+                _tracer.span_context
+            )
         wrapped_kwargs["kwds"] = kwds
         wrapped_kwargs["sampler"] = _tracer.sampler
         wrapped_kwargs["exporter"] = _tracer.exporter
@@ -109,16 +120,18 @@ def wrap_apply_async(apply_async_func):
 
 
 def wrap_submit(submit_func):
-    """Wrap the apply_async function of multiprocessing.pools. Get the function
-    that will be called and wrap it then add the opencensus context."""
+    """Wrap the submit function of concurrent.futures.ThreadPoolExecutor.
+    Capture the current runtime context and apply it when the function is
+    called in the worker thread."""
 
     def call(self, func, *args, **kwargs):
-        wrapped_func = wrap_task_func(func)
+        wrapped_func = RuntimeContext.with_current_context(
+            wrap_task_func(func)
+        )
         _tracer = execution_context.get_opencensus_tracer()
-        propagator = binary_format.BinaryFormatPropagator()
 
         wrapped_kwargs = {}
-        wrapped_kwargs["span_context_binary"] = propagator.to_header(
+        wrapped_kwargs["span_context_fields"] = _get_span_context_fields(
             _tracer.span_context
         )
         wrapped_kwargs["kwds"] = kwargs
@@ -131,6 +144,17 @@ def wrap_submit(submit_func):
     return call
 
 
+def _get_span_context_fields(span_context):
+    """Capture the fields of the span context, the tracer of the caller
+    keeps updating its span context after the task is submitted."""
+    return (
+        span_context.trace_id,
+        span_context.span_id,
+        span_context.trace_options.trace_options_byte,
+        span_context.tracestate,
+    )
+
+
 class wrap_task_func(object):
     """Wrap the function given to apply_async to get the tracer from context,
     execute the function then clear the context."""
@@ -141,9 +165,23 @@ class wrap_task_func(object):
     def __call__(self, *args, **kwargs):
         kwds = kwargs.pop("kwds")
 
-        span_context_binary = kwargs.pop("span_context_binary")
-        propagator = binary_format.BinaryFormatPropagator()
-        kwargs["span_context"] = propagator.from_header(span_context_binary)
+        if "span_context_fields" in kwargs:
+            trace_id, span_id, trace_options, tracestate = kwargs.pop(
+                "span_context_fields"
+            )
+            kwargs["span_context"] = SpanContext(
+                trace_id=trace_id,
+                span_id=span_id,
+                trace_options=TraceOptions(trace_options),
+                tracestate=tracestate,
+                from_header=True,
+            )
+        else:
+            span_context_binary = kwargs.pop("span_context_binary")
+            propagator = binary_format.BinaryFormatPropagator()
+            kwargs["span_context"] = propagator.from_header(
+                span_context_binary
+            )
 
         _tracer = tracer.Tracer(**kwargs)
         execution_context.set_opencensus_tracer(_tracer)
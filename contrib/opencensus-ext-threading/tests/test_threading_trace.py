@@ -15,12 +15,12 @@
 import threading
 import unittest
 from concurrent.futures import ThreadPoolExecutor
-from multiprocessing.pool import Pool
+from multiprocessing.pool import Pool, ThreadPool
 
 import mock
 
 from opencensus.ext.threading import trace
-from opencensus.trace import execution_context, tracer
+from opencensus.trace import execution_context, samplers, tracer
 
 
 class Test_threading_trace(unittest.TestCase):
@@ -121,6 +121,40 @@ class Test_threading_trace(unittest.TestCase):
 
         self.assertEqual(result, context.trace_id)
 
+    def test_wrap_thread_pool(self):
+        _tracer = tracer.Tracer()
+        execution_context.set_opencensus_tracer(_tracer)
+
+        trace.trace_integration()
+
+        pool = ThreadPool(processes=1)
+        with _tracer.span(name='span1'):
+            execution_context.set_opencensus_attr('key', 'value')
+            result = pool.apply_async(fake_pooled_func_with_attr).get(
+                timeout=1)
+
+        self.assertEqual(result, (_tracer.span_context.trace_id, 'value'))
+        pool.terminate()
+
+    def test_wrap_futures_context(self):
+        _tracer = tracer.Tracer(
+            sampler=samplers.AlwaysOnSampler(), exporter=mock.Mock())
+        execution_context.set_opencensus_tracer(_tracer)
+
+        trace.trace_integration()
+
+        pool = ThreadPoolExecutor(max_workers=1)
+        with _tracer.span(name='span1') as span:
+            execution_context.set_opencensus_attr('key', 'value')
+            future = pool.submit(fake_pooled_func_with_attr)
+            result = future.result()
+            # The worker gets its own span context, the caller's is
+            # unchanged.
+            self.assertEqual(_tracer.span_context.span_id, span.span_id)
+
+        self.assertEqual(result, (_tracer.span_context.trace_id, 'value'))
+        pool.shutdown()
+
     def fake_threaded_func(self):
         global global_tracer
         global_tracer = execution_context.get_opencensus_tracer()
@@ -131,6 +165,12 @@ def fake_pooled_func():
     return _tracer.span_context.trace_id
 
 
+def fake_pooled_func_with_attr():
+    _tracer = execution_context.get_opencensus_tracer()
+    return (_tracer.span_context.trace_id,
+            execution_context.get_opencensus_attr('key'))
+
+
 class MockTracer(object):
     def __init__(self, span=None):
         self.span = span
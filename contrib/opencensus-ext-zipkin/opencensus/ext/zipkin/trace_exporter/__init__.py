@@ -14,14 +14,14 @@
 
 """Export the spans data to Zipkin Collector."""
 
-import json
 import logging
 
 import requests
 
-from opencensus.common.transports import sync
+from opencensus.common.transports import http, retry, sync
 from opencensus.common.utils import check_str_length, timestamp_to_microseconds
 from opencensus.trace import base_exporter
+from opencensus.trace.span_batch import SpanBatch
 
 DEFAULT_ENDPOINT = '/api/v2/spans'
 DEFAULT_HOST_NAME = 'localhost'
@@ -65,6 +65,21 @@ class ZipkinExporter(base_exporter.Exporter):
                       and implement :meth:`.Transport.export`. Defaults to
                       :class:`.SyncTransport`. The other option is
                       :class:`.AsyncTransport`.
+
+    :type export_policy:
+        :class:`~opencensus.common.transports.retry.ExportPolicy`
+    :param export_policy: (Optional) Policy retrying failed requests and
+                          dropping spans while the server is unavailable.
+                          By default failed requests aren't retried.
+
+    :type http_client: :class:`~opencensus.common.transports.http.HttpClient`
+    :param http_client: (Optional) Client sending the requests, defaults to
+                        the client shared by the exporters.
+
+    :type compression: str
+    :param compression: (Optional) Compress requests reaching the
+                        compression threshold of the client with
+                        ``'gzip'`` or ``'deflate'``.
     """
 
     def __init__(
@@ -76,7 +91,10 @@ class ZipkinExporter(base_exporter.Exporter):
             protocol=DEFAULT_PROTOCOL,
             transport=sync.SyncTransport,
             ipv4=None,
-            ipv6=None):
+            ipv6=None,
+            export_policy=None,
+            http_client=None,
+            compression=None):
         self.service_name = service_name
         self.host_name = host_name
         self.port = port
@@ -86,6 +104,11 @@ class ZipkinExporter(base_exporter.Exporter):
         self.transport = transport(self)
         self.ipv4 = ipv4
         self.ipv6 = ipv6
+        self.export_policy = export_policy
+        if http_client is None:
+            http_client = http.get_client()
+        self.http_client = http_client
+        self.compression = compression
 
     @property
     def get_url(self):
@@ -104,12 +127,17 @@ class ZipkinExporter(base_exporter.Exporter):
             SpanData tuples to emit
         """
 
+        if self.export_policy is not None and self.export_policy.circuit_open:
+            logging.debug("Zipkin server unavailable, dropping spans.")
+            return
+
         try:
             zipkin_spans = self.translate_to_zipkin(span_datas)
-            result = requests.post(
-                url=self.url,
-                data=json.dumps(zipkin_spans),
-                headers=ZIPKIN_HEADERS)
+            if self.export_policy is None:
+                result = self._post(zipkin_spans)
+            else:
+                result = self.export_policy.call(
+                    self._post_with_retry, zipkin_spans)
 
             if result.status_code not in SUCCESS_STATUS_CODE:
                 logging.error(
@@ -118,6 +146,25 @@ class ZipkinExporter(base_exporter.Exporter):
         except Exception as e:  # pragma: NO COVER
             logging.error(getattr(e, 'message', e))
 
+    def _post(self, zipkin_spans):
+        return self.http_client.post(
+            url=self.url,
+            data=http.iter_json(zipkin_spans),
+            headers=ZIPKIN_HEADERS,
+            compression=self.compression)
+
+    def _post_with_retry(self, zipkin_spans):
+        try:
+            result = self._post(zipkin_spans)
+        except requests.RequestException as e:
+            raise retry.RetryableError(e)
+        if retry.is_retryable_status(result.status_code):
+            raise retry.RetryableError(
+                'Zipkin server responded {}'.format(result.status_code),
+                retry_after=retry.parse_retry_after(
+                    result.headers.get('Retry-After')))
+        return result
+
     def export(self, span_datas):
         self.transport.export(span_datas)
 
@@ -125,7 +172,8 @@ class ZipkinExporter(base_exporter.Exporter):
         """Translate the opencensus spans to zipkin spans.
 
         :type span_datas: list of :class:
-            `~opencensus.trace.span_data.SpanData`
+            `~opencensus.trace.span_data.SpanData` or :class:
+            `~opencensus.trace.span_batch.SpanBatch`
         :param span_datas:
             SpanData tuples to emit
 
@@ -144,27 +192,31 @@ class ZipkinExporter(base_exporter.Exporter):
         if self.ipv6 is not None:
             local_endpoint['ipv6'] = self.ipv6
 
+        batch = SpanBatch.from_span_datas(span_datas)
+        # Timestamp in zipkin spans is int of microseconds.
+        start_timestamps_mus = batch.start_microseconds
+        end_timestamps_mus = batch.end_microseconds
+        tags = batch.convert_attributes(_convert_attribute_to_tag)
+
         zipkin_spans = []
 
-        for span in span_datas:
-            # Timestamp in zipkin spans is int of microseconds.
-            start_timestamp_mus = timestamp_to_microseconds(span.start_time)
-            end_timestamp_mus = timestamp_to_microseconds(span.end_time)
-            duration_mus = end_timestamp_mus - start_timestamp_mus
+        for ii in range(len(batch)):
+            start_timestamp_mus = start_timestamps_mus[ii]
+            duration_mus = end_timestamps_mus[ii] - start_timestamp_mus
 
             zipkin_span = {
-                'traceId': span.context.trace_id,
-                'id': str(span.span_id),
-                'name': span.name,
+                'traceId': batch.trace_ids[ii],
+                'id': str(batch.span_ids[ii]),
+                'name': batch.names[ii],
                 'timestamp': int(round(start_timestamp_mus)),
                 'duration': int(round(duration_mus)),
                 'localEndpoint': local_endpoint,
-                'tags': _extract_tags_from_span(span.attributes),
-                'annotations': _extract_annotations_from_span(span),
+                'tags': dict(tags[ii]),
+                'annotations': _extract_annotations(batch.annotations[ii]),
             }
 
-            span_kind = span.span_kind
-            parent_span_id = span.parent_span_id
+            span_kind = batch.span_kinds[ii]
+            parent_span_id = batch.parent_span_ids[ii]
 
             if span_kind is not None:
                 kind = SPAN_KIND_MAP.get(span_kind)
@@ -186,25 +238,32 @@ def _extract_tags_from_span(attr):
         return {}
     tags = {}
     for attribute_key, attribute_value in attr.items():
-        if isinstance(attribute_value, (int, bool, float)):
-            value = str(attribute_value)
-        elif isinstance(attribute_value, str):
-            res, _ = check_str_length(str_to_check=attribute_value)
-            value = res
-        else:
-            logging.warning('Could not serialize tag %s', attribute_key)
-            continue
-        tags[attribute_key] = value
+        tag = _convert_attribute_to_tag(attribute_key, attribute_value)
+        if tag is not None:
+            tags[attribute_key] = tag[1]
     return tags
 
 
-def _extract_annotations_from_span(span):
+def _convert_attribute_to_tag(attribute_key, attribute_value):
+    """Convert an attribute to a zipkin tag ``(key, value)`` tuple."""
+    if isinstance(attribute_value, (int, bool, float)):
+        value = str(attribute_value)
+    elif isinstance(attribute_value, str):
+        res, _ = check_str_length(str_to_check=attribute_value)
+        value = res
+    else:
+        logging.warning('Could not serialize tag %s', attribute_key)
+        return None
+    return attribute_key, value
+
+
+def _extract_annotations(span_annotations):
     """Extract and convert time event annotations to zipkin annotations"""
-    if span.annotations is None:
+    if span_annotations is None:
         return []
 
     annotations = []
-    for annotation in span.annotations:
+    for annotation in span_annotations:
         event_timestamp_mus = timestamp_to_microseconds(annotation.timestamp)
         annotations.append({'timestamp': int(round(event_timestamp_mus)),
                             'value': annotation.description})
@@ -16,11 +16,15 @@ import unittest
 from datetime import datetime
 
 import mock
+import requests
 
+from opencensus.common import json_serializer
+from opencensus.common.transports import retry
 from opencensus.ext.zipkin import trace_exporter
 from opencensus.trace import span_context
 from opencensus.trace import span_data as span_data_module
 from opencensus.trace import time_event
+from opencensus.trace.span_batch import SpanBatch
 
 
 class TestZipkinExporter(unittest.TestCase):
@@ -54,11 +58,9 @@ class TestZipkinExporter(unittest.TestCase):
 
         self.assertTrue(exporter.transport.export_called)
 
-    @mock.patch('requests.post')
+    @mock.patch('requests.Session.post')
     @mock.patch.object(trace_exporter.ZipkinExporter, 'translate_to_zipkin')
     def test_emit_succeeded(self, translate_mock, requests_mock):
-        import json
-
         trace = {'test': 'this_is_for_test'}
 
         exporter = trace_exporter.ZipkinExporter(service_name='my_service')
@@ -70,14 +72,12 @@ class TestZipkinExporter(unittest.TestCase):
 
         requests_mock.assert_called_once_with(
             url=exporter.url,
-            data=json.dumps(trace),
+            data=json_serializer.dumpb(trace),
             headers=trace_exporter.ZIPKIN_HEADERS)
 
-    @mock.patch('requests.post')
+    @mock.patch('requests.Session.post')
     @mock.patch.object(trace_exporter.ZipkinExporter, 'translate_to_zipkin')
     def test_emit_failed(self, translate_mock, requests_mock):
-        import json
-
         trace = {'test': 'this_is_for_test'}
 
         exporter = trace_exporter.ZipkinExporter(service_name='my_service')
@@ -89,9 +89,42 @@ class TestZipkinExporter(unittest.TestCase):
 
         requests_mock.assert_called_once_with(
             url=exporter.url,
-            data=json.dumps(trace),
+            data=json_serializer.dumpb(trace),
             headers=trace_exporter.ZIPKIN_HEADERS)
 
+    @mock.patch('requests.Session.post')
+    @mock.patch.object(trace_exporter.ZipkinExporter, 'translate_to_zipkin')
+    def test_emit_retried(self, translate_mock, requests_mock):
+        translate_mock.return_value = {'test': 'this_is_for_test'}
+        unavailable = mock.Mock(status_code=503,
+                                headers={'Retry-After': '2'})
+        accepted = mock.Mock(status_code=202)
+        requests_mock.side_effect = [
+            requests.ConnectionError(), unavailable, accepted]
+        sleep = mock.Mock()
+        policy = retry.ExportPolicy(initial_backoff=1, jitter=0, sleep=sleep)
+
+        exporter = trace_exporter.ZipkinExporter(
+            service_name='my_service', export_policy=policy)
+        exporter.emit([])
+
+        self.assertEqual(requests_mock.call_count, 3)
+        self.assertEqual(sleep.call_args_list, [mock.call(1), mock.call(2)])
+
+    @mock.patch('requests.Session.post')
+    @mock.patch.object(trace_exporter.ZipkinExporter, 'translate_to_zipkin')
+    def test_emit_circuit_open(self, translate_mock, requests_mock):
+        breaker = retry.CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        policy = retry.ExportPolicy(circuit_breaker=breaker)
+
+        exporter = trace_exporter.ZipkinExporter(
+            service_name='my_service', export_policy=policy)
+        exporter.emit([])
+
+        self.assertFalse(translate_mock.called)
+        self.assertFalse(requests_mock.called)
+
     def test_translate_to_zipkin_span_kind_none(self):
         trace_id = '6e0c63257de34c92bf9efcd03927272e'
         spans_ipv4 = [
@@ -430,6 +463,12 @@ class TestZipkinExporter(unittest.TestCase):
 
         self.assertEqual(zipkin_spans_ipv6, expected_zipkin_spans_ipv6)
 
+        # Test columnar span batch
+        zipkin_spans_batch = exporter_ipv4.translate_to_zipkin(
+            span_datas=SpanBatch.from_span_datas(spans_ipv4))
+
+        self.assertEqual(zipkin_spans_batch, expected_zipkin_spans_ipv4)
+
     def test_ignore_incorrect_spans(self):
         attributes = {'unknown_value': {}}
         self.assertEqual(
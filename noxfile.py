@@ -130,6 +130,7 @@ def lint(session):
         'opencensus/',
         'tests/',
         'examples/',
+        'benchmarks/',
     )
 
 
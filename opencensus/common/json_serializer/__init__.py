@@ -0,0 +1,237 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""JSON serializer used by the exporters.
+
+Uses ``orjson`` or ``ujson`` when installed, and the standard library
+otherwise. The faster serializers produce the same JSON values as
+:func:`json.dumps`, but without the optional whitespace and with non ASCII
+characters encoded in UTF-8 rather than escaped. Objects they can't
+serialize, e.g. integers over 64 bits, are serialized by the standard
+library.
+
+NaN and infinite floats, which JSON doesn't support, are serialized as
+``null`` by all of them.
+"""
+
+import json
+import math
+
+import six
+
+
+def _finite(obj):
+    """Replace the NaN and infinite floats of an object with None."""
+    if isinstance(obj, float):
+        if math.isnan(obj) or math.isinf(obj):
+            return None
+        return obj
+    if isinstance(obj, dict):
+        return dict((key, _finite(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _dumps(obj, default):
+    """Serialize an object with the standard library."""
+    try:
+        return json.dumps(obj, default=default, allow_nan=False)
+    except ValueError:
+        # Serialize NaN and infinite floats as null, like the faster
+        # serializers, rather than as invalid JSON.
+        if default is not None:
+            default = _finite_default(default)
+        return json.dumps(_finite(obj), default=default)
+
+
+def _finite_default(default):
+    def _default(value):
+        return _finite(default(value))
+    return _default
+
+
+class JsonSerializer(object):
+    """Serializer using the standard library :mod:`json` module."""
+
+    name = 'json'
+    # Separator of list items, as in the output of dumps.
+    separator = b', '
+
+    def dumps(self, obj, default=None):
+        """Serialize an object to a JSON string.
+
+        :type obj: object
+        :param obj: The object to serialize.
+
+        :type default: callable
+        :param default: (Optional) Returns a serializable version of the
+                        objects JSON doesn't support, or raises
+                        :class:`TypeError`.
+
+        :rtype: str
+        :returns: The JSON string.
+        """
+        return _dumps(obj, default)
+
+    def dumpb(self, obj, default=None):
+        """Serialize an object to UTF-8 encoded JSON.
+
+        :rtype: bytes
+        :returns: The JSON bytes.
+        """
+        return _dumps(obj, default).encode('utf-8')
+
+    def dump(self, obj, writer, default=None):
+        """Serialize an object to UTF-8 encoded JSON written to a binary
+        file or any writer taking bytes."""
+        writer.write(self.dumpb(obj, default))
+
+    def loads(self, data):
+        """Deserialize a JSON string or UTF-8 encoded bytes."""
+        if isinstance(data, bytes) and not isinstance(data, str):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """Serializer using ``orjson``, which encodes straight to bytes."""
+
+    name = 'orjson'
+    separator = b','
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        # Leave datetimes and dataclasses to the default function, like the
+        # standard library does, and accept keys that aren't strings.
+        self._option = (orjson.OPT_NON_STR_KEYS |
+                        orjson.OPT_PASSTHROUGH_DATETIME |
+                        orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def dumpb(self, obj, default=None):
+        def _default(value):
+            # Tuple subclasses, e.g. named tuples, are arrays in the
+            # standard library.
+            if isinstance(value, tuple):
+                return list(value)
+            if default is None:
+                raise TypeError
+            return default(value)
+
+        try:
+            return self._orjson.dumps(obj, default=_default,
+                                      option=self._option)
+        except TypeError:
+            return super(OrjsonSerializer, self).dumpb(obj, default)
+
+    def dumps(self, obj, default=None):
+        return self.dumpb(obj, default).decode('utf-8')
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class UjsonSerializer(JsonSerializer):
+    """Serializer using ``ujson``, version 5 or later."""
+
+    name = 'ujson'
+    separator = b','
+
+    def __init__(self):
+        import ujson
+        # The default argument was added in ujson 5.
+        ujson.dumps(0, default=str)
+        self._ujson = ujson
+
+    def dumps(self, obj, default=None):
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=False,
+                                     escape_forward_slashes=False,
+                                     default=default)
+        except (TypeError, OverflowError):
+            return super(UjsonSerializer, self).dumps(obj, default)
+
+    def dumpb(self, obj, default=None):
+        return self.dumps(obj, default).encode('utf-8')
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+_SERIALIZERS = (OrjsonSerializer, UjsonSerializer, JsonSerializer)
+
+
+def _get_default_serializer():
+    for serializer_class in _SERIALIZERS:
+        try:
+            return serializer_class()
+        except Exception:
+            continue
+
+
+_serializer = _get_default_serializer()
+
+
+def get_serializer():
+    """Get the serializer used by the exporters.
+
+    :rtype: :class:`JsonSerializer`
+    :returns: The serializer.
+    """
+    return _serializer
+
+
+def set_serializer(serializer=None):
+    """Set the serializer used by the exporters.
+
+    :type serializer: str or :class:`JsonSerializer`
+    :param serializer: (Optional) A serializer, or the name of one of
+                       ``'orjson'``, ``'ujson'`` or ``'json'``. Defaults to
+                       the fastest one installed.
+    """
+    global _serializer
+    if serializer is None:
+        serializer = _get_default_serializer()
+    elif isinstance(serializer, six.string_types):
+        for serializer_class in _SERIALIZERS:
+            if serializer_class.name == serializer:
+                serializer = serializer_class()
+                break
+        else:
+            raise ValueError('Unknown JSON serializer {}'.format(serializer))
+    _serializer = serializer
+
+
+def dumps(obj, default=None):
+    """Serialize an object to a JSON string with the current serializer."""
+    return _serializer.dumps(obj, default)
+
+
+def dumpb(obj, default=None):
+    """Serialize an object to UTF-8 encoded JSON with the current
+    serializer."""
+    return _serializer.dumpb(obj, default)
+
+
+def dump(obj, writer, default=None):
+    """Serialize an object to UTF-8 encoded JSON written to a writer taking
+    bytes, with the current serializer."""
+    _serializer.dump(obj, writer, default)
+
+
+def loads(data):
+    """Deserialize a JSON string or UTF-8 encoded bytes with the current
+    serializer."""
+    return _serializer.loads(data)
@@ -14,15 +14,552 @@
 
 from six.moves import queue
 
+import atexit
+import heapq
+import itertools
 import logging
+import os
 import threading
 import time
 
+from opencensus.common import utils
+
 logger = logging.getLogger(__name__)
 
+_DEFAULT_MAX_WORKERS = 4
+_DEFAULT_WORKER_LIMIT = 32
+_DEFAULT_GRACE_PERIOD = 5.0  # Seconds
+_SCHEDULER_THREAD_NAME = 'opencensus.common.Scheduler'
+_WORKER_STOP = object()
+
+_exporter_hook = None
+
+
+def set_exporter_hook(hook):
+    """Set the function marking the threads that run scheduled calls.
+
+    The hook is called with True before each call, and with the value it
+    returned once the call finished. ``opencensus.trace.execution_context``
+    sets it to mark exporter threads, so that the requests sent by the
+    exporters aren't traced.
+
+    :type hook: function
+    :param hook: The function taking and returning the exporter flag of
+                 the current thread, or None.
+    """
+    global _exporter_hook
+    _exporter_hook = hook
+
+
+# Weak references to the functions called in the child process after a
+# fork, in registration order: the scheduler is reset before its tasks.
+_fork_handlers = []
+_fork_handlers_lock = threading.Lock()
+# Set while the fork handlers run, the schedulers start their threads once
+# every component was reset.
+_forking = False
+_deferred_starts = []
+
+
+def register_at_fork(after_in_child):
+    """Call a function in the child process after a fork.
+
+    Bound methods are weakly referenced, the registration doesn't keep their
+    object alive. Does nothing without ``os.register_at_fork``, before
+    Python 3.7.
+
+    :type after_in_child: function
+    :param after_in_child: The function to call.
+    """
+    if not hasattr(os, 'register_at_fork'):
+        return
+    weak_func = utils.get_weakref(after_in_child)
+    with _fork_handlers_lock:
+        _fork_handlers[:] = [
+            ref for ref in _fork_handlers if ref() is not None]
+        _fork_handlers.append(weak_func)
+
+
+def _run_fork_handlers():
+    """Call the functions registered with :func:`register_at_fork`."""
+    global _fork_handlers_lock, _forking
+    _fork_handlers_lock = threading.Lock()
+    _forking = True
+    try:
+        for ref in list(_fork_handlers):
+            func = ref()
+            if func is None:
+                continue
+            try:
+                func()
+            except Exception:
+                logger.exception('Error resetting %s after a fork.', func)
+    finally:
+        _forking = False
+    schedulers = list(_deferred_starts)
+    del _deferred_starts[:]
+    for scheduler in schedulers:
+        scheduler._start_threads()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_run_fork_handlers)
+
+
+class _Call(object):
+    """A function call scheduled to run on a :class:`Scheduler`."""
+
+    __slots__ = ('deadline', 'function', 'args', 'cancelled')
+
+    def __init__(self, deadline, function, args):
+        self.deadline = deadline
+        self.function = function
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Don't run the call if it didn't start yet."""
+        self.cancelled = True
+
+
+class Scheduler(object):
+    """Runs the background work of the exporters of a process.
+
+    A single timer thread keeps the scheduled calls in a heap ordered by
+    deadline, and hands the due calls to a pool of worker threads. Worker
+    threads are started when the idle ones can't take all the queued calls,
+    up to ``max_workers`` plus the workers reserved by tasks blocking on
+    I/O, see :meth:`reserve_worker`. Calls are marked as exporter calls, see
+    :func:`set_exporter_hook`.
+
+    The scheduler keeps working in the child processes of pre-fork servers,
+    its threads are started again after a fork.
+
+    :type max_workers: int
+    :param max_workers: The maximum number of calls running at the same
+                        time.
+
+    :type name: str
+    :param name: Used for naming the threads.
+
+    :type worker_limit: int
+    :param worker_limit: The maximum number of worker threads, including
+                         the reserved ones.
+    """
+
+    def __init__(self, max_workers=_DEFAULT_MAX_WORKERS,
+                 name=_SCHEDULER_THREAD_NAME,
+                 worker_limit=_DEFAULT_WORKER_LIMIT):
+        if max_workers < 1:
+            raise ValueError(
+                'max_workers must be at least 1, got {!r}'.format(
+                    max_workers))
+        self.max_workers = max_workers
+        self.name = name
+        self.worker_limit = max(worker_limit, max_workers)
+        self._reserved = 0
+        self._condition = threading.Condition(threading.Lock())
+        self._timers = []
+        self._counter = itertools.count()
+        self._ready = queue.Queue()
+        self._workers = []
+        self._idle = 0
+        self._timer_thread = None
+        self._shutdown = False
+        register_at_fork(self._after_fork)
+
+    def _after_fork(self):
+        """Reset the scheduler in the child process after a fork.
+
+        Only the thread that forked runs in the child, the timers are kept
+        and the threads started again on the next call scheduled. The calls
+        that were due are left to the parent.
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._ready = queue.Queue()
+        self._workers = []
+        self._idle = 0
+        self._timer_thread = None
+
+    @property
+    def is_shutdown(self):
+        """Returns True once :meth:`shutdown` was called."""
+        return self._shutdown
+
+    def reserve_worker(self):
+        """Add a worker thread to the pool, for a task that blocks on I/O.
+
+        Tasks sending exports or sleeping between retries hold a worker
+        for as long as they run, reserving one keeps them from delaying the
+        other calls. Once ``worker_limit`` is reached, the task shares the
+        existing workers and a warning is logged.
+
+        :rtype: bool
+        :returns: True if a worker was reserved, to release it with
+                  :meth:`release_worker`.
+        """
+        with self._condition:
+            if self.max_workers + self._reserved >= self.worker_limit:
+                logger.warning(
+                    '%s reached its limit of %d workers, blocking tasks '
+                    'share them.', self.name, self.worker_limit)
+                return False
+            self._reserved += 1
+            return True
+
+    def release_worker(self):
+        """Remove a worker reserved with :meth:`reserve_worker`.
+
+        Workers already started keep running, and are reused by the calls.
+        """
+        with self._condition:
+            self._reserved = max(self._reserved - 1, 0)
+
+    def call_at(self, deadline, function, *args):
+        """Call a function at a given time.
+
+        :type deadline: float
+        :param deadline: When to call the function, as returned by
+                         ``time.time()``.
+
+        :type function: function
+        :param function: The function to call.
+
+        :rtype: :class:`_Call`
+        :returns: The scheduled call, which can be cancelled. After the
+                  shutdown, due calls run right away in the calling thread,
+                  so that exporters flushed late during the process exit
+                  still export their data, and other calls never run.
+        """
+        call = _Call(deadline, function, args)
+        with self._condition:
+            if not self._shutdown:
+                if deadline <= time.time():
+                    self._submit(call)
+                else:
+                    heapq.heappush(
+                        self._timers, (deadline, next(self._counter), call))
+                    if self._timers[0][2] is call:
+                        self._condition.notify()
+                # Also started for the timers kept after a fork.
+                if self._timers:
+                    self._start_timer()
+                return call
+
+        if deadline > time.time():
+            call.cancel()
+            return call
+        self._run(call)
+        return call
+
+    def call_later(self, delay, function, *args):
+        """Call a function after ``delay`` seconds, see :meth:`call_at`."""
+        return self.call_at(time.time() + delay, function, *args)
+
+    def submit(self, function, *args):
+        """Call a function as soon as a worker thread is available, see
+        :meth:`call_at`."""
+        return self.call_at(0, function, *args)
+
+    def _start_thread(self, target, name):
+        thread = threading.Thread(target=target, name=name)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _start_timer(self):
+        # Called with the lock held.
+        if self._timer_thread is None and not self._defer_start():
+            self._timer_thread = self._start_thread(
+                self._timer_main, self.name)
+
+    def _start_workers(self):
+        # Called with the lock held. The idle workers only leave the count
+        # once they've taken a call, so start a worker for each queued call
+        # the idle ones can't take.
+        while not self._shutdown and self._ready.qsize() > self._idle and \
+                len(self._workers) < self.max_workers + self._reserved and \
+                not self._defer_start():
+            # The new worker counts as idle until it takes a call.
+            self._idle += 1
+            self._workers.append(self._start_thread(
+                self._worker_main,
+                '{} Worker-{}'.format(self.name, len(self._workers))))
+
+    def _defer_start(self):
+        """Returns True while the fork handlers run in the child process,
+        the threads are started once they're done."""
+        # Called with the lock held.
+        if not _forking:
+            return False
+        if self not in _deferred_starts:
+            _deferred_starts.append(self)
+        return True
+
+    def _start_threads(self):
+        """Start the threads needed by the calls scheduled by the fork
+        handlers."""
+        with self._condition:
+            if self._shutdown:
+                return
+            if self._timers:
+                self._start_timer()
+            self._start_workers()
+
+    def _submit(self, call):
+        # Called with the lock held.
+        self._ready.put(call)
+        self._start_workers()
+
+    def _timer_main(self):
+        timers = self._timers
+        with self._condition:
+            while not self._shutdown:
+                if not timers:
+                    self._condition.wait()
+                    continue
+                deadline, _, call = timers[0]
+                timeout = deadline - time.time()
+                if timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+                heapq.heappop(timers)
+                if not call.cancelled:
+                    self._submit(call)
+
+    def _worker_main(self):
+        while True:
+            call = self._ready.get()
+            if call is _WORKER_STOP:
+                break
+            with self._condition:
+                self._idle -= 1
+                # The calls left may have been counted on this worker.
+                self._start_workers()
+            self._run(call)
+            with self._condition:
+                self._idle += 1
+
+    def _run(self, call):
+        if call.cancelled:
+            return
+        # Indicate that the call runs in an exporter thread.
+        # Used to suppress tracking of requests in this thread
+        hook = _exporter_hook
+        is_exporter = hook(True) if hook is not None else None
+        try:
+            call.function(*call.args)
+        except Exception:
+            logger.exception('Error running scheduled call %s.',
+                             call.function)
+        finally:
+            if hook is not None:
+                hook(is_exporter)
+
+    def shutdown(self, timeout=None):
+        """Stop the scheduler.
+
+        Pending timers are cancelled, the calls already due are run before
+        the worker threads stop. See :meth:`call_at` for the calls scheduled
+        afterwards.
+
+        :type timeout: float
+        :param timeout: The maximum time to wait for the threads to stop.
+
+        :rtype: bool
+        :returns: True if the threads stopped.
+        """
+        with self._condition:
+            if self._shutdown:
+                return True
+            self._shutdown = True
+            del self._timers[:]
+            self._condition.notify_all()
+            threads = list(self._workers)
+            for _ in threads:
+                self._ready.put(_WORKER_STOP)
+            if self._timer_thread is not None:
+                threads.append(self._timer_thread)
+
+        deadline = None if timeout is None else time.time() + timeout
+        for thread in threads:
+            if thread is threading.current_thread():
+                continue
+            thread.join(None if deadline is None
+                        else max(deadline - time.time(), 0))
+        return not any(thread.is_alive() for thread in threads
+                       if thread is not threading.current_thread())
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def _after_fork():
+    global _scheduler_lock
+    _scheduler_lock = threading.Lock()
+
+
+register_at_fork(_after_fork)
+
+
+def get_scheduler():
+    """Get the scheduler shared by the exporters of the process.
+
+    The scheduler is created on first use, and shut down when the process
+    exits, after the exporters registered their own exit handlers.
+
+    :rtype: :class:`Scheduler`
+    :returns: The shared scheduler.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+            atexit.register(_scheduler.shutdown, _DEFAULT_GRACE_PERIOD)
+        return _scheduler
+
+
+class Task(object):
+    """A function run on a scheduler when triggered, one call at a time.
+
+    Triggers coalesce: the function runs once at the earliest requested
+    time. Triggering the task while the function runs makes it run again
+    afterwards.
+
+    :type function: function
+    :param function: The function to call.
+
+    :type scheduler: :class:`Scheduler`
+    :param scheduler: (Optional) The scheduler running the function,
+                      defaults to the shared scheduler.
+
+    :type name: str
+    :param name: The source of the task, used in logs.
+
+    :type blocking: bool
+    :param blocking: True if the function blocks on I/O, e.g. sends
+                     exports. A worker of the scheduler is reserved for the
+                     task until it's cancelled.
+    """
+
+    def __init__(self, function, scheduler=None, name=None, blocking=False):
+        self.function = function
+        self.name = name
+        self._scheduler = scheduler or get_scheduler()
+        self._reserved = blocking and self._scheduler.reserve_worker()
+        # Reentrant, the scheduler runs the function right away in the
+        # calling thread once it's shut down.
+        self._condition = threading.Condition(threading.RLock())
+        self._call = None
+        # Increased on each scheduled call, so that only the latest one
+        # runs the function.
+        self._generation = 0
+        self._running = False
+        self._rerun_at = None
+        self._cancelled = False
+        register_at_fork(self._after_fork)
+
+    def _after_fork(self):
+        """Reset the task in the child process after a fork.
+
+        A call that was due or running in the parent is scheduled again.
+        """
+        self._condition = threading.Condition(threading.RLock())
+        deadlines = []
+        if self._call is not None:
+            self._call.cancel()
+            deadlines.append(self._call.deadline)
+            self._call = None
+        if self._rerun_at is not None:
+            deadlines.append(self._rerun_at)
+            self._rerun_at = None
+        self._running = False
+        if deadlines and not self._cancelled:
+            self._schedule(min(deadlines))
+
+    @property
+    def cancelled(self):
+        """Returns True once the task was cancelled."""
+        return self._cancelled
+
+    def trigger(self, delay=0):
+        """Run the function in ``delay`` seconds, unless it's already
+        scheduled to run earlier.
+
+        :type delay: float
+        :param delay: Seconds to wait before running the function.
+        """
+        deadline = time.time() + delay
+        with self._condition:
+            if self._cancelled:
+                return
+            if self._running:
+                if self._rerun_at is None or deadline < self._rerun_at:
+                    self._rerun_at = deadline
+                return
+            if self._call is not None:
+                if self._call.deadline <= deadline:
+                    return
+                self._call.cancel()
+            self._schedule(deadline)
+
+    def _schedule(self, deadline):
+        # Called with the lock held.
+        self._generation += 1
+        self._call = self._scheduler.call_at(
+            deadline, self._run, self._generation)
 
-class PeriodicTask(threading.Thread):
-    """Thread that periodically calls a given function.
+    def _run(self, generation):
+        with self._condition:
+            if self._cancelled or generation != self._generation:
+                return
+            self._call = None
+            self._running = True
+        try:
+            self.function()
+        except Exception:
+            logger.exception('Error running %s.', self.name or self.function)
+        finally:
+            with self._condition:
+                self._running = False
+                if self._rerun_at is not None and not self._cancelled:
+                    self._schedule(self._rerun_at)
+                self._rerun_at = None
+                self._condition.notify_all()
+
+    def cancel(self):
+        """Stop running the function, a running call finishes."""
+        with self._condition:
+            self._cancelled = True
+            if self._call is not None:
+                self._call.cancel()
+                self._call = None
+            reserved, self._reserved = self._reserved, False
+        if reserved:
+            self._scheduler.release_worker()
+
+    def join(self, timeout=None):
+        """Wait for a running call of the function to finish.
+
+        :rtype: bool
+        :returns: False if the function is still running.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            while self._running:
+                if deadline is None:
+                    self._condition.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+
+class PeriodicTask(object):
+    """Task that periodically calls a given function on a scheduler.
 
     :type interval: int or float
     :param interval: Seconds between calls to the function.
@@ -38,26 +575,64 @@ class PeriodicTask(threading.Thread):
 
     :type name: str
     :param name: The source of the worker. Used for naming.
+
+    :type scheduler: :class:`Scheduler`
+    :param scheduler: (Optional) The scheduler calling the function,
+                      defaults to the shared scheduler.
+
+    :type blocking: bool
+    :param blocking: True if the function blocks on I/O, see :class:`Task`.
     """
 
-    def __init__(self, interval, function, args=None, kwargs=None, name=None):
-        super(PeriodicTask, self).__init__(name=name)
+    def __init__(self, interval, function, args=None, kwargs=None, name=None,
+                 scheduler=None, blocking=False):
         self.interval = interval
         self.function = function
         self.args = args or []
         self.kwargs = kwargs or {}
+        self.name = name
         self.finished = threading.Event()
+        self._scheduler = scheduler
+        self.blocking = blocking
+        self._task = None
 
-    def run(self):
-        wait_time = self.interval
-        while not self.finished.wait(wait_time):
-            start_time = time.time()
-            self.function(*self.args, **self.kwargs)
-            elapsed_time = time.time() - start_time
-            wait_time = max(self.interval - elapsed_time, 0)
+    def start(self):
+        """Schedule the first call of the function after ``interval``."""
+        if self._task is not None:
+            raise RuntimeError('{} already started'.format(self.name))
+        self._task = Task(self._run, self._scheduler, self.name,
+                          blocking=self.blocking)
+        self._task.trigger(self.interval)
+        # Registered after the task's own handler, which runs first.
+        register_at_fork(self._after_fork)
+
+    def _after_fork(self):
+        # The call running in the parent when it forked doesn't schedule
+        # the next one in the child.
+        if not self.finished.is_set():
+            self._task.trigger(self.interval)
+
+    def is_alive(self):
+        """Returns True if the task was started and not cancelled."""
+        return self._task is not None and not self.finished.is_set()
+
+    def _run(self):
+        if self.finished.is_set():
+            return
+        start_time = time.time()
+        self.function(*self.args, **self.kwargs)
+        elapsed_time = time.time() - start_time
+        self._task.trigger(max(self.interval - elapsed_time, 0))
 
     def cancel(self):
         self.finished.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    def join(self, timeout=None):
+        """Wait for a running call of the function to finish."""
+        if self._task is not None:
+            self._task.join(timeout)
 
 
 class QueueEvent(object):
@@ -83,6 +658,18 @@ class Queue(object):
     def __init__(self, capacity):
         self.EXIT_EVENT = QueueExitEvent('EXIT')
         self._queue = queue.Queue(maxsize=capacity)
+        # Called with each item put in the queue, e.g. to schedule a worker.
+        self.on_put = None
+        register_at_fork(self._after_fork)
+
+    def _after_fork(self):
+        # The items queued in the parent are exported by the parent.
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+
+    def _notify(self, item):
+        on_put = self.on_put
+        if on_put is not None:
+            on_put(item)
 
     def _gets(self, count, timeout):
         start_time = time.time()
@@ -115,6 +702,9 @@ class Queue(object):
     def is_empty(self):
         return not self._queue.qsize()
 
+    def qsize(self):
+        return self._queue.qsize()
+
     def flush(self, timeout=None):
         if self._queue.qsize() == 0:
             return 0
@@ -125,6 +715,7 @@ class Queue(object):
             self._queue.put(event, block=True, timeout=wait_time)
         except queue.Full:
             return
+        self._notify(event)
         elapsed_time = time.time() - start_time
         wait_time = timeout and max(timeout - elapsed_time, 0)
         if event.wait(wait_time):
@@ -135,6 +726,8 @@ class Queue(object):
             self._queue.put(item, block, timeout)
         except queue.Full:
             logger.warning('Queue is full. Dropping telemetry.')
+            return
+        self._notify(item)
 
     def puts(self, items, block=True, timeout=None):
         if block and timeout is not None:
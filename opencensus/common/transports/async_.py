@@ -16,22 +16,239 @@ from six.moves import queue, range
 
 import atexit
 import logging
+import sys
 import threading
+import time
+from collections import deque
 
+from opencensus.common import schedule
 from opencensus.common.transports import base
-from opencensus.trace import execution_context
 
 _DEFAULT_GRACE_PERIOD = 5.0  # Seconds
 _DEFAULT_MAX_BATCH_SIZE = 600
 _DEFAULT_WAIT_PERIOD = 60.0  # Seconds
-_WORKER_THREAD_NAME = 'opencensus.common.Worker'
-_WORKER_TERMINATOR = object()
+_DEFAULT_BLOCK_TIMEOUT = 1.0  # Seconds
+
+# Policies applied when data is exported while the queue is full.
+DROP_NEWEST = 'drop_newest'
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+_OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
 
 logger = logging.getLogger(__name__)
 
 
+def _estimate_size(item):
+    """Estimate the memory used by a queued item, from the shallow size of
+    the item and of its elements."""
+    size = sys.getsizeof(item)
+    if isinstance(item, (list, tuple)):
+        size += sum(sys.getsizeof(element) for element in item)
+    return size
+
+
+class _BoundedQueue(queue.Queue):
+    """A queue limited by its number of items and their estimated size.
+
+    :meth:`offer` applies the overflow policy when the queue is full, the
+    ``put`` methods of :class:`queue.Queue` ignore the limits.
+
+    :type max_items: int
+    :param max_items: The maximum number of queued items, 0 for no limit.
+
+    :type max_bytes: int
+    :param max_bytes: The maximum estimated size of the queued items in
+                      bytes, 0 for no limit.
+
+    :type overflow_policy: str
+    :param overflow_policy: One of :data:`DROP_NEWEST`, :data:`DROP_OLDEST`
+                            or :data:`BLOCK`.
+
+    :type block_timeout: float
+    :param block_timeout: The maximum time to wait for room in the queue
+                          with the :data:`BLOCK` policy, before dropping the
+                          new item.
+
+    :type item_size: callable
+    :param item_size: (Optional) Returns the size in bytes of an item,
+                      defaults to an estimate from ``sys.getsizeof``.
+    """
+
+    def __init__(self, max_items=0, max_bytes=0,
+                 overflow_policy=DROP_NEWEST,
+                 block_timeout=_DEFAULT_BLOCK_TIMEOUT,
+                 item_size=None):
+        if overflow_policy not in _OVERFLOW_POLICIES:
+            raise ValueError(
+                'overflow_policy must be one of {}, got {!r}'.format(
+                    ', '.join(_OVERFLOW_POLICIES), overflow_policy))
+        queue.Queue.__init__(self)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self._item_size = item_size or _estimate_size
+        self._reset()
+        schedule.register_at_fork(self._after_fork)
+
+    def _reset(self):
+        # The size and enqueue time of each item.
+        self._entries = deque()
+        self.size_bytes = 0
+        self.dropped = 0
+        self._flushing = False
+
+    def _after_fork(self):
+        # The items queued in the parent are exported by the parent, and
+        # its locks may be held by threads that don't exist in the child.
+        queue.Queue.__init__(self)
+        self._reset()
+
+    def _get_size(self, item):
+        if not self.max_bytes:
+            return 0
+        return self._item_size(item)
+
+    def _put(self, item):
+        self._append(item, self._get_size(item))
+
+    def _append(self, item, size):
+        self.queue.append(item)
+        self._entries.append((size, time.time()))
+        self.size_bytes += size
+
+    def _get(self):
+        self.size_bytes -= self._entries.popleft()[0]
+        return self.queue.popleft()
+
+    def _fits(self, size):
+        if self.max_items and self._qsize() >= self.max_items:
+            return False
+        if self.max_bytes and self._qsize() and \
+                self.size_bytes + size > self.max_bytes:
+            return False
+        return True
+
+    def _drop_oldest(self):
+        self._get()
+        self.dropped += 1
+        # Dropped items are done, they won't be processed.
+        self.unfinished_tasks -= 1
+        if not self.unfinished_tasks:
+            self.all_tasks_done.notify_all()
+
+    def offer(self, item):
+        """Add an item to the queue, applying the overflow policy if the
+        queue is full.
+
+        :rtype: bool
+        :returns: False if the item was dropped.
+        """
+        size = self._get_size(item)
+        with self.not_full:
+            if not self._fits(size):
+                if self.overflow_policy == BLOCK:
+                    self._wait_for_room(size)
+                elif self.overflow_policy == DROP_OLDEST:
+                    while self._qsize() and not self._fits(size):
+                        self._drop_oldest()
+                if not self._fits(size):
+                    self.dropped += 1
+                    return False
+            self._append(item, size)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+            return True
+
+    def _due_in(self, max_items, max_wait):
+        # Called with the mutex held.
+        count = self._qsize()
+        if not count:
+            return None
+        if count >= max_items or self._flushing:
+            return 0
+        return max(self._entries[0][1] + max_wait - time.time(), 0)
+
+    def due_in(self, max_items, max_wait):
+        """Get the time until the next batch is due.
+
+        A batch is due when ``max_items`` items are queued, the oldest item
+        has been queued for ``max_wait`` seconds, or a flush was requested
+        with :meth:`flush_pending`.
+
+        :type max_items: int
+        :param max_items: The maximum number of items of a batch.
+
+        :type max_wait: float
+        :param max_wait: The maximum time the oldest item waits for a batch.
+
+        :rtype: float
+        :returns: The seconds until the next batch is due, or None if the
+                  queue is empty.
+        """
+        with self.mutex:
+            return self._due_in(max_items, max_wait)
+
+    def get_batch(self, max_items, max_wait):
+        """Get the next batch of items if it's due, see :meth:`due_in`.
+        Does not mark the items as done.
+
+        :type max_items: int
+        :param max_items: The maximum number of items of the batch.
+
+        :type max_wait: float
+        :param max_wait: The maximum time the oldest item waits for a batch.
+
+        :rtype: list
+        :returns: The items of the batch, empty if no batch is due.
+        """
+        with self.mutex:
+            if self._due_in(max_items, max_wait) != 0:
+                return []
+            count = min(self._qsize(), max_items)
+            items = [self._get() for _ in range(count)]
+            if not self._qsize():
+                self._flushing = False
+            self.not_full.notify_all()
+            return items
+
+    def flush_pending(self):
+        """Make the queued items due immediately, until the queue is
+        empty."""
+        with self.mutex:
+            if self._qsize():
+                self._flushing = True
+
+    def wait_done(self, timeout=None):
+        """Like ``join``, with a timeout.
+
+        :rtype: bool
+        :returns: True if all the items were processed.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self.all_tasks_done:
+            while self.unfinished_tasks:
+                if deadline is None:
+                    self.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.all_tasks_done.wait(remaining)
+            return True
+
+    def _wait_for_room(self, size):
+        # Called with the mutex held.
+        deadline = time.time() + self.block_timeout
+        while not self._fits(size):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            self.not_full.wait(remaining)
+
+
 class _Worker(object):
-    """A background thread that exports batches of data.
+    """Exports batches of data from a queue on a scheduler.
 
     :type exporter: :class:`~opencensus.trace.base_exporter.Exporter` or
                     :class:`~opencensus.stats.base_exporter.StatsExporter`
@@ -42,97 +259,140 @@ class _Worker(object):
                          be submitted when the process is shutting down.
 
     :type max_batch_size: int
-    :param max_batch_size: The maximum number of items to send at a time
-                           in the background thread.
+    :param max_batch_size: The maximum number of items to send at a time.
 
     :type wait_period: int
-    :param wait_period: The amount of time to wait before sending the next
-                        batch of data.
+    :param wait_period: The maximum amount of time data waits in the queue
+                        before it's sent. Full batches are sent right away.
+
+    :type max_queue_size: int
+    :param max_queue_size: The maximum number of queued exports, 0 for no
+                           limit.
+
+    :type max_queue_bytes: int
+    :param max_queue_bytes: The maximum estimated size in bytes of the
+                            queued exports, 0 for no limit.
+
+    :type overflow_policy: str
+    :param overflow_policy: What to do when the queue is full, drop the new
+                            data (:data:`DROP_NEWEST`), drop the oldest
+                            queued data (:data:`DROP_OLDEST`) or wait for
+                            room in the queue (:data:`BLOCK`).
+
+    :type block_timeout: float
+    :param block_timeout: The maximum time to wait for room in the queue
+                          with the :data:`BLOCK` policy before dropping the
+                          new data.
+
+    :type item_size: callable
+    :param item_size: (Optional) Returns the size in bytes of the exported
+                      data, used with ``max_queue_bytes``.
+
+    :type num_workers: int
+    :param num_workers: The maximum number of batches exported
+                        concurrently, each reserves a worker of the
+                        scheduler. The exporter's ``emit`` must be thread
+                        safe when it's more than 1.
+
+    :type scheduler: :class:`~opencensus.common.schedule.Scheduler`
+    :param scheduler: (Optional) The scheduler running the exports,
+                      defaults to the shared scheduler.
     """
     def __init__(self, exporter,
                  grace_period=_DEFAULT_GRACE_PERIOD,
                  max_batch_size=_DEFAULT_MAX_BATCH_SIZE,
-                 wait_period=_DEFAULT_WAIT_PERIOD):
+                 wait_period=_DEFAULT_WAIT_PERIOD,
+                 max_queue_size=0,
+                 max_queue_bytes=0,
+                 overflow_policy=DROP_NEWEST,
+                 block_timeout=_DEFAULT_BLOCK_TIMEOUT,
+                 item_size=None,
+                 num_workers=1,
+                 scheduler=None):
+        if num_workers < 1:
+            raise ValueError(
+                'num_workers must be at least 1, got {!r}'.format(
+                    num_workers))
+        worker_limit = (scheduler or schedule.get_scheduler()).worker_limit
+        if num_workers > worker_limit:
+            raise ValueError(
+                'num_workers must be at most the worker_limit of the '
+                'scheduler ({}), got {!r}'.format(worker_limit, num_workers))
         self.exporter = exporter
         self._grace_period = grace_period
         self._max_batch_size = max_batch_size
         self._wait_period = wait_period
-        self._queue = queue.Queue(0)
+        self._queue = _BoundedQueue(
+            max_queue_size, max_queue_bytes, overflow_policy, block_timeout,
+            item_size)
+        self._num_workers = num_workers
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._tasks = []
+        schedule.register_at_fork(self._after_fork)
+
+    def _after_fork(self):
         self._lock = threading.Lock()
-        self._event = threading.Event()
-        self._thread = None
 
     @property
     def is_alive(self):
-        """Returns True is the background thread is running."""
-        return self._thread is not None and self._thread.is_alive()
+        """Returns True if the worker is started."""
+        return bool(self._tasks)
 
     def _get_items(self):
-        """Get multiple items from a Queue.
+        """Get the next batch of items from the queue, if it's due.
 
-        Gets at least one (blocking) and at most ``max_batch_size`` items
-        (non-blocking) from a given Queue. Does not mark the items as done.
+        A batch is due when ``max_batch_size`` items are queued, or the
+        oldest queued item waited for ``wait_period``, and has at most
+        ``max_batch_size`` items. Does not mark the items as done.
 
         :rtype: Sequence
         :returns: A sequence of items retrieved from the queue.
         """
-        items = [self._queue.get()]
+        return self._queue.get_batch(self._max_batch_size, self._wait_period)
 
-        while len(items) < self._max_batch_size:
-            try:
-                items.append(self._queue.get_nowait())
-            except queue.Empty:
-                break
-
-        return items
-
-    def _thread_main(self):
-        """The entry point for the worker thread.
+    def _export_batches(self):
+        """Export the due batches of data.
 
-        Pulls pending data off the queue and writes them in
-        batches to the specified tracing backend using the exporter.
+        Run by the worker tasks on the scheduler, writes the batches to the
+        specified tracing backend using the exporter.
         """
-        # Indicate that this thread is an exporter thread.
-        # Used to suppress tracking of requests in this thread
-        execution_context.set_is_exporter(True)
-        quit_ = False
-
         while True:
             items = self._get_items()
-            data = []
+            if not items:
+                break
 
+            data = []
             for item in items:
-                if item is _WORKER_TERMINATOR:
-                    quit_ = True
-                    # Continue processing items, don't break, try to process
-                    # all items we got back before quitting.
-                else:
-                    data.extend(item)
-
-            if data:
-                try:
-                    self.exporter.emit(data)
-                except Exception:
-                    logger.exception(
-                        '%s failed to emit data.'
-                        'Dropping %s objects from queue.',
-                        self.exporter.__class__.__name__,
-                        len(data))
-                    pass
+                data.extend(item)
+
+            try:
+                self.exporter.emit(data)
+            except Exception:
+                logger.exception(
+                    '%s failed to emit data.'
+                    'Dropping %s objects from queue.',
+                    self.exporter.__class__.__name__,
+                    len(data))
 
             for _ in range(len(items)):
                 self._queue.task_done()
 
-            # self._event is set at exit, at which point we start draining the
-            # queue immediately. If self._event is unset, block for
-            # self.wait_period between each batch of exports.
-            self._event.wait(self._wait_period)
+        self._schedule()
 
-            if quit_:
-                break
+    def _schedule(self):
+        """Trigger the worker tasks when the next batch is due."""
+        tasks = self._tasks
+        if not tasks:
+            return
+        due_in = self._queue.due_in(self._max_batch_size, self._wait_period)
+        if due_in is None:
+            return
+        for task in tasks:
+            task.trigger(due_in)
 
     def start(self):
-        """Starts the background thread.
+        """Starts exporting the queued data on the scheduler.
 
         Additionally, this registers a handler for process exit to attempt
         to send any pending data before shutdown.
@@ -141,34 +401,36 @@ class _Worker(object):
             if self.is_alive:
                 return
 
-            self._thread = threading.Thread(
-                target=self._thread_main, name=_WORKER_THREAD_NAME)
-            self._thread.daemon = True
-            self._thread.start()
+            name = '{} Worker'.format(self.exporter.__class__.__name__)
+            self._tasks = [
+                schedule.Task(self._export_batches, self._scheduler, name,
+                              blocking=True)
+                for _ in range(self._num_workers)]
             atexit.register(self._export_pending_data)
+        self._schedule()
 
     def stop(self):
-        """Signals the background thread to stop.
+        """Exports the pending data and stops the worker.
 
-        This does not terminate the background thread. It simply queues the
-        stop signal. If the main process exits before the background thread
-        processes the stop signal, it will be terminated without finishing
-        work. The ``grace_period`` parameter will give the background
-        thread some time to finish processing before this function returns.
+        The ``grace_period`` parameter gives the scheduler some time to
+        export the pending data before this function returns, the data
+        still queued after that is not exported.
 
         :rtype: bool
-        :returns: True if the thread terminated. False if the thread is still
-                  running.
+        :returns: True if the pending data was exported.
         """
         if not self.is_alive:
             return True
 
         with self._lock:
-            self._queue.put_nowait(_WORKER_TERMINATOR)
-            self._thread.join(timeout=self._grace_period)
+            # Export the pending data without waiting for a full batch.
+            self._queue.flush_pending()
+            self._schedule()
+            success = self._queue.wait_done(self._grace_period)
 
-            success = not self.is_alive
-            self._thread = None
+            for task in self._tasks:
+                task.cancel()
+            self._tasks = []
 
             return success
 
@@ -176,21 +438,38 @@ class _Worker(object):
         """Callback that attempts to send pending data before termination."""
         if not self.is_alive:
             return
-        # Stop blocking between export batches
-        self._event.set()
         self.stop()
 
+    @property
+    def dropped(self):
+        """The number of exports dropped because the queue was full."""
+        return self._queue.dropped
+
     def enqueue(self, data):
-        """Queues data to be written by the background thread."""
-        self._queue.put_nowait(data)
+        """Queues data to be written on the scheduler.
+
+        :rtype: bool
+        :returns: False if the data was dropped because the queue is full.
+        """
+        if self._queue.offer(data):
+            self._schedule()
+            return True
+        if self._queue.dropped == 1:
+            logger.warning(
+                '%s queue is full, dropping data. Use the dropped '
+                'property of the transport to get the number of dropped '
+                'exports.', self.exporter.__class__.__name__)
+        return False
 
     def flush(self):
         """Submit any pending data."""
+        self._queue.flush_pending()
+        self._schedule()
         self._queue.join()
 
 
 class AsyncTransport(base.Transport):
-    """Asynchronous transport that uses a background thread.
+    """Asynchronous transport exporting data on a scheduler.
 
     :type exporter: :class:`~opencensus.trace.base_exporter.Exporter` or
                     :class:`~opencensus.stats.base_exporter.StatsExporter`
@@ -201,27 +480,78 @@ class AsyncTransport(base.Transport):
                          be submitted when the process is shutting down.
 
     :type max_batch_size: int
-    :param max_batch_size: The maximum number of items to send at a time
-                           in the background thread.
+    :param max_batch_size: The maximum number of items to send at a time.
 
     :type wait_period: int
-    :param wait_period: The amount of time to wait before sending the next
-                        batch of data.
+    :param wait_period: The maximum amount of time data waits in the queue
+                        before it's sent. Full batches are sent right away.
+
+    :type max_queue_size: int
+    :param max_queue_size: The maximum number of queued exports, 0 for no
+                           limit.
+
+    :type max_queue_bytes: int
+    :param max_queue_bytes: The maximum estimated size in bytes of the
+                            queued exports, 0 for no limit.
+
+    :type overflow_policy: str
+    :param overflow_policy: What to do when the queue is full, drop the new
+                            data (:data:`DROP_NEWEST`), drop the oldest
+                            queued data (:data:`DROP_OLDEST`) or wait for
+                            room in the queue (:data:`BLOCK`).
+
+    :type block_timeout: float
+    :param block_timeout: The maximum time to wait for room in the queue
+                          with the :data:`BLOCK` policy before dropping the
+                          new data.
+
+    :type item_size: callable
+    :param item_size: (Optional) Returns the size in bytes of the exported
+                      data, used with ``max_queue_bytes``.
+
+    :type num_workers: int
+    :param num_workers: The maximum number of batches exported
+                        concurrently, each reserves a worker of the
+                        scheduler. The exporter's ``emit`` must be thread
+                        safe when it's more than 1.
+
+    :type scheduler: :class:`~opencensus.common.schedule.Scheduler`
+    :param scheduler: (Optional) The scheduler running the exports,
+                      defaults to the shared scheduler.
     """
 
     def __init__(self, exporter,
                  grace_period=_DEFAULT_GRACE_PERIOD,
                  max_batch_size=_DEFAULT_MAX_BATCH_SIZE,
-                 wait_period=_DEFAULT_WAIT_PERIOD):
+                 wait_period=_DEFAULT_WAIT_PERIOD,
+                 max_queue_size=0,
+                 max_queue_bytes=0,
+                 overflow_policy=DROP_NEWEST,
+                 block_timeout=_DEFAULT_BLOCK_TIMEOUT,
+                 item_size=None,
+                 num_workers=1,
+                 scheduler=None):
         self.exporter = exporter
         self.worker = _Worker(
             exporter,
             grace_period,
             max_batch_size,
             wait_period,
+            max_queue_size,
+            max_queue_bytes,
+            overflow_policy,
+            block_timeout,
+            item_size,
+            num_workers,
+            scheduler,
         )
         self.worker.start()
 
+    @property
+    def dropped(self):
+        """The number of exports dropped because the queue was full."""
+        return self.worker.dropped
+
     def export(self, data):
         """Put the trace/stats to be exported into queue."""
         self.worker.enqueue(data)
@@ -0,0 +1,290 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""HTTP client shared by the exporters sending data over HTTP.
+
+Requires the ``requests`` package, a dependency of these exporters.
+"""
+
+import threading
+import types
+import zlib
+
+import six
+
+from opencensus.common import json_serializer, schedule
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # pragma: NO COVER
+    requests = None
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+# Bodies smaller than about a packet don't gain from compression.
+DEFAULT_COMPRESSION_THRESHOLD = 1024  # Bytes
+
+# Request body compressions, the values of the Content-Encoding header.
+GZIP = 'gzip'
+DEFLATE = 'deflate'
+_COMPRESSIONS = (GZIP, DEFLATE)
+
+
+def iter_json(obj, default=None):
+    """Serialize an object to UTF-8 encoded JSON in chunks.
+
+    The items of a list are serialized one at a time, so that a request
+    body can be compressed as it is serialized, without holding the whole
+    JSON document in memory. Joined, the chunks are the same as
+    :func:`~opencensus.common.json_serializer.dumpb`.
+
+    :type obj: object
+    :param obj: The object to serialize.
+
+    :type default: callable
+    :param default: (Optional) Serializes objects JSON doesn't support.
+
+    :rtype: iterator
+    :returns: The JSON chunks.
+    """
+    serializer = json_serializer.get_serializer()
+    if not isinstance(obj, (list, tuple)):
+        yield serializer.dumpb(obj, default)
+        return
+    yield b'['
+    separator = b''
+    for item in obj:
+        yield separator
+        yield serializer.dumpb(item, default)
+        separator = serializer.separator
+    yield b']'
+
+
+def _get_compressor(compression):
+    if compression == GZIP:
+        return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED,
+                                16 + zlib.MAX_WBITS)
+    # HTTP deflate is the zlib format, not raw deflate.
+    return zlib.compressobj()
+
+
+def _to_bytes(chunk):
+    if isinstance(chunk, six.text_type):
+        return chunk.encode('utf-8')
+    return chunk
+
+
+def encode_body(chunks, compression=None,
+                threshold=DEFAULT_COMPRESSION_THRESHOLD):
+    """Join the chunks of a request body, compressing them once they reach
+    the threshold.
+
+    Chunks are compressed as they come, only the compressed body is held
+    in memory.
+
+    :type chunks: iterable
+    :param chunks: The str or bytes chunks of the body.
+
+    :type compression: str
+    :param compression: (Optional) :data:`GZIP` or :data:`DEFLATE`.
+
+    :type threshold: int
+    :param threshold: The size in bytes from which the body is compressed.
+
+    :rtype: tuple
+    :returns: The body, and the compression used or None. An uncompressed
+              body is joined as is.
+    """
+    if compression is not None and compression not in _COMPRESSIONS:
+        raise ValueError('Unknown compression {}'.format(compression))
+    buffered = []
+    size = 0
+    compressor = None
+    compressed = []
+    for chunk in chunks:
+        if compressor is not None:
+            compressed.append(compressor.compress(_to_bytes(chunk)))
+            continue
+        buffered.append(chunk)
+        size += len(chunk)
+        if compression is not None and size >= threshold:
+            compressor = _get_compressor(compression)
+            compressed.append(compressor.compress(
+                b''.join(_to_bytes(chunk) for chunk in buffered)))
+            buffered = None
+    if compressor is None:
+        if all(isinstance(chunk, bytes) for chunk in buffered):
+            return b''.join(buffered), None
+        return ''.join(buffered), None
+    compressed.append(compressor.flush())
+    return b''.join(compressed), compression
+
+
+class HttpClient(object):
+    """HTTP client keeping connections alive between requests.
+
+    Connections are pooled by host, so exporters sending batches to the
+    same backend reuse a TCP, and TLS, connection instead of opening a new
+    one for every batch. The client is thread safe, and starts a new pool
+    in the child process after a fork since pooled sockets can't be shared
+    with the parent.
+
+    :type pool_connections: int
+    :param pool_connections: The number of hosts to keep connection pools
+                             for.
+
+    :type pool_maxsize: int
+    :param pool_maxsize: The maximum number of connections kept alive per
+                         host, should be at least the number of threads
+                         exporting concurrently.
+
+    :type timeout: float or tuple
+    :param timeout: (Optional) The default connect and read timeout in
+                    seconds, None to wait forever.
+
+    :type proxies: dict
+    :param proxies: (Optional) Maps URL schemes to the URL of the proxy
+                    used for every request. Connections to the proxies are
+                    pooled as well.
+
+    :type trust_env: bool
+    :param trust_env: Whether to read proxies and certificates from the
+                      environment on each request.
+
+    :type compression: str
+    :param compression: (Optional) Compress request bodies with
+                        :data:`GZIP` or :data:`DEFLATE` by default.
+
+    :type compression_threshold: int
+    :param compression_threshold: The size in bytes from which request
+                                  bodies are compressed.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, timeout=None,
+                 proxies=None, trust_env=True, compression=None,
+                 compression_threshold=DEFAULT_COMPRESSION_THRESHOLD):
+        if requests is None:  # pragma: NO COVER
+            raise ImportError('HttpClient requires the requests package.')
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.proxies = proxies
+        self.trust_env = trust_env
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self._lock = threading.Lock()
+        self._session = None
+        schedule.register_at_fork(self._after_fork)
+
+    def _after_fork(self):
+        """Drop the pooled connections of the parent process."""
+        self._lock = threading.Lock()
+        self._session = None
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.trust_env = self.trust_env
+        if self.proxies:
+            session.proxies.update(self.proxies)
+        return session
+
+    @property
+    def session(self):
+        """The :class:`requests.Session` holding the pooled connections,
+        created on first use."""
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._new_session()
+                session = self._session
+        return session
+
+    def post(self, url, data=None, compression=None, **kwargs):
+        """Send a POST request.
+
+        Takes the keyword arguments of :func:`requests.post`, the timeout
+        defaults to the one of the client. The data may also be a generator
+        of chunks, e.g. from :func:`iter_json`, joined into the body.
+
+        :type url: str
+        :param url: The URL of the request.
+
+        :type data: str, bytes or generator
+        :param data: (Optional) The body of the request.
+
+        :type compression: str
+        :param compression: (Optional) Compress the body with :data:`GZIP`
+                            or :data:`DEFLATE` if it reaches the
+                            compression threshold, defaults to the
+                            compression of the client.
+
+        :rtype: :class:`requests.Response`
+        :returns: The response.
+        """
+        if self.timeout is not None:
+            kwargs.setdefault('timeout', self.timeout)
+        if compression is None:
+            compression = self.compression
+        if isinstance(data, types.GeneratorType) or (
+                compression is not None and
+                isinstance(data, (bytes, six.text_type))):
+            data, encoding = encode_body(
+                [data] if isinstance(data, (bytes, six.text_type)) else data,
+                compression, self.compression_threshold)
+            if encoding is not None:
+                headers = dict(kwargs.get('headers') or {})
+                headers['Content-Encoding'] = encoding
+                kwargs['headers'] = headers
+        if data is not None:
+            kwargs['data'] = data
+        return self.session.post(url=url, **kwargs)
+
+    def close(self):
+        """Close the pooled connections, the next request opens new ones."""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _after_fork():
+    global _client_lock
+    _client_lock = threading.Lock()
+
+
+schedule.register_at_fork(_after_fork)
+
+
+def get_client():
+    """Get the HTTP client shared by the exporters of the process.
+
+    :rtype: :class:`HttpClient`
+    :returns: The shared client, created on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,331 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retry and circuit breaking policy shared by the exporters.
+
+Exporters opt in by passing an :class:`ExportPolicy` and raising
+:class:`RetryableError` from the function sending the data when the failure
+is transient, e.g. a connection error or a 503 response.
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+_DEFAULT_MAX_RETRIES = 3
+_DEFAULT_INITIAL_BACKOFF = 0.5  # Seconds
+_DEFAULT_MAX_BACKOFF = 30.0  # Seconds
+_DEFAULT_MULTIPLIER = 2.0
+_DEFAULT_JITTER = 0.5
+_DEFAULT_FAILURE_THRESHOLD = 5
+_DEFAULT_RESET_TIMEOUT = 30.0  # Seconds
+
+# HTTP status codes of transient failures, worth retrying.
+RETRYABLE_STATUS_CODES = (
+    408,  # Request Timeout
+    429,  # Too Many Requests
+    500,  # Internal Server Error
+    502,  # Bad Gateway
+    503,  # Service Unavailable
+    504,  # Gateway Timeout
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RetryableError(Exception):
+    """A transient export failure.
+
+    :type retry_after: float
+    :param retry_after: (Optional) The number of seconds the backend asked
+                        to wait before retrying.
+    """
+
+    def __init__(self, message=None, retry_after=None):
+        super(RetryableError, self).__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RetryableError):
+    """Raised instead of calling a backend while its circuit is open."""
+
+
+def is_retryable_status(status_code):
+    return status_code in RETRYABLE_STATUS_CODES
+
+
+def parse_retry_after(value, now=None):
+    """Parse the value of a ``Retry-After`` header.
+
+    :type value: str
+    :param value: Either a number of seconds or an HTTP date.
+
+    :type now: float
+    :param now: (Optional) The current time, to compute the delay until an
+                HTTP date.
+
+    :rtype: float
+    :returns: The number of seconds to wait, or None if the value is missing
+              or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    if now is None:
+        now = time.time()
+    return max(0.0, mktime_tz(parsed) - now)
+
+
+class CircuitBreaker(object):
+    """Stop calling a backend after consecutive failures.
+
+    The circuit opens after ``failure_threshold`` consecutive failures, or
+    when the backend asks to wait with a ``Retry-After``. While open, calls
+    are rejected without contacting the backend. Once ``reset_timeout`` has
+    passed a single trial call is allowed, closing the circuit on success
+    and opening it again on failure.
+
+    :type failure_threshold: int
+    :param failure_threshold: The number of consecutive failures opening
+                              the circuit.
+
+    :type reset_timeout: float
+    :param reset_timeout: The number of seconds the circuit stays open
+                          before allowing a trial call.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=_DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=_DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = None
+        self._trial = False
+
+    @property
+    def state(self):
+        if self._open_until is None:
+            return self.CLOSED
+        if self._trial or time.time() < self._open_until:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def is_open(self):
+        """Whether calls are currently rejected, checked without locking."""
+        open_until = self._open_until
+        return open_until is not None and (
+            self._trial or time.time() < open_until)
+
+    def allow(self):
+        """Check whether a call may proceed.
+
+        Half open, this lets a single trial call through and rejects the
+        others until its outcome is recorded.
+
+        :rtype: bool
+        :returns: True if the call may proceed.
+        """
+        if self._open_until is None:
+            return True
+        with self._lock:
+            if self._open_until is None:
+                return True
+            if self._trial or time.time() < self._open_until:
+                return False
+            self._trial = True
+            return True
+
+    def release(self):
+        """Record a call that ended without reaching the backend, e.g. on a
+        local error, letting another trial call through when half open."""
+        if not self._trial:
+            return
+        with self._lock:
+            self._trial = False
+
+    def record_success(self):
+        if not self._failures and self._open_until is None:
+            return
+        with self._lock:
+            self._failures = 0
+            self._open_until = None
+            self._trial = False
+
+    def record_failure(self, retry_after=None):
+        """Record a failed call.
+
+        :type retry_after: float
+        :param retry_after: (Optional) The number of seconds the backend
+                            asked to wait, the circuit stays open at least
+                            as long.
+        """
+        with self._lock:
+            self._failures += 1
+            now = time.time()
+            if self._trial or self._failures >= self.failure_threshold:
+                self._open_until = now + max(
+                    self.reset_timeout, retry_after or 0)
+            elif retry_after:
+                self._open_until = max(self._open_until or 0,
+                                       now + retry_after)
+            self._trial = False
+
+
+class ExportPolicy(object):
+    """Retry transient export failures with exponential backoff.
+
+    :meth:`call` calls a function until it doesn't raise
+    :class:`RetryableError`, up to ``max_retries`` retries. The delay before
+    the nth retry is ``initial_backoff * multiplier ** (n - 1)``, capped by
+    ``max_backoff`` and reduced by a random fraction of at most ``jitter``,
+    so that clients failing together don't retry together. A ``Retry-After``
+    sent by the backend is used when longer, retries stop when it exceeds
+    ``max_backoff``.
+
+    :type max_retries: int
+    :param max_retries: The maximum number of retries of a call.
+
+    :type initial_backoff: float
+    :param initial_backoff: The delay before the first retry in seconds.
+
+    :type max_backoff: float
+    :param max_backoff: The maximum delay between retries in seconds.
+
+    :type multiplier: float
+    :param multiplier: The factor applied to the delay after each retry.
+
+    :type jitter: float
+    :param jitter: The maximum fraction of the delay removed at random,
+                   between 0 and 1.
+
+    :type circuit_breaker: :class:`CircuitBreaker`
+    :param circuit_breaker: (Optional) The circuit breaker rejecting calls
+                            while the backend keeps failing.
+
+    :type sleep: callable
+    :param sleep: (Optional) Waits the given number of seconds.
+    """
+
+    def __init__(self, max_retries=_DEFAULT_MAX_RETRIES,
+                 initial_backoff=_DEFAULT_INITIAL_BACKOFF,
+                 max_backoff=_DEFAULT_MAX_BACKOFF,
+                 multiplier=_DEFAULT_MULTIPLIER,
+                 jitter=_DEFAULT_JITTER,
+                 circuit_breaker=None,
+                 sleep=time.sleep):
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1')
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.circuit_breaker = circuit_breaker
+        self._sleep = sleep
+
+    @property
+    def circuit_open(self):
+        """Whether calls are currently rejected, for exporters to drop data
+        before preparing it."""
+        return (self.circuit_breaker is not None and
+                self.circuit_breaker.is_open)
+
+    def get_delay(self, retry, retry_after=None):
+        """Get the delay before a retry.
+
+        :type retry: int
+        :param retry: The number of the retry, starting at 1.
+
+        :type retry_after: float
+        :param retry_after: (Optional) The delay asked by the backend.
+
+        :rtype: float
+        :returns: The delay in seconds, or None if the backend asked to wait
+                  longer than ``max_backoff``.
+        """
+        if retry_after is not None and retry_after > self.max_backoff:
+            return None
+        delay = min(self.max_backoff,
+                    self.initial_backoff * self.multiplier ** (retry - 1))
+        delay -= delay * self.jitter * random.random()
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def get_max_duration(self, timeout):
+        """Get the longest time :meth:`call` may take, e.g. to lease the
+        data being sent for long enough.
+
+        :type timeout: float
+        :param timeout: The longest time a call of the function takes.
+
+        :rtype: float
+        :returns: The duration in seconds.
+        """
+        return ((self.max_retries + 1) * timeout +
+                self.max_retries * self.max_backoff)
+
+    def call(self, function, *args, **kwargs):
+        """Call a function, retrying it on :class:`RetryableError`.
+
+        Other exceptions are raised without retrying, and count as neither
+        failures nor successes of the backend.
+
+        :rtype: object
+        :returns: The result of the function.
+
+        :raises: :class:`CircuitOpenError` if the circuit is open, or the
+                 last :class:`RetryableError` once retries are exhausted.
+        """
+        breaker = self.circuit_breaker
+        retry = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError('Circuit open, export skipped.')
+            try:
+                result = function(*args, **kwargs)
+            except RetryableError as ex:
+                if breaker is not None:
+                    breaker.record_failure(ex.retry_after)
+                retry += 1
+                if retry > self.max_retries:
+                    raise
+                delay = self.get_delay(retry, ex.retry_after)
+                if delay is None:
+                    raise
+                logger.debug('Export failed (%s), retrying in %.2fs.',
+                             ex, delay)
+                self._sleep(delay)
+                continue
+            except Exception:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return result
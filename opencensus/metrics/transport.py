@@ -30,7 +30,8 @@ class TransportError(Exception):
 
 
 class PeriodicMetricTask(PeriodicTask):
-    """Thread that periodically calls a given function.
+    """Task that periodically calls a given function on the shared
+    scheduler.
 
     :type interval: int or float
     :param interval: Seconds between calls to the function.
@@ -48,8 +49,6 @@ class PeriodicMetricTask(PeriodicTask):
     :param name: The source of the worker. Used for naming.
     """
 
-    daemon = True
-
     def __init__(
         self,
         interval=None,
@@ -75,15 +74,10 @@ class PeriodicMetricTask(PeriodicTask):
                 logger.exception("Error handling metric export: {}".format(ex))
 
         super(PeriodicMetricTask, self).__init__(
-            interval, func, args, kwargs, '{} Worker'.format(name)
+            interval, func, args, kwargs, '{} Worker'.format(name),
+            blocking=True
         )
 
-    def run(self):
-        # Indicate that this thread is an exporter thread.
-        # Used to suppress tracking of requests in this thread
-        execution_context.set_is_exporter(True)
-        super(PeriodicMetricTask, self).run()
-
     def close(self):
         try:
             # Suppress request tracking on flush
@@ -98,7 +92,7 @@ class PeriodicMetricTask(PeriodicTask):
 def get_exporter_thread(metric_producers, exporter, interval=None):
     """Get a running task that periodically exports metrics.
 
-    Get a `PeriodicTask` that periodically calls:
+    Get a `PeriodicTask` that periodically calls, on the shared scheduler:
 
         export(itertools.chain(*all_gets))
 
@@ -116,7 +110,7 @@ def get_exporter_thread(metric_producers, exporter, interval=None):
     :param interval: Seconds between export calls.
 
     :rtype: :class:`PeriodicTask`
-    :return: A running thread responsible calling the exporter.
+    :return: A running task responsible calling the exporter.
 
     """
     weak_gets = [utils.get_weakref(producer.get_metrics)
@@ -127,9 +127,9 @@ class MeasureToViewMap(object):
     # TODO: deprecate
     def export(self, view_datas):
         """export view datas to registered exporters"""
-        view_datas_copy = \
-            [self.copy_and_finalize_view_data(vd) for vd in view_datas]
         if len(self.exporters) > 0:
+            view_datas_copy = \
+                [self.copy_and_finalize_view_data(vd) for vd in view_datas]
             for e in self.exporters:
                 try:
                     e.export(view_datas_copy)
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from opencensus.common import utils
+from opencensus.tags.tag_map import FrozenTagMap
 
 
 class ViewData(object):
@@ -36,6 +37,7 @@ class ViewData(object):
         self._start_time = start_time
         self._end_time = end_time
         self._tag_value_aggregation_data_map = {}
+        self._columns = None
 
     @property
     def view(self):
@@ -82,13 +84,18 @@ class ViewData(object):
 
     def record(self, context, value, timestamp, attachments=None):
         """records the view data against context"""
-        if context is None:
-            tags = dict()
+        if isinstance(context, FrozenTagMap):
+            if self._columns is None:
+                self._columns = tuple(self.view.columns)
+            tuple_vals = context.get_tag_values(self._columns)
         else:
-            tags = context.map
-        tag_values = self.get_tag_values(tags=tags,
-                                         columns=self.view.columns)
-        tuple_vals = tuple(tag_values)
+            if context is None:
+                tags = dict()
+            else:
+                tags = context.map
+            tag_values = self.get_tag_values(tags=tags,
+                                             columns=self.view.columns)
+            tuple_vals = tuple(tag_values)
         if tuple_vals not in self.tag_value_aggregation_data_map:
             self.tag_value_aggregation_data_map[tuple_vals] = \
                 self.view.new_aggregation_data()
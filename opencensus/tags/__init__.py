@@ -15,9 +15,10 @@
 from opencensus.common.runtime_context import RuntimeContext
 from opencensus.tags.tag import Tag
 from opencensus.tags.tag_key import TagKey
-from opencensus.tags.tag_map import TagMap
+from opencensus.tags.tag_map import FrozenTagMap, TagMap
 from opencensus.tags.tag_value import TagValue
 
-__all__ = ['Tag', 'TagContext', 'TagKey', 'TagValue', 'TagMap']
+__all__ = ['FrozenTagMap', 'Tag', 'TagContext', 'TagKey', 'TagValue',
+           'TagMap']
 
 TagContext = RuntimeContext.register_slot('tag_context', None)
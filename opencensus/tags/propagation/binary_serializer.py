@@ -17,8 +17,8 @@
 import six
 
 import logging
-
-from google.protobuf.internal.encoder import _VarintBytes
+import threading
+from collections import OrderedDict
 
 from opencensus.tags import tag_map as tag_map_module
 
@@ -29,12 +29,103 @@ VERSION_ID = 0
 TAG_FIELD_ID = 0
 TAG_MAP_SERIALIZED_SIZE_LIMIT = 8192
 
+# Maximum number of decoded tag maps kept for identical incoming bytes.
+MAX_CACHED_TAG_MAPS = 128
+
+
+def _varint_size(value):
+    """Get the number of bytes of the varint encoding of an int."""
+    if value <= 0x7f:
+        return 1
+    size = 1
+    while value > 0x7f:
+        value >>= 7
+        size += 1
+    return size
+
+
+def _encode_varint(value, buffer, pos):
+    """Write the varint encoding of an int into a bytearray.
+
+    :rtype: int
+    :returns: The position after the encoded int.
+    """
+    if value <= 0x7f:
+        buffer[pos] = value
+        return pos + 1
+    while value > 0x7f:
+        buffer[pos] = (value & 0x7f) | 0x80
+        value >>= 7
+        pos += 1
+    buffer[pos] = value
+    return pos + 1
+
+
+def _decode_varint(buffer, pos):
+    """Read a varint encoded int from a memoryview.
+
+    :rtype: tuple
+    :returns: The decoded int and the position after it.
+    """
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(buffer):
+            raise ValueError("Truncated tag context.")
+        byte = buffer[pos]
+        if six.PY2:
+            byte = ord(byte)
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class _DecodedTagMapCache(object):
+    """A thread-safe LRU cache of tag maps decoded from bytes."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            value = self._cache.pop(key, None)
+            if value is not None:
+                self._cache[key] = value
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_decoded_tag_maps = _DecodedTagMapCache(MAX_CACHED_TAG_MAPS)
+
 
 class BinarySerializer(object):
     def from_byte_array(self, binary):
+        """Decode a tag map from its binary format.
+
+        :type binary: bytes or bytearray
+        :param binary: The encoded tag map.
+
+        :rtype: :class:`~opencensus.tags.tag_map.FrozenTagMap`
+        :returns: The decoded tag map, shared by the callers decoding the
+                  same bytes. Copy it into a
+                  :class:`~opencensus.tags.tag_map.TagMap` to modify it.
+        """
         if len(binary) <= 0:
             logging.warning("Input byte[] cannot be empty/")
-            return tag_map_module.TagMap()
+            return tag_map_module.FrozenTagMap()
         else:
             buffer = memoryview(binary)
             version_id = buffer[0]
@@ -42,22 +133,35 @@ class BinarySerializer(object):
                 version_id = ord(version_id)
             if version_id != VERSION_ID:
                 raise ValueError("Invalid version id.")
-            return self._parse_tags(buffer)
+
+            key = bytes(binary)
+            tag_context = _decoded_tag_maps.get(key)
+            if tag_context is None:
+                tag_context = self._parse_tags(buffer).freeze()
+                _decoded_tag_maps.put(key, tag_context)
+            return tag_context
 
     def to_byte_array(self, tag_context):
-        encoded_bytes = b''
-        encoded_bytes += _VarintBytes(VERSION_ID)
+        encoded_strs = []
         total_chars = 0
+        size = _varint_size(VERSION_ID)
         for tag in tag_context:
-            tag_key, tag_value = tag
-            total_chars += len(tag_key)
-            total_chars += len(tag_value)
-            encoded_bytes = self._encode_tag(
-                tag_key, tag_value, encoded_bytes)
-        if total_chars <= TAG_MAP_SERIALIZED_SIZE_LIMIT:
-            return encoded_bytes
-        else:  # pragma: NO COVER
+            for tag_str in tag:
+                total_chars += len(tag_str)
+                tag_str = tag_str.encode(UTF8)
+                encoded_strs.append(tag_str)
+                size += _varint_size(len(tag_str)) + len(tag_str)
+        if total_chars > TAG_MAP_SERIALIZED_SIZE_LIMIT:  # pragma: NO COVER
             logging.warning("Size of the tag context exceeds the maximum size")
+            return None
+
+        size += _varint_size(TAG_FIELD_ID) * (len(encoded_strs) // 2)
+        buffer = bytearray(size)
+        pos = _encode_varint(VERSION_ID, buffer, 0)
+        for ii in range(0, len(encoded_strs), 2):
+            pos = self._encode_tag(
+                encoded_strs[ii], encoded_strs[ii + 1], buffer, pos)
+        return bytes(buffer)
 
     def _parse_tags(self, buffer):
         tag_context = tag_map_module.TagMap()
@@ -65,17 +169,12 @@ class BinarySerializer(object):
         total_chars = 0
         i = 1
         while i < limit:
-            field_id = buffer[i] if six.PY3 else ord(buffer[i])
+            field_id, i = _decode_varint(buffer, i)
             if field_id == TAG_FIELD_ID:
-                i += 1
-                key = self._decode_string(buffer, i)
-                i += len(key)
+                key, i = self._decode_string(buffer, i)
                 total_chars += len(key)
-                i += 1
-                val = self._decode_string(buffer, i)
-                i += len(val)
+                val, i = self._decode_string(buffer, i)
                 total_chars += len(val)
-                i += 1
                 if total_chars > \
                         TAG_MAP_SERIALIZED_SIZE_LIMIT:  # pragma: NO COVER
                     logging.warning("Size of the tag context exceeds maximum")
@@ -86,24 +185,23 @@ class BinarySerializer(object):
                 break
         return tag_context
 
-    def _encode_tag(self, tag_key, tag_value, encoded_bytes):
-        encoded_bytes += _VarintBytes(TAG_FIELD_ID)
-        encoded_bytes = self._encode_string(tag_key, encoded_bytes)
-        encoded_bytes = self._encode_string(tag_value, encoded_bytes)
-        return encoded_bytes
+    def _encode_tag(self, tag_key, tag_value, buffer, pos):
+        pos = _encode_varint(TAG_FIELD_ID, buffer, pos)
+        pos = self._encode_string(tag_key, buffer, pos)
+        return self._encode_string(tag_value, buffer, pos)
 
-    def _encode_string(self, input_str, encoded_bytes):
-        encoded_bytes += _VarintBytes(len(input_str))
-        encoded_bytes += input_str.encode(UTF8)
-        return encoded_bytes
+    def _encode_string(self, encoded_str, buffer, pos):
+        pos = _encode_varint(len(encoded_str), buffer, pos)
+        end = pos + len(encoded_str)
+        buffer[pos:end] = encoded_str
+        return end
 
     def _decode_string(self, buffer, pos):
-        length = buffer[pos] if six.PY3 else ord(buffer[pos])
-        builder = ""
-        i = 1
-        while i <= length:
-            bytes_to_decode = buffer[pos + i] if six.PY3 \
-                else ord(buffer[pos + i])
-            builder += _VarintBytes(bytes_to_decode).decode()
-            i += 1
-        return builder
+        length, pos = _decode_varint(buffer, pos)
+        end = pos + length
+        if end > len(buffer):
+            raise ValueError("Truncated tag context.")
+        # Slicing the memoryview doesn't copy the bytes.
+        if six.PY2:
+            return buffer[pos:end].tobytes().decode(UTF8), end
+        return str(buffer[pos:end], UTF8), end
@@ -14,6 +14,8 @@
 
 from collections import OrderedDict
 
+import six
+
 from opencensus.tags.tag_key import TagKey
 from opencensus.tags.tag_value import TagValue
 
@@ -102,3 +104,68 @@ class TagMap(object):
             return self.map[key]
         except KeyError:
             raise KeyError('key is not in map')
+
+    def freeze(self):
+        """Get an immutable copy of the map.
+
+        :rtype: :class:`FrozenTagMap`
+        :returns: A hashable tag map with the same tags.
+        """
+        return FrozenTagMap(self.map.items())
+
+
+class FrozenTagMap(TagMap):
+    """An immutable, hashable tag map.
+
+    The tag values of each list of columns the map is asked about are
+    memoized, so recording with the same tag map on many views costs a dict
+    lookup per view. The map can be shared safely across threads.
+
+    :type tags: list(:class: '~opencensus.tags.tag.Tag')
+    :param tags: a list of tags
+    """
+
+    def __init__(self, tags=None):
+        super(FrozenTagMap, self).__init__(tags)
+        self._hash = hash(frozenset(self.map.items()))
+        self._tag_values = {}
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenTagMap):
+            return NotImplemented
+        return (self._hash == other._hash and
+                six.viewitems(self.map) == six.viewitems(other.map))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('FrozenTagMap is immutable')
+
+    insert = delete = update = _immutable
+
+    def freeze(self):
+        return self
+
+    def get_tag_values(self, columns):
+        """Get the values of the tags of the given keys.
+
+        :type columns: tuple(:class: '~opencensus.tags.tag_key.TagKey')
+        :param columns: The tag keys, as in a view's columns.
+
+        :rtype: tuple
+        :returns: The value of each key, None for missing ones.
+        """
+        try:
+            return self._tag_values[columns]
+        except KeyError:
+            pass
+        tag_values = tuple(self.map.get(column) for column in columns)
+        self._tag_values[columns] = tag_values
+        return tag_values
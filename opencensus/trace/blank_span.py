@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from google.rpc import code_pb2
+
 from opencensus.trace import base_span
 from opencensus.trace.span_context import generate_span_id
 from opencensus.trace.tracers import base
@@ -68,6 +70,10 @@ class BlankSpan(base_span.BaseSpan):
         self.annotations = annotations
         self.message_events = message_events
         self.links = []
+        # Only tracked for span processors, see
+        # :class:`~opencensus.trace.tracers.noop_tracer.NoopTracer`.
+        self._start_timestamp = None
+        self._status_code = code_pb2.OK
         self.status = status
         self.same_process_as_parent_span = same_process_as_parent_span
         self._child_spans = []
@@ -78,6 +84,19 @@ class BlankSpan(base_span.BaseSpan):
     def on_create(callback):
         pass
 
+    @property
+    def status(self):
+        """The final status of the span."""
+        return self._status
+
+    @status.setter
+    def status(self, status):
+        # Integrations assign the status directly, its code is kept for span
+        # processors.
+        self._status = status
+        if status is not None:
+            self._status_code = status.canonical_code
+
     @property
     def children(self):
         """The child spans of the current BlankSpan."""
@@ -98,7 +117,8 @@ class BlankSpan(base_span.BaseSpan):
         return child_span
 
     def add_attribute(self, attribute_key, attribute_value):
-        """No-op implementation of this method.
+        """Only the attributes of errors and 5xx responses are passed to
+        the tracer of a timed span, for the flight recorder.
 
         :type attribute_key: str
         :param attribute_key: Attribute key.
@@ -106,7 +126,9 @@ class BlankSpan(base_span.BaseSpan):
         :type attribute_value:str
         :param attribute_value: Attribute value.
         """
-        pass
+        if self._start_timestamp is not None:
+            self.context_tracer._record_attribute(
+                attribute_key, attribute_value)
 
     def add_annotation(self, description, **attrs):
         """No-op implementation of this method.
@@ -137,12 +159,12 @@ class BlankSpan(base_span.BaseSpan):
         pass
 
     def set_status(self, status):
-        """No-op implementation of this method.
+        """Only keeps the status code, for span processors.
 
         :type code: :class: `~opencensus.trace.status.Status`
         :param code: A Status object.
         """
-        pass
+        self._status_code = status.canonical_code
 
     def start(self):
         """No-op implementation of this method."""
@@ -162,4 +184,7 @@ class BlankSpan(base_span.BaseSpan):
 
     def __exit__(self, exception_type, exception_value, traceback):
         """Finish a span."""
-        pass
+        if exception_value is not None:
+            self._status_code = code_pb2.UNKNOWN
+        if self._start_timestamp is not None:
+            self.context_tracer.end_span()
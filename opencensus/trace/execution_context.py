@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from opencensus.common import schedule
 from opencensus.common.runtime_context import RuntimeContext
 from opencensus.trace.tracers import noop_tracer
 
@@ -22,54 +23,62 @@ _tracer_slot = RuntimeContext.register_slot('tracer', noop_tracer.NoopTracer())
 
 
 def is_exporter():
-    return RuntimeContext.is_exporter
+    return _exporter_slot.current().is_exporter
 
 
 def set_is_exporter(is_exporter):
-    RuntimeContext.is_exporter = is_exporter
+    _exporter_slot.set(is_exporter)
+
+
+def _swap_is_exporter(is_exporter):
+    previous = _exporter_slot.current().is_exporter
+    _exporter_slot.set(is_exporter)
+    return previous
+
+
+# The calls run by the schedulers are marked as exporter calls.
+schedule.set_exporter_hook(_swap_is_exporter)
 
 
 def get_opencensus_tracer():
     """Get the opencensus tracer from runtime context."""
-    return RuntimeContext.tracer
+    return _tracer_slot.current().tracer
 
 
 def set_opencensus_tracer(tracer):
     """Add the tracer to runtime context."""
-    RuntimeContext.tracer = tracer
+    _tracer_slot.set(tracer)
 
 
 def set_opencensus_attr(attr_key, attr_value):
-    attrs = RuntimeContext.attrs.copy()
-    attrs[attr_key] = attr_value
-    RuntimeContext.attrs = attrs
+    # The attrs are only copied if they were shared since the last update.
+    _attrs_slot.get_mutable()[attr_key] = attr_value
 
 
 def set_opencensus_attrs(attrs):
-    RuntimeContext.attrs = attrs
+    _attrs_slot.set(attrs)
 
 
 def get_opencensus_attr(attr_key):
-    return RuntimeContext.attrs.get(attr_key)
+    return _attrs_slot.current().attrs.get(attr_key)
 
 
 def get_opencensus_attrs():
-    return RuntimeContext.attrs
+    return _attrs_slot.get()
 
 
 def get_current_span():
-    return RuntimeContext.current_span
+    return _current_span_slot.current().current_span
 
 
 def set_current_span(current_span):
-    RuntimeContext.current_span = current_span
+    _current_span_slot.set(current_span)
 
 
 def get_opencensus_full_context():
-    attrs = RuntimeContext.attrs
-    current_span = RuntimeContext.current_span
-    tracer = RuntimeContext.tracer
-    return tracer, current_span, attrs
+    attrs = _attrs_slot.get()
+    context = _tracer_slot.current()
+    return context.tracer, context.current_span, attrs
 
 
 def set_opencensus_full_context(tracer, span, attrs):
@@ -14,8 +14,7 @@
 
 """Export the trace spans to a local file."""
 
-import json
-
+from opencensus.common import json_serializer
 from opencensus.common.transports import sync
 from opencensus.trace import base_exporter, span_data
 
@@ -35,8 +34,9 @@ class FileExporter(base_exporter.Exporter):
                       :class:`.AsyncTransport`.
 
     :type file_mode: str
-    :param file_mode: The file mode to open the output file with.
-                      Defaults to w+
+    :param file_mode: The file mode to open the output file with, UTF-8
+                      encoded JSON is written in binary modes. Defaults to
+                      w+
 
     """
 
@@ -58,8 +58,10 @@ class FileExporter(base_exporter.Exporter):
             # convert to the legacy trace json for easier refactoring
             # TODO: refactor this to use the span data directly
             legacy_trace_json = span_data.format_legacy_trace_json(span_datas)
-            trace_str = json.dumps(legacy_trace_json)
-            file.write(trace_str)
+            if 'b' in self.file_mode:
+                json_serializer.dump(legacy_trace_json, file)
+            else:
+                file.write(json_serializer.dumps(legacy_trace_json))
 
     def export(self, span_datas):
         """
@@ -0,0 +1,193 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Keeps compact records of recent unsampled traces, so that failed
+requests can still be exported.
+"""
+
+import datetime
+import threading
+from collections import deque
+
+from google.rpc import code_pb2
+
+from opencensus.common import utils
+from opencensus.common.transports.async_ import AsyncTransport
+from opencensus.trace import span_data as span_data_module
+from opencensus.trace import status as status_module
+from opencensus.trace.span_context import SpanContext
+
+DEFAULT_MAX_TRACES = 100
+DEFAULT_MAX_SPANS_PER_TRACE = 64
+
+# Span status codes that make the trace be exported. These include the codes
+# of exceptions and of 5xx HTTP responses, see
+# :func:`opencensus.trace.utils.status_from_http_code`.
+ERROR_STATUS_CODES = frozenset([
+    code_pb2.UNKNOWN,
+    code_pb2.INTERNAL,
+    code_pb2.UNIMPLEMENTED,
+    code_pb2.UNAVAILABLE,
+    code_pb2.DEADLINE_EXCEEDED,
+    code_pb2.DATA_LOSS,
+])
+
+
+class TraceRecord(object):
+    """The spans of an unsampled local trace, as tuples of
+    ``(span_id, parent_span_id, name, span_kind, start_timestamp,
+    duration_ms, status_code)``.
+
+    :type recorder: :class:`FlightRecorder`
+    :param recorder: The recorder that keeps this trace.
+
+    :type trace_id: str
+    :param trace_id: The trace id of the request.
+
+    :type parent_span_id: str
+    :param parent_span_id: The span id of the remote parent, if any.
+    """
+
+    __slots__ = ('recorder', 'trace_id', 'parent_span_id', 'spans',
+                 'dropped_spans', 'error')
+
+    def __init__(self, recorder, trace_id, parent_span_id=None):
+        self.recorder = recorder
+        self.trace_id = trace_id
+        self.parent_span_id = parent_span_id
+        self.spans = []
+        self.dropped_spans = 0
+        self.error = False
+
+    def add_span(self, span_id, parent_span_id, name, span_kind,
+                 start_timestamp, duration_ms, status_code):
+        """Record an ended span."""
+        if status_code in ERROR_STATUS_CODES:
+            self.error = True
+        if len(self.spans) >= self.recorder.max_spans_per_trace:
+            self.dropped_spans += 1
+            return
+        self.spans.append((span_id, parent_span_id, name, span_kind,
+                           start_timestamp, duration_ms, status_code))
+
+    def end(self):
+        """End the local trace, exporting it if it failed."""
+        self.recorder.end_trace(self)
+
+    def to_span_datas(self):
+        """Convert the recorded spans into SpanData tuples."""
+        context = SpanContext(trace_id=self.trace_id)
+        span_datas = []
+        for (span_id, parent_span_id, name, span_kind, start_timestamp,
+             duration_ms, status_code) in self.spans:
+            start = datetime.datetime.utcfromtimestamp(start_timestamp)
+            end = start + datetime.timedelta(milliseconds=duration_ms)
+            span_datas.append(span_data_module.SpanData(
+                name=name,
+                context=context,
+                span_id=span_id,
+                parent_span_id=parent_span_id,
+                attributes={},
+                start_time=utils.to_iso_str(start),
+                end_time=utils.to_iso_str(end),
+                child_span_count=0,
+                stack_trace=None,
+                annotations=[],
+                message_events=[],
+                links=[],
+                status=status_module.Status(status_code),
+                same_process_as_parent_span=None,
+                span_kind=span_kind or 0,
+            ))
+        return span_datas
+
+
+class FlightRecorder(object):
+    """A bounded ring buffer of the most recent unsampled traces.
+
+    Unsampled traces that end with an error status, from an exception, a
+    5xx response or an error attribute, are exported retroactively. Other
+    traces are kept until newer ones push them out, and can be exported
+    with :meth:`promote`.
+
+    :type exporter: :class:`~opencensus.trace.base_exporter.Exporter`
+    :param exporter: The exporter used for promoted traces.
+
+    :type max_traces: int
+    :param max_traces: (Optional) Maximum number of traces kept.
+
+    :type max_spans_per_trace: int
+    :param max_spans_per_trace: (Optional) Maximum number of spans kept per
+                                trace, further spans are only counted.
+
+    :type transport: :class:`type`
+    :param transport: (Optional) Class for creating the transport emitting
+                      the promoted traces with the exporter, off the request
+                      threads by default.
+    """
+
+    def __init__(self, exporter, max_traces=DEFAULT_MAX_TRACES,
+                 max_spans_per_trace=DEFAULT_MAX_SPANS_PER_TRACE,
+                 transport=AsyncTransport):
+        self.exporter = exporter
+        self.transport = transport(exporter)
+        self.max_spans_per_trace = max_spans_per_trace
+        self._lock = threading.Lock()
+        self._traces = deque(maxlen=max_traces)
+
+    def start_trace(self, span_context):
+        """Start recording an unsampled trace.
+
+        :type span_context: :class:`~opencensus.trace.span_context.SpanContext`
+        :param span_context: The span context of the request.
+
+        :rtype: :class:`TraceRecord`
+        """
+        return TraceRecord(self, span_context.trace_id, span_context.span_id)
+
+    def end_trace(self, trace_record):
+        if trace_record.error:
+            self.export(trace_record)
+            return
+        with self._lock:
+            self._traces.append(trace_record)
+
+    def get_traces(self):
+        """Return the recorded traces, oldest first."""
+        with self._lock:
+            return list(self._traces)
+
+    def promote(self, trace_id):
+        """Export a recorded trace.
+
+        :type trace_id: str
+        :param trace_id: The id of the trace to export.
+
+        :rtype: bool
+        :returns: Whether the trace was still recorded.
+        """
+        with self._lock:
+            for trace_record in self._traces:
+                if trace_record.trace_id == trace_id:
+                    self._traces.remove(trace_record)
+                    break
+            else:
+                return False
+        self.export(trace_record)
+        return True
+
+    def export(self, trace_record):
+        span_datas = trace_record.to_span_datas()
+        if span_datas:
+            self.transport.export(span_datas)
@@ -0,0 +1,274 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import OrderedDict
+
+from opencensus.trace.propagation import (
+    b3_format,
+    google_cloud_format,
+    trace_context_http_header_format,
+)
+from opencensus.trace.propagation.tracestate_string_format import (
+    TracestateStringFormatter,
+)
+from opencensus.trace.span_context import SpanContext
+from opencensus.trace.trace_options import TraceOptions
+from opencensus.trace.tracestate import Tracestate
+
+DEFAULT_CACHE_SIZE = 128
+
+_TRACEPARENT_HEADER_NAME = 'traceparent'
+_TRACESTATE_HEADER_NAME = 'tracestate'
+_B3_HEADER_NAMES = (
+    b3_format._STATE_HEADER_KEY,
+    b3_format._TRACE_ID_KEY,
+    b3_format._SPAN_ID_KEY,
+    b3_format._SAMPLED_KEY,
+)
+_GOOGLE_CLOUD_HEADER_NAME = \
+    google_cloud_format._TRACE_CONTEXT_HEADER_NAME.lower()
+
+_HEADER_NAMES = frozenset(
+    (_TRACEPARENT_HEADER_NAME, _TRACESTATE_HEADER_NAME,
+     _GOOGLE_CLOUD_HEADER_NAME) + _B3_HEADER_NAMES)
+
+# Length of 'vv-<32 hex trace id>-<16 hex span id>-oo'.
+_TRACEPARENT_LENGTH = 55
+_HEX_DIGITS = '0123456789abcdef'
+_INVALID_TRACE_ID = '0' * 32
+_INVALID_SPAN_ID = '0' * 16
+
+
+def _parse_traceparent(header):
+    """Parse a traceparent header without regular expressions.
+
+    :rtype: tuple
+    :returns: The trace id, span id and trace options, None if the header is
+              invalid, or False if the header isn't of the fixed width.
+    """
+    header = header.strip(' \t')
+    if len(header) != _TRACEPARENT_LENGTH:
+        return False
+    if header[2] != '-' or header[35] != '-' or header[52] != '-':
+        return None
+
+    version = header[0:2]
+    trace_id = header[3:35]
+    span_id = header[36:52]
+    trace_options = header[53:55]
+    if (version + trace_id + span_id + trace_options).strip(_HEX_DIGITS):
+        return None
+    if version == 'ff':
+        return None
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    # TraceOptions parses decimal strings, the header has a hex byte.
+    return trace_id, span_id, str(int(trace_options, 16))
+
+
+def _to_parsed(span_context):
+    """Get the parsed fields of a propagated span context, or None if the
+    headers didn't carry a valid one.
+    """
+    if not span_context.from_header:
+        return None
+    return (span_context.trace_id, span_context.span_id,
+            span_context.trace_options.trace_options_byte)
+
+
+class _ParsedHeaderCache(object):
+    """A thread-safe LRU cache of parsed header values."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._cache.pop(key)
+            except KeyError:
+                return default
+            self._cache[key] = value
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = value
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+_MISSING = object()
+
+
+class CompositePropagator(object):
+    """Propagator accepting W3C trace context, B3 and Google Cloud headers.
+
+    The header mapping is scanned once, matching header names case
+    insensitively. The formats are tried in the order traceparent, B3 and
+    X-Cloud-Trace-Context, the first one carrying a valid span context is
+    used.
+
+    Recently parsed header values are kept in a small LRU cache, since
+    requests on a keep-alive connection often repeat the same parent.
+
+    :type cache_size: int
+    :param cache_size: (Optional) Maximum number of cached header values,
+                       0 disables the cache.
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        self._cache = _ParsedHeaderCache(cache_size)
+        self._trace_context_propagator = \
+            trace_context_http_header_format.TraceContextPropagator()
+        self._b3_propagator = b3_format.B3FormatPropagator()
+        self._google_cloud_propagator = \
+            google_cloud_format.GoogleCloudFormatPropagator()
+
+    def _get_headers(self, headers):
+        found = {}
+        for name, value in headers.items():
+            if value is None:
+                continue
+            name = name.lower()
+            if name in _HEADER_NAMES:
+                found[name] = value
+        return found
+
+    def _parse(self, parse, header):
+        if not self._cache.maxsize:
+            return parse(header)
+        parsed = self._cache.get(header, _MISSING)
+        if parsed is _MISSING:
+            parsed = parse(header)
+            self._cache.put(header, parsed)
+        return parsed
+
+    def _parse_traceparent(self, header):
+        parsed = _parse_traceparent(header[1])
+        if parsed is False:
+            parsed = _to_parsed(self._trace_context_propagator.from_headers(
+                {_TRACEPARENT_HEADER_NAME: header[1]}))
+        return parsed
+
+    def _parse_b3(self, header):
+        return _to_parsed(self._b3_propagator.from_headers(
+            dict(zip(_B3_HEADER_NAMES, header))))
+
+    def _parse_google_cloud(self, header):
+        return _to_parsed(
+            self._google_cloud_propagator.from_header(header[1]))
+
+    def _parse_tracestate(self, header):
+        try:
+            tracestate = TracestateStringFormatter().from_string(header[1])
+        except ValueError:
+            return None
+        if not tracestate.is_valid():
+            return None
+        return tracestate
+
+    def from_headers(self, headers):
+        """Generate a SpanContext object from the first valid trace context
+        in the headers.
+
+        :type headers: dict
+        :param headers: HTTP request headers.
+
+        :rtype: :class:`~opencensus.trace.span_context.SpanContext`
+        :returns: SpanContext generated from the headers.
+        """
+        if not headers:
+            return SpanContext()
+
+        found = self._get_headers(headers)
+
+        # Cache keys are tuples starting with the header name, or all the
+        # B3 header values.
+        parsed = None
+        header = found.get(_TRACEPARENT_HEADER_NAME)
+        if header is not None:
+            parsed = self._parse(self._parse_traceparent,
+                                 (_TRACEPARENT_HEADER_NAME, header))
+            if parsed is not None:
+                span_context = self._make_span_context(parsed)
+                self._set_tracestate(
+                    span_context, found.get(_TRACESTATE_HEADER_NAME))
+                return span_context
+
+        b3_headers = tuple(found.get(name) for name in _B3_HEADER_NAMES)
+        if any(b3_headers):
+            parsed = self._parse(self._parse_b3, b3_headers)
+
+        header = found.get(_GOOGLE_CLOUD_HEADER_NAME)
+        if parsed is None and header is not None:
+            parsed = self._parse(self._parse_google_cloud,
+                                 (_GOOGLE_CLOUD_HEADER_NAME, header))
+
+        if parsed is None:
+            return SpanContext()
+        return self._make_span_context(parsed)
+
+    def _make_span_context(self, parsed):
+        trace_id, span_id, trace_options = parsed
+        return SpanContext(
+            trace_id=trace_id,
+            span_id=span_id,
+            trace_options=TraceOptions(trace_options),
+            from_header=True)
+
+    def _set_tracestate(self, span_context, header):
+        if header is None:
+            return
+        tracestate = self._parse(self._parse_tracestate,
+                                 (_TRACESTATE_HEADER_NAME, header))
+        if tracestate is not None:
+            # The cached tracestate is shared, give each context its own
+            # copy, without validating the members again.
+            span_context.tracestate = Tracestate()
+            for key, value in tracestate.items():
+                OrderedDict.__setitem__(span_context.tracestate, key, value)
+
+    def to_headers(self, span_context):
+        """Convert a SpanContext object to trace context, B3 and Google Cloud
+        headers.
+
+        :type span_context:
+            :class:`~opencensus.trace.span_context.SpanContext`
+        :param span_context: SpanContext object.
+
+        :rtype: dict
+        :returns: Trace context headers in all three formats.
+        """
+        headers = {}
+        if span_context.span_id is not None:
+            headers.update(
+                self._google_cloud_propagator.to_headers(span_context))
+        headers.update(self._b3_propagator.to_headers(span_context))
+        headers.update(
+            self._trace_context_propagator.to_headers(span_context))
+        return headers
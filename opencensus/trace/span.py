@@ -20,6 +20,7 @@ except ImportError:
     from collections import Sequence
 
 import threading
+import time
 from collections import OrderedDict, deque
 from datetime import datetime
 from itertools import chain
@@ -28,6 +29,7 @@ from opencensus.common import utils
 from opencensus.trace import attributes as attributes_module
 from opencensus.trace import base_span
 from opencensus.trace import link as link_module
+from opencensus.trace import span_processor
 from opencensus.trace import stack_trace as stack_trace_module
 from opencensus.trace import status as status_module
 from opencensus.trace import time_event
@@ -273,6 +275,8 @@ class Span(base_span.BaseSpan):
         self._child_spans = []
         self.context_tracer = context_tracer
         self.span_kind = span_kind
+        self._start_timestamp = None
+        self.duration_ms = None
         for callback in Span._on_create_callbacks:
             callback(self)
 
@@ -363,10 +367,21 @@ class Span(base_span.BaseSpan):
     def start(self):
         """Set the start time for a span."""
         self.start_time = utils.to_iso_str()
+        self._start_timestamp = time.time()
 
     def finish(self):
         """Set the end time for a span."""
         self.end_time = utils.to_iso_str()
+        if self._start_timestamp is None:
+            return
+        self.duration_ms = (time.time() - self._start_timestamp) * 1000
+        self._start_timestamp = None
+        if span_processor.get_span_processors():
+            span_processor.notify_span_end(
+                self.name,
+                self.span_kind,
+                self.status.canonical_code,
+                self.duration_ms)
 
     def __iter__(self):
         """Iterate through the span tree."""
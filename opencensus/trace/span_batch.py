@@ -0,0 +1,213 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar representation of a batch of finished spans for exporters."""
+
+from opencensus.common.utils import timestamp_to_microseconds
+from opencensus.trace.span_data import SpanData
+
+# Length of the 'YYYY-MM-DDTHH:MM:SS' prefix of ISO timestamps.
+_SECONDS_PREFIX_LEN = 19
+# Length of 'YYYY-MM-DDTHH:MM:SS.ffffffZ' timestamps.
+_TIMESTAMP_LEN = 27
+
+
+class SpanBatch(object):
+    """A batch of finished spans stored as parallel lists, one entry per
+    span, instead of one :class:`~opencensus.trace.span_data.SpanData` per
+    span.
+
+    Attributes are stored as tuples of indexes into a table of unique
+    ``(key, value)`` pairs, so translators convert each distinct attribute
+    once per batch rather than once per span. Spans of a batch usually
+    share their timestamps' seconds, which are also only parsed once.
+
+    Use :meth:`from_span_datas` to build a batch, exporters accepting a
+    batch produce the same output as for the equivalent list of SpanData.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.contexts = []
+        self.trace_ids = []
+        self.span_ids = []
+        self.parent_span_ids = []
+        self.start_times = []
+        self.end_times = []
+        self.span_kinds = []
+        self.statuses = []
+        self.child_span_counts = []
+        self.stack_traces = []
+        self.annotations = []
+        self.message_events = []
+        self.links = []
+        self.same_process_as_parent_spans = []
+        # Per span tuple of indexes into ``attribute_table``.
+        self.attributes = []
+        self.attribute_table = []
+        self._attribute_indexes = {}
+        self._start_microseconds = None
+        self._end_microseconds = None
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_span_datas(cls, span_datas):
+        """Build a batch from finished spans.
+
+        :type span_datas: list of :class:
+            `~opencensus.trace.span_data.SpanData`
+        :param span_datas: The finished spans.
+
+        :rtype: :class:`SpanBatch`
+        """
+        if isinstance(span_datas, cls):
+            return span_datas
+        batch = cls()
+        for span_data in span_datas:
+            batch.append(span_data)
+        return batch
+
+    def append(self, span_data):
+        """Add a finished span to the batch."""
+        context = span_data.context
+        self.names.append(span_data.name)
+        self.contexts.append(context)
+        self.trace_ids.append(
+            context.trace_id if context is not None else None)
+        self.span_ids.append(span_data.span_id)
+        self.parent_span_ids.append(span_data.parent_span_id)
+        self.start_times.append(span_data.start_time)
+        self.end_times.append(span_data.end_time)
+        self.span_kinds.append(span_data.span_kind)
+        self.statuses.append(span_data.status)
+        self.child_span_counts.append(span_data.child_span_count)
+        self.stack_traces.append(span_data.stack_trace)
+        self.annotations.append(span_data.annotations)
+        self.message_events.append(span_data.message_events)
+        self.links.append(span_data.links)
+        self.same_process_as_parent_spans.append(
+            span_data.same_process_as_parent_span)
+        self.attributes.append(self._intern_attributes(span_data.attributes))
+        self._start_microseconds = None
+        self._end_microseconds = None
+
+    def _intern_attributes(self, attributes):
+        if not attributes:
+            return ()
+        indexes = []
+        for item in attributes.items():
+            try:
+                index = self._attribute_indexes.get(item)
+                hashable = True
+            except TypeError:
+                # Unhashable values are stored without deduplication.
+                index, hashable = None, False
+            if index is None:
+                index = len(self.attribute_table)
+                self.attribute_table.append(item)
+                if hashable:
+                    self._attribute_indexes[item] = index
+            indexes.append(index)
+        return tuple(indexes)
+
+    def get_attributes(self, index):
+        """Get the attributes of a span as a dict."""
+        table = self.attribute_table
+        return dict(table[ii] for ii in self.attributes[index])
+
+    def convert_attributes(self, convert):
+        """Convert every distinct attribute of the batch.
+
+        :type convert: callable
+        :param convert: Called with the key and the value of each distinct
+                        attribute, returning the converted attribute or
+                        None to skip it.
+
+        :rtype: list
+        :returns: Per span lists of the converted attributes.
+        """
+        converted = [convert(key, value)
+                     for key, value in self.attribute_table]
+        return [[converted[ii] for ii in indexes
+                 if converted[ii] is not None]
+                for indexes in self.attributes]
+
+    @property
+    def start_microseconds(self):
+        """The start times of the spans in microseconds since epoch."""
+        if self._start_microseconds is None:
+            self._start_microseconds = _to_microseconds(self.start_times)
+        return self._start_microseconds
+
+    @property
+    def end_microseconds(self):
+        """The end times of the spans in microseconds since epoch."""
+        if self._end_microseconds is None:
+            self._end_microseconds = _to_microseconds(self.end_times)
+        return self._end_microseconds
+
+    def get_span_datas(self):
+        """Convert the batch back into SpanData tuples."""
+        return [SpanData(
+            name=self.names[ii],
+            context=self.contexts[ii],
+            span_id=self.span_ids[ii],
+            parent_span_id=self.parent_span_ids[ii],
+            attributes=self.get_attributes(ii),
+            start_time=self.start_times[ii],
+            end_time=self.end_times[ii],
+            child_span_count=self.child_span_counts[ii],
+            stack_trace=self.stack_traces[ii],
+            annotations=self.annotations[ii],
+            message_events=self.message_events[ii],
+            links=self.links[ii],
+            status=self.statuses[ii],
+            same_process_as_parent_span=self.same_process_as_parent_spans[ii],
+            span_kind=self.span_kinds[ii],
+        ) for ii in range(len(self))]
+
+    def group_by_trace(self):
+        """Get the span indexes of each trace in the batch.
+
+        :rtype: dict
+        :returns: Lists of span indexes keyed by trace id.
+        """
+        traces = {}
+        for ii, trace_id in enumerate(self.trace_ids):
+            traces.setdefault(trace_id, []).append(ii)
+        return traces
+
+
+def _to_microseconds(timestamps):
+    """Convert ISO timestamps into microseconds, parsing the seconds of
+    identical 'YYYY-MM-DDTHH:MM:SS' prefixes only once.
+    """
+    seconds = {}
+    result = []
+    for timestamp in timestamps:
+        if timestamp is None:
+            result.append(None)
+            continue
+        if len(timestamp) != _TIMESTAMP_LEN:
+            result.append(timestamp_to_microseconds(timestamp))
+            continue
+        prefix = timestamp[:_SECONDS_PREFIX_LEN]
+        mus = seconds.get(prefix)
+        if mus is None:
+            mus = seconds[prefix] = timestamp_to_microseconds(
+                prefix + '.000000Z')
+        result.append(mus + int(timestamp[_SECONDS_PREFIX_LEN + 1:-1]))
+    return result
@@ -103,9 +103,11 @@ class SpanData(_SpanData):
     __slots__ = ()
 
 
-def _format_legacy_span_json(span_data):
+def _format_legacy_span_json(span_data, stack_trace_window=None):
     """
     :param SpanData span_data: SpanData object to convert
+    :param StackTraceWindow stack_trace_window: (Optional) Stack traces sent
+        within the window are formatted by hash id only
     :rtype: dict
     :return: Dictionary representing the Span
     """
@@ -126,8 +128,11 @@ def _format_legacy_span_json(span_data):
             span_data.attributes).format_attributes_json()
 
     if span_data.stack_trace is not None:
+        hash_only = stack_trace_window is not None and \
+            stack_trace_window.is_sent(
+                span_data.stack_trace.stack_trace_hash_id)
         span_json['stackTrace'] = \
-            span_data.stack_trace.format_stack_trace_json()
+            span_data.stack_trace.format_stack_trace_json(hash_only)
 
     formatted_time_events = []
     if span_data.annotations:
@@ -161,13 +166,17 @@ def _format_legacy_span_json(span_data):
     return span_json
 
 
-def format_legacy_trace_json(span_datas):
+def format_legacy_trace_json(span_datas, stack_trace_window=None):
     """Formats a list of SpanData tuples into the legacy 'trace' dictionary
     format for backwards compatibility
     :type span_datas: list of :class:
             `~opencensus.trace.span_data.SpanData`
     :param list of opencensus.trace.span_data.SpanData span_datas:
         SpanData tuples to emit
+    :type stack_trace_window: :class:
+            `~opencensus.trace.stack_trace.StackTraceWindow`
+    :param stack_trace_window: (Optional) Stack traces sent within the window
+        are formatted by hash id only
     :rtype: dict
     :return: Legacy 'trace' dictionary representing given SpanData tuples
     """
@@ -180,5 +189,6 @@ def format_legacy_trace_json(span_datas):
     assert trace_id is not None
     return {
         'traceId': trace_id,
-        'spans': [_format_legacy_span_json(sd) for sd in span_datas],
+        'spans': [_format_legacy_span_json(sd, stack_trace_window)
+                  for sd in span_datas],
     }
@@ -0,0 +1,136 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Request rate, error and duration metrics derived from spans."""
+
+import threading
+
+from opencensus.stats import aggregation as aggregation_module
+from opencensus.stats import measure as measure_module
+from opencensus.stats import stats as stats_module
+from opencensus.stats import view as view_module
+from opencensus.tags import tag_key as tag_key_module
+from opencensus.tags import tag_map as tag_map_module
+from opencensus.tags import tag_value as tag_value_module
+from opencensus.tags import validation
+from opencensus.trace import span_processor
+
+SPAN_NAME_KEY = tag_key_module.TagKey('span_name')
+SPAN_KIND_KEY = tag_key_module.TagKey('span_kind')
+SPAN_STATUS_KEY = tag_key_module.TagKey('status_code')
+
+SPAN_LATENCY_MEASURE = measure_module.MeasureFloat(
+    'opencensus/span/latency',
+    'The latency of ended spans',
+    'ms')
+
+DEFAULT_LATENCY_BOUNDARIES = [
+    1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# Bounds the tag map cache in case span names have a high cardinality.
+MAX_CACHED_TAG_MAPS = 1024
+
+_SPAN_KIND_NAMES = {
+    0: 'UNSPECIFIED',
+    1: 'SERVER',
+    2: 'CLIENT',
+}
+
+
+def _to_tag_value(value):
+    value = value[:255]
+    if not validation.is_legal_chars(value):
+        value = ''.join(
+            cc if 32 <= ord(cc) <= 126 else '_' for cc in value)
+    return tag_value_module.TagValue(value)
+
+
+class SpanMetricsProcessor(span_processor.SpanProcessor):
+    """Records the count and latency distribution of every ended span,
+    keyed by span name, span kind and status code.
+
+    Since span processors also run for unsampled traces, the recorded
+    metrics stay accurate with any trace sampling rate.
+
+    :type latency_boundaries: list(float)
+    :param latency_boundaries: (Optional) Bucket boundaries of the latency
+                               distribution in milliseconds.
+
+    :type view_manager: :class:`~opencensus.stats.view_manager.ViewManager`
+    :param view_manager: (Optional) The view manager to register the views
+                         with. Defaults to the global one.
+
+    :type stats_recorder:
+        :class:`~opencensus.stats.stats_recorder.StatsRecorder`
+    :param stats_recorder: (Optional) The recorder used to record the
+                           measurements. Defaults to the global one.
+    """
+
+    def __init__(self, latency_boundaries=None, view_manager=None,
+                 stats_recorder=None):
+        if latency_boundaries is None:
+            latency_boundaries = DEFAULT_LATENCY_BOUNDARIES
+        if view_manager is None:
+            view_manager = stats_module.stats.view_manager
+        if stats_recorder is None:
+            stats_recorder = stats_module.stats.stats_recorder
+
+        columns = [SPAN_NAME_KEY, SPAN_KIND_KEY, SPAN_STATUS_KEY]
+        self.latency_view = view_module.View(
+            'opencensus/span/latency',
+            'The latency distribution of ended spans',
+            columns,
+            SPAN_LATENCY_MEASURE,
+            aggregation_module.DistributionAggregation(latency_boundaries))
+        self.count_view = view_module.View(
+            'opencensus/span/count',
+            'The number of ended spans',
+            columns,
+            SPAN_LATENCY_MEASURE,
+            aggregation_module.CountAggregation())
+        view_manager.register_view(self.latency_view)
+        view_manager.register_view(self.count_view)
+
+        self._stats_recorder = stats_recorder
+        self._tag_maps_lock = threading.Lock()
+        self._tag_maps = {}
+
+    def _get_tag_map(self, name, span_kind, status_code):
+        key = (name, span_kind, status_code)
+        tag_map = self._tag_maps.get(key)
+        if tag_map is None:
+            tag_map = tag_map_module.TagMap()
+            tag_map.insert(SPAN_NAME_KEY, _to_tag_value(name or ''))
+            tag_map.insert(SPAN_KIND_KEY, _SPAN_KIND_NAMES.get(
+                span_kind or 0, str(span_kind)))
+            tag_map.insert(SPAN_STATUS_KEY, str(status_code))
+            tag_map = tag_map.freeze()
+            with self._tag_maps_lock:
+                if len(self._tag_maps) >= MAX_CACHED_TAG_MAPS:
+                    self._tag_maps.clear()
+                self._tag_maps[key] = tag_map
+        return tag_map
+
+    def on_end(self, name, span_kind, status_code, latency_ms):
+        mmap = self._stats_recorder.new_measurement_map()
+        mmap.measure_float_put(SPAN_LATENCY_MEASURE, max(latency_ms, 0))
+        mmap.record(self._get_tag_map(name, span_kind, status_code))
+
+    def register(self):
+        """Start recording metrics for every ended span."""
+        span_processor.add_span_processor(self)
+
+    def unregister(self):
+        """Stop recording metrics."""
+        span_processor.remove_span_processor(self)
@@ -0,0 +1,83 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Hooks that are notified when any span ends, sampled or not."""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_processors_lock = threading.Lock()
+# Replaced rather than mutated so that readers can iterate without locking.
+_processors = ()
+
+
+class SpanProcessor(object):
+    """Base class for span processors.
+
+    Span processors are called on every span end, including the spans of
+    unsampled traces. They only receive the few fields that are available
+    without materializing the span, so they are cheap enough to run on the
+    request path.
+
+    Subclasses of :class:`SpanProcessor` must override :meth:`on_end`.
+    """
+
+    def on_end(self, name, span_kind, status_code, latency_ms):
+        """Called when a span ends.
+
+        :type name: str
+        :param name: The name of the span.
+
+        :type span_kind: int
+        :param span_kind: The kind of the span, see
+                          :class:`opencensus.trace.span.SpanKind`.
+
+        :type status_code: int
+        :param status_code: The canonical status code of the span.
+
+        :type latency_ms: float
+        :param latency_ms: The duration of the span in milliseconds.
+        """
+        raise NotImplementedError
+
+
+def add_span_processor(processor):
+    """Register a processor to be called on every span end."""
+    global _processors
+    with _processors_lock:
+        if processor not in _processors:
+            _processors = _processors + (processor,)
+
+
+def remove_span_processor(processor):
+    """Unregister a previously registered processor."""
+    global _processors
+    with _processors_lock:
+        _processors = tuple(pp for pp in _processors if pp is not processor)
+
+
+def get_span_processors():
+    """Return the registered processors."""
+    return _processors
+
+
+def notify_span_end(name, span_kind, status_code, latency_ms):
+    """Call every registered processor with the data of an ended span."""
+    for processor in _processors:
+        try:
+            processor.on_end(name, span_kind, status_code, latency_ms)
+        except Exception:  # pragma: NO COVER
+            logger.exception('Span processor %r failed.', processor)
@@ -15,12 +15,22 @@
 import hashlib
 import os
 import random
+import threading
+import time
 import traceback
+from collections import OrderedDict
 
 from opencensus.common.utils import get_truncatable_str
 
 MAX_FRAMES = 128
 
+# Number of distinct stacks whose formatted frames and hash are kept by
+# `StackTrace.from_traceback`.
+MAX_CACHED_STACK_TRACES = 256
+
+# Seconds during which a sent stack trace is only referred to by its hash id.
+DEFAULT_STACK_TRACE_WINDOW = 60
+
 BUILD_ID = os.environ.get('BUILD_ID', 'unknown')
 SOURCE_VERSION = os.environ.get('SOURCE_VERSION', 'unknown')
 
@@ -132,7 +142,25 @@ class StackTrace(object):
 
     @classmethod
     def from_traceback(cls, tb):
-        """Initializes a StackTrace from a python traceback instance"""
+        """Initializes a StackTrace from a python traceback instance.
+
+        Stacks are cached by the code objects and line numbers of their
+        frames, so that repeated exceptions from the same location do not
+        extract and hash the traceback again.
+        """
+        key = _get_traceback_key(tb)
+        cached = _stack_trace_cache.get(key)
+        if cached is None:
+            cached = cls._from_traceback(tb)
+            _stack_trace_cache.put(key, cached)
+
+        stack_trace = cls(stack_trace_hash_id=cached.stack_trace_hash_id)
+        stack_trace.stack_frames = list(cached.stack_frames)
+        stack_trace.dropped_frames_count = cached.dropped_frames_count
+        return stack_trace
+
+    @classmethod
+    def _from_traceback(cls, tb):
         stack_trace = cls(
             stack_trace_hash_id=generate_hash_id_from_traceback(tb)
         )
@@ -160,11 +188,17 @@ class StackTrace(object):
         else:
             self.stack_frames.append(stack_frame.format_stack_frame_json())
 
-    def format_stack_trace_json(self):
-        """Convert a StackTrace object to json format."""
+    def format_stack_trace_json(self, hash_only=False):
+        """Convert a StackTrace object to json format.
+
+        :type hash_only: bool
+        :param hash_only: (Optional) Leave out the stack frames, for stack
+                          traces that were already sent with the same hash
+                          id.
+        """
         stack_trace_json = {}
 
-        if self.stack_frames:
+        if self.stack_frames and not hash_only:
             stack_trace_json['stack_frames'] = {
                 'frame': self.stack_frames,
                 'dropped_frames_count': self.dropped_frames_count
@@ -187,3 +221,81 @@ def generate_hash_id_from_traceback(tb):
     # truncate the hash for easier compatibility with StackDriver,
     # should still be unique enough to avoid collisions
     return int(m.hexdigest()[:12], 16)
+
+
+def _get_traceback_key(tb):
+    key = []
+    while tb is not None:
+        key.append((tb.tb_frame.f_code, tb.tb_lineno))
+        tb = tb.tb_next
+    return tuple(key)
+
+
+class _StackTraceCache(object):
+    """A thread-safe LRU cache of stack traces."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            value = self._cache.pop(key, None)
+            if value is not None:
+                self._cache[key] = value
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = value
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_stack_trace_cache = _StackTraceCache(MAX_CACHED_STACK_TRACES)
+
+
+class StackTraceWindow(object):
+    """Tracks the stack traces sent by an exporter, so that a stack trace
+    that was sent recently can be sent by hash id only.
+
+    :type window: float
+    :param window: (Optional) Seconds after which a stack trace is sent
+                   with its frames again.
+
+    :type maxsize: int
+    :param maxsize: (Optional) Maximum number of tracked hash ids.
+    """
+
+    def __init__(self, window=DEFAULT_STACK_TRACE_WINDOW,
+                 maxsize=MAX_CACHED_STACK_TRACES):
+        self.window = window
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._sent = OrderedDict()
+
+    def is_sent(self, stack_trace_hash_id):
+        """Return whether the stack trace was sent within the window, and
+        record it as sent otherwise.
+
+        :type stack_trace_hash_id: int
+        :param stack_trace_hash_id: The hash id of the stack trace.
+
+        :rtype: bool
+        """
+        now = time.time()
+        with self._lock:
+            sent_at = self._sent.get(stack_trace_hash_id)
+            if sent_at is not None and now - sent_at < self.window:
+                return True
+            self._sent.pop(stack_trace_hash_id, None)
+            self._sent[stack_trace_hash_id] = now
+            while len(self._sent) > self.maxsize:
+                self._sent.popitem(last=False)
+            return False
@@ -36,13 +36,30 @@ class Tracer(object):
                      :class:`.Fileexporter`, :class:`.Printexporter`,
                      :class:`.Loggingexporter`, :class:`.Zipkinexporter`,
                      :class:`.GoogleCloudexporter`
+
+    :type compress_spans: bool
+    :param compress_spans: (Optional) Merge consecutive sibling spans with the
+                           same name and kind into composite spans, see
+                           :class:`.ContextTracer`.
+
+    :type max_spans: int
+    :param max_spans: (Optional) Maximum number of spans exported per trace,
+                      see :class:`.ContextTracer`.
+
+    :type flight_recorder:
+        :class:`~opencensus.trace.flight_recorder.FlightRecorder`
+    :param flight_recorder: (Optional) Keeps compact records of unsampled
+                            traces and exports the failed ones.
     """
     def __init__(
             self,
             span_context=None,
             sampler=None,
             exporter=None,
-            propagator=None):
+            propagator=None,
+            compress_spans=False,
+            max_spans=None,
+            flight_recorder=None):
         if span_context is None:
             span_context = SpanContext()
 
@@ -60,6 +77,9 @@ class Tracer(object):
         self.sampler = sampler
         self.exporter = exporter
         self.propagator = propagator
+        self.compress_spans = compress_spans
+        self.max_spans = max_spans
+        self.flight_recorder = flight_recorder
         self.tracer = self.get_tracer()
         self.store_tracer()
 
@@ -81,7 +101,13 @@ class Tracer(object):
             self.span_context.trace_options.set_enabled(True)
             return context_tracer.ContextTracer(
                 exporter=self.exporter,
-                span_context=self.span_context)
+                span_context=self.span_context,
+                compress_spans=self.compress_spans,
+                max_spans=self.max_spans)
+        if self.flight_recorder is not None:
+            return noop_tracer.NoopTracer(
+                trace_record=self.flight_recorder.start_trace(
+                    self.span_context))
         return noop_tracer.NoopTracer()
 
     def store_tracer(self):
@@ -22,15 +22,72 @@ from opencensus.trace.span_context import SpanContext
 from opencensus.trace.tracers import base
 
 
+# Attributes set on composite spans, see ``ContextTracer``.
+COMPOSITE_COUNT = 'composite.count'
+COMPOSITE_DURATION_SUM = 'composite.duration_sum_ms'
+COMPOSITE_DURATION_MIN = 'composite.duration_min_ms'
+COMPOSITE_DURATION_MAX = 'composite.duration_max_ms'
+# Set on local root spans when spans were dropped by ``max_spans``.
+DROPPED_SPAN_COUNT = 'dropped_span_count'
+
+
+class _CompositeSpan(object):
+    """Consecutive sibling spans with the same name and kind, merged into
+    a single span.
+    """
+
+    def __init__(self, span_data, duration_ms):
+        self.span_data = span_data
+        self.end_time = span_data.end_time
+        self.count = 1
+        self.duration_sum = self.duration_min = self.duration_max = \
+            duration_ms
+
+    def matches(self, span):
+        return (span.name == self.span_data.name and
+                span.span_kind == self.span_data.span_kind)
+
+    def add(self, span):
+        self.end_time = span.end_time
+        self.count += 1
+        self.duration_sum += span.duration_ms
+        self.duration_min = min(self.duration_min, span.duration_ms)
+        self.duration_max = max(self.duration_max, span.duration_ms)
+
+    def to_span_data(self):
+        if self.count == 1:
+            return self.span_data
+        attributes = dict(self.span_data.attributes)
+        attributes[COMPOSITE_COUNT] = self.count
+        attributes[COMPOSITE_DURATION_SUM] = self.duration_sum
+        attributes[COMPOSITE_DURATION_MIN] = self.duration_min
+        attributes[COMPOSITE_DURATION_MAX] = self.duration_max
+        return self.span_data._replace(
+            end_time=self.end_time, attributes=attributes)
+
+
 class ContextTracer(base.Tracer):
     """The interface for tracing a request context.
 
     :type span_context: :class:`~opencensus.trace.span_context.SpanContext`
     :param span_context: SpanContext encapsulates the current context within
                          the request's trace.
+
+    :type compress_spans: bool
+    :param compress_spans: (Optional) Merge consecutive sibling leaf spans
+                           with the same name and kind into one composite
+                           span, carrying their count and total, min and max
+                           durations as attributes. Useful for N+1 query
+                           loops.
+
+    :type max_spans: int
+    :param max_spans: (Optional) Maximum number of spans exported for the
+                      trace. Further spans are only counted, and the count
+                      is added to the local root span.
     """
 
-    def __init__(self, exporter=None, span_context=None):
+    def __init__(self, exporter=None, span_context=None,
+                 compress_spans=False, max_spans=None):
         if exporter is None:
             exporter = print_exporter.PrintExporter()
 
@@ -41,10 +98,18 @@ class ContextTracer(base.Tracer):
         self.span_context = span_context
         self.trace_id = span_context.trace_id
         self.root_span_id = span_context.span_id
+        self.compress_spans = compress_spans
+        self.max_spans = max_spans
+        self.exported_span_count = 0
+        self.dropped_span_count = 0
 
         self._spans_list_condition = threading.Condition()
         # List of spans to report
         self._spans_list = []
+        # Composite spans waiting for more siblings, by parent span id
+        self._composite_spans = {}
+        # Ids of the spans that had child spans ending
+        self._parent_span_ids = set()
 
     def finish(self):
         """Finish all spans
@@ -54,6 +119,9 @@ class ContextTracer(base.Tracer):
         """
         while self._spans_list:
             self.end_span()
+        with self._spans_list_condition:
+            for parent_span_id in list(self._composite_spans):
+                self._flush_composite_span(parent_span_id)
 
     def span(self, name='span'):
         """Create a new span with the trace using the context information.
@@ -118,12 +186,73 @@ class ContextTracer(base.Tracer):
 
         with self._spans_list_condition:
             if cur_span in self._spans_list:
-                span_datas = self.get_span_datas(cur_span)
-                self.exporter.export(span_datas)
+                self._report_span(cur_span)
                 self._spans_list.remove(cur_span)
 
         return cur_span
 
+    def _report_span(self, span):
+        """Export an ended span, merging it into a composite span first if
+        span compression is enabled. Must hold the spans list lock.
+        """
+        if not self.compress_spans:
+            self._export(span, self.get_span_datas(span))
+            return
+
+        # The children of the span can not get more siblings.
+        self._flush_composite_span(span.span_id)
+        is_parent = span.span_id in self._parent_span_ids
+        self._parent_span_ids.discard(span.span_id)
+
+        # Only leaf spans with a local parent are merged, so that no exported
+        # span refers to a merged span and local roots are never held back.
+        if not isinstance(span.parent_span, trace_span.Span):
+            self._export(span, self.get_span_datas(span))
+            return
+        parent_span_id = span.parent_span.span_id
+        self._parent_span_ids.add(parent_span_id)
+        if is_parent or span.children or span.duration_ms is None:
+            self._flush_composite_span(parent_span_id)
+            self._export(span, self.get_span_datas(span))
+            return
+
+        composite_span = self._composite_spans.get(parent_span_id)
+        if composite_span is not None and composite_span.matches(span):
+            composite_span.add(span)
+            return
+        self._flush_composite_span(parent_span_id)
+        [span_data] = self.get_span_datas(span)
+        self._composite_spans[parent_span_id] = _CompositeSpan(
+            span_data, span.duration_ms)
+
+    def _flush_composite_span(self, parent_span_id):
+        composite_span = self._composite_spans.pop(parent_span_id, None)
+        if composite_span is not None:
+            self._export(None, [composite_span.to_span_data()],
+                         composite_span.count)
+
+    def _export(self, span, span_datas, span_count=None):
+        """Export span datas unless the trace already has ``max_spans``
+        spans. The local root span is always exported, with the number of
+        dropped spans.
+        """
+        if span_count is None:
+            span_count = len(span_datas)
+        is_local_root = span is not None and \
+            not isinstance(span.parent_span, trace_span.Span)
+        if self.max_spans is not None:
+            if is_local_root:
+                if self.dropped_span_count:
+                    span.add_attribute(
+                        DROPPED_SPAN_COUNT, self.dropped_span_count)
+                    span_datas = self.get_span_datas(span)
+            elif self.exported_span_count + len(span_datas) > \
+                    self.max_spans:
+                self.dropped_span_count += span_count
+                return
+        self.exported_span_count += len(span_datas)
+        self.exporter.export(span_datas)
+
     def current_span(self):
         """Return the current span."""
         current_span = execution_context.get_current_span()
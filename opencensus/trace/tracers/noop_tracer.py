@@ -12,22 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
+from opencensus.common.runtime_context import RuntimeContext
+from opencensus.trace import attributes_helper
 from opencensus.trace import blank_span as trace_span
-from opencensus.trace import trace_options
+from opencensus.trace import span_processor, trace_options
 from opencensus.trace.span_context import SpanContext
 from opencensus.trace.tracers import base
 
+ERROR_NAME = attributes_helper.COMMON_ATTRIBUTES['ERROR_NAME']
+HTTP_STATUS_CODE = attributes_helper.COMMON_ATTRIBUTES['HTTP_STATUS_CODE']
+
 
 class NoopTracer(base.Tracer):
     """No-op implementation of the :class:`Tracer` interface, all methods are
     no-ops. Should be used when tracing is not enabled or not sampled.
+
+    :type trace_record: :class:`~opencensus.trace.flight_recorder.TraceRecord`
+    :param trace_record: (Optional) Compact record of the unsampled trace,
+                         which gets the name, duration and status of every
+                         ended span.
     """
 
-    def __init__(self):
+    def __init__(self, trace_record=None):
 
         self.span_context = SpanContext(
             trace_options=trace_options.TraceOptions(0)
         )
+        self.trace_record = trace_record
+        # Spans started while span processors are registered or the trace is
+        # recorded, so that their durations can be reported even though the
+        # trace is not sampled.
+        self._timed_spans = []
 
     def finish(self):
         """End spans and send to reporter."""
@@ -56,17 +73,58 @@ class NoopTracer(base.Tracer):
         :returns: The Span object.
         """
         span = trace_span.BlankSpan(name, context_tracer=self)
+        if self.trace_record is not None or \
+                span_processor.get_span_processors():
+            span._start_timestamp = time.time()
+            self._timed_spans.append(span)
+            # Integrations get the current span from the execution context
+            # to set its status.
+            RuntimeContext.current_span = span
         return span
 
     def end_span(self):
-        """End a span. Remove the span from the span stack, and update the
-        span_id in TraceContext as the current span_id which is the peek
-        element in the span stack.
+        """End a span. Nothing is exported, but span processors and the
+        trace record are given the duration and status of spans that were
+        timed when they started.
         """
-        pass
+        try:
+            span = self._timed_spans.pop()
+        except IndexError:
+            return
+        start_timestamp, span._start_timestamp = span._start_timestamp, None
+        duration_ms = (time.time() - start_timestamp) * 1000
+        RuntimeContext.current_span = \
+            self._timed_spans[-1] if self._timed_spans else None
+        if span_processor.get_span_processors():
+            span_processor.notify_span_end(
+                span.name, span.span_kind, span._status_code, duration_ms)
+
+        trace_record = self.trace_record
+        if trace_record is None:
+            return
+        if self._timed_spans:
+            parent_span_id = self._timed_spans[-1].span_id
+        else:
+            parent_span_id = trace_record.parent_span_id
+        trace_record.add_span(
+            span.span_id, parent_span_id, span.name, span.span_kind,
+            start_timestamp, duration_ms, span._status_code)
+        if not self._timed_spans:
+            trace_record.end()
 
     def current_span(self):
-        """Return the current span."""
+        """Return the current span.
+
+        While span processors are registered or the trace is recorded, this
+        is the innermost span started and not ended yet, so that the status
+        set by integrations reaches them. Otherwise, or when no span was
+        started, a new :class:`~opencensus.trace.blank_span.BlankSpan`.
+
+        :rtype: :class:`~opencensus.trace.blank_span.BlankSpan`
+        :returns: The current span.
+        """
+        if self._timed_spans:
+            return self._timed_spans[-1]
         return trace_span.BlankSpan()
 
     def add_attribute_to_current_span(self, attribute_key, attribute_value):
@@ -78,7 +136,22 @@ class NoopTracer(base.Tracer):
         :type attribute_value:str
         :param attribute_value: Attribute value.
         """
-        return
+        self._record_attribute(attribute_key, attribute_value)
+
+    def _record_attribute(self, attribute_key, attribute_value):
+        """Mark the recorded trace as failed on the attributes set for
+        errors and 5xx responses, so that it gets exported."""
+        trace_record = self.trace_record
+        if trace_record is None:
+            return
+        if attribute_key == ERROR_NAME:
+            trace_record.error = True
+        elif attribute_key == HTTP_STATUS_CODE:
+            try:
+                if int(attribute_value) >= 500:
+                    trace_record.error = True
+            except (TypeError, ValueError):
+                pass
 
     def list_collected_spans(self):
         """List collected spans."""
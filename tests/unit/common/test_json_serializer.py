@@ -0,0 +1,186 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import datetime
+import io
+import json
+import unittest
+
+import mock
+
+from opencensus.common import json_serializer
+from opencensus.common.transports import http
+
+Point = collections.namedtuple('Point', 'x y')
+
+OBJ = {
+    'name': u'caf\u00e9',
+    'list': [1, 2.5, None, True, 'a/b'],
+    'tuple': (1, 2),
+    'nested': {'key': {'deep': []}},
+    1: 'int key',
+}
+
+
+def _get_serializers():
+    serializers = [json_serializer.JsonSerializer()]
+    for serializer_class in (json_serializer.OrjsonSerializer,
+                             json_serializer.UjsonSerializer):
+        try:
+            serializers.append(serializer_class())
+        except Exception:
+            pass
+    return serializers
+
+
+class TestSerializers(unittest.TestCase):
+
+    def assertSameJson(self, data, obj, default=None):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        self.assertEqual(json.loads(data),
+                         json.loads(json.dumps(obj, default=default)))
+
+    def test_dumps(self):
+        for serializer in _get_serializers():
+            data = serializer.dumps(OBJ)
+            self.assertIsInstance(data, str)
+            self.assertSameJson(data, OBJ)
+
+    def test_dumpb(self):
+        for serializer in _get_serializers():
+            data = serializer.dumpb(OBJ)
+            self.assertIsInstance(data, bytes)
+            self.assertSameJson(data, OBJ)
+
+    def test_dump(self):
+        for serializer in _get_serializers():
+            writer = io.BytesIO()
+            serializer.dump(OBJ, writer)
+            self.assertSameJson(writer.getvalue(), OBJ)
+
+    def test_default(self):
+        obj = [datetime.datetime(2026, 1, 2, 3, 4, 5), Point(1, 2), object]
+        for serializer in _get_serializers():
+            self.assertSameJson(serializer.dumpb(obj, default=str), obj,
+                                default=str)
+            with self.assertRaises(TypeError):
+                serializer.dumpb([datetime.datetime(2026, 1, 2)])
+
+    def test_fallback(self):
+        obj = [2 ** 70]
+        for serializer in _get_serializers():
+            self.assertSameJson(serializer.dumpb(obj), obj)
+
+    def test_non_finite_floats(self):
+        obj = {'nan': float('nan'), 'list': [float('inf'), 1.5],
+               'point': Point(float('-inf'), 2)}
+        for serializer in _get_serializers():
+            self.assertEqual(
+                serializer.loads(serializer.dumpb(obj)),
+                {'nan': None, 'list': [None, 1.5], 'point': [None, 2]})
+            self.assertEqual(
+                json.loads(serializer.dumps([object], default=lambda _: [
+                    float('nan')])),
+                [[None]])
+
+    def test_separator(self):
+        for serializer in _get_serializers():
+            self.assertEqual(
+                serializer.dumpb([1, 2]),
+                b'[1' + serializer.separator + b'2]')
+
+    def test_loads(self):
+        for serializer in _get_serializers():
+            self.assertEqual(serializer.loads(b'{"a": [1]}'), {'a': [1]})
+            self.assertEqual(serializer.loads(u'"caf\u00e9"'), u'caf\u00e9')
+
+
+class TestUjsonSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.ujson = mock.Mock()
+        self.ujson.dumps.side_effect = lambda obj, **kwargs: json.dumps(
+            obj, separators=(',', ':'))
+        patcher = mock.patch.dict('sys.modules', ujson=self.ujson)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.serializer = json_serializer.UjsonSerializer()
+        self.ujson.dumps.reset_mock()
+
+    def test_dumpb(self):
+        self.assertEqual(self.serializer.dumpb([1, 2], default=str),
+                         b'[1,2]')
+        self.ujson.dumps.assert_called_once_with(
+            [1, 2], ensure_ascii=False, escape_forward_slashes=False,
+            default=str)
+
+    def test_dump(self):
+        writer = io.BytesIO()
+        self.serializer.dump({'a': 1}, writer)
+        self.assertEqual(writer.getvalue(), b'{"a":1}')
+        self.ujson.dumps.assert_called_once()
+
+    def test_non_finite_floats(self):
+        self.ujson.dumps.side_effect = OverflowError
+        self.assertEqual(self.serializer.dumpb([float('nan')]), b'[null]')
+
+    def test_iter_json(self):
+        with mock.patch.object(json_serializer, '_serializer',
+                               self.serializer):
+            self.assertEqual(b''.join(http.iter_json([1, {'a': 2}])),
+                             b'[1,{"a":2}]')
+        self.assertEqual(self.ujson.dumps.call_count, 2)
+
+
+class TestSetSerializer(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(json_serializer, '_serializer')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_set_serializer(self):
+        serializer = json_serializer.JsonSerializer()
+        json_serializer.set_serializer(serializer)
+        self.assertIs(json_serializer.get_serializer(), serializer)
+
+        json_serializer.set_serializer('json')
+        self.assertIsInstance(json_serializer.get_serializer(),
+                              json_serializer.JsonSerializer)
+
+        # Defaults to the fastest serializer installed.
+        json_serializer.set_serializer()
+        serializers = _get_serializers()
+        self.assertEqual(json_serializer.get_serializer().name,
+                         (serializers[1:] or serializers)[0].name)
+
+        with self.assertRaises(ValueError):
+            json_serializer.set_serializer('pickle')
+
+    def test_functions(self):
+        serializer = mock.Mock()
+        json_serializer.set_serializer(serializer)
+        writer = io.BytesIO()
+
+        json_serializer.dumps(OBJ)
+        json_serializer.dumpb(OBJ, default=str)
+        json_serializer.dump(OBJ, writer)
+        json_serializer.loads('{}')
+
+        serializer.dumps.assert_called_once_with(OBJ, None)
+        serializer.dumpb.assert_called_once_with(OBJ, str)
+        serializer.dump.assert_called_once_with(OBJ, writer, None)
+        serializer.loads.assert_called_once_with('{}')
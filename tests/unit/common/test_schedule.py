@@ -12,13 +12,473 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import threading
+import time
 import unittest
 
+import mock
+
+from opencensus.common import schedule
 from opencensus.common.schedule import PeriodicTask, Queue, QueueEvent
+from opencensus.trace import execution_context
 
 TIMEOUT = .1
 
 
+class TestRegisterAtFork(unittest.TestCase):
+
+    def setUp(self):
+        patch = mock.patch.multiple(
+            schedule, _fork_handlers=[], _fork_handlers_lock=threading.Lock(),
+            _deferred_starts=[])
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_register_at_fork(self):
+        calls = []
+
+        class Component(object):
+            def after_fork(self):
+                calls.append(self)
+
+        def function():
+            calls.append('function')
+
+        component = Component()
+        with mock.patch('os.register_at_fork', create=True) as mock_register:
+            schedule.register_at_fork(component.after_fork)
+            schedule.register_at_fork(function)
+        # A single handler is registered when the module is imported.
+        mock_register.assert_not_called()
+
+        schedule._run_fork_handlers()
+        self.assertEqual(calls, [component, 'function'])
+
+        # The registration doesn't keep the component alive.
+        del calls[:], component
+        schedule._run_fork_handlers()
+        self.assertEqual(calls, ['function'])
+
+        # Dead registrations are dropped.
+        with mock.patch('os.register_at_fork', create=True):
+            schedule.register_at_fork(Component().after_fork)
+        self.assertEqual(len(schedule._fork_handlers), 2)
+
+    @mock.patch('opencensus.common.schedule.logger')
+    def test_fork_handler_error(self, mock_logger):
+        handlers = [mock.Mock(side_effect=ValueError), mock.Mock()]
+        with mock.patch('os.register_at_fork', create=True):
+            for handler in handlers:
+                schedule.register_at_fork(handler)
+        schedule._run_fork_handlers()
+        mock_logger.exception.assert_called_once()
+        handlers[1].assert_called_once_with()
+        self.assertFalse(schedule._forking)
+
+    def test_threads_start_after_fork_handlers(self):
+        scheduler = schedule.Scheduler()
+        self.addCleanup(scheduler.shutdown)
+        called = threading.Event()
+
+        def after_fork():
+            scheduler.submit(called.set)
+            scheduler.call_later(10, mock.Mock())
+            # No thread runs before every component is reset.
+            self.assertEqual(scheduler._workers, [])
+            self.assertIsNone(scheduler._timer_thread)
+
+        with mock.patch('os.register_at_fork', create=True):
+            schedule.register_at_fork(after_fork)
+        schedule._run_fork_handlers()
+
+        self.assertTrue(called.wait(TIMEOUT))
+        self.assertEqual(len(scheduler._workers), 1)
+        self.assertTrue(scheduler._timer_thread.is_alive())
+        self.assertEqual(schedule._deferred_starts, [])
+
+    def test_register_at_fork_unavailable(self):
+        with mock.patch.object(schedule, 'os') as mock_os:
+            del mock_os.register_at_fork
+            schedule.register_at_fork(mock.Mock())
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = schedule.Scheduler(max_workers=2)
+        self.addCleanup(self.scheduler.shutdown)
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            schedule.Scheduler(max_workers=0)
+
+    def test_submit(self):
+        called = threading.Event()
+        self.scheduler.submit(called.set)
+        self.assertTrue(called.wait(TIMEOUT))
+        # No timer thread is needed for due calls.
+        self.assertIsNone(self.scheduler._timer_thread)
+
+    def test_call_later_order(self):
+        calls = []
+        done = threading.Event()
+        self.scheduler.call_later(TIMEOUT / 2, calls.append, 2)
+        self.scheduler.call_later(TIMEOUT, done.set)
+        self.scheduler.call_later(TIMEOUT / 10, calls.append, 1)
+
+        self.assertTrue(done.wait(TIMEOUT * 10))
+        self.assertEqual(calls, [1, 2])
+
+    def test_cancel(self):
+        func = mock.Mock()
+        call = self.scheduler.call_later(TIMEOUT / 10, func)
+        call.cancel()
+        time.sleep(TIMEOUT / 2)
+        func.assert_not_called()
+
+    def test_bounded_workers(self):
+        release = threading.Event()
+        for _ in range(5):
+            self.scheduler.submit(release.wait, TIMEOUT * 10)
+        self.assertEqual(len(self.scheduler._workers), 2)
+        release.set()
+
+    def test_exporter_threads(self):
+        is_exporter = []
+        done = threading.Event()
+
+        def check():
+            is_exporter.append(execution_context.is_exporter())
+            done.set()
+
+        self.scheduler.submit(check)
+        self.assertTrue(done.wait(TIMEOUT))
+        self.assertEqual(is_exporter, [True])
+
+    def test_exporter_hook(self):
+        hook = mock.Mock(return_value='previous')
+        with mock.patch.object(schedule, '_exporter_hook', hook):
+            self.scheduler.shutdown()
+            self.scheduler.submit(mock.Mock())
+        self.assertEqual(hook.call_args_list,
+                         [mock.call(True), mock.call('previous')])
+
+    def test_no_exporter_hook(self):
+        func = mock.Mock()
+        with mock.patch.object(schedule, '_exporter_hook', None):
+            self.scheduler.shutdown()
+            self.scheduler.submit(func)
+        func.assert_called_once_with()
+
+    def test_reserve_worker(self):
+        self.assertTrue(self.scheduler.reserve_worker())
+        # Workers that never get idle.
+        with mock.patch.object(self.scheduler, '_start_thread'):
+            for _ in range(5):
+                self.scheduler.submit(mock.Mock())
+        self.assertEqual(len(self.scheduler._workers), 3)
+        self.scheduler._workers = []
+        self.scheduler.release_worker()
+        self.assertEqual(self.scheduler._reserved, 0)
+        self.scheduler.release_worker()
+        self.assertEqual(self.scheduler._reserved, 0)
+
+    def test_blocking_calls_overlap(self):
+        scheduler = schedule.Scheduler(max_workers=1)
+        self.addCleanup(scheduler.shutdown)
+        for _ in range(3):
+            self.assertTrue(scheduler.reserve_worker())
+        # Leave an idle worker behind.
+        done = threading.Event()
+        scheduler.submit(done.set)
+        self.assertTrue(done.wait(TIMEOUT))
+
+        started = []
+        overlapped = []
+        condition = threading.Condition()
+
+        def call():
+            with condition:
+                started.append(None)
+                condition.notify_all()
+                deadline = time.time() + TIMEOUT * 10
+                while len(started) < 4 and time.time() < deadline:
+                    condition.wait(deadline - time.time())
+                overlapped.append(len(started))
+                condition.notify_all()
+
+        for _ in range(4):
+            scheduler.submit(call)
+        with condition:
+            deadline = time.time() + TIMEOUT * 20
+            while len(overlapped) < 4 and time.time() < deadline:
+                condition.wait(deadline - time.time())
+        self.assertEqual(overlapped, [4] * 4)
+        self.assertEqual(len(scheduler._workers), 4)
+
+    @mock.patch('opencensus.common.schedule.logger')
+    def test_reserve_worker_limit(self, mock_logger):
+        scheduler = schedule.Scheduler(max_workers=2, worker_limit=3)
+        self.assertTrue(scheduler.reserve_worker())
+        mock_logger.warning.assert_not_called()
+        self.assertFalse(scheduler.reserve_worker())
+        mock_logger.warning.assert_called_once()
+        self.assertEqual(scheduler._reserved, 1)
+        # The limit covers at least max_workers.
+        self.assertEqual(schedule.Scheduler(max_workers=40).worker_limit, 40)
+
+    @mock.patch('opencensus.common.schedule.logger')
+    def test_call_error(self, mock_logger):
+        done = threading.Event()
+        self.scheduler.submit(mock.Mock(side_effect=ValueError))
+        self.scheduler.submit(done.set)
+        self.assertTrue(done.wait(TIMEOUT))
+        mock_logger.exception.assert_called()
+
+    def test_shutdown(self):
+        func = mock.Mock()
+        self.scheduler.call_later(TIMEOUT, func)
+        self.scheduler.submit(func)
+
+        self.assertTrue(self.scheduler.shutdown(TIMEOUT))
+
+        # The due call runs, the pending timer is cancelled.
+        func.assert_called_once_with()
+        self.assertTrue(self.scheduler.is_shutdown)
+        self.assertTrue(self.scheduler.shutdown())
+
+    def test_call_after_shutdown(self):
+        self.scheduler.shutdown()
+        is_exporter = []
+        func = mock.Mock(side_effect=lambda: is_exporter.append(
+            execution_context.is_exporter()))
+
+        self.assertTrue(self.scheduler.call_later(TIMEOUT, func).cancelled)
+        func.assert_not_called()
+
+        # Due calls run in the calling thread.
+        self.scheduler.submit(func)
+        func.assert_called_once_with()
+        self.assertEqual(is_exporter, [True])
+        self.assertFalse(execution_context.is_exporter())
+        self.assertEqual(self.scheduler._workers, [])
+
+    def test_after_fork(self):
+        # State copied from a parent with running threads.
+        scheduler = schedule.Scheduler()
+        scheduler._workers.append(mock.Mock())
+        scheduler._timers.append(
+            (time.time() + 10, 0, schedule._Call(0, mock.Mock(), ())))
+        scheduler._condition.acquire()
+
+        scheduler._after_fork()
+        self.addCleanup(scheduler.shutdown)
+
+        # Locks held by the parent's threads are replaced.
+        self.assertTrue(scheduler._condition.acquire(False))
+        scheduler._condition.release()
+        self.assertEqual(scheduler._workers, [])
+        self.assertEqual(len(scheduler._timers), 1)
+        # The timer thread starts with the next call scheduled.
+        self.assertIsNone(scheduler._timer_thread)
+        called = threading.Event()
+        scheduler.submit(called.set)
+        self.assertTrue(called.wait(TIMEOUT))
+        self.assertTrue(scheduler._timer_thread.is_alive())
+
+    @unittest.skipUnless(hasattr(os, 'register_at_fork'),
+                         'requires os.register_at_fork')
+    def test_fork(self):
+        parent = os.getpid()
+        in_child = threading.Event()
+
+        def periodic():
+            if os.getpid() != parent:
+                in_child.set()
+
+        task = PeriodicTask(TIMEOUT / 10, periodic, scheduler=self.scheduler)
+        task.start()
+        self.addCleanup(task.cancel)
+        submitted = threading.Event()
+        self.scheduler.submit(time.sleep, TIMEOUT / 10)
+
+        pid = os.fork()
+        if not pid:  # pragma: NO COVER
+            self.scheduler.submit(submitted.set)
+            ok = submitted.wait(TIMEOUT * 10) and in_child.wait(TIMEOUT * 10)
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(status, 0)
+
+    def test_get_scheduler(self):
+        with mock.patch.object(schedule, '_scheduler', None), \
+                mock.patch('atexit.register') as mock_atexit:
+            scheduler = schedule.get_scheduler()
+            self.assertIs(schedule.get_scheduler(), scheduler)
+        mock_atexit.assert_called_once_with(
+            scheduler.shutdown, schedule._DEFAULT_GRACE_PERIOD)
+
+
+class TestTask(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = mock.Mock(spec=schedule.Scheduler)
+        self.scheduler.call_at.side_effect = \
+            lambda deadline, func, *args: schedule._Call(deadline, func, args)
+        self.func = mock.Mock()
+        self.task = schedule.Task(self.func, self.scheduler, 'test')
+
+    def _run_scheduled(self):
+        call = self.task._call
+        call.function(*call.args)
+
+    def test_trigger_coalesces(self):
+        self.task.trigger(10)
+        self.task.trigger(20)
+        self.assertEqual(self.scheduler.call_at.call_count, 1)
+
+        # An earlier trigger replaces the scheduled call.
+        call = self.task._call
+        self.task.trigger()
+        self.assertTrue(call.cancelled)
+        self.assertEqual(self.scheduler.call_at.call_count, 2)
+
+        self._run_scheduled()
+        self.func.assert_called_once_with()
+        self.assertIsNone(self.task._call)
+
+    def test_replaced_call_does_not_run(self):
+        self.task.trigger(10)
+        call = self.task._call
+        self.task.trigger()
+
+        call.function(*call.args)
+        self.func.assert_not_called()
+
+    def test_trigger_while_running(self):
+        self.func.side_effect = lambda: self.task.trigger(5)
+        self.task.trigger()
+        self._run_scheduled()
+
+        # The function runs again afterwards.
+        self.assertEqual(self.scheduler.call_at.call_count, 2)
+        self.assertGreater(self.task._call.deadline, time.time() + 4)
+
+    def test_cancel(self):
+        self.task.trigger(10)
+        call = self.task._call
+        self.task.cancel()
+        self.assertTrue(call.cancelled)
+        self.assertTrue(self.task.cancelled)
+
+        self.task.trigger()
+        self.assertEqual(self.scheduler.call_at.call_count, 1)
+
+    @mock.patch('opencensus.common.schedule.logger')
+    def test_error(self, mock_logger):
+        self.func.side_effect = ValueError
+        self.task.trigger()
+        self._run_scheduled()
+
+        mock_logger.exception.assert_called()
+        self.assertTrue(self.task.join(0))
+
+    def test_trigger_after_shutdown(self):
+        scheduler = schedule.Scheduler()
+        scheduler.shutdown()
+        task = schedule.Task(self.func, scheduler)
+
+        task.trigger()
+
+        self.func.assert_called_once_with()
+        self.assertTrue(task.join(0))
+
+    def test_after_fork(self):
+        self.task.trigger(10)
+        call = self.task._call
+        self.task._running = True
+        self.task._rerun_at = time.time() + 5
+
+        self.task._after_fork()
+
+        # The earliest pending call is scheduled again.
+        self.assertFalse(self.task._running)
+        self.assertTrue(call.cancelled)
+        self.assertLess(self.task._call.deadline, time.time() + 6)
+        self._run_scheduled()
+        self.func.assert_called_once_with()
+
+    def test_after_fork_idle(self):
+        self.task._after_fork()
+        self.assertFalse(self.scheduler.call_at.called)
+
+    def test_blocking(self):
+        self.scheduler.reserve_worker.return_value = True
+        task = schedule.Task(self.func, self.scheduler, 'test', blocking=True)
+        self.scheduler.reserve_worker.assert_called_once_with()
+        task.cancel()
+        task.cancel()
+        self.scheduler.release_worker.assert_called_once_with()
+
+    def test_blocking_limit(self):
+        self.scheduler.reserve_worker.return_value = False
+        task = schedule.Task(self.func, self.scheduler, 'test', blocking=True)
+        task.cancel()
+        self.scheduler.release_worker.assert_not_called()
+
+    def test_not_blocking(self):
+        self.task.cancel()
+        self.scheduler.reserve_worker.assert_not_called()
+        self.scheduler.release_worker.assert_not_called()
+
+    def test_join(self):
+        self.assertTrue(self.task.join())
+        self.task._running = True
+        self.assertFalse(self.task.join(TIMEOUT / 10))
+
+
+class TestPeriodicTask(unittest.TestCase):
+
+    def test_periodic_task(self):
+        scheduler = schedule.Scheduler()
+        self.addCleanup(scheduler.shutdown)
+        calls = []
+        done = threading.Event()
+
+        def func(value):
+            calls.append(value)
+            if len(calls) == 3:
+                done.set()
+
+        task = PeriodicTask(TIMEOUT / 10, func, args=[1], scheduler=scheduler)
+        self.assertFalse(task.is_alive())
+        task.start()
+        self.assertTrue(task.is_alive())
+        self.assertTrue(done.wait(TIMEOUT * 10))
+
+        task.cancel()
+        task.join()
+        self.assertFalse(task.is_alive())
+        self.assertTrue(task.finished.is_set())
+        count = len(calls)
+        time.sleep(TIMEOUT / 2)
+        self.assertEqual(len(calls), count)
+
+        with self.assertRaises(RuntimeError):
+            task.start()
+
+    def test_blocking(self):
+        scheduler = schedule.Scheduler()
+        self.addCleanup(scheduler.shutdown)
+        task = PeriodicTask(10, mock.Mock(), scheduler=scheduler,
+                            blocking=True)
+        task.start()
+        self.assertEqual(scheduler._reserved, 1)
+        task.cancel()
+        self.assertEqual(scheduler._reserved, 0)
+
+
 class TestQueueEvent(unittest.TestCase):
     def test_basic(self):
         evt = QueueEvent('foobar')
@@ -58,6 +518,24 @@ class TestQueue(unittest.TestCase):
             task.cancel()
             task.join()
 
+    def test_on_put(self):
+        queue = Queue(capacity=1)
+        queue.on_put = mock.Mock()
+        queue.put(1)
+        queue.on_put.assert_called_once_with(1)
+
+        # Dropped items are not reported.
+        queue.put(2, block=False)
+        self.assertEqual(queue.on_put.call_count, 1)
+        self.assertEqual(queue.qsize(), 1)
+
+    def test_after_fork(self):
+        queue = Queue(capacity=10)
+        queue.puts((1, 2))
+        queue._after_fork()
+        self.assertTrue(queue.is_empty())
+        self.assertEqual(queue._queue.maxsize, 10)
+
     def test_flush_timeout(self):
         queue = Queue(capacity=10)
         self.assertEqual(queue.flush(timeout=TIMEOUT), 0)
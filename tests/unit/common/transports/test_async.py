@@ -12,23 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+import time
 import unittest
 
 import mock
 
+from opencensus.common import schedule
 from opencensus.common.transports import async_
 
 
 class Test_Worker(unittest.TestCase):
 
-    def _start_worker(self, worker):
-        patch_thread = mock.patch('threading.Thread', new=_Thread)
-        patch_atexit = mock.patch('atexit.register')
+    def _make_scheduler(self):
+        scheduler = schedule.Scheduler()
+        self.addCleanup(scheduler.shutdown)
+        return scheduler
+
+    def _mock_scheduler(self):
+        scheduler = mock.Mock(spec=schedule.Scheduler, worker_limit=4)
+        scheduler.call_at.side_effect = \
+            lambda deadline, func, *args: schedule._Call(deadline, func, args)
+        return scheduler
 
-        with patch_thread as mock_thread:
-            with patch_atexit as mock_atexit:
-                worker.start()
-                return mock_thread, mock_atexit
+    def _start_worker(self, worker):
+        with mock.patch('atexit.register') as mock_atexit:
+            worker.start()
+            return mock_atexit
 
     def test_constructor(self):
         exporter = mock.Mock()
@@ -42,76 +52,130 @@ class Test_Worker(unittest.TestCase):
         self.assertEqual(worker._grace_period, grace_period)
         self.assertEqual(worker._max_batch_size, max_batch_size)
         self.assertFalse(worker.is_alive)
-        self.assertIsNone(worker._thread)
+        self.assertEqual(worker._tasks, [])
+
+    def test_constructor_invalid_num_workers(self):
+        with self.assertRaises(ValueError):
+            async_._Worker(mock.Mock(), num_workers=0)
+        with self.assertRaises(ValueError):
+            async_._Worker(
+                mock.Mock(), num_workers=5,
+                scheduler=mock.Mock(spec=schedule.Scheduler, worker_limit=4))
 
     def test_start(self):
         exporter = mock.Mock()
-        worker = async_._Worker(exporter)
+        scheduler = mock.Mock(spec=schedule.Scheduler, worker_limit=4)
+        worker = async_._Worker(exporter, scheduler=scheduler)
 
-        mock_thread, mock_atexit = self._start_worker(worker)
+        mock_atexit = self._start_worker(worker)
 
         self.assertTrue(worker.is_alive)
-        self.assertIsNotNone(worker._thread)
-        self.assertTrue(worker._thread.daemon)
-        self.assertEqual(worker._thread._target, worker._thread_main)
-        self.assertEqual(
-            worker._thread._name, async_._WORKER_THREAD_NAME)
+        [task] = worker._tasks
+        self.assertEqual(task.function, worker._export_batches)
+        self.assertEqual(task.name, 'Mock Worker')
         mock_atexit.assert_called_once_with(worker._export_pending_data)
 
-        cur_thread = worker._thread
         self._start_worker(worker)
-        self.assertIs(cur_thread, worker._thread)
+        self.assertEqual(worker._tasks, [task])
 
-    def test_stop(self):
-        exporter = mock.Mock()
-        worker = async_._Worker(exporter)
+        # Nothing is scheduled until data is queued.
+        self.assertFalse(scheduler.call_at.called)
 
-        mock_thread, mock_atexit = self._start_worker(worker)
+    def test_start_num_workers(self):
+        worker = async_._Worker(
+            mock.Mock(), num_workers=3,
+            scheduler=mock.Mock(spec=schedule.Scheduler, worker_limit=4))
 
-        worker.stop()
+        self._start_worker(worker)
 
-        self.assertEqual(worker._queue.qsize(), 1)
-        self.assertEqual(
-            worker._queue.get(), async_._WORKER_TERMINATOR)
-        self.assertFalse(worker.is_alive)
-        self.assertIsNone(worker._thread)
+        self.assertEqual(len(worker._tasks), 3)
 
-        # If thread not alive, do not stop twice.
-        worker.stop()
+    def test_num_workers_reserved(self):
+        scheduler = schedule.Scheduler(max_workers=1)
+        self.addCleanup(scheduler.shutdown)
+        worker = async_._Worker(
+            mock.Mock(), num_workers=6, scheduler=scheduler)
 
-    def test__export_pending_data(self):
-        exporter = mock.Mock()
-        worker = async_._Worker(exporter)
+        self._start_worker(worker)
+        # Each worker task has a thread of its own.
+        self.assertEqual(scheduler._reserved, 6)
+
+        self.assertTrue(worker.stop())
+        self.assertEqual(scheduler._reserved, 0)
+
+    def test_start_schedules_queued_data(self):
+        scheduler = self._mock_scheduler()
+        worker = async_._Worker(
+            mock.Mock(), max_batch_size=1, scheduler=scheduler)
+        worker.enqueue([1])
+        self.assertFalse(scheduler.call_at.called)
 
         self._start_worker(worker)
-        worker._export_pending_data()
 
-        self.assertFalse(worker.is_alive)
+        [[(deadline, _, _), _]] = scheduler.call_at.call_args_list
+        self.assertLessEqual(deadline, time.time())
 
-        worker._export_pending_data()
+    def test_enqueue_schedules_due_batch(self):
+        scheduler = self._mock_scheduler()
+        worker = async_._Worker(
+            mock.Mock(), max_batch_size=2, wait_period=60,
+            scheduler=scheduler)
+        self._start_worker(worker)
+
+        worker.enqueue([1])
+        call = worker._tasks[0]._call
+        self.assertGreater(call.deadline, time.time() + 59)
+
+        # The full batch is exported right away.
+        worker.enqueue([2])
+        self.assertEqual(scheduler.call_at.call_count, 2)
+        self.assertTrue(call.cancelled)
+        self.assertLessEqual(worker._tasks[0]._call.deadline, time.time())
 
-    def test__export_pending_data_non_empty_queue(self):
+    def test_stop(self):
         exporter = mock.Mock()
-        worker = async_._Worker(exporter)
+        worker = async_._Worker(exporter, scheduler=self._make_scheduler())
+        self._start_worker(worker)
+        [task] = worker._tasks
+        worker.enqueue([1])
+
+        self.assertTrue(worker.stop())
+
+        # The pending data is exported without waiting for wait_period.
+        exporter.emit.assert_called_once_with([1])
+        self.assertFalse(worker.is_alive)
+        self.assertEqual(worker._tasks, [])
+        self.assertTrue(task.cancelled)
 
+        # If not alive, do not stop twice.
+        self.assertTrue(worker.stop())
+
+    def test_stop_timeout(self):
+        exporter = mock.Mock()
+        worker = async_._Worker(
+            exporter, grace_period=0.01, scheduler=self._mock_scheduler())
         self._start_worker(worker)
-        worker.enqueue(mock.Mock())
-        worker._export_pending_data()
+        worker.enqueue([1])
 
+        self.assertFalse(worker.stop())
+
+        self.assertFalse(exporter.emit.called)
         self.assertFalse(worker.is_alive)
 
-    def test__export_pending_data_did_not_join(self):
+    def test__export_pending_data(self):
         exporter = mock.Mock()
-        worker = async_._Worker(exporter)
+        worker = async_._Worker(exporter, scheduler=self._make_scheduler())
 
         self._start_worker(worker)
-        worker._thread._terminate_on_join = False
-        worker.enqueue(mock.Mock())
+        worker.enqueue([1])
         worker._export_pending_data()
 
         self.assertFalse(worker.is_alive)
+        exporter.emit.assert_called_once_with([1])
+
+        worker._export_pending_data()
 
-    def test__thread_main(self):
+    def test__export_batches(self):
         exporter = mock.Mock()
         worker = async_._Worker(exporter, wait_period=0)
 
@@ -124,83 +188,64 @@ class Test_Worker(unittest.TestCase):
             'spans': [{}],
         }
 
-        worker.enqueue(trace1)
-        worker.enqueue(trace2)
-        worker._queue.put_nowait(async_._WORKER_TERMINATOR)
+        worker.enqueue([trace1])
+        worker.enqueue([trace2])
 
-        worker._thread_main()
+        worker._export_batches()
 
-        self.assertTrue(worker.exporter.emit.called)
+        exporter.emit.assert_called_once_with([trace1, trace2])
         self.assertEqual(worker._queue.qsize(), 0)
+        self.assertEqual(worker._queue.unfinished_tasks, 0)
 
-    def test__thread_main_batches(self):
+    def test__export_batches_full_batches(self):
         exporter = mock.Mock()
-        worker = async_._Worker(exporter, max_batch_size=2, wait_period=0)
-
-        # Enqueue three records and the termination signal. This should be
-        # enough to perform two separate batches and a third loop with just
-        # the exit.
-        trace1 = {
-            'traceId': 'test1',
-            'spans': [{}, {}],
-        }
-        trace2 = {
-            'traceId': 'test2',
-            'spans': [{}, {}],
-        }
-        trace3 = {
-            'traceId': 'test3',
-            'spans': [{}, {}],
-        }
-        trace4 = {
-            'traceId': 'test4',
-            'spans': [{}, {}],
-        }
-        worker.enqueue(trace1)
-        worker.enqueue(trace2)
-        worker.enqueue(trace3)
-        worker.enqueue(trace4)
+        worker = async_._Worker(exporter, max_batch_size=2, wait_period=60)
 
-        worker._queue.put_nowait(async_._WORKER_TERMINATOR)
+        # Only the full batches are due, the last item waits for
+        # wait_period.
+        for ii in range(5):
+            worker.enqueue([ii])
 
-        worker._thread_main()
+        worker._export_batches()
 
-        self.assertEqual(worker._queue.qsize(), 0)
-
-    def test__thread_main_terminate_before_finish(self):
-
-        class Exporter(object):
-            def __init__(self):
-                self.exported = []
-
-            def emit(self, span):
-                self.exported.append(span)
-
-        exporter = Exporter()
-        worker = async_._Worker(exporter, max_batch_size=2, wait_period=0)
-
-        # Enqueue three records and the termination signal. This should be
-        # enough to perform two separate batches and a third loop with just
-        # the exit.
-        worker._queue.put_nowait(async_._WORKER_TERMINATOR)
+        self.assertEqual(exporter.emit.call_args_list,
+                         [mock.call([0, 1]), mock.call([2, 3])])
+        self.assertEqual(worker._queue.qsize(), 1)
 
-        # Worker should be terminated after sending span_data1, and
-        # span_data2 won't be exported.
-        span_data1 = [mock.Mock()]
-        span_data2 = [mock.Mock()]
+    def test_num_workers_export_concurrently(self):
+        lock = threading.Lock()
+        in_flight = [0]
+        overlapped = threading.Event()
+        exported = []
+
+        def emit(data):
+            with lock:
+                in_flight[0] += 1
+                exported.extend(data)
+                if in_flight[0] == 2:
+                    overlapped.set()
+            # Only returns once two exports ran at the same time.
+            overlapped.wait(5)
+            with lock:
+                in_flight[0] -= 1
 
-        worker.enqueue(span_data1)
-        worker.enqueue(span_data2)
-
-        worker._thread_main()
+        exporter = mock.Mock()
+        exporter.emit.side_effect = emit
+        worker = async_._Worker(
+            exporter, max_batch_size=1, wait_period=60, num_workers=2,
+            scheduler=self._make_scheduler())
+        self._start_worker(worker)
 
-        self.assertEqual(exporter.exported, [span_data1])
+        for ii in range(3):
+            worker.enqueue([ii])
 
-        # trace2 should be left in the queue because worker is terminated.
-        self.assertEqual(worker._queue.qsize(), 1)
+        self.assertTrue(worker.stop())
+        self.assertTrue(overlapped.is_set())
+        self.assertEqual(sorted(exported), [0, 1, 2])
+        self.assertEqual(worker._queue.qsize(), 0)
 
     @mock.patch('opencensus.common.transports.async_.logger.exception')
-    def test__thread_main_alive_on_emit_failed(self, mock):
+    def test__export_batches_emit_failed(self, mock):
 
         class Exporter(object):
             def __init__(self):
@@ -222,9 +267,8 @@ class Test_Worker(unittest.TestCase):
         worker.enqueue(span_data0)
         worker.enqueue(span_data1)
         worker.enqueue(span_data2)
-        worker.enqueue(async_._WORKER_TERMINATOR)
 
-        worker._thread_main()
+        worker._export_batches()
 
         # Span 2 should throw an exception, only span 0 and 1 are left
         self.assertEqual(exporter.exported, span_data0 + span_data1)
@@ -233,21 +277,213 @@ class Test_Worker(unittest.TestCase):
         expected = '%s failed to emit data.Dropping %s objects from queue.'
         mock.assert_called_with(expected, 'Exporter', 1)
 
-        # Nothing should be left in the queue because worker is terminated
-        # and the data was dropped.
+        # Nothing should be left in the queue because the data was dropped.
         self.assertEqual(worker._queue.qsize(), 0)
+        self.assertEqual(worker._queue.unfinished_tasks, 0)
 
-    def test_flush(self):
-        from six.moves import queue
+    @mock.patch('opencensus.common.transports.async_.logger.warning')
+    def test_enqueue_full(self, mock_warning):
+        worker = async_._Worker(mock.Mock(), max_queue_size=1)
 
+        self.assertTrue(worker.enqueue([1]))
+        self.assertFalse(worker.enqueue([2]))
+        self.assertFalse(worker.enqueue([3]))
+
+        self.assertEqual(worker.dropped, 2)
+        # Only the first drop is logged.
+        self.assertEqual(mock_warning.call_count, 1)
+
+    def test_flush(self):
         exporter = mock.Mock()
         worker = async_._Worker(exporter)
-        worker._queue = mock.Mock(spec=queue.Queue)
+        worker._queue = mock.Mock(spec=async_._BoundedQueue)
 
         # Queue is empty, should not block.
         worker.flush()
+        worker._queue.flush_pending.assert_called()
         worker._queue.join.assert_called()
 
+    def test_full_batch_sent_without_waiting(self):
+        exported = threading.Event()
+        exporter = mock.Mock()
+        exporter.emit.side_effect = lambda data: exported.set()
+        worker = async_._Worker(exporter, max_batch_size=2, wait_period=60,
+                                scheduler=self._make_scheduler())
+        self._start_worker(worker)
+        self.addCleanup(worker.stop)
+
+        worker.enqueue([1])
+        worker.enqueue([2])
+
+        self.assertTrue(exported.wait(5))
+        exporter.emit.assert_called_once_with([1, 2])
+
+
+class Test_BoundedQueue(unittest.TestCase):
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            async_._BoundedQueue(overflow_policy='unknown')
+
+    def test_unbounded(self):
+        bounded_queue = async_._BoundedQueue()
+        for ii in range(100):
+            self.assertTrue(bounded_queue.offer([ii]))
+        self.assertEqual(bounded_queue.qsize(), 100)
+        self.assertEqual(bounded_queue.dropped, 0)
+
+    def test_drop_newest(self):
+        bounded_queue = async_._BoundedQueue(max_items=2)
+        self.assertTrue(bounded_queue.offer(1))
+        self.assertTrue(bounded_queue.offer(2))
+        self.assertFalse(bounded_queue.offer(3))
+
+        self.assertEqual(bounded_queue.dropped, 1)
+        self.assertEqual([bounded_queue.get(), bounded_queue.get()], [1, 2])
+
+    def test_drop_oldest(self):
+        bounded_queue = async_._BoundedQueue(
+            max_items=2, overflow_policy=async_.DROP_OLDEST)
+        for ii in range(4):
+            self.assertTrue(bounded_queue.offer(ii))
+
+        self.assertEqual(bounded_queue.dropped, 2)
+        self.assertEqual([bounded_queue.get(), bounded_queue.get()], [2, 3])
+        bounded_queue.task_done()
+        bounded_queue.task_done()
+        # The dropped items don't block joining the queue.
+        bounded_queue.join()
+
+    def test_block(self):
+        bounded_queue = async_._BoundedQueue(
+            max_items=1, overflow_policy=async_.BLOCK, block_timeout=5)
+        bounded_queue.offer(1)
+
+        def consume():
+            bounded_queue.get()
+
+        timer = threading.Timer(0.01, consume)
+        timer.start()
+        self.assertTrue(bounded_queue.offer(2))
+        timer.join()
+        self.assertEqual(bounded_queue.get(), 2)
+
+    def test_block_timeout(self):
+        bounded_queue = async_._BoundedQueue(
+            max_items=1, overflow_policy=async_.BLOCK, block_timeout=0.01)
+        bounded_queue.offer(1)
+
+        self.assertFalse(bounded_queue.offer(2))
+        self.assertEqual(bounded_queue.dropped, 1)
+
+    def test_max_bytes(self):
+        bounded_queue = async_._BoundedQueue(
+            max_bytes=10, item_size=len)
+        self.assertTrue(bounded_queue.offer('x' * 6))
+        self.assertFalse(bounded_queue.offer('x' * 6))
+        self.assertTrue(bounded_queue.offer('x' * 4))
+        self.assertEqual(bounded_queue.size_bytes, 10)
+
+        bounded_queue.get()
+        self.assertEqual(bounded_queue.size_bytes, 4)
+
+    def test_max_bytes_oversized_item(self):
+        # An item larger than the budget is only queued alone.
+        bounded_queue = async_._BoundedQueue(
+            max_bytes=10, overflow_policy=async_.DROP_OLDEST, item_size=len)
+        bounded_queue.offer('x' * 4)
+        self.assertTrue(bounded_queue.offer('x' * 20))
+        self.assertEqual(bounded_queue.qsize(), 1)
+        self.assertEqual(bounded_queue.dropped, 1)
+
+    def test_put_ignores_limits(self):
+        bounded_queue = async_._BoundedQueue(max_items=1)
+        bounded_queue.offer(1)
+        bounded_queue.put_nowait(2)
+        self.assertEqual(bounded_queue.qsize(), 2)
+
+    def test_get_batch_full(self):
+        bounded_queue = async_._BoundedQueue()
+        for ii in range(3):
+            bounded_queue.offer(ii)
+
+        self.assertEqual(bounded_queue.get_batch(2, 60), [0, 1])
+
+    def test_get_batch_deadline(self):
+        bounded_queue = async_._BoundedQueue()
+        with mock.patch('time.time', return_value=100.0):
+            bounded_queue.offer(0)
+        bounded_queue.offer(1)
+
+        # The oldest item is past its deadline.
+        with mock.patch('time.time', return_value=110.0):
+            self.assertEqual(bounded_queue.get_batch(5, 10), [0, 1])
+
+    def test_get_batch_not_due(self):
+        bounded_queue = async_._BoundedQueue()
+        self.assertEqual(bounded_queue.get_batch(5, 60), [])
+        bounded_queue.offer(0)
+        self.assertEqual(bounded_queue.get_batch(5, 60), [])
+        self.assertEqual(bounded_queue.qsize(), 1)
+
+    def test_due_in(self):
+        bounded_queue = async_._BoundedQueue()
+        self.assertIsNone(bounded_queue.due_in(2, 10))
+
+        with mock.patch('time.time', return_value=100.0):
+            bounded_queue.offer(0)
+        with mock.patch('time.time', return_value=104.0):
+            self.assertEqual(bounded_queue.due_in(2, 10), 6)
+        with mock.patch('time.time', return_value=120.0):
+            self.assertEqual(bounded_queue.due_in(2, 10), 0)
+
+        bounded_queue.offer(1)
+        self.assertEqual(bounded_queue.due_in(2, 60), 0)
+
+    def test_wait_done(self):
+        bounded_queue = async_._BoundedQueue()
+        self.assertTrue(bounded_queue.wait_done(0))
+        bounded_queue.offer(0)
+        self.assertFalse(bounded_queue.wait_done(0.01))
+
+        bounded_queue.get()
+        timer = threading.Timer(0.01, bounded_queue.task_done)
+        timer.start()
+        self.addCleanup(timer.join)
+        self.assertTrue(bounded_queue.wait_done(5))
+
+    def test_flush_pending(self):
+        bounded_queue = async_._BoundedQueue()
+        bounded_queue.flush_pending()
+        self.assertFalse(bounded_queue._flushing)
+
+        for ii in range(3):
+            bounded_queue.offer(ii)
+        bounded_queue.flush_pending()
+        self.assertEqual(bounded_queue.due_in(2, 60), 0)
+
+        self.assertEqual(bounded_queue.get_batch(2, 60), [0, 1])
+        self.assertEqual(bounded_queue.get_batch(2, 60), [2])
+        self.assertFalse(bounded_queue._flushing)
+
+    def test_after_fork(self):
+        bounded_queue = async_._BoundedQueue(max_items=1)
+        bounded_queue.offer(1)
+        bounded_queue.offer(2)
+        bounded_queue.mutex.acquire()
+
+        bounded_queue._after_fork()
+
+        self.assertEqual(bounded_queue.qsize(), 0)
+        self.assertEqual(bounded_queue.unfinished_tasks, 0)
+        self.assertEqual(bounded_queue.dropped, 0)
+        self.assertIsNone(bounded_queue.due_in(1, 60))
+        self.assertTrue(bounded_queue.offer(3))
+        self.assertEqual(bounded_queue.max_items, 1)
+
+    def test_estimate_size(self):
+        self.assertGreater(async_._estimate_size(['x' * 100]), 100)
+
 
 class TestAsyncTransport(unittest.TestCase):
 
@@ -281,6 +517,17 @@ class TestAsyncTransport(unittest.TestCase):
 
         self.assertTrue(transport.worker.enqueue.called)
 
+    def test_dropped(self):
+        with mock.patch('atexit.register'):
+            transport = async_.AsyncTransport(
+                mock.Mock(), max_queue_size=1,
+                scheduler=mock.Mock(spec=schedule.Scheduler, worker_limit=4))
+
+        transport.export([1])
+        transport.export([2])
+
+        self.assertEqual(transport.dropped, 1)
+
     def test_flush(self):
         patch_worker = mock.patch(
             'opencensus.common.transports.async_._Worker',
@@ -293,27 +540,3 @@ class TestAsyncTransport(unittest.TestCase):
             transport.flush()
 
             self.assertTrue(transport.worker.flush.called)
-
-
-class _Thread(object):
-
-    def __init__(self, target, name):
-        self._target = target
-        self._name = name
-        self._timeout = None
-        self._terminate_on_join = True
-        self.daemon = False
-
-    def is_alive(self):
-        return self._is_alive
-
-    def start(self):
-        self._is_alive = True
-
-    def stop(self):
-        self._is_alive = False
-
-    def join(self, timeout=None):
-        self._timeout = timeout
-        if self._terminate_on_join:
-            self.stop()
@@ -0,0 +1,202 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import io
+import json
+import threading
+import unittest
+import zlib
+
+import mock
+from six.moves import BaseHTTPServer
+
+from opencensus.common import json_serializer
+from opencensus.common.transports import http
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.client_ports.add(self.client_address[1])
+        self.send_response(202)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestEncoding(unittest.TestCase):
+
+    def test_iter_json(self):
+        for obj in ([], [1, {'key': 'value'}], ({'a': [1]},), {'b': 2}):
+            self.assertEqual(b''.join(http.iter_json(obj)),
+                             json_serializer.dumpb(obj))
+
+        self.assertEqual(b''.join(http.iter_json([object], default=str)),
+                         json_serializer.dumpb([object], default=str))
+
+    def test_iter_json_stdlib(self):
+        with mock.patch.object(json_serializer, '_serializer',
+                               json_serializer.JsonSerializer()):
+            self.assertEqual(b''.join(http.iter_json([1, {'key': 'value'}])),
+                             json.dumps([1, {'key': 'value'}]).encode())
+
+    def test_encode_body_below_threshold(self):
+        self.assertEqual(
+            http.encode_body(['[', '1', ']'], http.GZIP, threshold=4),
+            ('[1]', None))
+        self.assertEqual(http.encode_body([b'ab', b'c']), (b'abc', None))
+
+    def test_encode_body_gzip(self):
+        chunks = ['[', '"{}"'.format('a' * 100), ', ', u'"\u00e9"', ']']
+
+        body, encoding = http.encode_body(chunks, http.GZIP, threshold=10)
+
+        self.assertEqual(encoding, 'gzip')
+        with gzip.GzipFile(fileobj=io.BytesIO(body)) as gzip_file:
+            self.assertEqual(gzip_file.read(),
+                             ''.join(chunks).encode('utf-8'))
+        self.assertLess(len(body), 50)
+
+    def test_encode_body_deflate(self):
+        chunks = [b'x' * 600, b'y' * 600]
+
+        body, encoding = http.encode_body(chunks, http.DEFLATE)
+
+        self.assertEqual(encoding, 'deflate')
+        self.assertEqual(zlib.decompress(body), b''.join(chunks))
+
+    def test_encode_body_invalid(self):
+        with self.assertRaises(ValueError):
+            http.encode_body(['data'], 'br')
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def test_session(self):
+        client = http.HttpClient(pool_connections=2, pool_maxsize=3,
+                                 proxies={'https': 'http://proxy:8080'},
+                                 trust_env=False)
+
+        session = client.session
+
+        self.assertIs(client.session, session)
+        self.assertFalse(session.trust_env)
+        self.assertEqual(session.proxies, {'https': 'http://proxy:8080'})
+        adapter = session.get_adapter('https://example.com')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 3)
+
+    def test_post(self):
+        client = http.HttpClient(timeout=5)
+        with mock.patch('requests.Session.post') as post:
+            client.post('http://localhost/', data='data')
+            client.post('http://localhost/', timeout=1)
+
+        self.assertEqual(post.call_args_list, [
+            mock.call(url='http://localhost/', data='data', timeout=5),
+            mock.call(url='http://localhost/', timeout=1),
+        ])
+
+    def test_post_without_timeout(self):
+        client = http.HttpClient()
+        with mock.patch('requests.Session.post') as post:
+            client.post('http://localhost/')
+
+        post.assert_called_once_with(url='http://localhost/')
+
+    def test_post_generator(self):
+        client = http.HttpClient()
+        with mock.patch('requests.Session.post') as post:
+            client.post('http://localhost/', data=http.iter_json([1, 2]))
+
+        post.assert_called_once_with(url='http://localhost/',
+                                     data=json_serializer.dumpb([1, 2]))
+
+    def test_post_compressed(self):
+        client = http.HttpClient(compression=http.DEFLATE,
+                                 compression_threshold=10)
+        data = json.dumps(['value'] * 10)
+        with mock.patch('requests.Session.post') as post:
+            client.post('http://localhost/', data=data,
+                        headers={'Content-Type': 'application/json'})
+            client.post('http://localhost/', data='[]')
+            client.post('http://localhost/', data=data,
+                        compression=http.GZIP)
+
+        kwargs = post.call_args_list[0][1]
+        self.assertEqual(kwargs['headers'], {
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'deflate',
+        })
+        self.assertEqual(zlib.decompress(kwargs['data']),
+                         data.encode('utf-8'))
+        self.assertEqual(post.call_args_list[1],
+                         mock.call(url='http://localhost/', data='[]'))
+        kwargs = post.call_args_list[2][1]
+        self.assertEqual(kwargs['headers'], {'Content-Encoding': 'gzip'})
+        self.assertEqual(zlib.decompress(kwargs['data'], 16 + zlib.MAX_WBITS),
+                         data.encode('utf-8'))
+
+    def test_keep_alive(self):
+        server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), _Handler)
+        server.client_ports = set()
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = 'http://127.0.0.1:{}/'.format(server.server_address[1])
+        client = http.HttpClient(trust_env=False)
+
+        for _ in range(3):
+            self.assertEqual(client.post(url, data='data').status_code, 202)
+        self.assertEqual(len(server.client_ports), 1)
+
+        client.close()
+        client.post(url, data='data')
+        self.assertEqual(len(server.client_ports), 2)
+        client.close()
+
+    def test_close(self):
+        client = http.HttpClient()
+        client.close()
+        session = client.session
+
+        with mock.patch.object(session, 'close') as close:
+            client.close()
+
+        close.assert_called_once_with()
+        self.assertIsNot(client.session, session)
+
+    def test_after_fork(self):
+        client = http.HttpClient()
+        session = client.session
+
+        client._after_fork()
+
+        self.assertIsNot(client.session, session)
+
+
+class TestGetClient(unittest.TestCase):
+
+    def test_get_client(self):
+        with mock.patch.object(http, '_client', None):
+            client = http.get_client()
+            self.assertIsInstance(client, http.HttpClient)
+            self.assertIs(http.get_client(), client)
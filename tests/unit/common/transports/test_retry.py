@@ -0,0 +1,237 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+from opencensus.common.transports import retry
+
+
+class TestParseRetryAfter(unittest.TestCase):
+
+    def test_seconds(self):
+        self.assertEqual(retry.parse_retry_after('120'), 120.0)
+        self.assertEqual(retry.parse_retry_after('-1'), 0.0)
+
+    def test_http_date(self):
+        now = 784111777.0  # Sun, 06 Nov 1994 08:49:37 GMT
+        self.assertEqual(retry.parse_retry_after(
+            'Sun, 06 Nov 1994 08:50:07 GMT', now=now), 30.0)
+        self.assertEqual(retry.parse_retry_after(
+            'Sun, 06 Nov 1994 08:49:07 GMT', now=now), 0.0)
+
+    def test_invalid(self):
+        for value in (None, '', 'soon'):
+            self.assertIsNone(retry.parse_retry_after(value))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = retry.CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+        with mock.patch('time.time', return_value=100):
+            breaker.record_failure()
+            self.assertTrue(breaker.allow())
+            self.assertEqual(breaker.state, breaker.CLOSED)
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+            self.assertTrue(breaker.is_open)
+            self.assertEqual(breaker.state, breaker.OPEN)
+
+    def test_success_resets_failures(self):
+        breaker = retry.CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        self.assertTrue(breaker.allow())
+
+    def test_half_open_trial(self):
+        breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+        with mock.patch('time.time', return_value=100):
+            breaker.record_failure()
+        with mock.patch('time.time', return_value=110):
+            self.assertEqual(breaker.state, breaker.HALF_OPEN)
+            self.assertFalse(breaker.is_open)
+            self.assertTrue(breaker.allow())
+            # Only one trial at a time.
+            self.assertFalse(breaker.allow())
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+        with mock.patch('time.time', return_value=120):
+            self.assertTrue(breaker.allow())
+            breaker.record_success()
+            self.assertEqual(breaker.state, breaker.CLOSED)
+            self.assertTrue(breaker.allow())
+            self.assertTrue(breaker.allow())
+
+    def test_release(self):
+        breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+        breaker.release()
+        self.assertEqual(breaker.state, breaker.CLOSED)
+        with mock.patch('time.time', return_value=100):
+            breaker.record_failure()
+        with mock.patch('time.time', return_value=110):
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())
+            breaker.release()
+            self.assertEqual(breaker.state, breaker.HALF_OPEN)
+            self.assertTrue(breaker.allow())
+
+    def test_retry_after(self):
+        breaker = retry.CircuitBreaker(failure_threshold=5, reset_timeout=10)
+
+        with mock.patch('time.time', return_value=100):
+            breaker.record_failure(retry_after=3)
+            self.assertFalse(breaker.allow())
+        with mock.patch('time.time', return_value=103):
+            self.assertTrue(breaker.allow())
+
+        breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        with mock.patch('time.time', return_value=100):
+            breaker.record_failure(retry_after=60)
+        with mock.patch('time.time', return_value=159):
+            self.assertFalse(breaker.allow())
+
+
+class TestExportPolicy(unittest.TestCase):
+
+    def test_invalid_jitter(self):
+        with self.assertRaises(ValueError):
+            retry.ExportPolicy(jitter=2)
+
+    def test_get_delay(self):
+        policy = retry.ExportPolicy(initial_backoff=1, max_backoff=5,
+                                    multiplier=2, jitter=0)
+
+        self.assertEqual([policy.get_delay(ii) for ii in range(1, 5)],
+                         [1, 2, 4, 5])
+        self.assertEqual(policy.get_delay(1, retry_after=3), 3)
+        self.assertEqual(policy.get_delay(3, retry_after=3), 4)
+        self.assertIsNone(policy.get_delay(1, retry_after=6))
+
+    def test_get_delay_jitter(self):
+        policy = retry.ExportPolicy(initial_backoff=4, jitter=0.5)
+
+        with mock.patch('random.random', return_value=1.0):
+            self.assertEqual(policy.get_delay(1), 2)
+        with mock.patch('random.random', return_value=0.0):
+            self.assertEqual(policy.get_delay(1), 4)
+
+    def test_get_max_duration(self):
+        policy = retry.ExportPolicy(max_retries=3, max_backoff=30)
+
+        self.assertEqual(policy.get_max_duration(10), 4 * 10 + 3 * 30)
+
+    def test_call_success(self):
+        sleep = mock.Mock()
+        policy = retry.ExportPolicy(sleep=sleep)
+        function = mock.Mock(return_value='result')
+
+        self.assertEqual(policy.call(function, 1, key=2), 'result')
+        function.assert_called_once_with(1, key=2)
+        self.assertFalse(sleep.called)
+
+    def test_call_retries(self):
+        sleep = mock.Mock()
+        policy = retry.ExportPolicy(initial_backoff=1, jitter=0, sleep=sleep)
+        function = mock.Mock(side_effect=[
+            retry.RetryableError(),
+            retry.RetryableError(retry_after=5),
+            'result',
+        ])
+
+        self.assertEqual(policy.call(function), 'result')
+        self.assertEqual(function.call_count, 3)
+        self.assertEqual(sleep.call_args_list, [mock.call(1), mock.call(5)])
+
+    def test_call_retries_exhausted(self):
+        sleep = mock.Mock()
+        policy = retry.ExportPolicy(max_retries=2, sleep=sleep)
+        function = mock.Mock(side_effect=retry.RetryableError('failed'))
+
+        with self.assertRaises(retry.RetryableError):
+            policy.call(function)
+        self.assertEqual(function.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_call_retry_after_too_long(self):
+        sleep = mock.Mock()
+        policy = retry.ExportPolicy(max_backoff=10, sleep=sleep)
+        function = mock.Mock(
+            side_effect=retry.RetryableError(retry_after=60))
+
+        with self.assertRaises(retry.RetryableError):
+            policy.call(function)
+        function.assert_called_once_with()
+        self.assertFalse(sleep.called)
+
+    def test_call_other_error(self):
+        breaker = retry.CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        policy = retry.ExportPolicy(circuit_breaker=breaker,
+                                    sleep=mock.Mock())
+        function = mock.Mock(side_effect=ValueError)
+
+        with self.assertRaises(ValueError):
+            policy.call(function)
+        function.assert_called_once_with()
+        # Nothing was exported, the failures aren't reset
+        self.assertEqual(breaker._failures, 1)
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+
+    def test_call_other_error_half_open(self):
+        breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        with mock.patch('time.time', return_value=100):
+            breaker.record_failure()
+        policy = retry.ExportPolicy(circuit_breaker=breaker,
+                                    sleep=mock.Mock())
+        function = mock.Mock(side_effect=ValueError)
+
+        with mock.patch('time.time', return_value=110):
+            with self.assertRaises(ValueError):
+                policy.call(function)
+            # The circuit stays half open for another trial
+            self.assertEqual(breaker.state, breaker.HALF_OPEN)
+            self.assertTrue(breaker.allow())
+
+    def test_call_circuit_open(self):
+        breaker = retry.CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        policy = retry.ExportPolicy(max_retries=5, circuit_breaker=breaker,
+                                    sleep=mock.Mock())
+        function = mock.Mock(side_effect=retry.RetryableError)
+
+        self.assertFalse(policy.circuit_open)
+        with self.assertRaises(retry.CircuitOpenError):
+            policy.call(function)
+        # The circuit opened after the second failure, stopping retries.
+        self.assertEqual(function.call_count, 2)
+        self.assertTrue(policy.circuit_open)
+
+        with self.assertRaises(retry.CircuitOpenError):
+            policy.call(function)
+        self.assertEqual(function.call_count, 2)
+
+    def test_circuit_open_without_breaker(self):
+        self.assertFalse(retry.ExportPolicy().circuit_open)
+
+    def test_is_retryable_status(self):
+        self.assertTrue(retry.is_retryable_status(503))
+        self.assertFalse(retry.is_retryable_status(400))
@@ -410,3 +410,11 @@ class TestMeasureToViewMap(unittest.TestCase):
         self.assertIsNot(exported_vd1, exported_vd2)
         self.assertIsNot(exported_vd1.end_time, view_data.end_time)
         self.assertIsNot(exported_vd2.end_time, view_data.end_time)
+
+    def test_export_without_exporters(self):
+        mtvm = measure_to_view_map_module.MeasureToViewMap()
+        view_data = ViewData(REQUEST_COUNT_VIEW, mock.Mock(), mock.Mock())
+        with mock.patch.object(
+                mtvm, 'copy_and_finalize_view_data') as copy_view_data:
+            mtvm.export([view_data])
+        self.assertFalse(copy_view_data.called)
@@ -22,6 +22,7 @@ from opencensus.stats import aggregation as aggregation_module
 from opencensus.stats import measure as measure_module
 from opencensus.stats import view as view_module
 from opencensus.stats import view_data as view_data_module
+from opencensus.tags import FrozenTagMap
 
 
 class TestViewData(unittest.TestCase):
@@ -117,6 +118,24 @@ class TestViewData(unittest.TestCase):
             view_data.tag_value_aggregation_data_map.get(tuple_vals_2).add(
                 value))
 
+    def test_record_frozen_tag_map(self):
+        view = mock.Mock()
+        view.columns = ['key1', 'key3']
+        view_data = view_data_module.ViewData(
+            view=view, start_time=utils.to_iso_str(),
+            end_time=utils.to_iso_str())
+        context = FrozenTagMap([('key1', 'val1'), ('key2', 'val2')])
+        time = utils.to_iso_str()
+
+        view_data.record(context=context, value=1, timestamp=time)
+        view_data.record(context=context, value=2, timestamp=time)
+
+        self.assertEqual(list(view_data.tag_value_aggregation_data_map),
+                         [('val1', None)])
+        self.assertEqual(view.new_aggregation_data.call_count, 1)
+        self.assertEqual(
+            context.get_tag_values(('key1', 'key3')), ('val1', None))
+
     def test_record_with_attachment(self):
         boundaries = [1, 2, 3]
         distribution_aggregation = aggregation_module.DistributionAggregation(
@@ -14,7 +14,10 @@
 
 import unittest
 
+import mock
+
 from opencensus.tags import Tag, TagKey, TagValue
+from opencensus.tags import tag_map as tag_map_module
 from opencensus.tags.propagation import binary_serializer
 
 
@@ -26,6 +29,7 @@ class TestBinarySerializer(unittest.TestCase):
         expected_tags = {}
 
         self.assertEqual(expected_tags, tag_context.map)
+        self.assertIsInstance(tag_context, tag_map_module.FrozenTagMap)
 
     def test_from_byte_array_invalid_version_id(self):
         binary = bytearray(b'\x04key1\x04val1')
@@ -70,3 +74,53 @@ class TestBinarySerializer(unittest.TestCase):
             [('key1', 'val1')])
 
         self.assertEqual(frozenset(tag_context.map), frozenset(expected_dict))
+
+    def test_round_trip_long_values(self):
+        from opencensus.tags.tag_map import TagMap
+
+        tag_context = TagMap()
+        tag_context.insert('k' * 200, 'v' * 255)
+        tag_context.insert('key', 'value')
+        propagator = binary_serializer.BinarySerializer()
+        binary = propagator.to_byte_array(tag_context)
+
+        # Lengths of 128 and over take two varint bytes.
+        self.assertEqual(binary[:4], b'\x00\x00\xc8\x01')
+        self.assertEqual(
+            list(propagator.from_byte_array(bytearray(binary))),
+            list(tag_context))
+
+    def test_from_byte_array_truncated(self):
+        propagator = binary_serializer.BinarySerializer()
+        for binary in (b'\x00\x00\x04key1\x04val', b'\x00\x00\x04key1\x84'):
+            with self.assertRaises(ValueError):
+                propagator.from_byte_array(binary=bytearray(binary))
+
+    def test_from_byte_array_cached(self):
+        binary = b'\x00\x00\x04key1\x04val1'
+        propagator = binary_serializer.BinarySerializer()
+        tag_context = propagator.from_byte_array(binary=bytearray(binary))
+        self.assertIsInstance(tag_context, tag_map_module.FrozenTagMap)
+        with self.assertRaises(TypeError):
+            tag_context.insert('key2', 'val2')
+        # Modified on a copy.
+        copy = tag_map_module.TagMap(tag_context)
+        copy.insert('key2', 'val2')
+
+        with mock.patch.object(propagator, '_parse_tags') as parse_tags:
+            cached = propagator.from_byte_array(binary=binary)
+
+        self.assertFalse(parse_tags.called)
+        self.assertIs(cached, tag_context)
+        self.assertEqual(cached.map, {'key1': 'val1'})
+
+    def test_decoded_tag_maps_bounded(self):
+        propagator = binary_serializer.BinarySerializer()
+        binary_serializer._decoded_tag_maps.clear()
+        for ii in range(binary_serializer.MAX_CACHED_TAG_MAPS + 1):
+            value = str(ii).encode()
+            propagator.from_byte_array(
+                b'\x00\x00\x03key' + bytearray([len(value)]) + value)
+
+        self.assertEqual(len(binary_serializer._decoded_tag_maps._cache),
+                         binary_serializer.MAX_CACHED_TAG_MAPS)
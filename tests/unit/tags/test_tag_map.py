@@ -90,3 +90,45 @@ class TestTagMap(unittest.TestCase):
 
         with self.assertRaises(KeyError):
             tag_map.get_value(key='not_in_map')
+
+
+class TestFrozenTagMap(unittest.TestCase):
+    def test_freeze(self):
+        tag_map = tags.TagMap([tags.Tag('key1', 'value1')])
+        frozen = tag_map.freeze()
+        tag_map.insert('key2', 'value2')
+
+        self.assertIsInstance(frozen, tags.FrozenTagMap)
+        self.assertEqual(frozen.map, {'key1': 'value1'})
+        self.assertIs(frozen.freeze(), frozen)
+
+    def test_immutable(self):
+        frozen = tags.FrozenTagMap([tags.Tag('key1', 'value1')])
+
+        with self.assertRaises(TypeError):
+            frozen.insert('key2', 'value2')
+        with self.assertRaises(TypeError):
+            frozen.delete('key1')
+        with self.assertRaises(TypeError):
+            frozen.update('key1', 'value2')
+        self.assertEqual(frozen.get_value('key1'), 'value1')
+
+    def test_hash_eq(self):
+        frozen1 = tags.FrozenTagMap([('key1', 'value1'), ('key2', 'value2')])
+        frozen2 = tags.FrozenTagMap([('key2', 'value2'), ('key1', 'value1')])
+        frozen3 = tags.FrozenTagMap([('key1', 'value2')])
+
+        self.assertEqual(frozen1, frozen2)
+        self.assertEqual(hash(frozen1), hash(frozen2))
+        self.assertNotEqual(frozen1, frozen3)
+        self.assertNotEqual(frozen1, tags.TagMap([('key1', 'value1')]))
+        self.assertEqual(len({frozen1, frozen2, frozen3}), 2)
+
+    def test_get_tag_values(self):
+        frozen = tags.FrozenTagMap([('key1', 'value1'), ('key2', 'value2')])
+        columns = ('key2', 'key3')
+
+        tag_values = frozen.get_tag_values(columns)
+
+        self.assertEqual(tag_values, ('value2', None))
+        self.assertIs(frozen.get_tag_values(('key2', 'key3')), tag_values)
@@ -15,6 +15,8 @@
 import os
 import unittest
 
+import mock
+
 
 class TestFileExporter(unittest.TestCase):
     @staticmethod
@@ -41,6 +43,27 @@ class TestFileExporter(unittest.TestCase):
         assert os.path.exists(file_name) == 1
         os.remove(file_name)
 
+    def test_emit_file_mode(self):
+        file_name = 'file_name'
+        self.addCleanup(os.remove, file_name)
+        for file_mode in ('w+', 'wb', 'a'):
+            exporter = self._make_one(file_name=file_name,
+                                      file_mode=file_mode)
+            with mock.patch('opencensus.trace.file_exporter.open',
+                            mock.mock_open(), create=True) as mock_open:
+                exporter.emit([])
+            mock_open.assert_called_once_with(file_name, file_mode)
+            data, = mock_open().write.call_args[0]
+            self.assertIsInstance(
+                data, bytes if 'b' in file_mode else str)
+
+        exporter = self._make_one(file_name=file_name, file_mode='w')
+        exporter.emit([])
+        exporter = self._make_one(file_name=file_name, file_mode='a')
+        exporter.emit([])
+        with open(file_name) as file:
+            self.assertEqual(file.read(), '{}{}')
+
     def test_export(self):
         file_name = 'file_name'
         exporter = self._make_one(file_name=file_name, transport=MockTransport)
@@ -0,0 +1,157 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+
+from opencensus.trace.propagation import composite_format
+from opencensus.trace.span_context import SpanContext
+from opencensus.trace.trace_options import TraceOptions
+
+TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+SPAN_ID = '00f067aa0ba902b7'
+TRACEPARENT = '00-{}-{}-01'.format(TRACE_ID, SPAN_ID)
+
+
+class TestCompositePropagator(unittest.TestCase):
+
+    def setUp(self):
+        self.propagator = composite_format.CompositePropagator()
+
+    def test_from_headers_none(self):
+        for headers in (None, {}, {'other': 'value'}):
+            span_context = self.propagator.from_headers(headers)
+            self.assertFalse(span_context.from_header)
+
+    def test_from_headers_traceparent(self):
+        span_context = self.propagator.from_headers({
+            'Traceparent': ' ' + TRACEPARENT,
+            'tracestate': 'foo=1,bar=2',
+        })
+
+        self.assertTrue(span_context.from_header)
+        self.assertEqual(span_context.trace_id, TRACE_ID)
+        self.assertEqual(span_context.span_id, SPAN_ID)
+        self.assertTrue(span_context.trace_options.enabled)
+        self.assertEqual(dict(span_context.tracestate),
+                         {'foo': '1', 'bar': '2'})
+
+    def test_from_headers_traceparent_invalid(self):
+        for header in (
+                'ff-{}-{}-01'.format(TRACE_ID, SPAN_ID),
+                '00-{}-{}-01'.format('0' * 32, SPAN_ID),
+                '00-{}-{}-01'.format(TRACE_ID, '0' * 16),
+                '00-{}-{}-01'.format(TRACE_ID.upper(), SPAN_ID),
+                '00_{}_{}_01'.format(TRACE_ID, SPAN_ID),
+                TRACEPARENT + '-extra',
+                '00-1234-5678-01'):
+            span_context = self.propagator.from_headers(
+                {'traceparent': header})
+            self.assertFalse(span_context.from_header, header)
+
+    def test_from_headers_traceparent_future_version(self):
+        span_context = self.propagator.from_headers(
+            {'traceparent': 'cc-{}-{}-00-extra'.format(TRACE_ID, SPAN_ID)})
+
+        self.assertTrue(span_context.from_header)
+        self.assertEqual(span_context.span_id, SPAN_ID)
+        self.assertFalse(span_context.trace_options.enabled)
+
+    def test_from_headers_invalid_tracestate(self):
+        span_context = self.propagator.from_headers({
+            'traceparent': TRACEPARENT,
+            'tracestate': 'foo=1,foo=2',
+        })
+
+        self.assertTrue(span_context.from_header)
+        self.assertIsNone(span_context.tracestate)
+
+    def test_from_headers_b3(self):
+        span_context = self.propagator.from_headers({
+            'traceparent': 'invalid',
+            'X-B3-TraceId': TRACE_ID,
+            'X-B3-SpanId': SPAN_ID,
+            'X-B3-Sampled': '1',
+            'X-Cloud-Trace-Context': '{}/1;o=0'.format('1' * 32),
+        })
+
+        self.assertTrue(span_context.from_header)
+        self.assertEqual(span_context.trace_id, TRACE_ID)
+        self.assertEqual(span_context.span_id, SPAN_ID)
+        self.assertTrue(span_context.trace_options.enabled)
+
+    def test_from_headers_b3_single_header(self):
+        span_context = self.propagator.from_headers(
+            {'b3': '{}-{}-0'.format(TRACE_ID, SPAN_ID)})
+
+        self.assertEqual(span_context.trace_id, TRACE_ID)
+        self.assertFalse(span_context.trace_options.enabled)
+
+    def test_from_headers_google_cloud(self):
+        span_context = self.propagator.from_headers({
+            'x-b3-sampled': '1',
+            'X-Cloud-Trace-Context': '{}/1;o=1'.format(TRACE_ID),
+        })
+
+        self.assertTrue(span_context.from_header)
+        self.assertEqual(span_context.trace_id, TRACE_ID)
+        self.assertEqual(span_context.span_id, '0000000000000001')
+        self.assertTrue(span_context.trace_options.enabled)
+
+    def test_cache(self):
+        headers = {'traceparent': TRACEPARENT, 'tracestate': 'foo=1'}
+        span_context = self.propagator.from_headers(headers)
+        span_context.span_id = '1' * 16
+        span_context.tracestate['bar'] = '2'
+
+        with mock.patch.object(composite_format, '_parse_traceparent') \
+                as parse:
+            cached = self.propagator.from_headers(headers)
+
+        self.assertFalse(parse.called)
+        self.assertIsNot(cached, span_context)
+        self.assertEqual(cached.span_id, SPAN_ID)
+        self.assertEqual(dict(cached.tracestate), {'foo': '1'})
+
+    def test_cache_bounded(self):
+        propagator = composite_format.CompositePropagator(cache_size=2)
+        for trace_id in ('1' * 32, '2' * 32, '3' * 32):
+            propagator.from_headers({'x-cloud-trace-context': trace_id})
+        self.assertEqual(len(propagator._cache), 2)
+
+        propagator = composite_format.CompositePropagator(cache_size=0)
+        propagator.from_headers({'traceparent': TRACEPARENT})
+        self.assertEqual(len(propagator._cache), 0)
+
+    def test_to_headers(self):
+        span_context = SpanContext(
+            trace_id=TRACE_ID,
+            span_id=SPAN_ID,
+            trace_options=TraceOptions('1'))
+
+        headers = self.propagator.to_headers(span_context)
+
+        self.assertEqual(headers['traceparent'], TRACEPARENT)
+        self.assertEqual(headers['x-b3-traceid'], TRACE_ID)
+        self.assertEqual(headers['X-Cloud-Trace-Context'],
+                         '{}/{};o=1'.format(TRACE_ID, int(SPAN_ID, 16)))
+        self.assertEqual(self.propagator.from_headers(headers).span_id,
+                         SPAN_ID)
+
+    def test_to_headers_without_span_id(self):
+        headers = self.propagator.to_headers(SpanContext(trace_id=TRACE_ID))
+
+        self.assertNotIn('X-Cloud-Trace-Context', headers)
+        self.assertIn('x-b3-traceid', headers)
@@ -70,6 +70,16 @@ class Test__get_opencensus_attr(unittest.TestCase):
         self.assertEqual("test_value",
                          execution_context.get_opencensus_attr("test"))
 
+    def test_set_attr_keeps_returned_attrs(self):
+        execution_context.set_opencensus_attr('key', 'value')
+        attrs = execution_context.get_opencensus_attrs()
+
+        execution_context.set_opencensus_attr('key', 'other')
+
+        self.assertEqual(attrs, {'key': 'value'})
+        self.assertEqual(execution_context.get_opencensus_attr('key'),
+                         'other')
+
     def test_clean_tracer(self):
         mock_tracer = mock.Mock()
         some_value = mock.Mock()
@@ -0,0 +1,194 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+from google.rpc import code_pb2
+
+from opencensus.common.transports import async_, sync
+from opencensus.trace import (
+    execution_context,
+    flight_recorder,
+    samplers,
+    span_context,
+)
+from opencensus.trace import tracer as tracer_module
+from opencensus.trace.span import SpanKind
+from opencensus.trace.status import Status
+
+TRACE_ID = '6e0c63257de34c92bf9efcd03927272e'
+PARENT_SPAN_ID = '6e0c63257de34c92'
+
+
+class TestFlightRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = mock.Mock()
+        self.recorder = flight_recorder.FlightRecorder(
+            self.exporter, max_traces=2, max_spans_per_trace=3,
+            transport=sync.SyncTransport)
+
+    def _make_tracer(self, trace_id=TRACE_ID):
+        return tracer_module.Tracer(
+            span_context=span_context.SpanContext(
+                trace_id=trace_id, span_id=PARENT_SPAN_ID),
+            sampler=samplers.AlwaysOffSampler(),
+            exporter=self.exporter,
+            flight_recorder=self.recorder)
+
+    def test_record_unsampled_trace(self):
+        tracer = self._make_tracer()
+        with tracer.span('root') as root:
+            root.span_kind = SpanKind.SERVER
+            with tracer.span('child'):
+                pass
+
+        self.assertFalse(self.exporter.emit.called)
+        [trace_record] = self.recorder.get_traces()
+        self.assertEqual(trace_record.trace_id, TRACE_ID)
+        child, root_ = trace_record.spans
+        self.assertEqual(child[1], root.span_id)
+        self.assertEqual(root_[:4],
+                         (root.span_id, PARENT_SPAN_ID, 'root',
+                          SpanKind.SERVER))
+        self.assertEqual(root_[6], code_pb2.OK)
+
+    def test_ring_buffer(self):
+        for trace_id in ('1' * 32, '2' * 32, '3' * 32):
+            with self._make_tracer(trace_id).span('root'):
+                pass
+
+        self.assertEqual([tr.trace_id for tr in self.recorder.get_traces()],
+                         ['2' * 32, '3' * 32])
+
+    def test_max_spans_per_trace(self):
+        tracer = self._make_tracer()
+        with tracer.span('root'):
+            for _ in range(4):
+                with tracer.span('child'):
+                    pass
+
+        [trace_record] = self.recorder.get_traces()
+        self.assertEqual(len(trace_record.spans), 3)
+        self.assertEqual(trace_record.dropped_spans, 2)
+
+    def test_promote_exception(self):
+        tracer = self._make_tracer()
+        with self.assertRaises(ValueError):
+            with tracer.span('root'):
+                with tracer.span('child'):
+                    raise ValueError
+
+        self.assertEqual(self.recorder.get_traces(), [])
+        [[[[child, root]], _]] = self.exporter.emit.call_args_list
+        self.assertEqual(child.name, 'child')
+        self.assertEqual(child.parent_span_id, root.span_id)
+        self.assertEqual(root.parent_span_id, PARENT_SPAN_ID)
+        self.assertEqual(root.context.trace_id, TRACE_ID)
+        self.assertEqual(root.status.canonical_code, code_pb2.UNKNOWN)
+        self.assertLessEqual(root.start_time, child.start_time)
+
+    def test_promote_5xx(self):
+        tracer = self._make_tracer()
+        tracer.start_span('root')
+        tracer.add_attribute_to_current_span('http.status_code', 503)
+        tracer.end_span()
+
+        self.assertTrue(self.exporter.emit.called)
+
+    def test_promote_error_status(self):
+        tracer = self._make_tracer()
+        with tracer.span('root') as root:
+            root.set_status(Status(code_pb2.NOT_FOUND))
+            with tracer.span('child') as child:
+                child.set_status(Status(code_pb2.UNAVAILABLE))
+
+        self.assertTrue(self.exporter.emit.called)
+
+    def test_promote_current_span_status(self):
+        tracer = self._make_tracer()
+        tracer.start_span('root')
+        span = execution_context.get_current_span()
+        self.assertIs(span, tracer.current_span())
+        # As done by the flask integration on errors.
+        span.status = Status(code_pb2.UNKNOWN, 'error')
+        tracer.end_span()
+
+        self.assertIsNone(execution_context.get_current_span())
+        self.assertTrue(self.exporter.emit.called)
+
+    def test_promote_span_attributes(self):
+        # As done by the django integration.
+        tracer = self._make_tracer()
+        span = tracer.start_span('root')
+        span.add_attribute('http.status_code', 500)
+        tracer.end_span()
+
+        tracer = self._make_tracer()
+        span = tracer.start_span('root')
+        span.add_attribute('error.name', 'ValueError')
+        tracer.end_span()
+
+        self.assertEqual(self.exporter.emit.call_count, 2)
+
+    def test_current_span_restored(self):
+        tracer = self._make_tracer()
+        with tracer.span('root') as root:
+            with tracer.span('child') as child:
+                self.assertIs(execution_context.get_current_span(), child)
+            self.assertIs(execution_context.get_current_span(), root)
+
+    def test_async_transport(self):
+        with mock.patch('atexit.register'):
+            recorder = flight_recorder.FlightRecorder(self.exporter)
+        self.assertIsInstance(recorder.transport, async_.AsyncTransport)
+        with mock.patch.object(recorder.transport, 'export') as export:
+            with self.assertRaises(ValueError):
+                with tracer_module.Tracer(
+                        sampler=samplers.AlwaysOffSampler(),
+                        flight_recorder=recorder).span('root'):
+                    raise ValueError
+        # The trace is handed to the transport, not emitted on the request
+        # thread.
+        self.assertTrue(export.called)
+        self.assertFalse(self.exporter.emit.called)
+
+    def test_not_promoted_4xx(self):
+        tracer = self._make_tracer()
+        tracer.start_span('root')
+        tracer.add_attribute_to_current_span('http.status_code', '404')
+        tracer.add_attribute_to_current_span('http.status_code', None)
+        tracer.end_span()
+
+        self.assertFalse(self.exporter.emit.called)
+
+    def test_promote(self):
+        with self._make_tracer().span('root'):
+            pass
+
+        self.assertFalse(self.recorder.promote('0' * 32))
+        self.assertTrue(self.recorder.promote(TRACE_ID))
+        self.assertFalse(self.recorder.promote(TRACE_ID))
+        self.assertEqual(self.exporter.emit.call_count, 1)
+
+    def test_sampled_trace_not_recorded(self):
+        tracer = tracer_module.Tracer(
+            sampler=samplers.AlwaysOnSampler(),
+            exporter=self.exporter,
+            flight_recorder=self.recorder)
+        with tracer.span('root'):
+            pass
+
+        self.assertEqual(self.recorder.get_traces(), [])
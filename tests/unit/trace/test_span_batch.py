@@ -0,0 +1,118 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from opencensus.common.utils import timestamp_to_microseconds
+from opencensus.trace import span_context, span_data
+from opencensus.trace.span_batch import SpanBatch
+from opencensus.trace.status import Status
+
+TRACE_ID = '6e0c63257de34c92bf9efcd03927272e'
+
+
+def _make_span_data(span_id, attributes=None, context=None,
+                    start_time='2017-08-15T18:02:26.071158Z',
+                    end_time='2017-08-15T18:02:36.071158Z'):
+    if context is None:
+        context = span_context.SpanContext(trace_id=TRACE_ID)
+    return span_data.SpanData(
+        name='span' + span_id,
+        context=context,
+        span_id=span_id,
+        parent_span_id=None,
+        attributes=attributes,
+        start_time=start_time,
+        end_time=end_time,
+        child_span_count=0,
+        stack_trace=None,
+        annotations=None,
+        message_events=None,
+        links=None,
+        status=Status(0),
+        same_process_as_parent_span=None,
+        span_kind=0,
+    )
+
+
+class TestSpanBatch(unittest.TestCase):
+
+    def test_from_span_datas(self):
+        span_datas = [
+            _make_span_data('1', {'key': 'value', 'count': 1}),
+            _make_span_data('2', {'key': 'value', 'list': [1]}),
+            _make_span_data('3', {}),
+        ]
+        batch = SpanBatch.from_span_datas(span_datas)
+
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.span_ids, ['1', '2', '3'])
+        self.assertEqual(batch.names, ['span1', 'span2', 'span3'])
+        self.assertEqual(batch.trace_ids, [TRACE_ID] * 3)
+        # Identical attributes are only stored once.
+        self.assertEqual(len(batch.attribute_table), 3)
+        self.assertEqual(batch.attributes[2], ())
+        self.assertEqual(batch.get_attributes(1),
+                         {'key': 'value', 'list': [1]})
+        self.assertEqual(batch.get_span_datas(), span_datas)
+        self.assertIs(SpanBatch.from_span_datas(batch), batch)
+
+    def test_convert_attributes(self):
+        batch = SpanBatch.from_span_datas([
+            _make_span_data('1', {'key': 'value', 'skip': 1}),
+            _make_span_data('2', {'key': 'value'}),
+        ])
+        calls = []
+
+        def convert(key, value):
+            calls.append(key)
+            if key != 'skip':
+                return key, value.upper()
+
+        self.assertEqual(batch.convert_attributes(convert),
+                         [[('key', 'VALUE')], [('key', 'VALUE')]])
+        self.assertEqual(sorted(calls), ['key', 'skip'])
+
+    def test_microseconds(self):
+        timestamps = [
+            '2017-08-15T18:02:26.071158Z',
+            '2017-08-15T18:02:26.000001Z',
+            '2017-08-15T18:02:27.999999Z',
+        ]
+        batch = SpanBatch.from_span_datas([
+            _make_span_data(str(ii), start_time=timestamp,
+                            end_time=timestamp)
+            for ii, timestamp in enumerate(timestamps)
+        ] + [_make_span_data('3', start_time=None, end_time=None)])
+
+        expected = [timestamp_to_microseconds(ts) for ts in timestamps]
+        self.assertEqual(batch.start_microseconds, expected + [None])
+        self.assertEqual(batch.end_microseconds, expected + [None])
+
+    def test_microseconds_reset_on_append(self):
+        batch = SpanBatch()
+        self.assertEqual(batch.start_microseconds, [])
+        batch.append(_make_span_data('1'))
+        self.assertEqual(len(batch.start_microseconds), 1)
+
+    def test_group_by_trace(self):
+        other_context = span_context.SpanContext(trace_id='1' * 32)
+        batch = SpanBatch.from_span_datas([
+            _make_span_data('1'),
+            _make_span_data('2', context=other_context),
+            _make_span_data('3'),
+        ])
+
+        self.assertEqual(batch.group_by_trace(),
+                         {TRACE_ID: [0, 2], '1' * 32: [1]})
@@ -100,3 +100,30 @@ class TestSpanData(unittest.TestCase):
         trace_json = span_data_module.format_legacy_trace_json([span_data])
         self.assertEqual(trace_json.get('traceId'), trace_id)
         self.assertEqual(len(trace_json.get('spans')), 1)
+
+    def test_format_legacy_trace_json_stack_trace_window(self):
+        span_data = span_data_module.SpanData(
+            name='root',
+            context=span_context.SpanContext(
+                trace_id='6e0c63257de34c92bf9efcd03927272e',
+                span_id='6e0c63257de34c92'
+            ),
+            span_id='6e0c63257de34c92',
+            parent_span_id=None,
+            attributes={},
+            start_time=utils.to_iso_str(),
+            end_time=utils.to_iso_str(),
+            stack_trace=stack_trace.StackTrace(['frame'], 111),
+            links=[],
+            status=None,
+            annotations=[],
+            message_events=[],
+            same_process_as_parent_span=None,
+            child_span_count=0,
+            span_kind=0,
+        )
+        window = stack_trace.StackTraceWindow()
+        first, second = span_data_module.format_legacy_trace_json(
+            [span_data, span_data], window)['spans']
+        self.assertIn('stack_frames', first['stackTrace'])
+        self.assertEqual(second['stackTrace'], {'stack_trace_hash_id': 111})
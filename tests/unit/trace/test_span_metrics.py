@@ -0,0 +1,79 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from google.rpc import code_pb2
+
+from opencensus.stats import execution_context as stats_execution_context
+from opencensus.stats import stats_recorder as stats_recorder_module
+from opencensus.stats import view_manager as view_manager_module
+from opencensus.trace import samplers, span_metrics, tracer
+from opencensus.trace.span import SpanKind
+
+
+class TestSpanMetricsProcessor(unittest.TestCase):
+
+    def setUp(self):
+        stats_execution_context.clear()
+        self.view_manager = view_manager_module.ViewManager()
+        self.processor = span_metrics.SpanMetricsProcessor(
+            view_manager=self.view_manager,
+            stats_recorder=stats_recorder_module.StatsRecorder())
+        self.processor.register()
+
+    def tearDown(self):
+        self.processor.unregister()
+        stats_execution_context.clear()
+
+    def _get_view_data(self, view):
+        return self.view_manager.get_view(
+            view.name).tag_value_aggregation_data_map
+
+    def test_on_end(self):
+        self.processor.on_end('span1', SpanKind.SERVER, code_pb2.OK, 5.0)
+        self.processor.on_end('span1', SpanKind.SERVER, code_pb2.OK, 15.0)
+        self.processor.on_end('span1', None, code_pb2.UNKNOWN, 1.0)
+
+        counts = self._get_view_data(self.processor.count_view)
+        self.assertEqual(counts[('span1', 'SERVER', '0')].count_data, 2)
+        self.assertEqual(counts[('span1', 'UNSPECIFIED', '2')].count_data, 1)
+
+        latencies = self._get_view_data(self.processor.latency_view)
+        distribution = latencies[('span1', 'SERVER', '0')]
+        self.assertEqual(distribution.count_data, 2)
+        self.assertEqual(distribution.mean_data, 10.0)
+
+    def test_invalid_span_name(self):
+        self.processor.on_end(u'sp\xe4n', SpanKind.CLIENT, code_pb2.OK, 1.0)
+        self.processor.on_end('x' * 300, SpanKind.CLIENT, code_pb2.OK, 1.0)
+
+        counts = self._get_view_data(self.processor.count_view)
+        self.assertIn(('sp_n', 'CLIENT', '0'), counts)
+        self.assertIn(('x' * 255, 'CLIENT', '0'), counts)
+
+    def test_tag_map_cache_bounded(self):
+        for ii in range(span_metrics.MAX_CACHED_TAG_MAPS + 1):
+            self.processor.on_end(str(ii), SpanKind.CLIENT, code_pb2.OK, 1.0)
+        self.assertEqual(len(self.processor._tag_maps), 1)
+
+    def test_unsampled_traces(self):
+        tracer_ = tracer.Tracer(sampler=samplers.AlwaysOffSampler())
+        for _ in range(3):
+            with tracer_.span('unsampled'):
+                pass
+
+        counts = self._get_view_data(self.processor.count_view)
+        self.assertEqual(
+            counts[('unsampled', 'UNSPECIFIED', '0')].count_data, 3)
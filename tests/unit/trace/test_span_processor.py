@@ -0,0 +1,112 @@
+# Copyright 2026, OpenCensus Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+from google.rpc import code_pb2
+
+from opencensus.trace import span_processor
+from opencensus.trace.span import Span, SpanKind
+from opencensus.trace.status import Status
+from opencensus.trace.tracers import noop_tracer
+
+
+class TestSpanProcessor(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = mock.Mock()
+        span_processor.add_span_processor(self.processor)
+
+    def tearDown(self):
+        span_processor.remove_span_processor(self.processor)
+
+    def test_base_on_end(self):
+        with self.assertRaises(NotImplementedError):
+            span_processor.SpanProcessor().on_end('span', 0, 0, 1.0)
+
+    def test_add_remove(self):
+        span_processor.add_span_processor(self.processor)
+        self.assertEqual(span_processor.get_span_processors(),
+                         (self.processor,))
+        span_processor.remove_span_processor(self.processor)
+        self.assertEqual(span_processor.get_span_processors(), ())
+
+    def test_span_end(self):
+        span = Span('span1', span_kind=SpanKind.CLIENT)
+        span.start()
+        span.set_status(Status(code_pb2.NOT_FOUND))
+        span.finish()
+        # A span is only reported once.
+        span.finish()
+
+        self.processor.on_end.assert_called_once_with(
+            'span1', SpanKind.CLIENT, code_pb2.NOT_FOUND, mock.ANY)
+        self.assertGreaterEqual(self.processor.on_end.call_args[0][3], 0)
+
+    def test_span_end_not_started(self):
+        Span('span1').finish()
+        self.assertFalse(self.processor.on_end.called)
+
+    def test_blank_span_end(self):
+        tracer = noop_tracer.NoopTracer()
+        with tracer.span('span1') as span:
+            span.span_kind = SpanKind.SERVER
+            self.assertIs(tracer.current_span(), span)
+            span.set_status(Status(code_pb2.INTERNAL))
+
+        self.processor.on_end.assert_called_once_with(
+            'span1', SpanKind.SERVER, code_pb2.INTERNAL, mock.ANY)
+        self.assertEqual(tracer._timed_spans, [])
+
+    def test_blank_span_status_assigned(self):
+        tracer = noop_tracer.NoopTracer()
+        with tracer.span('span1'):
+            # As done by the integrations.
+            tracer.current_span().status = Status(code_pb2.UNAVAILABLE)
+
+        self.processor.on_end.assert_called_once_with(
+            'span1', None, code_pb2.UNAVAILABLE, mock.ANY)
+
+    def test_blank_span_exception(self):
+        tracer = noop_tracer.NoopTracer()
+        with self.assertRaises(ValueError):
+            with tracer.span('span1'):
+                raise ValueError
+
+        self.processor.on_end.assert_called_once_with(
+            'span1', None, code_pb2.UNKNOWN, mock.ANY)
+
+    def test_noop_start_end_span(self):
+        tracer = noop_tracer.NoopTracer()
+        tracer.start_span('span1')
+        tracer.start_span('span2')
+        tracer.end_span()
+        tracer.end_span()
+        # Ending more spans than were started is harmless.
+        tracer.end_span()
+
+        self.assertEqual(
+            [call[0][0] for call in self.processor.on_end.call_args_list],
+            ['span2', 'span1'])
+
+    def test_noop_without_processors(self):
+        span_processor.remove_span_processor(self.processor)
+        tracer = noop_tracer.NoopTracer()
+        with tracer.span('span1'):
+            pass
+        tracer.end_span()
+
+        self.assertEqual(tracer._timed_spans, [])
+        self.assertFalse(self.processor.on_end.called)
@@ -193,3 +193,78 @@ class TestStackTrace(unittest.TestCase):
         # total frames should be MAX_FRAMES + 3 (1 for test function,
         # 1 for recursion start, one for exception, MAX_FRAMES in helper)
         self.assertEqual(stack_trace.dropped_frames_count, 3)
+
+    def test_from_traceback_cached(self):
+        def fail():
+            try:
+                raise AssertionError('something went wrong')
+            except AssertionError:
+                _, _, tb = sys.exc_info()
+            return stack_trace_module.StackTrace.from_traceback(tb)
+
+        first = fail()
+        patch = mock.patch(
+            'opencensus.trace.stack_trace.traceback.extract_tb')
+        with patch as mock_extract_tb:
+            second = fail()
+        self.assertFalse(mock_extract_tb.called)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(first.stack_trace_hash_id, second.stack_trace_hash_id)
+        self.assertEqual(first.stack_frames, second.stack_frames)
+        self.assertIsNot(first.stack_frames, second.stack_frames)
+        self.assertEqual(len(second.stack_frames), 1)
+
+    def test_from_traceback_different_lines(self):
+        try:
+            raise AssertionError
+        except AssertionError:
+            _, _, tb1 = sys.exc_info()
+        try:
+            raise AssertionError
+        except AssertionError:
+            _, _, tb2 = sys.exc_info()
+
+        self.assertNotEqual(
+            stack_trace_module.StackTrace.from_traceback(
+                tb1).stack_trace_hash_id,
+            stack_trace_module.StackTrace.from_traceback(
+                tb2).stack_trace_hash_id)
+
+    def test_stack_trace_cache_lru(self):
+        cache = stack_trace_module._StackTraceCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+
+    def test_format_stack_trace_json_hash_only(self):
+        stack_trace = stack_trace_module.StackTrace(['frame'], 1100)
+        self.assertEqual(stack_trace.format_stack_trace_json(hash_only=True),
+                         {'stack_trace_hash_id': 1100})
+
+
+class TestStackTraceWindow(unittest.TestCase):
+
+    def test_is_sent(self):
+        window = stack_trace_module.StackTraceWindow(window=10)
+        with mock.patch('opencensus.trace.stack_trace.time.time',
+                        return_value=100):
+            self.assertFalse(window.is_sent(1))
+            self.assertTrue(window.is_sent(1))
+            self.assertFalse(window.is_sent(2))
+        with mock.patch('opencensus.trace.stack_trace.time.time',
+                        return_value=111):
+            self.assertFalse(window.is_sent(1))
+            self.assertTrue(window.is_sent(1))
+
+    def test_maxsize(self):
+        window = stack_trace_module.StackTraceWindow(maxsize=1)
+        self.assertFalse(window.is_sent(1))
+        self.assertFalse(window.is_sent(2))
+        self.assertFalse(window.is_sent(1))
@@ -244,3 +244,111 @@ class TestContextTracer(unittest.TestCase):
 
         span1.add_attribute.assert_called_once_with(attribute_key,
                                                     attribute_value)
+
+    def _exported_span_datas(self, exporter):
+        return [sd for call in exporter.export.call_args_list
+                for sd in call[0][0]]
+
+    def test_compress_spans(self):
+        exporter = mock.Mock()
+        tracer = context_tracer.ContextTracer(
+            exporter=exporter, compress_spans=True)
+        with tracer.span('root'):
+            for _ in range(3):
+                with tracer.span('query'):
+                    pass
+            with tracer.span('render'):
+                pass
+            with tracer.span('query'):
+                pass
+
+        span_datas = self._exported_span_datas(exporter)
+        self.assertEqual([sd.name for sd in span_datas],
+                         ['query', 'render', 'query', 'root'])
+        composite = span_datas[0]
+        self.assertEqual(composite.attributes[context_tracer.COMPOSITE_COUNT],
+                         3)
+        self.assertLessEqual(
+            composite.attributes[context_tracer.COMPOSITE_DURATION_MIN],
+            composite.attributes[context_tracer.COMPOSITE_DURATION_MAX])
+        self.assertGreaterEqual(
+            composite.attributes[context_tracer.COMPOSITE_DURATION_SUM],
+            composite.attributes[context_tracer.COMPOSITE_DURATION_MAX])
+        self.assertNotIn(context_tracer.COMPOSITE_COUNT,
+                         span_datas[2].attributes)
+
+    def test_compress_spans_different_kind(self):
+        exporter = mock.Mock()
+        tracer = context_tracer.ContextTracer(
+            exporter=exporter, compress_spans=True)
+        with tracer.span('root'):
+            with tracer.span('query') as query:
+                query.span_kind = span.SpanKind.CLIENT
+            with tracer.span('query'):
+                pass
+
+        span_datas = self._exported_span_datas(exporter)
+        self.assertEqual(len(span_datas), 3)
+
+    def test_compress_spans_not_parents(self):
+        exporter = mock.Mock()
+        tracer = context_tracer.ContextTracer(
+            exporter=exporter, compress_spans=True)
+        with tracer.span('root'):
+            with tracer.span('request'):
+                with tracer.span('query'):
+                    pass
+            with tracer.span('request'):
+                pass
+
+        span_datas = self._exported_span_datas(exporter)
+        self.assertEqual([sd.name for sd in span_datas],
+                         ['query', 'request', 'request', 'root'])
+        self.assertEqual(span_datas[0].parent_span_id, span_datas[1].span_id)
+
+    def test_compress_spans_finish(self):
+        exporter = mock.Mock()
+        tracer = context_tracer.ContextTracer(
+            exporter=exporter, compress_spans=True)
+        tracer.start_span('root')
+        tracer.start_span('query')
+        tracer.end_span()
+        tracer.start_span('query')
+        tracer.end_span()
+        self.assertEqual(self._exported_span_datas(exporter), [])
+
+        tracer.finish()
+        span_datas = self._exported_span_datas(exporter)
+        self.assertEqual([sd.name for sd in span_datas], ['query', 'root'])
+        self.assertEqual(
+            span_datas[0].attributes[context_tracer.COMPOSITE_COUNT], 2)
+
+    def test_max_spans(self):
+        exporter = mock.Mock()
+        tracer = context_tracer.ContextTracer(exporter=exporter, max_spans=2)
+        with tracer.span('root'):
+            for name in ('span1', 'span2', 'span3'):
+                with tracer.span(name):
+                    pass
+
+        span_datas = self._exported_span_datas(exporter)
+        self.assertEqual([sd.name for sd in span_datas],
+                         ['span1', 'span2', 'root'])
+        self.assertEqual(tracer.dropped_span_count, 1)
+        self.assertEqual(
+            span_datas[-1].attributes[context_tracer.DROPPED_SPAN_COUNT], 1)
+
+    def test_max_spans_with_compression(self):
+        exporter = mock.Mock()
+        tracer = context_tracer.ContextTracer(
+            exporter=exporter, compress_spans=True, max_spans=1)
+        with tracer.span('root'):
+            with tracer.span('span1'):
+                pass
+            for _ in range(3):
+                with tracer.span('query'):
+                    pass
+
+        span_datas = self._exported_span_datas(exporter)
+        self.assertEqual([sd.name for sd in span_datas], ['span1', 'root'])
+        self.assertEqual(tracer.dropped_span_count, 3)